@@ -0,0 +1,104 @@
+"""
+@description: Memory footprint of get_* results with and without compact dtypes.
+@author: Rithwik Babu
+
+Fetches the same panel and supplemental data against FakeBigQueryClient in
+the default layout, with compact=True, and with compact=True, float32=True,
+and reports the in-memory size of each result frame, strings included.
+
+Usage: python benchmarks/bench_compact.py [--hawk-ids N] [--fields N] [--days N]
+           [--records-per-day N] [--series N] [--json PATH]
+"""
+import argparse
+import json
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from fake_bigquery import FakeBigQueryClient, SyntheticDataset, use_fake_client
+from hawk_sdk.api import Universal, UniversalSupplemental
+from hawk_sdk.core.common.download import RestDownloader, set_downloader
+
+MODES = {
+    'default': {},
+    'compact': {'compact': True},
+    'compact+float32': {'compact': True, 'float32': True},
+}
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Returns the memory held by a frame, its index and string contents.
+
+    :param df: The frame to measure.
+    :return: Size in bytes.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def build_cases(
+    dataset: SyntheticDataset
+) -> Dict[str, Callable[..., pd.DataFrame]]:
+    """Builds the fetches to compare, each taking the compact keyword arguments.
+
+    :param dataset: The synthetic tables.
+    :return: Callables returning a result frame, by case name.
+    """
+    hawk_ids, field_ids = dataset.hawk_ids, dataset.field_ids
+    start, end = dataset.start_date, dataset.end_date
+    universal = Universal()
+    supplemental = UniversalSupplemental()
+    return {
+        'universal.get_data 1d': lambda **kwargs: universal.get_data(
+            hawk_ids, field_ids, start, end, '1d', **kwargs
+        ).to_df(),
+        'universal.get_data 1d server_pivot':
+            lambda **kwargs: universal.get_data(
+                hawk_ids, field_ids, start, end, '1d', server_pivot=True,
+                **kwargs
+            ).to_df(),
+        'universal_supplemental.get_data_by_source':
+            lambda **kwargs: supplemental.get_data_by_source(
+                dataset.sources, start, end, **kwargs
+            ).to_df(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--hawk-ids', type=int, default=200)
+    parser.add_argument('--fields', type=int, default=20)
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--records-per-day', type=int, default=1)
+    parser.add_argument('--series', type=int, default=50)
+    parser.add_argument('--json', help='Write the results to this file')
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(
+        args.hawk_ids, args.fields, args.days, args.records_per_day, args.series
+    )
+    print(f"records={dataset.records.num_rows:,} "
+          f"supplemental_records={dataset.supplemental_records.num_rows:,}")
+    set_downloader(RestDownloader())
+
+    results: List[Dict] = []
+    with use_fake_client(FakeBigQueryClient(dataset)):
+        for name, fetch in build_cases(dataset).items():
+            baseline = None
+            for mode, kwargs in MODES.items():
+                df = fetch(**kwargs)
+                size = frame_bytes(df)
+                baseline = baseline or size
+                results.append({
+                    'name': name, 'mode': mode, 'rows': len(df), 'bytes': size
+                })
+                print(f"{name:<42} {mode:<16} rows={len(df):>9,} "
+                      f"memory={size / 2 ** 20:9.2f} MiB "
+                      f"({size / baseline:6.1%})")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'scale': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+@description: Benchmark of the Universal pivot engine.
+@author: Rithwik Babu
+
+Compares hawk_sdk.core.common.pivot.pivot_records against the previous
+combine_first + pivot_table implementation on synthetic long-format records.
+tests/test_pivot.py checks both produce the same values.
+
+Usage: python benchmarks/bench_pivot.py [n_days] [n_hawk_ids] [n_fields]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from hawk_sdk.core.common.pivot import pivot_records
+
+
+def make_records(n_days: int, n_hawk_ids: int, n_fields: int) -> pd.DataFrame:
+    """Builds long-format records with numeric, int, char and empty values.
+
+    :param n_days: Number of distinct dates.
+    :param n_hawk_ids: Number of distinct hawk_ids.
+    :param n_fields: Number of distinct fields; the last one holds chars.
+    :return: A shuffled long-format DataFrame.
+    """
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2020-01-01', periods=n_days, freq='D', tz='UTC')
+    date, hawk_id, field_id = (a.ravel() for a in np.meshgrid(
+        np.arange(n_days), np.arange(n_hawk_ids), np.arange(n_fields),
+        indexing='ij'))
+    n = len(date)
+
+    double_value = rng.normal(size=n)
+    int_value = np.full(n, np.nan)
+    is_int = field_id == 0
+    int_value[is_int] = rng.integers(0, 1000, size=is_int.sum())
+    double_value[is_int] = np.nan
+    is_char = field_id == n_fields - 1
+    double_value[is_char] = np.nan
+    char_value = np.where(is_char, 'x' + (hawk_id % 7).astype(str), None)
+    # Drop a slice of values so some cells and whole rows come out empty.
+    double_value[rng.random(n) < 0.1] = np.nan
+
+    df = pd.DataFrame({
+        'date': dates[date],
+        'hawk_id': hawk_id + 1,
+        'ticker': 'T' + (hawk_id + 1).astype(str),
+        'field_id': field_id,
+        'field_name': 'field_' + np.char.zfill(field_id.astype(str), 3),
+        'double_value': double_value,
+        'int_value': int_value,
+        'char_value': char_value,
+    })
+    return df.sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+def pivot_table_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """The pre-engine implementation of UniversalService._pivot_data."""
+    df = df.copy()
+    df['value'] = df['double_value'].combine_first(
+        df['int_value'].astype(float)
+    ).combine_first(
+        df['char_value']
+    )
+    pivoted = df.pivot_table(
+        index=['date', 'hawk_id', 'ticker'],
+        columns='field_name',
+        values='value',
+        aggfunc='first'
+    ).reset_index()
+    pivoted.columns.name = None
+    return pivoted
+
+
+def main() -> None:
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 250
+    n_hawk_ids = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    n_fields = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    df = make_records(n_days, n_hawk_ids, n_fields)
+    print(f'records={len(df):,}')
+
+    start = time.perf_counter()
+    pivot_table_reference(df)
+    print(f'pivot_table {time.perf_counter() - start:8.3f}s')
+
+    start = time.perf_counter()
+    pivot_records(df)
+    print(f'engine      {time.perf_counter() - start:8.3f}s')
+
+
+if __name__ == '__main__':
+    main()
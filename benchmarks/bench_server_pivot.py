@@ -0,0 +1,177 @@
+"""
+@description: Benchmark of server-side vs client-side Universal pivoting.
+@author: Rithwik Babu
+
+Offline mode encodes the same synthetic records the way tabledata.list
+returns them, once in long format and once pre-pivoted as fetch_data_wide
+would return them. It reports the JSON payload size of each and the client
+time to turn it into the final frame, after asserting both frames match.
+
+Live mode runs Universal.get_data both ways against BigQuery and reports
+end-to-end latency.
+
+Usage:
+    python benchmarks/bench_server_pivot.py [n_days] [n_hawk_ids] [n_fields]
+    python benchmarks/bench_server_pivot.py --live HAWK_IDS FIELD_IDS \
+        START END
+        (HAWK_IDS and FIELD_IDS are comma separated)
+"""
+import json
+import sys
+import time
+from typing import Dict, List
+
+import pandas as pd
+from google.cloud import bigquery
+
+from bench_ingestion import SCHEMA, make_row_iterator
+from bench_pivot import make_records
+from hawk_sdk.api.universal.service import UniversalService
+from hawk_sdk.core.common.columnar import to_dataframe
+from hawk_sdk.core.common.pivot import assemble_wide
+
+PAGE_SIZE = 50_000
+
+
+def encode_pages(
+    df: pd.DataFrame, schema: List[bigquery.SchemaField]
+) -> List[Dict]:
+    """Encodes a frame as tabledata.list JSON pages.
+
+    :param df: The rows to encode, with one column per schema field.
+    :param schema: The BigQuery schema of the rows.
+    :return: A list of JSON page payloads.
+    """
+    columns = []
+    for field in schema:
+        values = df[field.name]
+        if field.field_type == 'TIMESTAMP':
+            encoded = (values.astype('int64') // 1000).astype(str)
+        elif field.field_type == 'INT64':
+            encoded = values.astype('Int64').astype(str)
+        else:
+            encoded = values.astype(str)
+        columns.append([
+            value if present else None
+            for value, present in zip(
+                encoded.tolist(), values.notna().tolist()
+            )
+        ])
+
+    rows = [{'f': [{'v': value} for value in row]} for row in zip(*columns)]
+    pages = []
+    for offset in range(0, max(len(rows), 1), PAGE_SIZE):
+        page = {
+            'rows': rows[offset:offset + PAGE_SIZE], 'totalRows': len(rows)
+        }
+        if offset + PAGE_SIZE < len(rows):
+            page['pageToken'] = str(offset + PAGE_SIZE)
+        pages.append(page)
+    return pages
+
+
+def make_wide(records: pd.DataFrame) -> pd.DataFrame:
+    """Pivots records the way fetch_data_wide does in SQL.
+
+    :param records: Long-format records.
+    :return: One row per (date, hawk_id) with n_<id> and c_<id> columns.
+    """
+    records = records.assign(
+        numeric_value=records['double_value'].fillna(records['int_value'])
+    )
+    keyed = records.set_index(['date', 'hawk_id', 'ticker', 'field_id'])
+    wide = pd.concat({
+        'n': keyed['numeric_value'].unstack('field_id'),
+        'c': keyed['char_value'].astype(object).unstack('field_id'),
+    }, axis=1)
+    field_ids = sorted(records['field_id'].unique())
+    wide = wide.reindex(columns=[
+        (kind, field_id) for field_id in field_ids for kind in ('n', 'c')
+    ])
+    wide.columns = [f'{kind}_{field_id}' for kind, field_id in wide.columns]
+    return wide.reset_index()
+
+
+def run_offline(n_days: int, n_hawk_ids: int, n_fields: int) -> None:
+    """Compares payload size and client time for both pivot paths.
+
+    :param n_days: Number of distinct dates.
+    :param n_hawk_ids: Number of distinct hawk_ids.
+    :param n_fields: Number of distinct fields.
+    :return: None, prints the measurements.
+    """
+    records = make_records(n_days, n_hawk_ids, n_fields)
+    field_names = dict(zip(records['field_id'], records['field_name']))
+    wide = make_wide(records)
+
+    wide_schema = SCHEMA[:3] + [
+        bigquery.SchemaField(
+            column, 'FLOAT64' if column.startswith('n_') else 'STRING'
+        )
+        for column in wide.columns[3:]
+    ]
+    long_pages = encode_pages(records, SCHEMA)
+    wide_pages = encode_pages(wide, wide_schema)
+
+    start = time.perf_counter()
+    client_side = UniversalService._pivot_data(make_row_iterator(long_pages))
+    long_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    server_side = assemble_wide(
+        to_dataframe(make_row_iterator(wide_pages, wide_schema)), field_names
+    )
+    wide_time = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(client_side, server_side, check_dtype=False)
+
+    for name, pages, elapsed in (
+        ('client', long_pages, long_time),
+        ('server', wide_pages, wide_time),
+    ):
+        payload = sum(len(json.dumps(page)) for page in pages)
+        rows = sum(len(page['rows']) for page in pages)
+        print(f'{name}-side pivot rows={rows:>10,} '
+              f'payload={payload / 2 ** 20:9.1f} MiB '
+              f'client_time={elapsed:7.3f}s')
+
+
+def run_live(
+    hawk_ids: List[int], field_ids: List[int], start: str, end: str
+) -> None:
+    """Times Universal.get_data with both pivot paths against BigQuery.
+
+    :param hawk_ids: The hawk_ids to request.
+    :param field_ids: The field_ids to request.
+    :param start: The start date (YYYY-MM-DD).
+    :param end: The end date (YYYY-MM-DD).
+    :return: None, prints the measurements.
+    """
+    from hawk_sdk.api import Universal
+
+    with Universal() as universal:
+        for server_pivot in (False, True):
+            began = time.perf_counter()
+            df = universal.get_data(
+                hawk_ids, field_ids, start, end, '1d', server_pivot=server_pivot
+            ).to_df()
+            elapsed = time.perf_counter() - began
+            print(f'server_pivot={server_pivot!s:<5} rows={len(df):>10,} '
+                  f'time={elapsed:7.3f}s')
+
+
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == '--live':
+        hawk_ids = [int(value) for value in sys.argv[2].split(',')]
+        field_ids = [int(value) for value in sys.argv[3].split(',')]
+        run_live(hawk_ids, field_ids, sys.argv[4], sys.argv[5])
+        return
+
+    n_days = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    n_hawk_ids = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    n_fields = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    run_offline(n_days, n_hawk_ids, n_fields)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+"""
+@description: Throughput and memory benchmarks against a fake BigQuery client.
+@author: Rithwik Babu
+
+Runs the service helpers, DataObject exports and end-to-end datasource calls
+against FakeBigQueryClient at a configurable scale and reports rows per
+second and peak memory for each. Queries are memoized after a warm-up run,
+so timings cover the SDK (page parsing, Arrow conversion, pivoting, export)
+rather than the query engine. --downloader storage serves results above
+--storage-min-rows through LocalStorageDownloader instead of JSON pages. Use
+--json to save the results and compare them across commits.
+
+Usage: python benchmarks/bench_suite.py [--hawk-ids N] [--fields N] [--days N]
+           [--records-per-day N] [--repeat N] [--downloader rest|storage]
+           [--storage-min-rows N] [--only SUBSTRING] [--json PATH]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import pandas as pd
+import pyarrow as pa
+
+from fake_bigquery import (
+    FakeBigQueryClient,
+    LocalStorageDownloader,
+    SyntheticDataset,
+    use_fake_client
+)
+from hawk_sdk.api import (
+    AsyncUniversal,
+    System,
+    Universal,
+    UniversalSupplemental
+)
+from hawk_sdk.api.universal.service import UniversalService
+from hawk_sdk.core.backend.duckdb_backend import DuckDBBackend
+from hawk_sdk.core.backend.mirror import MirrorSync
+from hawk_sdk.core.common.coalesce import RequestCoalescer
+from hawk_sdk.core.common.data_object import DataObject
+from hawk_sdk.core.common.download import RestDownloader, set_downloader
+from hawk_sdk.core.common.export import read_arrow
+
+
+def measure(name: str, fn: Callable[[], int], repeat: int) -> Dict:
+    """Times a benchmark case and records its peak memory.
+
+    The best of ``repeat`` timed runs is reported. Peak memory comes from a
+    separate run under tracemalloc plus the Arrow pool high-water mark,
+    because tracemalloc slows Python code down far more than native code.
+
+    :param name: The case name.
+    :param fn: Runs the case once and returns the number of rows it consumed.
+    :param repeat: Number of timed runs.
+    :return: The measurement.
+    """
+    fn()  # warm-up, also fills the fake client's query memo
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn()
+        timings.append(time.perf_counter() - start)
+    elapsed = min(timings)
+
+    default_pool = pa.default_memory_pool()
+    pool = pa.proxy_memory_pool(default_pool)
+    pa.set_memory_pool(pool)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        pa.set_memory_pool(default_pool)
+    peak += pool.max_memory()
+
+    result = {
+        'name': name,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed else 0.0,
+        'peak_mib': peak / 2 ** 20,
+    }
+    print(f"{name:<40} rows={rows:>10,} time={elapsed:8.3f}s "
+          f"rate={result['rows_per_second']:>12,.0f}/s "
+          f"peak={result['peak_mib']:9.1f} MiB")
+    return result
+
+
+def build_cases(
+    dataset: SyntheticDataset, tmp_dir: str
+) -> Dict[str, Callable[[], int]]:
+    """Builds the benchmark cases over one dataset.
+
+    Service helpers and exports consume pre-fetched jobs, so they measure
+    only the step named; datasource cases cover the whole call. Every case
+    returns the result rows it consumed, so rates are comparable across the
+    pivoted and unpivoted paths.
+
+    :param dataset: The synthetic tables.
+    :param tmp_dir: Directory for export output.
+    :return: Callables returning their row count, by case name.
+    """
+    hawk_ids, field_ids = dataset.hawk_ids, dataset.field_ids
+    start, end = dataset.start_date, dataset.end_date
+    universal = Universal()
+    supplemental = UniversalSupplemental()
+    system = System()
+
+    long_job = universal.repository.submit_data(
+        hawk_ids, field_ids, start, end, 'raw'
+    )
+    supplemental_job = supplemental.repository.submit_data_by_source(
+        dataset.sources, start, end
+    )
+    long_rows = long_job.to_arrow().num_rows
+    supplemental_rows = supplemental_job.to_arrow().num_rows
+    frame = UniversalService._pivot_data(long_job.result())
+    exported = DataObject('universal_data', frame)
+    # One as-of cutoff per day, as a daily-rebalanced backtest would use.
+    cutoffs = [f'{day:%Y-%m-%d} 23:59:59' for day in pd.date_range(start, end)]
+    # A batch of tickers to resolve, as a pipeline would send at once.
+    repeats = max(100_000 // len(dataset.tickers), 1)
+    ticker_batch = pd.Series(dataset.tickers * repeats)
+    # The same tables as a local Parquet mirror, queried without job round
+    # trips.
+    mirror = os.path.join(tmp_dir, 'mirror')
+    dataset.write_mirror(mirror)
+    local = Universal(backend=DuckDBBackend(mirror))
+    # Feature-service threads asking for overlapping halves of the universe
+    # at once.
+    coalesced = Universal(coalescer=RequestCoalescer())
+    thread_hawk_ids = [
+        hawk_ids[i % 2::2] + hawk_ids[:len(hawk_ids) // 4] for i in range(8)
+    ]
+
+    def universal_get_data(**kwargs) -> Callable[[], int]:
+        return lambda: universal.get_data(
+            hawk_ids, field_ids, start, end, **kwargs
+        ).metrics.rows
+
+    def async_get_data() -> int:
+        async def run() -> int:
+            async with AsyncUniversal() as async_universal:
+                data = await async_universal.get_data(
+                    hawk_ids, field_ids, start, end, '1d'
+                )
+                return data.metrics.rows
+        return asyncio.run(run())
+
+    def latest_threads(datasource: Universal) -> Callable[[], int]:
+        def run() -> int:
+            with ThreadPoolExecutor(len(thread_hawk_ids)) as pool:
+                return sum(pool.map(
+                    lambda ids: len(datasource.get_latest_snapshot(
+                        ids, field_ids, per_field=True
+                    ).to_df()),
+                    thread_hawk_ids
+                ))
+        return run
+
+    def arrow_to_polars() -> int:
+        data = universal.get_data(
+            hawk_ids, field_ids, start, end, 'raw', arrow=True
+        )
+        data.to_polars()
+        return data.metrics.rows
+
+    def iter_data() -> int:
+        for _ in universal.iter_data(
+            hawk_ids, field_ids, start, end, 'raw', batch_rows=200_000
+        ):
+            pass
+        return long_rows
+
+    def pivot_data() -> int:
+        UniversalService._pivot_data(long_job.result())
+        return long_rows
+
+    def normalize_data() -> int:
+        UniversalService._normalize_data(supplemental_job.result())
+        return supplemental_rows
+
+    def snapshot_per_cutoff() -> int:
+        return sum(
+            len(universal.get_data(
+                hawk_ids, field_ids, start, cutoff, 'snapshot'
+            ).to_df())
+            for cutoff in cutoffs
+        )
+
+    def mirror_sync() -> int:
+        # A fresh directory each run, so every run is a full sync.
+        with MirrorSync(tempfile.mkdtemp(dir=tmp_dir)) as mirror:
+            return sum(mirror.sync(start, f'{end} 23:59:59').values())
+
+    def export(method: str, extension: str, **kwargs) -> Callable[[], int]:
+        path = os.path.join(tmp_dir, f'export.{extension}')
+
+        def run() -> int:
+            getattr(exported, method)(path, **kwargs)
+            return len(frame)
+        return run
+
+    def reload_arrow() -> int:
+        path = os.path.join(tmp_dir, 'reload.arrow')
+        if not os.path.exists(path):
+            exported.to_arrow(path)
+        return read_arrow(path).num_rows
+
+    return {
+        'service._pivot_data': pivot_data,
+        'service._normalize_data': normalize_data,
+        'data_object.to_df': lambda: len(exported.to_df()),
+        'data_object.to_csv': export('to_csv', 'csv'),
+        'data_object.to_csv chunked': export(
+            'to_csv', 'csv', chunk_rows=100_000
+        ),
+        'data_object.to_xlsx': export('to_xlsx', 'xlsx'),
+        'data_object.to_parquet': export('to_parquet', 'parquet'),
+        'data_object.to_feather': export('to_feather', 'feather'),
+        'data_object.to_arrow': export('to_arrow', 'arrow'),
+        'export.read_arrow': reload_arrow,
+        'universal.get_data raw': universal_get_data(interval='raw'),
+        'universal.get_data 1d': universal_get_data(interval='1d'),
+        'universal.get_data 1d server_pivot': universal_get_data(
+            interval='1d', server_pivot=True
+        ),
+        'universal.get_data raw arrow': universal_get_data(
+            interval='raw', arrow=True
+        ),
+        'universal.get_data raw arrow to_polars': arrow_to_polars,
+        'universal.get_data 1d local_metadata': universal_get_data(
+            interval='1d', local_metadata=True
+        ),
+        'universal.get_data 1d chunked': universal_get_data(
+            interval='1d', hawk_id_chunk_size=max(len(hawk_ids) // 4, 1)
+        ),
+        'universal.get_data 1d local mirror': lambda: local.get_data(
+            hawk_ids, field_ids, start, end, '1d'
+        ).metrics.rows,
+        'universal.get_latest_snapshot local mirror': (
+            lambda: local.get_latest_snapshot(
+                hawk_ids, field_ids
+            ).metrics.rows
+        ),
+        'universal.iter_data raw': iter_data,
+        'mirror.sync': mirror_sync,
+        'universal.get_latest_snapshot': lambda: universal.get_latest_snapshot(
+            hawk_ids, field_ids
+        ).metrics.rows,
+        'universal.get_latest_snapshot per_field': (
+            lambda: universal.get_latest_snapshot(
+                hawk_ids, field_ids, per_field=True
+            ).metrics.rows
+        ),
+        'universal.get_as_of daily': lambda: universal.get_as_of(
+            hawk_ids, field_ids, cutoffs
+        ).metrics.rows,
+        'universal.get_data snapshot per cutoff': snapshot_per_cutoff,
+        'async_universal.get_data 1d': async_get_data,
+        'universal.get_latest_snapshot 8 threads': latest_threads(universal),
+        'universal.get_latest_snapshot 8 threads coalesced':
+            latest_threads(coalesced),
+        'system.get_hawk_ids': lambda: len(
+            system.get_hawk_ids(dataset.tickers).to_df()
+        ),
+        'system.resolver.resolve': lambda: len(
+            system.resolver.resolve(ticker_batch)
+        ),
+        'universal_supplemental.get_data_by_source':
+            lambda: supplemental.get_data_by_source(
+                dataset.sources, start, end
+            ).metrics.rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--hawk-ids', type=int, default=200)
+    parser.add_argument('--fields', type=int, default=20)
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--records-per-day', type=int, default=1)
+    parser.add_argument('--series', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--downloader', choices=['rest', 'storage'], default='rest'
+    )
+    parser.add_argument('--storage-min-rows', type=int, default=None)
+    parser.add_argument(
+        '--only', help='Run only cases whose name contains this'
+    )
+    parser.add_argument('--json', help='Write the results to this file')
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(
+        args.hawk_ids, args.fields, args.days, args.records_per_day, args.series
+    )
+    print(f"records={dataset.records.num_rows:,} "
+          f"supplemental_records={dataset.supplemental_records.num_rows:,}")
+
+    if args.downloader == 'storage':
+        set_downloader(LocalStorageDownloader(args.storage_min_rows))
+    else:
+        set_downloader(RestDownloader())
+
+    results: List[Dict] = []
+    client = FakeBigQueryClient(dataset)
+    with use_fake_client(client), tempfile.TemporaryDirectory() as tmp_dir:
+        for name, case in build_cases(dataset, tmp_dir).items():
+            if args.only and args.only not in name:
+                continue
+            try:
+                results.append(measure(name, case, args.repeat))
+            except ImportError as e:
+                print(f"{name:<40} skipped: {e}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'scale': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
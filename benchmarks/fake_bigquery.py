@@ -0,0 +1,431 @@
+"""
+@description: Local BigQuery stand-in serving synthetic Hawk tables.
+@author: Rithwik Babu
+
+SyntheticDataset builds the records, fields, hawk_identifiers,
+supplemental_records and supplemental_series tables at a chosen scale.
+FakeBigQueryClient runs the SDK's own SQL against them in DuckDB, after
+rewriting the few BigQuery-only constructs the repositories use. Results are
+served as JSON pages through a real RowIterator, so ingestion costs the same
+as with BigQuery.
+
+Wrap code in use_fake_client(client) and every datasource created inside
+talks to the fake instead of BigQuery. Install LocalStorageDownloader with
+hawk_sdk.core.common.download.set_downloader to exercise the Storage Read
+API path as well. Requires duckdb.
+"""
+import datetime
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.cloud import bigquery
+from google.cloud.bigquery.table import RowIterator
+
+from bench_ingestion import make_row_iterator
+from hawk_sdk.core.backend.dialect import to_duckdb
+from hawk_sdk.core.common.constants import DEFAULT_STORAGE_READ_MAX_STREAMS
+from hawk_sdk.core.common.download import StorageReadDownloader
+
+PAGE_SIZE = 50_000
+TIMESTAMP_PARAMS = {'start_date', 'end_date', 'timestamp'}
+SUPPLEMENTAL_SOURCES = ['eia_petroleum', 'fred', 'cftc']
+
+
+class SyntheticDataset:
+    """Deterministic Hawk tables of n_hawk_ids x n_fields x n_days records."""
+
+    def __init__(
+        self,
+        n_hawk_ids: int = 200,
+        n_fields: int = 20,
+        n_days: int = 60,
+        records_per_day: int = 1,
+        n_series: int = 50,
+        seed: int = 0
+    ) -> None:
+        """Generates all tables.
+
+        Field 0 holds int_value and the last field char_value; the others
+        hold double_value with about 10% missing. Supplemental series are
+        spread over SUPPLEMENTAL_SOURCES with records_per_day values per day.
+
+        :param n_hawk_ids: Number of hawk_ids, numbered from 1 with tickers
+            T1, T2, ...
+        :param n_fields: Number of fields, numbered from 0 and named
+            field_000, ...
+        :param n_days: Number of days of records starting 2020-01-01.
+        :param records_per_day: Records per (hawk_id, field, day), spread evenly
+            over the day.
+        :param n_series: Number of supplemental series.
+        :param seed: Random seed for the values.
+        """
+        rng = np.random.default_rng(seed)
+        timestamps = pd.date_range(
+            '2020-01-01', periods=n_days * records_per_day,
+            freq=pd.Timedelta(days=1) / records_per_day, tz='UTC'
+        )
+        self.start_date = timestamps[0].strftime('%Y-%m-%d')
+        self.end_date = timestamps[-1].strftime('%Y-%m-%d')
+        self.hawk_ids = list(range(1, n_hawk_ids + 1))
+        self.field_ids = list(range(n_fields))
+
+        ts, hawk_id, field_id = (a.ravel() for a in np.meshgrid(
+            np.arange(len(timestamps)), np.array(self.hawk_ids),
+            np.array(self.field_ids), indexing='ij'
+        ))
+        n = len(ts)
+        double_value = rng.normal(100, 10, size=n)
+        double_value[rng.random(n) < 0.1] = np.nan
+        int_value = np.where(
+            field_id == 0, rng.integers(0, 1_000_000, size=n), 0
+        )
+        is_char = field_id == n_fields - 1
+        no_double = (field_id == 0) | is_char | np.isnan(double_value)
+        self.records = pa.table({
+            'record_timestamp': pa.array(timestamps[ts]),
+            'hawk_id': pa.array(hawk_id, pa.int64()),
+            'field_id': pa.array(field_id, pa.int64()),
+            'double_value': pa.array(double_value, mask=no_double),
+            'int_value': pa.array(int_value, pa.int64(), mask=field_id != 0),
+            'char_value': pa.array(
+                np.char.add('grade_', (hawk_id % 5).astype(str)), pa.string(),
+                mask=~is_char
+            ),
+        })
+
+        self.fields = pa.table({
+            'field_id': pa.array(self.field_ids, pa.int64()),
+            'field_name': [
+                f'field_{field_id:03d}' for field_id in self.field_ids
+            ],
+        })
+        self.tickers = [f'T{hawk_id}' for hawk_id in self.hawk_ids]
+        self.hawk_identifiers = pa.table({
+            'hawk_id': pa.array(self.hawk_ids * 2, pa.int64()),
+            'id_type': ['TICKER'] * n_hawk_ids + ['FIGI'] * n_hawk_ids,
+            'value': self.tickers + [
+                f'BBG{hawk_id:09d}' for hawk_id in self.hawk_ids
+            ],
+        })
+
+        series_source = [
+            SUPPLEMENTAL_SOURCES[i % len(SUPPLEMENTAL_SOURCES)]
+            for i in range(n_series)
+        ]
+        self.series_ids = [f'S{i:04d}' for i in range(n_series)]
+        self.sources = sorted(set(series_source))
+        self.supplemental_series = pa.table({
+            'source': series_source,
+            'series_id': self.series_ids,
+            'name': [f'Series {i}' for i in range(n_series)],
+            'description': [f'Synthetic series {i}' for i in range(n_series)],
+            'frequency': ['daily'] * n_series,
+            'unit': ['units'] * n_series,
+        })
+        ts, series = (a.ravel() for a in np.meshgrid(
+            np.arange(len(timestamps)), np.arange(n_series), indexing='ij'
+        ))
+        self.supplemental_records = pa.table({
+            'source': pa.array(np.array(series_source)[series], pa.string()),
+            'series_id': pa.array(
+                np.array(self.series_ids)[series], pa.string()
+            ),
+            'record_timestamp': pa.array(timestamps[ts]),
+            'value': rng.normal(50, 5, size=len(ts)),
+            'char_value': pa.nulls(len(ts), pa.string()),
+        })
+
+    @property
+    def tables(self) -> Dict[str, pa.Table]:
+        """The tables by their BigQuery name."""
+        return {
+            'records': self.records,
+            'fields': self.fields,
+            'hawk_identifiers': self.hawk_identifiers,
+            'supplemental_records': self.supplemental_records,
+            'supplemental_series': self.supplemental_series,
+        }
+
+    def write_mirror(self, root: str, environment: str = 'production') -> None:
+        """Writes the tables as a local mirror that DuckDBBackend can query.
+
+        :param root: The mirror directory.
+        :param environment: The environment folder to write the tables under.
+        :return: None
+        """
+        for name, table in self.tables.items():
+            folder = os.path.join(root, environment, name)
+            os.makedirs(folder, exist_ok=True)
+            pq.write_table(table, os.path.join(folder, 'part-00000.parquet'))
+
+
+class FakeQueryJob:
+    """A finished QueryJob over a precomputed result."""
+
+    def __init__(
+        self,
+        table: pa.Table,
+        pages: List[Dict],
+        schema: List[bigquery.SchemaField]
+    ) -> None:
+        """Initializes the job.
+
+        :param table: The result, served to LocalStorageDownloader.
+        :param pages: The result as tabledata.list JSON pages.
+        :param schema: The result schema.
+        """
+        self.table = table
+        self.pages = pages
+        self.schema = schema
+        self.job_id = f'fake_{uuid.uuid4().hex}'
+        self.error_result = None
+        self.total_bytes_processed = table.nbytes
+        self.total_bytes_billed = table.nbytes
+        self.slot_millis = 0
+        self.cache_hit = False
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.created = self.started = self.ended = now
+
+    def done(self, *args: Any, **kwargs: Any) -> bool:
+        return True
+
+    def result(self, *args: Any, **kwargs: Any) -> RowIterator:
+        rows = make_row_iterator(
+            self.pages, self.schema, total_rows=self.table.num_rows
+        )
+        rows.arrow_table = self.table
+        return rows
+
+    def to_arrow(self, *args: Any, **kwargs: Any) -> pa.Table:
+        return self.result().to_arrow(create_bqstorage_client=False)
+
+
+class FakeBigQueryClient:
+    """Answers bq_client.query calls from a SyntheticDataset via DuckDB."""
+
+    def __init__(self, dataset: SyntheticDataset, memoize: bool = True) -> None:
+        """Loads the dataset into an in-memory DuckDB database.
+
+        :param dataset: The tables to serve.
+        :param memoize: Reuse the pages of identical earlier queries, so
+            repeated benchmark runs measure the SDK rather than DuckDB.
+        """
+        self.connection = duckdb.connect()
+        self.connection.execute("SET TimeZone = 'UTC'")
+        for name, table in dataset.tables.items():
+            # Registered views are per cursor, so copy into real tables.
+            self.connection.register('staged', table)
+            self.connection.execute(
+                f"CREATE TABLE {name} AS SELECT * FROM staged"
+            )
+            self.connection.unregister('staged')
+        self.memoize = memoize
+        self.queries = 0
+        self._results: Dict[
+            Tuple, Tuple[pa.Table, List[Dict], List[bigquery.SchemaField]]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def query(
+        self,
+        query: str,
+        job_config: Optional[bigquery.QueryJobConfig] = None,
+        **kwargs: Any
+    ) -> FakeQueryJob:
+        """Runs a repository query.
+
+        :param query: BigQuery SQL as built by the repositories.
+        :param job_config: Carries the query parameters.
+        :return: A finished FakeQueryJob.
+        """
+        params = _parameters(job_config)
+        key = (query, repr(sorted(params.items())))
+        with self._lock:
+            self.queries += 1
+            cached = self._results.get(key)
+        if cached is None:
+            cursor = self.connection.cursor()
+            table = cursor.execute(translate(query), params).fetch_arrow_table()
+            cursor.close()
+            table = table.cast(pa.schema([
+                field.with_type(pa.timestamp('us', tz='UTC'))
+                if pa.types.is_timestamp(field.type) else field
+                for field in table.schema
+            ]))
+            schema = [
+                bigquery.SchemaField(field.name, _bigquery_type(field.type))
+                for field in table.schema
+            ]
+            cached = (table, encode_pages(table), schema)
+            if self.memoize:
+                with self._lock:
+                    self._results[key] = cached
+        return FakeQueryJob(*cached)
+
+    def close(self) -> None:
+        pass
+
+
+class LocalStorageDownloader(StorageReadDownloader):
+    """Stands in for the Storage Read API with the fake client's Arrow results.
+
+    Results over the threshold are cut into ``max_stream_count`` streams
+    (one when order must be kept), each sent through an Arrow IPC round trip
+    on its own thread and yielded as it completes, like parallel read
+    streams. ``fail_with`` makes every read session raise that error, to
+    exercise the REST fallback.
+    """
+
+    def __init__(
+        self,
+        min_rows: Optional[int] = None,
+        max_stream_count: int = DEFAULT_STORAGE_READ_MAX_STREAMS,
+        fail_with: Optional[Exception] = None
+    ) -> None:
+        super().__init__(min_rows, max_stream_count)
+        self.fail_with = fail_with
+        self.sessions = 0
+
+    def _read_client(self, rows: RowIterator) -> Optional[Any]:
+        if self.disabled or rows.total_rows is None:
+            return None
+        if rows.total_rows < self.min_rows:
+            return None
+        return self
+
+    def _read_batches(
+        self,
+        rows: RowIterator,
+        read_client: Any,
+        preserve_order: bool
+    ) -> Iterator[pa.RecordBatch]:
+        self.sessions += 1
+        if self.fail_with is not None:
+            raise self.fail_with
+        table = rows.arrow_table
+        n_streams = 1
+        if not preserve_order:
+            n_streams = max(min(self.max_stream_count, table.num_rows), 1)
+        bounds = np.linspace(0, table.num_rows, n_streams + 1).astype(int)
+        with ThreadPoolExecutor(max_workers=n_streams) as pool:
+            streams = [
+                pool.submit(_ipc_round_trip, table.slice(start, end - start))
+                for start, end in zip(bounds, bounds[1:])
+            ]
+            if not preserve_order:
+                streams = as_completed(streams)
+            for stream in streams:
+                yield from stream.result()
+
+
+@contextmanager
+def use_fake_client(client: FakeBigQueryClient) -> Iterator[FakeBigQueryClient]:
+    """Makes every datasource created in the block query the fake client.
+
+    :param client: The fake client to hand out.
+    :return: The same client.
+    """
+    with mock.patch(
+        'hawk_sdk.core.common.utils.get_bigquery_client', return_value=client
+    ):
+        yield client
+
+
+def translate(query: str) -> str:
+    """Rewrites repository SQL from BigQuery to DuckDB.
+
+    :param query: BigQuery SQL with @named parameters.
+    :return: Equivalent DuckDB SQL with $named parameters.
+    """
+    return to_duckdb(query, lambda dataset, table: table)
+
+
+def _ipc_round_trip(table: pa.Table) -> List[pa.RecordBatch]:
+    """Encodes a table as an Arrow IPC stream and decodes it again.
+
+    :param table: One read stream's rows.
+    :return: The decoded record batches.
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=10_000)
+    return pa.ipc.open_stream(sink.getvalue()).read_all().to_batches()
+
+
+def encode_pages(table: pa.Table) -> List[Dict]:
+    """Encodes an Arrow table as tabledata.list JSON pages.
+
+    :param table: The query result.
+    :return: A list of JSON page payloads.
+    """
+    columns = []
+    for column in table.columns:
+        if pa.types.is_timestamp(column.type):
+            values = column.cast(pa.timestamp('us', tz='UTC')).cast(pa.int64())
+        else:
+            values = column
+        columns.append([
+            None if value is None else str(value)
+            for value in values.to_pylist()
+        ])
+
+    rows = [{'f': [{'v': value} for value in row]} for row in zip(*columns)]
+    pages = []
+    for offset in range(0, max(len(rows), 1), PAGE_SIZE):
+        page = {'rows': rows[offset:offset + PAGE_SIZE], 'totalRows': len(rows)}
+        if offset + PAGE_SIZE < len(rows):
+            page['pageToken'] = str(offset + PAGE_SIZE)
+        pages.append(page)
+    return pages
+
+
+def _parameters(
+    job_config: Optional[bigquery.QueryJobConfig]
+) -> Dict[str, Any]:
+    """Extracts query parameters as DuckDB values.
+
+    Date parameters are converted to timestamps, mirroring BigQuery's
+    coercion of STRING parameters compared against TIMESTAMP columns.
+
+    :param job_config: The job config of the query, if any.
+    :return: Parameter values by name.
+    """
+    params = {}
+    for param in (job_config.query_parameters if job_config else []):
+        if isinstance(param, bigquery.ArrayQueryParameter):
+            params[param.name] = list(param.values)
+        elif param.name in TIMESTAMP_PARAMS:
+            timestamp = pd.Timestamp(param.value)
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.tz_localize('UTC')
+            params[param.name] = timestamp.to_pydatetime()
+        else:
+            params[param.name] = param.value
+    return params
+
+
+def _bigquery_type(arrow_type: pa.DataType) -> str:
+    """Maps an Arrow result type to the BigQuery type name.
+
+    :param arrow_type: The Arrow column type.
+    :return: The matching BigQuery type.
+    """
+    if pa.types.is_timestamp(arrow_type):
+        return 'TIMESTAMP'
+    if pa.types.is_integer(arrow_type):
+        return 'INT64'
+    if pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return 'FLOAT64'
+    if pa.types.is_boolean(arrow_type):
+        return 'BOOL'
+    return 'STRING'
@@ -0,0 +1 @@
+from hawk_sdk.api.batch import BatchRequest, BatchResult, batch, batch_async
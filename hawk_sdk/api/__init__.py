@@ -1,3 +1,8 @@
+from hawk_sdk.api.system.async_main import AsyncSystem
 from hawk_sdk.api.system.main import System
+from hawk_sdk.api.universal.async_main import AsyncUniversal
 from hawk_sdk.api.universal.main import Universal
+from hawk_sdk.api.universal_supplemental.async_main import (
+    AsyncUniversalSupplemental
+)
 from hawk_sdk.api.universal_supplemental.main import UniversalSupplemental
@@ -0,0 +1,119 @@
+"""
+@description: Batch API running requests across datasources as concurrent jobs.
+@author: Rithwik Babu
+"""
+import asyncio
+import inspect
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from hawk_sdk.api.system.async_main import AsyncSystem
+from hawk_sdk.api.universal.async_main import AsyncUniversal
+from hawk_sdk.api.universal_supplemental.async_main import (
+    AsyncUniversalSupplemental
+)
+from hawk_sdk.core.common.data_object import DataObject
+
+DATASOURCES = {
+    'system': AsyncSystem,
+    'universal': AsyncUniversal,
+    'universal_supplemental': AsyncUniversalSupplemental,
+}
+
+
+class BatchRequest(NamedTuple):
+    """One datasource call in a batch, e.g. ('universal', 'get_data', {...})."""
+
+    datasource: str
+    method: str
+    kwargs: Dict[str, Any] = {}
+
+
+class BatchResult(NamedTuple):
+    """The outcome of a BatchRequest: its DataObject, or the error it raised."""
+
+    request: BatchRequest
+    data: Optional[DataObject] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request succeeded."""
+        return self.error is None
+
+
+def batch(
+    requests: List[BatchRequest],
+    environment: str = "production"
+) -> List[BatchResult]:
+    """Runs many datasource requests at once and collects their results.
+
+    Every request's BigQuery jobs are submitted up front and awaited
+    concurrently, so the batch takes about as long as its slowest request.
+    A failing request is reported in its result and does not cancel the
+    others. Call batch_async instead from code already running an event loop.
+
+    :param requests: The requests to run.
+    :param environment: The environment to fetch data from.
+    :return: One BatchResult per request, in request order.
+    """
+    return asyncio.run(batch_async(requests, environment))
+
+
+async def batch_async(
+    requests: List[BatchRequest],
+    environment: str = "production"
+) -> List[BatchResult]:
+    """Async variant of batch.
+
+    :param requests: The requests to run.
+    :param environment: The environment to fetch data from.
+    :return: One BatchResult per request, in request order.
+    """
+    for request in requests:
+        _validate(request)
+
+    datasources = {
+        name: DATASOURCES[name](environment=environment)
+        for name in {request.datasource for request in requests}
+    }
+
+    async def run(request: BatchRequest) -> BatchResult:
+        method = getattr(datasources[request.datasource], request.method)
+        try:
+            return BatchResult(request, data=await method(**request.kwargs))
+        except Exception as e:
+            logging.error(
+                f"Batch request {request.datasource}.{request.method} "
+                f"failed: {e}"
+            )
+            return BatchResult(request, error=e)
+
+    try:
+        return list(await asyncio.gather(
+            *(run(request) for request in requests)
+        ))
+    finally:
+        for datasource in datasources.values():
+            datasource.close()
+
+
+def _validate(request: BatchRequest) -> None:
+    """Checks that a request names an existing datasource method.
+
+    :param request: The request to check.
+    :return: None
+    """
+    datasource = DATASOURCES.get(request.datasource)
+    if datasource is None:
+        raise ValueError(
+            f"Unknown datasource '{request.datasource}'. "
+            f"Use one of {sorted(DATASOURCES)}."
+        )
+    method = getattr(datasource, request.method, None)
+    if (request.method.startswith('_')
+            or not inspect.iscoroutinefunction(method)):
+        raise ValueError(
+            f"'{request.method}' is not a batchable "
+            f"{request.datasource} method."
+        )
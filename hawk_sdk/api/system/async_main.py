@@ -0,0 +1,76 @@
+"""
+@description: Asyncio datasource API for Hawk System data access.
+@author: Rithwik Babu
+"""
+from typing import List, Optional
+
+from hawk_sdk.api.system.repository import SystemRepository
+from hawk_sdk.api.system.resolver import IdentifierResolver
+from hawk_sdk.api.system.service import SystemService
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.common.data_object import DataObject
+from hawk_sdk.core.common.metrics import instrumented
+
+
+class AsyncSystem:
+    """Asyncio counterpart of System."""
+
+    def __init__(
+        self,
+        environment="production",
+        backend: Optional[QueryBackend] = None
+    ) -> None:
+        """Initializes the System datasource with required configurations.
+
+        :param environment: The environment to fetch data from.
+        :param backend: The engine to run queries on, e.g. a DuckDBBackend over
+            a local mirror. Defaults to BigQuery.
+        """
+        self.repository = SystemRepository(
+            environment=environment, backend=backend
+        )
+        self.service = SystemService(self.repository)
+
+    def close(self) -> None:
+        """Releases the BigQuery client or local database of this datasource.
+
+        :return: None
+        """
+        self.repository.close()
+
+    async def __aenter__(self) -> "AsyncSystem":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def resolver(self) -> IdentifierResolver:
+        """Vectorized identifier to hawk_id lookups, shared in the process."""
+        return self.service.resolver
+
+    @instrumented('system.get_hawk_ids')
+    async def get_hawk_ids(
+        self,
+        tickers: List[str],
+        id_type: str = 'TICKER'
+    ) -> DataObject:
+        """Fetch hawk_ids for the given list of tickers.
+
+        :param tickers: A list of specific tickers (or identifiers of id_type)
+            to filter by.
+        :param id_type: The id_type of the identifiers, e.g. 'TICKER' or 'FIGI'.
+            The identifier column is named after it in lower case.
+        :return: A hawk DataObject containing the hawk ID data.
+        """
+        return DataObject(
+            name="system_hawk_id_mappings",
+            data=await self.service.get_hawk_ids_async(tickers, id_type)
+        )
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached identifier mappings so the next lookup refreshes them.
+
+        :return: None
+        """
+        self.service.invalidate_metadata()
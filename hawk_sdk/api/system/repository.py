@@ -3,51 +3,190 @@
 @author: Rithwik Babu
 """
 import logging
-from typing import Iterator, List
+from typing import Iterator, List, Optional
 
 from google.cloud import bigquery
 
-from hawk_sdk.core.common.utils import get_bigquery_client
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.backend.default import default_backend
+from hawk_sdk.core.common.jobs import execute_job
 
 
 class SystemRepository:
     """Repository for accessing System data."""
 
-    def __init__(self, environment: str) -> None:
-        """Initializes the repository with a BigQuery client.
+    def __init__(
+        self,
+        environment: str,
+        backend: Optional[QueryBackend] = None
+    ) -> None:
+        """Initializes the repository with a query backend.
 
-        :param bq_client: An instance of BigQuery Client.
         :param environment: The environment to fetch data from (e.g., 'production', 'development').
+        :param backend: The engine to run queries on; defaults to BigQuery, or
+            the local mirror named by HAWK_SDK_LOCAL_MIRROR.
         """
-        self.bq_client = get_bigquery_client()
+        self.backend = backend if backend is not None else default_backend()
         self.environment = environment
 
-    def fetch_hawk_ids(self, tickers: List[str]) -> Iterator[dict]:
-        """Fetches hawk_ids for the given list of tickers from BigQuery.
+    def close(self) -> None:
+        """Releases the backend's client or database.
 
-        :param tickers: A list of ticker strings to filter by.
-        :return: An iterator over raw data rows.
+        :return: None
+        """
+        self.backend.close()
+
+    def fetch_hawk_ids(
+        self,
+        identifiers: List[str],
+        id_type: str = 'TICKER'
+    ) -> Iterator[dict]:
+        """Fetches hawk_ids for the given identifiers from BigQuery.
+
+        :param identifiers: A list of identifiers (e.g. tickers) to filter by.
+        :param id_type: The id_type of the identifiers, e.g. 'TICKER' or 'FIGI'.
+        :return: An iterator over raw data rows containing value and hawk_id.
+        """
+        try:
+            return execute_job(self.submit_hawk_ids, identifiers, id_type)
+        except Exception as e:
+            logging.error(f"Failed to fetch hawk_ids: {e}")
+            raise
+
+    def submit_hawk_ids(
+        self,
+        identifiers: List[str],
+        id_type: str = 'TICKER'
+    ) -> bigquery.QueryJob:
+        """Submits the query for the hawk_ids of the given identifiers.
+
+        :param identifiers: A list of identifiers (e.g. tickers) to filter by.
+        :param id_type: The id_type of the identifiers, e.g. 'TICKER' or 'FIGI'.
+        :return: The submitted QueryJob; call result() for the rows.
         """
         query = f"""
         SELECT 
-            value AS ticker, 
+            value, 
             hawk_id
         FROM 
             `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers`
         WHERE 
-            id_type = 'TICKER'
-            AND value IN UNNEST(@ticker_list)
+            id_type = @id_type
+            AND value IN UNNEST(@identifiers)
+        ORDER BY 
+            value, hawk_id
         """
 
         query_params = [
-            bigquery.ArrayQueryParameter("ticker_list", "STRING", tickers),
+            bigquery.ScalarQueryParameter("id_type", "STRING", id_type),
+            bigquery.ArrayQueryParameter("identifiers", "STRING", identifiers),
         ]
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
+        return self.backend.query(query, job_config)
+
+    def fetch_identifiers(
+        self,
+        bucket_count: int,
+        buckets: Optional[List[int]] = None
+    ) -> Iterator[dict]:
+        """Fetches identifier mappings of every id_type from BigQuery.
+
+        :param bucket_count: Number of hawk_id buckets, as in
+            fetch_identifier_signatures.
+        :param buckets: Only fetch hawk_ids in these buckets, or None for all of
+            them.
+        :return: An iterator over raw data rows containing hawk_id, id_type,
+            value and bucket.
+        """
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
+            return execute_job(self.submit_identifiers, bucket_count, buckets)
         except Exception as e:
-            logging.error(f"Failed to fetch hawk_ids: {e}")
+            logging.error(f"Failed to fetch identifiers: {e}")
             raise
+
+    def submit_identifiers(
+        self,
+        bucket_count: int,
+        buckets: Optional[List[int]] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query for identifier mappings of every id_type.
+
+        :param bucket_count: Number of hawk_id buckets.
+        :param buckets: Only fetch hawk_ids in these buckets, or None for all of
+            them.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        bucket_filter = "" if buckets is None else """
+        WHERE 
+            MOD(hawk_id, @bucket_count) IN UNNEST(@buckets)"""
+        source = f"`wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers`"
+        query = f"""
+        SELECT 
+            hawk_id, 
+            id_type, 
+            value, 
+            MOD(hawk_id, @bucket_count) AS bucket
+        FROM 
+            {source}{bucket_filter}
+        """
+
+        query_params = [
+            bigquery.ScalarQueryParameter("bucket_count", "INT64", bucket_count)
+        ]
+        if buckets is not None:
+            query_params.append(
+                bigquery.ArrayQueryParameter("buckets", "INT64", buckets)
+            )
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
+
+    def fetch_identifier_signatures(self, bucket_count: int) -> Iterator[dict]:
+        """Fetches a row count and fingerprint per bucket of hawk_identifiers.
+
+        Rows are bucketed by hawk_id modulo bucket_count. A bucket's signature
+        changes whenever a row in it is added, removed or edited, so comparing
+        signatures finds the buckets to reload.
+
+        :param bucket_count: Number of hawk_id buckets.
+        :return: An iterator over raw data rows containing bucket, row_count and
+            fingerprint.
+        """
+        try:
+            return execute_job(self.submit_identifier_signatures, bucket_count)
+        except Exception as e:
+            logging.error(f"Failed to fetch identifier signatures: {e}")
+            raise
+
+    def submit_identifier_signatures(
+        self,
+        bucket_count: int
+    ) -> bigquery.QueryJob:
+        """Submits the query for the per-bucket signatures of hawk_identifiers.
+
+        :param bucket_count: Number of hawk_id buckets.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        query = f"""
+        SELECT 
+            MOD(hawk_id, @bucket_count) AS bucket, 
+            COUNT(*) AS row_count, 
+            BIT_XOR(FARM_FINGERPRINT(
+                CONCAT(CAST(hawk_id AS STRING), '|', id_type, '|', value)
+            )) AS fingerprint
+        FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers`
+        GROUP BY 
+            bucket
+        """
+
+        query_params = [
+            bigquery.ScalarQueryParameter("bucket_count", "INT64", bucket_count)
+        ]
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
@@ -0,0 +1,298 @@
+"""
+@description: In-process index resolving identifiers to hawk_ids and back.
+@author: Rithwik Babu
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hawk_sdk.api.system.repository import SystemRepository
+from hawk_sdk.core.common.columnar import to_dataframe
+from hawk_sdk.core.common.constants import (
+    DEFAULT_IDENTIFIER_BUCKETS,
+    DEFAULT_METADATA_TTL
+)
+
+
+class IdentifierIndex:
+    """The hawk_identifiers mapping of one environment, held in memory.
+
+    Rows are kept with their hawk_id bucket and the per-bucket signatures
+    they were loaded under, so a refresh only reloads buckets whose
+    signature changed. Lookups are hash indexes built per id_type on first
+    use and dropped whenever the rows change.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self.rows: Optional[pd.DataFrame] = None
+        self.signatures: Set[Tuple[int, int, int]] = set()
+        self.loaded_at = 0.0
+        self.stale = False
+        self.forward: Dict[str, Tuple[pd.Index, np.ndarray]] = {}
+        self.reverse: Dict[str, Tuple[pd.Index, np.ndarray]] = {}
+        self.lock = threading.Lock()
+
+
+# Indexes are shared by every resolver of the same environment and backend.
+_indexes: Dict[Tuple[str, str], IdentifierIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+class IdentifierResolver:
+    """Resolves whole arrays of identifiers to hawk_ids, and hawk_ids back.
+
+    The hawk_identifiers table, with every id_type, is loaded once per
+    process and environment and shared by all resolvers. After ``max_age``
+    seconds the next lookup refreshes it: one small query compares
+    per-bucket signatures, and only the buckets that changed are fetched
+    again.
+
+    An identifier mapped to several hawk_ids resolves to the smallest one,
+    and a hawk_id with several identifiers of a type maps back to the first
+    in sort order.
+    """
+
+    def __init__(
+        self,
+        repository: SystemRepository,
+        max_age: Optional[float] = None
+    ) -> None:
+        """Initializes the resolver without loading anything yet.
+
+        :param repository: The repository to load identifiers through.
+        :param max_age: Seconds before the mapping is refreshed. Defaults to the
+            HAWK_SDK_METADATA_TTL environment variable or DEFAULT_METADATA_TTL.
+        """
+        if max_age is None:
+            max_age = float(os.environ.get(
+                'HAWK_SDK_METADATA_TTL', DEFAULT_METADATA_TTL
+            ))
+        self.repository = repository
+        self.max_age = max_age
+        key = (repository.environment, repository.backend.name)
+        with _indexes_lock:
+            self._index = _indexes.setdefault(key, IdentifierIndex())
+
+    def resolve(
+        self,
+        identifiers: Iterable[Any],
+        id_type: str = 'TICKER'
+    ) -> pd.Series:
+        """Looks up the hawk_ids of many identifiers in one vectorized pass.
+
+        :param identifiers: The identifiers, e.g. a list, array or Series of
+            tickers.
+        :param id_type: The id_type of the identifiers, e.g. 'TICKER' or 'FIGI'.
+        :return: A nullable Int64 Series of hawk_ids named hawk_id, aligned with
+            the input (keeping a Series' index), with NA for unknown
+            identifiers.
+        """
+        values = identifiers
+        if not isinstance(values, pd.Series):
+            values = pd.Series(list(values))
+        index, hawk_ids = self._lookup('forward', id_type)
+        positions = index.get_indexer(values)
+        found = positions >= 0
+        result = pd.array(
+            np.where(found, hawk_ids.take(positions), 0), dtype='Int64'
+        )
+        result[~found] = pd.NA
+        return pd.Series(result, index=values.index, name='hawk_id')
+
+    def reverse(
+        self,
+        hawk_ids: Iterable[int],
+        id_type: str = 'TICKER'
+    ) -> pd.Series:
+        """Looks up an identifier of many hawk_ids in one vectorized pass.
+
+        :param hawk_ids: The hawk_ids, e.g. a list, array or Series.
+        :param id_type: The id_type to return, e.g. 'TICKER'.
+        :return: A Series of identifiers named after the id_type in lower case,
+            aligned with the input, with a missing value for hawk_ids without
+            one.
+        """
+        values = hawk_ids
+        if not isinstance(values, pd.Series):
+            values = pd.Series(list(values))
+        index, identifiers = self._lookup('reverse', id_type)
+        positions = index.get_indexer(values)
+        result = pd.Series(identifiers, dtype='str').take(positions)
+        result = result.where(positions >= 0).set_axis(values.index)
+        return result.rename(id_type.lower())
+
+    def resolve_hawk_ids(self, hawk_ids: Iterable[Any]) -> List[int]:
+        """Replaces the tickers in a list of hawk_ids by their hawk_ids.
+
+        :param hawk_ids: hawk_ids and tickers, in any mix.
+        :return: The hawk_ids, in the same order.
+        :raises ValueError: If a ticker is unknown.
+        """
+        values = list(hawk_ids)
+        tickers = [
+            (i, value) for i, value in enumerate(values)
+            if isinstance(value, str)
+        ]
+        if not tickers:
+            return values
+        resolved = self.resolve([ticker for _, ticker in tickers])
+        unknown = [
+            ticker for (_, ticker), hawk_id in zip(tickers, resolved)
+            if pd.isna(hawk_id)
+        ]
+        if unknown:
+            shown = ', '.join(unknown[:10])
+            if len(unknown) > 10:
+                shown += ', ...'
+            raise ValueError(f"Unknown tickers ({len(unknown)}): {shown}")
+        for (i, _), hawk_id in zip(tickers, resolved):
+            values[i] = int(hawk_id)
+        return values
+
+    def mappings(self, id_type: str = 'TICKER') -> pd.DataFrame:
+        """Returns every identifier of a type with its hawk_id.
+
+        :param id_type: The id_type to list, e.g. 'TICKER'.
+        :return: A DataFrame of the identifier (named after the id_type in lower
+            case) and hawk_id, sorted by identifier and hawk_id.
+        """
+        rows = self._rows()
+        rows = rows[rows['id_type'] == id_type]
+        return pd.DataFrame({
+            id_type.lower(): rows['value'].to_numpy(),
+            'hawk_id': rows['hawk_id'].to_numpy(),
+        })
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the mapping has been loaded in this process."""
+        return self._index.rows is not None
+
+    @property
+    def id_types(self) -> List[str]:
+        """The id_types in the mapping, e.g. ['FIGI', 'TICKER']."""
+        return sorted(self._rows()['id_type'].unique())
+
+    def refresh(self) -> int:
+        """Reloads the buckets of the mapping that changed since it was loaded.
+
+        :return: The number of rows fetched.
+        """
+        index = self._index
+        with index.lock:
+            rows = to_dataframe(self.repository.fetch_identifier_signatures(
+                DEFAULT_IDENTIFIER_BUCKETS
+            ))
+            signatures = set(
+                rows[['bucket', 'row_count', 'fingerprint']]
+                .itertuples(index=False, name=None)
+            )
+
+            fetched = 0
+            if index.rows is None:
+                rows = self._fetch(None)
+                fetched = len(rows)
+            else:
+                changed = sorted({
+                    int(bucket)
+                    for bucket, _, _ in index.signatures ^ signatures
+                })
+                rows = None
+                if changed:
+                    reloaded = self._fetch(changed)
+                    kept = index.rows[~index.rows['bucket'].isin(changed)]
+                    rows = pd.concat([kept, reloaded], ignore_index=True)
+                    fetched = len(reloaded)
+
+            if rows is not None:
+                index.rows = rows.sort_values(
+                    ['id_type', 'value', 'hawk_id'], ignore_index=True
+                )
+                index.forward = {}
+                index.reverse = {}
+            index.signatures = signatures
+            index.loaded_at = time.monotonic()
+            index.stale = False
+        return fetched
+
+    def invalidate(self) -> None:
+        """Makes the next lookup refresh the mapping.
+
+        :return: None
+        """
+        self._index.stale = True
+
+    def _rows(self) -> pd.DataFrame:
+        """Returns the mapping rows, loading or refreshing them when due.
+
+        :return: A DataFrame of hawk_id, id_type, value and bucket.
+        """
+        index = self._index
+        if (
+            index.rows is None
+            or index.stale
+            or time.monotonic() - index.loaded_at >= self.max_age
+        ):
+            self.refresh()
+        return index.rows
+
+    def _lookup(
+        self,
+        direction: str,
+        id_type: str
+    ) -> Tuple[pd.Index, np.ndarray]:
+        """Returns the hash index of an id_type in one direction.
+
+        :param direction: 'forward' maps identifiers to hawk_ids, 'reverse'
+            hawk_ids to identifiers.
+        :param id_type: The id_type to look up.
+        :return: A unique Index of keys and the value each key maps to.
+        :raises ValueError: If the id_type is not in the mapping.
+        """
+        index = self._index
+        # Refresh first: refresh() takes the index lock itself.
+        self._rows()
+        with index.lock:
+            # The rows and lookups are read together, so a lookup is never built
+            # from rows a concurrent refresh has already replaced.
+            rows = index.rows
+            lookups = getattr(index, direction)
+            lookup = lookups.get(id_type)
+            if lookup is None:
+                matching = rows[rows['id_type'] == id_type]
+                if matching.empty:
+                    available = ', '.join(sorted(rows['id_type'].unique()))
+                    raise ValueError(
+                        f"Unknown id_type: {id_type}. Available: {available}."
+                    )
+                # Rows are sorted by value, then hawk_id; the first row of each
+                # key is kept.
+                if direction == 'forward':
+                    key, target = 'value', 'hawk_id'
+                else:
+                    key, target = 'hawk_id', 'value'
+                    matching = matching.sort_values(['hawk_id', 'value'])
+                matching = matching.drop_duplicates(key)
+                lookup = (
+                    pd.Index(matching[key].to_numpy()),
+                    matching[target].to_numpy()
+                )
+                lookups[id_type] = lookup
+        return lookup
+
+    def _fetch(self, buckets: Optional[List[int]]) -> pd.DataFrame:
+        """Fetches the mapping rows of some buckets.
+
+        :param buckets: The buckets to fetch, or None for all of them.
+        :return: A DataFrame of hawk_id, id_type, value and bucket.
+        """
+        rows = to_dataframe(self.repository.fetch_identifiers(
+            DEFAULT_IDENTIFIER_BUCKETS, buckets
+        ))
+        return rows.astype({'hawk_id': 'int64', 'bucket': 'int64'})
+
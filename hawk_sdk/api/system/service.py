@@ -2,12 +2,15 @@
 @description: Service layer for processing and normalizing System data.
 @author: Rithwik Babu
 """
-
-from typing import List, Iterator
+import asyncio
+from typing import List
 
 import pandas as pd
 
 from hawk_sdk.api.system.repository import SystemRepository
+from hawk_sdk.api.system.resolver import IdentifierResolver
+from hawk_sdk.core.cache.metadata_cache import metadata_cache
+from hawk_sdk.core.common.columnar import to_dataframe
 
 
 class SystemService:
@@ -19,21 +22,56 @@ class SystemService:
         :param repository: An instance of SystemRepository for data access.
         """
         self.repository = repository
+        self.resolver = IdentifierResolver(repository)
+
+    def get_hawk_ids(
+        self,
+        tickers: List[str],
+        id_type: str = 'TICKER'
+    ) -> pd.DataFrame:
+        """Looks up hawk IDs for identifiers.
+
+        Once the in-process identifier index is loaded, lookups are served
+        from it. Until then a targeted query fetches only the requested
+        identifiers, rather than loading the whole hawk_identifiers table
+        for a few of them.
+
+        :param tickers: A list of specific tickers (or identifiers of id_type)
+            to filter by.
+        :param id_type: The id_type of the identifiers, e.g. 'TICKER' or 'FIGI'.
+        :return: A pandas DataFrame containing the normalized hawk ID data.
+        """
+        if not self.resolver.loaded:
+            rows = to_dataframe(
+                self.repository.fetch_hawk_ids(list(tickers), id_type)
+            )
+            return pd.DataFrame({
+                id_type.lower(): rows['value'].to_numpy(),
+                'hawk_id': rows['hawk_id'].to_numpy(dtype='int64'),
+            })
+        mappings = self.resolver.mappings(id_type)
+        matching = mappings[mappings[id_type.lower()].isin(tickers)]
+        return matching.reset_index(drop=True)
 
-    def get_hawk_ids(self, tickers: List[str]) -> pd.DataFrame:
-        """Fetches and normalizes hawk IDs into a pandas DataFrame.
+    async def get_hawk_ids_async(
+        self,
+        tickers: List[str],
+        id_type: str = 'TICKER'
+    ) -> pd.DataFrame:
+        """Async variant of get_hawk_ids.
 
-        :param tickers: A list of specific tickers to filter by.
+        :param tickers: A list of specific tickers (or identifiers of id_type)
+            to filter by.
+        :param id_type: The id_type of the identifiers, e.g. 'TICKER' or 'FIGI'.
         :return: A pandas DataFrame containing the normalized hawk ID data.
         """
-        raw_data = self.repository.fetch_hawk_ids(tickers)
-        return self._normalize_data(raw_data)
+        # The lookup query and index loads are synchronous.
+        return await asyncio.to_thread(self.get_hawk_ids, tickers, id_type)
 
-    @staticmethod
-    def _normalize_data(data: Iterator[dict]) -> pd.DataFrame:
-        """Converts raw data into a normalized pandas DataFrame.
+    def invalidate_metadata(self) -> None:
+        """Drops this environment's cached metadata so it reloads on next use.
 
-        :param data: An iterator over raw data rows.
-        :return: A pandas DataFrame containing normalized data.
+        :return: None
         """
-        return pd.DataFrame([dict(row) for row in data])
+        metadata_cache.invalidate(self.repository.environment)
+        self.resolver.invalidate()
@@ -0,0 +1,341 @@
+"""
+@description: Asyncio datasource API for Universal data access.
+@author: Rithwik Babu
+"""
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+from hawk_sdk.api.system.repository import SystemRepository
+from hawk_sdk.api.system.resolver import IdentifierResolver
+from hawk_sdk.api.universal.cached_repository import CachedUniversalRepository
+from hawk_sdk.api.universal.coalescing_repository import (
+    CoalescingUniversalRepository
+)
+from hawk_sdk.api.universal.repository import UniversalRepository
+from hawk_sdk.api.universal.service import UniversalService
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.cache.parquet_cache import ParquetCache
+from hawk_sdk.core.common.coalesce import RequestCoalescer
+from hawk_sdk.core.common.constants import (
+    DEFAULT_HAWK_ID_CHUNK_SIZE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_STREAM_BATCH_ROWS
+)
+from hawk_sdk.core.common.data_object import DataObject
+from hawk_sdk.core.common.metrics import instrumented
+
+
+class AsyncUniversal:
+    """Asyncio counterpart of Universal.
+
+    Queries are submitted as BigQuery jobs and awaited by polling, so many
+    requests can run concurrently from one event loop. Results are the same
+    DataObjects the Universal methods of the same name return.
+    """
+
+    def __init__(
+        self,
+        environment="production",
+        cache: Optional[ParquetCache] = None,
+        backend: Optional[QueryBackend] = None,
+        coalescer: Optional[RequestCoalescer] = None
+    ) -> None:
+        """Initializes the Universal datasource with required configurations.
+
+        :param environment: The environment to fetch data from.
+        :param cache: Optional local cache that get_data reads and fills.
+        :param backend: The engine to run queries on, e.g. a DuckDBBackend over
+            a local mirror. Defaults to BigQuery.
+        :param coalescer: Optional RequestCoalescer letting concurrent calls,
+            from this and any other datasource sharing it, run overlapping
+            queries as one job.
+        """
+        self.repository = UniversalRepository(
+            environment=environment, backend=backend
+        )
+        if cache is not None:
+            self.repository = CachedUniversalRepository(self.repository, cache)
+        if coalescer is not None:
+            self.repository = CoalescingUniversalRepository(
+                self.repository, coalescer
+            )
+        self.service = UniversalService(self.repository)
+        # Built on the first call passing tickers in place of hawk_ids.
+        self._resolver: Optional[IdentifierResolver] = None
+
+    def close(self) -> None:
+        """Releases the BigQuery client or local database of this datasource.
+
+        :return: None
+        """
+        self.repository.close()
+
+    async def __aenter__(self) -> "AsyncUniversal":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def resolver(self) -> IdentifierResolver:
+        """Resolves tickers passed in place of hawk_ids, built on first use."""
+        if self._resolver is None:
+            self._resolver = IdentifierResolver(SystemRepository(
+                environment=self.repository.environment,
+                backend=self.repository.backend
+            ))
+        return self._resolver
+
+    @instrumented('universal.get_data')
+    async def get_data(
+        self,
+        hawk_ids: List[Union[int, str]],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        hawk_id_chunk_size: Optional[int] = DEFAULT_HAWK_ID_CHUNK_SIZE,
+        date_chunk_days: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        server_pivot: bool = False,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        arrow: bool = False
+    ) -> DataObject:
+        """Fetch data for any combination of hawk_ids and field_ids.
+
+        See Universal.get_data for the output layout and parameter details.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date (YYYY-MM-DD). Ignored when
+            interval='snapshot'.
+        :param end_date: The end date (YYYY-MM-DD), or cutoff timestamp
+            (YYYY-MM-DD HH:MM:SS) for snapshot.
+        :param interval: Bucket size (e.g., '1d', '1h'), 'raw', or 'snapshot'.
+        :param hawk_id_chunk_size: Max hawk_ids per query; larger requests are
+            split into concurrent jobs.
+        :param date_chunk_days: Max days per query, or None to not split by
+            date.
+        :param max_workers: Max chunk jobs running at the same time.
+        :param server_pivot: Pivot to one row per (date, hawk_id) inside
+            BigQuery.
+        :param aggregations: How each field is aggregated per bucket, keyed by
+            field_id.
+        :param local_metadata: Fill in tickers and field names from the metadata
+            cache.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :param per_field: For snapshot, return each (hawk_id, field)'s own most
+            recent value at or before end_date. By default only the records at
+            the single latest timestamp of the whole request are returned, which
+            leaves out tickers and fields that update on other schedules.
+        :param max_staleness: With per_field, leave out values older than this
+            before end_date (e.g. '5d', '12h').
+        :param arrow: Return the data as a pyarrow Table, pivoted without
+            pandas. to_arrow() and to_polars() use it without copying and
+            to_df() converts it on demand. With compact, tickers and char fields
+            are dictionary-encoded, integer-only fields are int64 and date stays
+            a column.
+        :return: A hawk DataObject containing the data.
+        """
+        hawk_ids = await self._resolve_hawk_ids(hawk_ids)
+        args = (
+            hawk_ids, field_ids, start_date, end_date, interval,
+            hawk_id_chunk_size, date_chunk_days, max_workers, server_pivot,
+            aggregations, local_metadata, compact, float32, per_field,
+            max_staleness, arrow
+        )
+        shared = (CachedUniversalRepository, CoalescingUniversalRepository)
+        if isinstance(self.repository, shared):
+            # Cache reads, gap fills and shared jobs go through the synchronous
+            # path.
+            data = await asyncio.to_thread(self.service.get_data, *args)
+        else:
+            data = await self.service.get_data_async(*args)
+        return DataObject(name="universal_data", data=data)
+
+    async def iter_data(
+        self,
+        hawk_ids: List[Union[int, str]],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        batch_rows: int = DEFAULT_STREAM_BATCH_ROWS,
+        date_chunk_days: Optional[int] = None,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False
+    ) -> AsyncIterator[DataObject]:
+        """Stream data for any combination of hawk_ids and field_ids in chunks.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date (YYYY-MM-DD).
+        :param end_date: The end date (YYYY-MM-DD).
+        :param interval: Bucket size (e.g., '1d', '1h') or 'raw'. 'snapshot' is
+            not supported.
+        :param batch_rows: Long-format records to buffer per chunk before
+            pivoting.
+        :param date_chunk_days: Max days per query, or None for a single query.
+        :param aggregations: How each field is aggregated per bucket, keyed by
+            field_id.
+        :param local_metadata: Fill in tickers and field names from the metadata
+            cache.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :return: An async iterator of hawk DataObjects.
+        """
+        hawk_ids = await self._resolve_hawk_ids(hawk_ids)
+        async for chunk in self.service.iter_data_async(
+            hawk_ids, field_ids, start_date, end_date, interval,
+            batch_rows, date_chunk_days, aggregations, local_metadata, compact,
+            float32
+        ):
+            yield DataObject(name="universal_data", data=chunk)
+
+    @instrumented('universal.get_as_of')
+    async def get_as_of(
+        self,
+        hawk_ids: List[Union[int, str]],
+        field_ids: List[int],
+        timestamps: List[str],
+        start_date: Optional[str] = None,
+        compact: bool = False,
+        float32: bool = False
+    ) -> DataObject:
+        """Fetch each field's latest value at or before each of many timestamps.
+
+        Returns one row per (timestamp, hawk_id) with columns date (the
+        timestamp), hawk_id, ticker and one column per field, holding the most
+        recent value of each field at that time. All timestamps are answered by
+        a single query, so a backtest can get its as-of values for every
+        rebalance date at once.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamps: The as-of timestamps (YYYY-MM-DD HH:MM:SS), in any
+            order; naive timestamps are UTC.
+        :param start_date: Ignore records before this date (YYYY-MM-DD),
+            bounding how far back the query scans. None considers all history.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :return: A hawk DataObject containing the as-of data.
+        """
+        hawk_ids = await self._resolve_hawk_ids(hawk_ids)
+        args = (hawk_ids, field_ids, timestamps, start_date, compact, float32)
+        if isinstance(self.repository, CoalescingUniversalRepository):
+            data = await asyncio.to_thread(self.service.get_as_of_data, *args)
+        else:
+            data = await self.service.get_as_of_data_async(*args)
+        return DataObject(name="universal_as_of", data=data)
+
+    @instrumented('universal.get_latest_snapshot')
+    async def get_latest_snapshot(
+        self,
+        hawk_ids: List[Union[int, str]],
+        field_ids: List[int],
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        arrow: bool = False
+    ) -> DataObject:
+        """Fetch the most recent data for the given hawk_ids and field_ids.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :param per_field: Return each (hawk_id, field)'s own most recent value.
+            By default only the records at the single latest timestamp of the
+            whole request are returned.
+        :param max_staleness: With per_field, leave out values older than this
+            (e.g. '5d', '12h').
+        :param arrow: Return the data as a pyarrow Table, pivoted without
+            pandas. to_arrow() and to_polars() use it without copying and
+            to_df() converts it on demand. With compact, tickers and char fields
+            are dictionary-encoded, integer-only fields are int64 and date stays
+            a column.
+        :return: A hawk DataObject containing the latest snapshot data.
+        """
+        hawk_ids = await self._resolve_hawk_ids(hawk_ids)
+        args = (
+            hawk_ids, field_ids, compact, float32, per_field, max_staleness,
+            arrow
+        )
+        if isinstance(self.repository, CoalescingUniversalRepository):
+            data = await asyncio.to_thread(
+                self.service.get_latest_snapshot, *args
+            )
+        else:
+            data = await self.service.get_latest_snapshot_async(*args)
+        return DataObject(name="universal_latest_snapshot", data=data)
+
+    @instrumented('universal.get_field_ids')
+    async def get_field_ids(self, field_names: List[str]) -> DataObject:
+        """Lookup field_ids for the given field names.
+
+        :param field_names: A list of field name strings to lookup.
+        :return: A hawk DataObject containing field_id and field_name pairs.
+        """
+        return DataObject(
+            name="field_ids",
+            data=await self.service.get_field_ids_async(field_names)
+        )
+
+    @instrumented('universal.get_all_fields')
+    async def get_all_fields(self) -> DataObject:
+        """Get all available fields in the system.
+
+        :return: A hawk DataObject containing all field_id and field_name pairs.
+        """
+        return DataObject(
+            name="all_fields",
+            data=await self.service.get_all_fields_async()
+        )
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached fields and tickers so the next lookup reloads them.
+
+        :return: None
+        """
+        self.service.invalidate_metadata()
+
+    async def _resolve_hawk_ids(
+        self,
+        hawk_ids: List[Union[int, str]]
+    ) -> List[int]:
+        """Replaces the tickers in a list of hawk_ids by their hawk_ids.
+
+        The resolver may load its index, so it runs in a worker thread.
+
+        :param hawk_ids: hawk_ids and tickers, in any mix.
+        :return: The hawk_ids, in the same order.
+        """
+        hawk_ids = list(hawk_ids)
+        if not any(isinstance(hawk_id, str) for hawk_id in hawk_ids):
+            return hawk_ids
+        return await asyncio.to_thread(self.resolver.resolve_hawk_ids, hawk_ids)
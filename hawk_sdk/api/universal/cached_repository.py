@@ -0,0 +1,199 @@
+"""
+@description: Repository wrapper serving Universal records from a local cache.
+@author: Rithwik Babu
+"""
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from hawk_sdk.api.universal.repository import UniversalRepository
+from hawk_sdk.core.cache.parquet_cache import (
+    RECORD_SCHEMA,
+    ParquetCache,
+    as_records,
+    from_micros,
+    to_micros,
+)
+from hawk_sdk.core.cache.planner import GapFetch, plan_gap_fetches
+from hawk_sdk.core.common.columnar import to_arrow_table
+from hawk_sdk.core.common.intervals import (
+    RAW_INTERVAL,
+    align_range,
+    group_fields_by_aggregation,
+    interval_seconds,
+)
+
+
+class CachedUniversalRepository:
+    """Universal repository that answers range fetches from a ParquetCache.
+
+    Only the (hawk_id, field_id, range) slices the cache does not hold are
+    fetched from BigQuery, as a minimal set of range queries. They are
+    stored, and returned together with the cached records read before the
+    store, so the result does not depend on what the store evicts. All
+    other repository methods go straight to the wrapped repository.
+
+    Aggregated intervals are cached apart from raw records, under one
+    namespace per (environment, interval, aggregation).
+    """
+
+    def __init__(
+        self,
+        repository: UniversalRepository,
+        cache: ParquetCache
+    ) -> None:
+        """Initializes the wrapper.
+
+        :param repository: The UniversalRepository to fetch misses from.
+        :param cache: The local cache to serve and store records.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.repository, name)
+
+    def fetch_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True,
+        limit: Optional[int] = None
+    ) -> Union[Iterator[dict], pa.Table]:
+        """Fetches long-format records, preferring the local cache.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id; defaults to 'last'.
+        :param join_metadata: Unused; cached records always carry ticker and
+            field_name.
+        :param limit: Only fetch the first ``limit`` (date, hawk_id) rows. Such
+            previews go straight to BigQuery and are not cached.
+        :return: A pyarrow Table of long-format records.
+        """
+        if limit is not None:
+            return self.repository.fetch_data(
+                hawk_ids, field_ids, start_date, end_date, interval,
+                aggregations, join_metadata, limit
+            )
+        environment = self.repository.environment
+        if interval == RAW_INTERVAL:
+            return self._fetch_cached(
+                environment, hawk_ids, field_ids, start_date, end_date,
+                interval, None
+            )
+
+        # Gaps must start and end on bucket boundaries, or a bucket would be
+        # aggregated over only part of its records.
+        start_date, end_date = align_range(start_date, end_date, interval)
+        groups = group_fields_by_aggregation(field_ids, aggregations)
+        tables = [
+            self._fetch_cached(
+                f"{environment}/interval={interval}/aggregation={aggregation}",
+                hawk_ids, group, start_date, end_date, interval,
+                dict.fromkeys(group, aggregation)
+            )
+            for aggregation, group in groups.items()
+        ]
+        return pa.concat_tables(tables)
+
+    def _fetch_cached(
+        self,
+        namespace: str,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]]
+    ) -> pa.Table:
+        """Serves one cache namespace, fetching and storing its gaps.
+
+        Aggregated records are dated at the start of their bucket, and the
+        query widens any range to whole buckets. Coverage is therefore
+        checked and stored on the bucket grid, so every gap covers whole
+        buckets and its refetched rows replace the cached ones.
+
+        :param namespace: The cache namespace holding these records.
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query.
+        :param end_date: The end date for the data query.
+        :param interval: The interval for the data query.
+        :param aggregations: Aggregation per field_id.
+        :return: A pyarrow Table of long-format records.
+        """
+        start_us, end_us = to_micros(start_date), to_micros(end_date)
+        bucket_us = None if interval == RAW_INTERVAL \
+            else interval_seconds(interval) * 1_000_000
+
+        missing = {
+            field_id: self.cache.missing_ranges(
+                namespace, field_id, hawk_ids, start_us, end_us, bucket_us
+            )
+            for field_id in field_ids
+        }
+        # Read what the cache holds before writing the gaps, since a write
+        # may evict partitions this request still needs.
+        cached = self.cache.read(
+            namespace, field_ids, hawk_ids, start_us, end_us
+        )
+        gaps = plan_gap_fetches(missing)
+        if not gaps:
+            return cached
+
+        tables = [_drop_gaps(cached, gaps)]
+        for gap in gaps:
+            table = as_records(to_arrow_table(self.repository.fetch_data(
+                gap.hawk_ids, gap.field_ids,
+                from_micros(gap.start_us), from_micros(gap.end_us),
+                interval, aggregations
+            ), preserve_order=False))
+            self.cache.write(
+                namespace, gap.field_ids, gap.hawk_ids,
+                gap.start_us, gap.end_us, table, bucket_us
+            )
+            tables.append(table)
+        return pa.concat_tables(tables)
+
+
+def _drop_gaps(table: pa.Table, gaps: List[GapFetch]) -> pa.Table:
+    """Removes cached records lying in slices that are about to be refetched.
+
+    Such records are left over from expired or partial coverage and are
+    replaced by the fetched ones.
+
+    :param table: Cached records with RECORD_SCHEMA columns.
+    :param gaps: The gap fetches of the request.
+    :return: The records outside every gap.
+    """
+    if table.num_rows == 0:
+        return table
+    date_type = RECORD_SCHEMA.field('date').type
+    stale = None
+    for gap in gaps:
+        field_ids = pa.array(gap.field_ids, pa.int64())
+        hawk_ids = pa.array(gap.hawk_ids, pa.int64())
+        start = pa.scalar(gap.start_us, date_type)
+        end = pa.scalar(gap.end_us, date_type)
+        in_gap = pc.and_(
+            pc.and_(
+                pc.is_in(table['field_id'], field_ids),
+                pc.is_in(table['hawk_id'], hawk_ids)
+            ),
+            pc.and_(
+                pc.greater_equal(table['date'], start),
+                pc.less_equal(table['date'], end)
+            )
+        )
+        stale = in_gap if stale is None else pc.or_(stale, in_gap)
+    return table.filter(pc.invert(stale))
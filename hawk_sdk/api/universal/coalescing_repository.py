@@ -0,0 +1,236 @@
+"""
+@description: Repository wrapper sharing Universal queries between callers.
+@author: Rithwik Babu
+"""
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Union
+)
+
+import pyarrow as pa
+
+from hawk_sdk.api.universal.cached_repository import CachedUniversalRepository
+from hawk_sdk.api.universal.repository import UniversalRepository
+from hawk_sdk.core.common.coalesce import RequestCoalescer
+from hawk_sdk.core.common.columnar import to_arrow_table
+
+
+class CoalescingUniversalRepository:
+    """Universal repository that routes data queries through a RequestCoalescer.
+
+    Range, latest-value and as-of queries return each hawk_id's rows
+    independently of the other hawk_ids, so concurrent ones with the same
+    fields and dates are merged into one job. Snapshot queries pick the
+    latest timestamp over all their hawk_ids and are only shared between
+    callers asking for the same hawk_ids. All other repository methods go
+    straight to the wrapped repository.
+    """
+
+    def __init__(
+        self,
+        repository: Union[UniversalRepository, CachedUniversalRepository],
+        coalescer: RequestCoalescer
+    ) -> None:
+        """Initializes the wrapper.
+
+        :param repository: The repository to run the shared queries on.
+        :param coalescer: The coalescer matching up concurrent queries.
+        """
+        self.repository = repository
+        self.coalescer = coalescer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.repository, name)
+
+    def fetch_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True,
+        limit: Optional[int] = None
+    ) -> Union[Iterator[dict], pa.Table]:
+        """Fetches long-format records, sharing the job with concurrent callers.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id; defaults to 'last'.
+        :param join_metadata: Join ticker and field_name onto the records.
+        :param limit: Only fetch the first ``limit`` (date, hawk_id) rows. Such
+            previews depend on every hawk_id of the query and are not shared.
+        :return: A pyarrow Table of long-format records, or the raw rows of a
+            preview.
+        """
+        if limit is not None:
+            return self.repository.fetch_data(
+                hawk_ids, field_ids, start_date, end_date, interval,
+                aggregations, join_metadata, limit
+            )
+        return self._coalesce(
+            self.repository.fetch_data, True, hawk_ids, field_ids, start_date,
+            end_date, interval, aggregations, join_metadata
+        )
+
+    def fetch_data_wide(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True
+    ) -> pa.Table:
+        """Fetches pivoted records, sharing the job with concurrent callers.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id; defaults to 'last'.
+        :param join_metadata: Join ticker onto the rows.
+        :return: A pyarrow Table with one row per (date, hawk_id).
+        """
+        return self._coalesce(
+            self.repository.fetch_data_wide, True, hawk_ids, field_ids,
+            start_date, end_date, interval, aggregations, join_metadata
+        )
+
+    def fetch_latest_values(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        timestamp: Optional[str] = None,
+        start_date: Optional[str] = None
+    ) -> pa.Table:
+        """Fetches each (hawk_id, field)'s latest value, sharing the job.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamp: Only consider records at or before this timestamp, or
+            None for all.
+        :param start_date: Only consider records at or after this timestamp, or
+            None for all.
+        :return: A pyarrow Table of long-format records.
+        """
+        return self._coalesce(
+            self.repository.fetch_latest_values, True, hawk_ids,
+            field_ids, timestamp, start_date
+        )
+
+    def fetch_as_of(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        cutoff_micros: List[int],
+        start_date: Optional[str] = None
+    ) -> pa.Table:
+        """Fetches as-of values at many cutoffs, sharing the job.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param cutoff_micros: The cutoffs, in microseconds since the epoch.
+        :param start_date: Ignore records before this date, or None for all
+            history.
+        :return: A pyarrow Table of long-format records.
+        """
+        return self._coalesce(
+            self.repository.fetch_as_of, True, hawk_ids,
+            field_ids, cutoff_micros, start_date
+        )
+
+    def fetch_snapshot(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        timestamp: str
+    ) -> pa.Table:
+        """Fetches a snapshot, sharing the job for the same hawk_ids.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamp: The cutoff timestamp (YYYY-MM-DD HH:MM:SS).
+        :return: A pyarrow Table of long-format records.
+        """
+        return self._coalesce(
+            self.repository.fetch_snapshot, False, hawk_ids, field_ids,
+            timestamp
+        )
+
+    def fetch_latest_snapshot(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int]
+    ) -> pa.Table:
+        """Fetches the latest snapshot, sharing the job for the same hawk_ids.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :return: A pyarrow Table of long-format records.
+        """
+        return self._coalesce(
+            self.repository.fetch_latest_snapshot, False, hawk_ids, field_ids
+        )
+
+    def _coalesce(
+        self,
+        method: Callable[..., Any],
+        merge: bool,
+        hawk_ids: List[int],
+        *args: Any
+    ) -> pa.Table:
+        """Runs a repository fetch through the coalescer.
+
+        :param method: The wrapped repository's fetch method.
+        :param merge: Whether the fetch may be merged with others on other
+            hawk_ids.
+        :param hawk_ids: The hawk_ids to fetch.
+        :param args: The other arguments of the fetch, after hawk_ids.
+        :return: A pyarrow Table of the rows of the hawk_ids.
+        """
+        key = (
+            self.repository.environment,
+            self.repository.backend.name,
+            method.__name__,
+            *(_freeze(arg) for arg in args),
+        )
+        # The service re-sorts every result, so it can be read over parallel
+        # streams.
+        return self.coalescer.fetch(
+            key,
+            hawk_ids,
+            lambda union: to_arrow_table(
+                method(union, *args), preserve_order=False
+            ),
+            merge
+        )
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turns a query argument into a hashable value for a coalescing key.
+
+    :param value: A list, dict or scalar argument.
+    :return: The value with lists as tuples and dicts as sorted item tuples.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(
+            (key, _freeze(item)) for key, item in value.items()
+        ))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -2,28 +2,106 @@
 @description: Datasource API for Universal data access and export functions.
 @author: Rithwik Babu
 """
-from typing import List
+from typing import Dict, Iterator, List, Optional, Union
 
+from hawk_sdk.api.system.repository import SystemRepository
+from hawk_sdk.api.system.resolver import IdentifierResolver
+from hawk_sdk.api.universal.cached_repository import CachedUniversalRepository
+from hawk_sdk.api.universal.coalescing_repository import (
+    CoalescingUniversalRepository
+)
+from hawk_sdk.api.universal.plan import UniversalDataPlan
 from hawk_sdk.api.universal.repository import UniversalRepository
 from hawk_sdk.api.universal.service import UniversalService
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.cache.parquet_cache import ParquetCache
+from hawk_sdk.core.common.coalesce import RequestCoalescer
+from hawk_sdk.core.common.constants import (
+    DEFAULT_HAWK_ID_CHUNK_SIZE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_STREAM_BATCH_ROWS
+)
 from hawk_sdk.core.common.data_object import DataObject
+from hawk_sdk.core.common.lazy import LazyDataObject
+from hawk_sdk.core.common.metrics import instrumented
 
 
 class Universal:
     """Datasource API for fetching any data via hawk_ids and field_ids."""
 
-    def __init__(self, environment="production") -> None:
-        """Initializes the Universal datasource with required configurations."""
-        self.repository = UniversalRepository(environment=environment)
+    def __init__(
+        self,
+        environment="production",
+        cache: Optional[ParquetCache] = None,
+        backend: Optional[QueryBackend] = None,
+        coalescer: Optional[RequestCoalescer] = None
+    ) -> None:
+        """Initializes the Universal datasource with required configurations.
+
+        :param environment: The environment to fetch data from.
+        :param cache: Optional local cache that get_data reads and fills.
+        :param backend: The engine to run queries on, e.g. a DuckDBBackend over
+            a local mirror. Defaults to BigQuery.
+        :param coalescer: Optional RequestCoalescer letting concurrent calls,
+            from this and any other datasource sharing it, run overlapping
+            queries as one job.
+        """
+        self.repository = UniversalRepository(
+            environment=environment, backend=backend
+        )
+        if cache is not None:
+            self.repository = CachedUniversalRepository(self.repository, cache)
+        if coalescer is not None:
+            self.repository = CoalescingUniversalRepository(
+                self.repository, coalescer
+            )
         self.service = UniversalService(self.repository)
+        # Built on the first call passing tickers in place of hawk_ids.
+        self._resolver: Optional[IdentifierResolver] = None
+
+    def close(self) -> None:
+        """Releases the BigQuery client or local database of this datasource.
+
+        :return: None
+        """
+        self.repository.close()
+
+    def __enter__(self) -> "Universal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def resolver(self) -> IdentifierResolver:
+        """Resolves tickers passed in place of hawk_ids, built on first use."""
+        if self._resolver is None:
+            self._resolver = IdentifierResolver(SystemRepository(
+                environment=self.repository.environment,
+                backend=self.repository.backend
+            ))
+        return self._resolver
 
+    @instrumented('universal.get_data')
     def get_data(
         self,
-        hawk_ids: List[int],
+        hawk_ids: List[Union[int, str]],
         field_ids: List[int],
         start_date: str,
         end_date: str,
-        interval: str
+        interval: str,
+        hawk_id_chunk_size: Optional[int] = DEFAULT_HAWK_ID_CHUNK_SIZE,
+        date_chunk_days: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        server_pivot: bool = False,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        lazy: bool = False,
+        arrow: bool = False
     ) -> DataObject:
         """Fetch data for any combination of hawk_ids and field_ids.
 
@@ -31,38 +109,210 @@ class Universal:
         per field. If a hawk_id doesn't have a value for a field on a given date,
         the value will be empty (NaN).
 
-        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
         :param field_ids: A list of field_ids to fetch data for.
         :param start_date: The start date (YYYY-MM-DD). Ignored when interval='snapshot'.
         :param end_date: The end date (YYYY-MM-DD), or cutoff timestamp (YYYY-MM-DD HH:MM:SS) for snapshot.
-        :param interval: Data interval (e.g., '1d', '1h'). Use 'snapshot' for point-in-time data.
+        :param interval: Bucket size (e.g., '1d', '1h', '15m'), 'raw' for
+            unaggregated records, or 'snapshot' for point-in-time data. Buckets
+            are dated at their start, and start_date/end_date are widened to
+            whole buckets.
+        :param hawk_id_chunk_size: Max hawk_ids per query; larger requests are
+            split and run in parallel.
+        :param date_chunk_days: Max days per query, or None to not split by
+            date.
+        :param max_workers: Max chunk queries running at the same time.
+        :param server_pivot: Pivot to one row per (date, hawk_id) inside
+            BigQuery, which transfers far fewer bytes for wide requests.
+            Bypasses the local cache.
+        :param aggregations: How each field is aggregated per bucket, keyed by
+            field_id: 'last' (default), 'first', 'min', 'max', 'sum', 'mean',
+            'count', or 'open'/'high'/'low'/'close'.
+        :param local_metadata: Leave the ticker and field name joins out of the
+            query and fill them in from the process-wide metadata cache instead.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :param per_field: For snapshot, return each (hawk_id, field)'s own most
+            recent value at or before end_date. By default only the records at
+            the single latest timestamp of the whole request are returned, which
+            leaves out tickers and fields that update on other schedules.
+        :param max_staleness: With per_field, leave out values older than this
+            before end_date (e.g. '5d', '12h').
+        :param lazy: Return a LazyDataObject that runs the query on first
+            access. Its head() and count() run LIMIT and COUNT(*) queries, and
+            select() queries only the selected fields.
+        :param arrow: Return the data as a pyarrow Table, pivoted without
+            pandas. to_arrow() and to_polars() use it without copying and
+            to_df() converts it on demand. With compact, tickers and char fields
+            are dictionary-encoded, integer-only fields are int64 and date stays
+            a column.
         :return: A hawk DataObject containing the data.
         """
+        hawk_ids = self._resolve_hawk_ids(hawk_ids)
+        if lazy:
+            options = dict(
+                hawk_id_chunk_size=hawk_id_chunk_size,
+                date_chunk_days=date_chunk_days, max_workers=max_workers,
+                server_pivot=server_pivot, aggregations=aggregations,
+                local_metadata=local_metadata, compact=compact, float32=float32,
+                per_field=per_field, max_staleness=max_staleness, arrow=arrow
+            )
+            return LazyDataObject("universal_data", UniversalDataPlan(
+                self.service, hawk_ids, field_ids, start_date, end_date,
+                interval, options
+            ))
         return DataObject(
             name="universal_data",
-            data=self.service.get_data(hawk_ids, field_ids, start_date, end_date, interval)
+            data=self.service.get_data(
+                hawk_ids, field_ids, start_date, end_date, interval,
+                hawk_id_chunk_size, date_chunk_days, max_workers, server_pivot,
+                aggregations, local_metadata, compact, float32, per_field,
+                max_staleness, arrow
+            )
         )
 
+    def iter_data(
+        self,
+        hawk_ids: List[Union[int, str]],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        batch_rows: int = DEFAULT_STREAM_BATCH_ROWS,
+        date_chunk_days: Optional[int] = None,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False
+    ) -> Iterator[DataObject]:
+        """Stream data for any combination of hawk_ids and field_ids in chunks.
+
+        Yields DataObjects with the same columns as get_data, in date order.
+        Each chunk holds whole dates, so a (date, hawk_id) row never spans two
+        chunks, and memory stays bounded by roughly ``batch_rows`` records.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date (YYYY-MM-DD).
+        :param end_date: The end date (YYYY-MM-DD).
+        :param interval: Bucket size (e.g., '1d', '1h') or 'raw'. 'snapshot' is
+            not supported.
+        :param batch_rows: Long-format records to buffer per chunk before
+            pivoting.
+        :param date_chunk_days: Max days per query, or None for a single query.
+        :param aggregations: How each field is aggregated per bucket, keyed by
+            field_id.
+        :param local_metadata: Fill in tickers and field names from the metadata
+            cache.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :return: An iterator of hawk DataObjects.
+        """
+        hawk_ids = self._resolve_hawk_ids(hawk_ids)
+        for chunk in self.service.iter_data(
+            hawk_ids, field_ids, start_date, end_date, interval,
+            batch_rows, date_chunk_days, aggregations, local_metadata, compact,
+            float32
+        ):
+            yield DataObject(name="universal_data", data=chunk)
+
+    @instrumented('universal.get_as_of')
+    def get_as_of(
+        self,
+        hawk_ids: List[Union[int, str]],
+        field_ids: List[int],
+        timestamps: List[str],
+        start_date: Optional[str] = None,
+        compact: bool = False,
+        float32: bool = False
+    ) -> DataObject:
+        """Fetch each field's latest value at or before each of many timestamps.
+
+        Returns one row per (timestamp, hawk_id) with columns date (the
+        timestamp), hawk_id, ticker and one column per field, holding the most
+        recent value of each field at that time. All timestamps are answered by
+        a single query, so a backtest can get its as-of values for every
+        rebalance date at once.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamps: The as-of timestamps (YYYY-MM-DD HH:MM:SS), in any
+            order; naive timestamps are UTC.
+        :param start_date: Ignore records before this date (YYYY-MM-DD),
+            bounding how far back the query scans. None considers all history.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :return: A hawk DataObject containing the as-of data.
+        """
+        hawk_ids = self._resolve_hawk_ids(hawk_ids)
+        return DataObject(
+            name="universal_as_of",
+            data=self.service.get_as_of_data(
+                hawk_ids, field_ids, timestamps, start_date, compact, float32
+            )
+        )
+
+    @instrumented('universal.get_latest_snapshot')
     def get_latest_snapshot(
         self,
-        hawk_ids: List[int],
-        field_ids: List[int]
+        hawk_ids: List[Union[int, str]],
+        field_ids: List[int],
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        arrow: bool = False
     ) -> DataObject:
         """Fetch the most recent data available for the given hawk_ids and field_ids.
 
-        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param hawk_ids: A list of hawk_ids to fetch data for. Tickers in the
+            list are resolved to hawk_ids.
         :param field_ids: A list of field_ids to fetch data for.
+        :param compact: Return a smaller frame: tickers as categoricals,
+            integer-only fields as nullable Int64, and a UTC DatetimeIndex on
+            date instead of a date column.
+        :param float32: With compact, store float fields as float32 (about 7
+            significant digits).
+        :param per_field: Return each (hawk_id, field)'s own most recent value.
+            By default only the records at the single latest timestamp of the
+            whole request are returned.
+        :param max_staleness: With per_field, leave out values older than this
+            (e.g. '5d', '12h').
+        :param arrow: Return the data as a pyarrow Table, pivoted without
+            pandas. to_arrow() and to_polars() use it without copying and
+            to_df() converts it on demand. With compact, tickers and char fields
+            are dictionary-encoded, integer-only fields are int64 and date stays
+            a column.
         :return: A hawk DataObject containing the latest snapshot data.
         """
+        hawk_ids = self._resolve_hawk_ids(hawk_ids)
         return DataObject(
             name="universal_latest_snapshot",
-            data=self.service.get_latest_snapshot(hawk_ids, field_ids)
+            data=self.service.get_latest_snapshot(
+                hawk_ids, field_ids, compact, float32, per_field,
+                max_staleness, arrow
+            )
         )
 
+    @instrumented('universal.get_field_ids')
     def get_field_ids(self, field_names: List[str]) -> DataObject:
         """Lookup field_ids for the given field names.
 
-        Useful for discovering field_ids when you know the field names.
+        Useful for discovering field_ids when you know the field names. The
+        fields table is loaded once and then served from the process-wide
+        metadata cache.
 
         :param field_names: A list of field name strings to lookup.
         :return: A hawk DataObject containing field_id and field_name pairs.
@@ -72,6 +322,7 @@ class Universal:
             data=self.service.get_field_ids(field_names)
         )
 
+    @instrumented('universal.get_all_fields')
     def get_all_fields(self) -> DataObject:
         """Get all available fields in the system.
 
@@ -83,3 +334,24 @@ class Universal:
             name="all_fields",
             data=self.service.get_all_fields()
         )
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached fields and tickers so the next lookup reloads them.
+
+        :return: None
+        """
+        self.service.invalidate_metadata()
+
+    def _resolve_hawk_ids(
+        self,
+        hawk_ids: List[Union[int, str]]
+    ) -> List[int]:
+        """Replaces the tickers in a list of hawk_ids by their hawk_ids.
+
+        :param hawk_ids: hawk_ids and tickers, in any mix.
+        :return: The hawk_ids, in the same order.
+        """
+        hawk_ids = list(hawk_ids)
+        if not any(isinstance(hawk_id, str) for hawk_id in hawk_ids):
+            return hawk_ids
+        return self.resolver.resolve_hawk_ids(hawk_ids)
@@ -0,0 +1,113 @@
+"""
+@description: Deferred Universal queries for lazy DataObjects.
+@author: Rithwik Babu
+"""
+from typing import Any, Dict, List, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from hawk_sdk.api.universal.service import UniversalService
+from hawk_sdk.core.common.lazy import QueryPlan
+from hawk_sdk.core.common.pivot import INDEX_COLUMNS
+
+
+class UniversalDataPlan(QueryPlan):
+    """A deferred Universal.get_data call.
+
+    head() limits the query to the first (date, hawk_id) rows and count()
+    runs a COUNT(*) over them. Selecting columns narrows the query to the
+    selected fields, looked up by name in the metadata cache. Snapshots are
+    fetched whole and projected locally, since which records are latest
+    depends on every requested field.
+    """
+
+    def __init__(
+        self,
+        service: UniversalService,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        options: Dict[str, Any]
+    ) -> None:
+        """Initializes the plan.
+
+        :param service: The service to run the queries with.
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date (YYYY-MM-DD) or timestamp for snapshot.
+        :param interval: The interval for the data query.
+        :param options: The remaining keyword arguments of
+            UniversalService.get_data.
+        """
+        super().__init__('universal.get_data')
+        self.service = service
+        self.hawk_ids = hawk_ids
+        self.field_ids = field_ids
+        self.start_date = start_date
+        self.end_date = end_date
+        self.interval = interval
+        self.options = options
+
+    def fetch(self) -> Union[pd.DataFrame, pa.Table]:
+        """Runs the full query.
+
+        :return: The get_data frame or Table, projected to the selected columns.
+        """
+        return self.project(self.service.get_data(
+            self.hawk_ids, self._field_ids(), self.start_date, self.end_date,
+            self.interval, **self.options
+        ))
+
+    def head(self, n: int) -> pd.DataFrame:
+        """Fetches the first n (date, hawk_id) rows.
+
+        :param n: Number of rows to return.
+        :return: A pandas DataFrame.
+        """
+        if self.interval == "snapshot":
+            # A snapshot has one row per hawk_id at most, so it is fetched
+            # whole, with every get_data option.
+            return super().head(n)
+        return self.project(self.service.head_data(
+            self.hawk_ids, self._field_ids(), self.start_date, self.end_date,
+            self.interval, n, self.options.get('aggregations'),
+            self.options.get('local_metadata', False),
+            self.options.get('compact', False),
+            self.options.get('float32', False)
+        ))
+
+    def count(self) -> int:
+        """Counts the (date, hawk_id) rows in BigQuery.
+
+        :return: The row count.
+        """
+        if self.interval == "snapshot":
+            return super().count()
+        return self.service.count_data(
+            self.hawk_ids, self._field_ids(), self.start_date, self.end_date,
+            self.interval, self.options.get('aggregations')
+        )
+
+    def _field_ids(self) -> List[int]:
+        """Returns the field_ids needed for the selected columns.
+
+        :return: The selected fields' ids, or every requested field_id when no
+            field column is selected or the plan is a snapshot.
+        """
+        names = [
+            column for column in (self.columns or [])
+            if column not in INDEX_COLUMNS
+        ]
+        if not names or self.interval == "snapshot":
+            return self.field_ids
+
+        fields = self.service.get_field_ids(names)
+        fields = fields[fields['field_id'].isin(self.field_ids)]
+        missing = sorted(set(names) - set(fields['field_name']))
+        if missing:
+            raise ValueError(f"Columns not in the requested fields: {missing}")
+        return fields['field_id'].tolist()
@@ -3,42 +3,196 @@
 @author: Rithwik Babu
 """
 import logging
-from typing import Iterator, List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from google.cloud import bigquery
 
-from hawk_sdk.core.common.utils import get_bigquery_client
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.backend.default import default_backend
+from hawk_sdk.core.common.intervals import (
+    RAW_INTERVAL,
+    align_range,
+    bucket_expression,
+    group_fields_by_aggregation,
+)
+from hawk_sdk.core.common.jobs import execute_job
+
+_FIRST_LAST_ROW = (
+    "QUALIFY ROW_NUMBER() OVER "
+    "(PARTITION BY date, hawk_id, field_id "
+    "ORDER BY record_timestamp {order}) = 1"
+)
+_GROUP_BY = "GROUP BY date, hawk_id, field_id"
+
+# Value columns and trailing clause of the UNION ALL branch per aggregation.
+_VALUE_COLUMNS = "double_value, int_value, char_value"
+_AGGREGATE_COLUMNS = {
+    'first': _VALUE_COLUMNS,
+    'last': _VALUE_COLUMNS,
+    'min': "MIN(double_value) AS double_value, MIN(int_value) AS int_value, "
+           "MIN(char_value) AS char_value",
+    'max': "MAX(double_value) AS double_value, MAX(int_value) AS int_value, "
+           "MAX(char_value) AS char_value",
+    'sum': "SUM(double_value) AS double_value, SUM(int_value) AS int_value, "
+           "CAST(NULL AS STRING) AS char_value",
+    'mean': "AVG(COALESCE(double_value, int_value)) AS double_value, "
+            "CAST(NULL AS INT64) AS int_value, "
+            "CAST(NULL AS STRING) AS char_value",
+    'count': "CAST(NULL AS FLOAT64) AS double_value, COUNT(*) AS int_value, "
+             "CAST(NULL AS STRING) AS char_value",
+}
+_AGGREGATE_CLAUSES = {
+    'first': _FIRST_LAST_ROW.format(order='ASC'),
+    'last': _FIRST_LAST_ROW.format(order='DESC'),
+    'min': _GROUP_BY,
+    'max': _GROUP_BY,
+    'sum': _GROUP_BY,
+    'mean': _GROUP_BY,
+    'count': _GROUP_BY,
+}
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Records that survive pivoting, which drops those without any value.
+_HAS_VALUE = (
+    "double_value IS NOT NULL OR int_value IS NOT NULL "
+    "OR char_value IS NOT NULL"
+)
 
 
 class UniversalRepository:
     """Repository for accessing any data via hawk_ids and field_ids."""
 
-    def __init__(self, environment: str) -> None:
-        """Initializes the repository with a BigQuery client.
+    def __init__(
+        self,
+        environment: str,
+        backend: Optional[QueryBackend] = None
+    ) -> None:
+        """Initializes the repository with a query backend.
 
         :param environment: The environment to fetch data from (e.g., 'production', 'development').
+        :param backend: The engine to run queries on; defaults to BigQuery, or
+            the local mirror named by HAWK_SDK_LOCAL_MIRROR.
         """
-        self.bq_client = get_bigquery_client()
+        self.backend = backend if backend is not None else default_backend()
         self.environment = environment
 
+    def close(self) -> None:
+        """Releases the backend's client or database.
+
+        :return: None
+        """
+        self.backend.close()
+
     def fetch_data(
         self,
         hawk_ids: List[int],
         field_ids: List[int],
         start_date: str,
         end_date: str,
-        interval: str
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True,
+        limit: Optional[int] = None
     ) -> Iterator[dict]:
-        """Fetches raw data from BigQuery for the given hawk_ids and field_ids.
+        """Fetches data from BigQuery for the given hawk_ids and field_ids.
+
+        With interval 'raw' every record in the range is returned. Any other
+        interval buckets records server-side and returns one aggregated record
+        per (bucket, hawk_id, field_id), dated at the bucket start.
 
         :param hawk_ids: A list of hawk_ids to fetch data for.
         :param field_ids: A list of field_ids to fetch data for.
         :param start_date: The start date for the data query (YYYY-MM-DD).
         :param end_date: The end date for the data query (YYYY-MM-DD).
-        :param interval: The interval for the data query (e.g., '1d', '1h', '1m').
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id (e.g., 'last', 'first',
+            'max', 'sum', 'mean', 'count' or 'open'/'high'/'low'/'close');
+            defaults to 'last'.
+        :param join_metadata: Join ticker and field_name in the query. When
+            False those columns are left out, to be attached from the local
+            metadata cache.
+        :param limit: Only return the records of the first ``limit`` (date,
+            hawk_id) rows that have a value, e.g. for a preview of the pivoted
+            frame.
         :return: An iterator over raw data rows.
         """
-        query = f"""
+        try:
+            return execute_job(
+                self.submit_data, hawk_ids, field_ids, start_date, end_date,
+                interval, aggregations, join_metadata, limit
+            )
+        except Exception as e:
+            logging.error(f"Failed to fetch universal data: {e}")
+            raise
+
+    def submit_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True,
+        limit: Optional[int] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query for data of the given hawk_ids and field_ids.
+
+        With interval 'raw' every record in the range is returned. Any other
+        interval buckets records server-side and returns one aggregated record
+        per (bucket, hawk_id, field_id), dated at the bucket start.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id (e.g., 'last', 'first',
+            'max', 'sum', 'mean', 'count' or 'open'/'high'/'low'/'close');
+            defaults to 'last'.
+        :param join_metadata: Join ticker and field_name in the query. When
+            False those columns are left out, to be attached from the local
+            metadata cache.
+        :param limit: Only return the records of the first ``limit`` (date,
+            hawk_id) rows that have a value, e.g. for a preview of the pivoted
+            frame.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        records_cte, records_params = self._records_cte(
+            field_ids, interval, aggregations
+        )
+        records = "records_data"
+        if limit is not None:
+            records_cte += f""",
+        head_keys AS (
+          SELECT DISTINCT 
+            date,
+            hawk_id
+          FROM 
+            records_data
+          WHERE 
+            {_HAS_VALUE}
+          ORDER BY 
+            date, hawk_id
+          LIMIT {int(limit)}
+        ),
+        head_data AS (
+          SELECT 
+            r.*
+          FROM 
+            records_data AS r
+          JOIN 
+            head_keys AS k
+            ON r.date = k.date AND r.hawk_id = k.hawk_id
+        )"""
+            records = "head_data"
+        if join_metadata:
+            query = f"""
         WITH field_info AS (
           SELECT 
             field_id,
@@ -48,59 +202,329 @@ class UniversalRepository:
           WHERE 
             field_id IN UNNEST(@field_ids)
         ),
-        records_data AS (
-          SELECT 
-            r.record_timestamp AS date,
-            r.hawk_id,
-            hi.value AS ticker,
-            f.field_id,
-            f.field_name,
-            r.double_value,
-            r.int_value,
-            r.char_value
-          FROM 
-            `wsb-hc-qasap-ae2e.{self.environment}.records` AS r
-          JOIN 
-            field_info AS f
-            ON r.field_id = f.field_id
-          LEFT JOIN 
-            `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers` AS hi
-            ON r.hawk_id = hi.hawk_id AND hi.id_type = 'TICKER'
-          WHERE 
-            r.hawk_id IN UNNEST(@hawk_ids)
-            AND r.record_timestamp BETWEEN @start_date AND @end_date
-        )
+{records_cte}
+        SELECT 
+          r.date,
+          r.hawk_id,
+          hi.value AS ticker,
+          f.field_id,
+          f.field_name,
+          r.double_value,
+          r.int_value,
+          r.char_value
+        FROM 
+          {records} AS r
+        JOIN 
+          field_info AS f
+          ON r.field_id = f.field_id
+        LEFT JOIN 
+          `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers` AS hi
+          ON r.hawk_id = hi.hawk_id AND hi.id_type = 'TICKER'
+        ORDER BY 
+          date, hawk_id, field_id;
+        """
+        else:
+            query = f"""
+        WITH
+{records_cte}
         SELECT 
           date,
           hawk_id,
-          ticker,
           field_id,
-          field_name,
           double_value,
           int_value,
           char_value
         FROM 
-          records_data
+          {records}
         ORDER BY 
           date, hawk_id, field_id;
         """
 
+        start_date, end_date = align_range(start_date, end_date, interval)
         query_params = [
             bigquery.ArrayQueryParameter("hawk_ids", "INT64", hawk_ids),
             bigquery.ArrayQueryParameter("field_ids", "INT64", field_ids),
             bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
             bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
+            *records_params,
         ]
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
+        return self.backend.query(query, job_config)
+
+    def fetch_data_wide(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True
+    ) -> Iterator[dict]:
+        """Fetches data from BigQuery pivoted to one row per (date, hawk_id).
+
+        The pivot is done with conditional aggregation, producing two columns
+        per field: ``n_<field_id>`` holding double_value (else int_value) and
+        ``c_<field_id>`` holding char_value. Intervals other than 'raw' are
+        bucketed and aggregated before the pivot, as in fetch_data.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id; defaults to 'last'.
+        :param join_metadata: Join the ticker in the query. When False the
+            column is left out, to be attached from the local metadata cache.
+        :return: An iterator over raw wide-format data rows.
+        """
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
+            return execute_job(
+                self.submit_data_wide, hawk_ids, field_ids, start_date,
+                end_date, interval, aggregations, join_metadata
+            )
         except Exception as e:
-            logging.error(f"Failed to fetch universal data: {e}")
+            logging.error(f"Failed to fetch wide universal data: {e}")
+            raise
+
+    def submit_data_wide(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True
+    ) -> bigquery.QueryJob:
+        """Submits the query for data pivoted to one row per (date, hawk_id).
+
+        The pivot is done with conditional aggregation, producing two columns
+        per field: ``n_<field_id>`` holding double_value (else int_value) and
+        ``c_<field_id>`` holding char_value. Intervals other than 'raw' are
+        bucketed and aggregated before the pivot, as in fetch_data.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id; defaults to 'last'.
+        :param join_metadata: Join the ticker in the query. When False the
+            column is left out, to be attached from the local metadata cache.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        records_cte, records_params = self._records_cte(
+            field_ids, interval, aggregations
+        )
+        field_columns = ",\n".join(
+            f"""            MAX(IF(field_id = {field_id},
+                COALESCE(double_value, int_value), NULL)) AS n_{field_id},
+            MAX(IF(field_id = {field_id}, char_value, NULL)) AS c_{field_id}"""
+            for field_id in sorted({int(field_id) for field_id in field_ids})
+        )
+        ticker_column, ticker_join = "", ""
+        if join_metadata:
+            ticker_column = "hi.value AS ticker,"
+            ticker_join = f"""LEFT JOIN 
+          `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers` AS hi
+          ON w.hawk_id = hi.hawk_id AND hi.id_type = 'TICKER'"""
+        query = f"""
+        WITH
+{records_cte},
+        wide_data AS (
+          SELECT 
+            date,
+            hawk_id,
+{field_columns}
+          FROM 
+            records_data
+          GROUP BY 
+            date, hawk_id
+        )
+        SELECT 
+          w.date,
+          w.hawk_id,
+          {ticker_column}
+          w.* EXCEPT (date, hawk_id)
+        FROM 
+          wide_data AS w
+        {ticker_join}
+        ORDER BY 
+          date, hawk_id;
+        """
+
+        start_date, end_date = align_range(start_date, end_date, interval)
+        query_params = [
+            bigquery.ArrayQueryParameter("hawk_ids", "INT64", hawk_ids),
+            bigquery.ArrayQueryParameter("field_ids", "INT64", field_ids),
+            bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
+            bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
+            *records_params,
+        ]
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
+
+    def fetch_row_count(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None
+    ) -> Iterator[dict]:
+        """Counts the (date, hawk_id) rows a range query pivots to.
+
+        :param hawk_ids: A list of hawk_ids to count data for.
+        :param field_ids: A list of field_ids to count data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id; defaults to 'last'.
+        :return: An iterator over a single row holding row_count.
+        """
+        try:
+            return execute_job(
+                self.submit_row_count, hawk_ids, field_ids, start_date,
+                end_date, interval, aggregations
+            )
+        except Exception as e:
+            logging.error(f"Failed to count universal data: {e}")
             raise
 
+    def submit_row_count(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query counting the (date, hawk_id) rows of a range query.
+
+        Only rows with at least one value are counted, as pivoting drops the
+        others.
+
+        :param hawk_ids: A list of hawk_ids to count data for.
+        :param field_ids: A list of field_ids to count data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            '1m', 'raw').
+        :param aggregations: Aggregation per field_id; defaults to 'last'.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        records_cte, records_params = self._records_cte(
+            field_ids, interval, aggregations
+        )
+        query = f"""
+        WITH
+{records_cte}
+        SELECT 
+          COUNT(*) AS row_count
+        FROM (
+          SELECT DISTINCT 
+            date,
+            hawk_id
+          FROM 
+            records_data
+          WHERE 
+            {_HAS_VALUE}
+        );
+        """
+
+        start_date, end_date = align_range(start_date, end_date, interval)
+        query_params = [
+            bigquery.ArrayQueryParameter("hawk_ids", "INT64", hawk_ids),
+            bigquery.ArrayQueryParameter("field_ids", "INT64", field_ids),
+            bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
+            bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
+            *records_params,
+        ]
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
+
+    def _records_cte(
+        self,
+        field_ids: List[int],
+        interval: str,
+        aggregations: Optional[Dict[int, str]]
+    ) -> Tuple[str, List[bigquery.ArrayQueryParameter]]:
+        """Builds the ``records_data`` CTE shared by the range queries.
+
+        The CTE yields date, hawk_id, field_id, double_value, int_value and
+        char_value. For 'raw' these are the records themselves. Otherwise
+        records are grouped into buckets and every aggregation in use gets
+        its own branch of a UNION ALL over the fields that asked for it;
+        first/last keep the earliest/latest record of the bucket, the others
+        aggregate the values.
+
+        :param field_ids: The requested field_ids.
+        :param interval: The interval for the data query.
+        :param aggregations: Aggregation per field_id.
+        :return: The CTE SQL and the extra query parameters it needs.
+        """
+        source = f"""
+          FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.records` AS r
+          WHERE 
+            r.hawk_id IN UNNEST(@hawk_ids)
+            AND r.field_id IN UNNEST(@field_ids)
+            AND r.record_timestamp BETWEEN @start_date AND @end_date"""
+
+        if interval == RAW_INTERVAL:
+            return f"""        records_data AS (
+          SELECT 
+            r.record_timestamp AS date,
+            r.hawk_id,
+            r.field_id,
+            r.double_value,
+            r.int_value,
+            r.char_value{source}
+        )""", []
+
+        bucket = bucket_expression('r.record_timestamp', interval)
+        branches = []
+        params = []
+        groups = group_fields_by_aggregation(field_ids, aggregations)
+        for name, group in sorted(groups.items()):
+            params.append(bigquery.ArrayQueryParameter(
+                f"{name}_field_ids", "INT64", group
+            ))
+            branches.append(f"""          SELECT 
+            date, hawk_id, field_id, {_AGGREGATE_COLUMNS[name]}
+          FROM 
+            bucketed
+          WHERE 
+            field_id IN UNNEST(@{name}_field_ids)
+          {_AGGREGATE_CLAUSES[name]}""")
+
+        union = "\n          UNION ALL\n".join(branches)
+        return f"""        bucketed AS (
+          SELECT 
+            {bucket} AS date,
+            r.record_timestamp,
+            r.hawk_id,
+            r.field_id,
+            r.double_value,
+            r.int_value,
+            r.char_value{source}
+        ),
+        records_data AS (
+{union}
+        )""", params
+
     def fetch_snapshot(
         self,
         hawk_ids: List[int],
@@ -114,6 +538,27 @@ class UniversalRepository:
         :param timestamp: The cutoff timestamp (YYYY-MM-DD HH:MM:SS).
         :return: An iterator over raw data rows.
         """
+        try:
+            return execute_job(
+                self.submit_snapshot, hawk_ids, field_ids, timestamp
+            )
+        except Exception as e:
+            logging.error(f"Failed to fetch universal snapshot data: {e}")
+            raise
+
+    def submit_snapshot(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        timestamp: str
+    ) -> bigquery.QueryJob:
+        """Submits the query for the snapshot data at the given timestamp.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamp: The cutoff timestamp (YYYY-MM-DD HH:MM:SS).
+        :return: The submitted QueryJob; call result() for the rows.
+        """
         query = f"""
         WITH field_info AS (
           SELECT 
@@ -179,13 +624,258 @@ class UniversalRepository:
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
+        return self.backend.query(query, job_config)
+
+    def fetch_latest_values(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        timestamp: Optional[str] = None,
+        start_date: Optional[str] = None
+    ) -> Iterator[dict]:
+        """Fetches the most recent record of every (hawk_id, field_id).
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamp: The cutoff timestamp (YYYY-MM-DD HH:MM:SS), or None
+            for no cutoff.
+        :param start_date: Ignore records before this timestamp, or None for all
+            history.
+        :return: An iterator over raw data rows.
+        """
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
+            return execute_job(
+                self.submit_latest_values, hawk_ids, field_ids, timestamp,
+                start_date
+            )
         except Exception as e:
-            logging.error(f"Failed to fetch universal snapshot data: {e}")
+            logging.error(f"Failed to fetch latest universal values: {e}")
             raise
 
+    def submit_latest_values(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        timestamp: Optional[str] = None,
+        start_date: Optional[str] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query for the latest record of every (hawk_id, field_id).
+
+        Unlike the snapshot queries, which keep only the records at the single
+        latest timestamp of the whole request, every pair keeps its own latest
+        record with a value. Each row is dated at its hawk_id's most recent
+        update, so the records pivot to one row per hawk_id.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamp: The cutoff timestamp (YYYY-MM-DD HH:MM:SS), or None
+            for no cutoff.
+        :param start_date: Ignore records before this timestamp, or None for all
+            history.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        conditions = ""
+        if timestamp is not None:
+            conditions += "\n            AND r.record_timestamp <= @timestamp"
+        if start_date is not None:
+            conditions += "\n            AND r.record_timestamp >= @start_date"
+        query = f"""
+        WITH field_info AS (
+          SELECT 
+            field_id,
+            field_name
+          FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.fields`
+          WHERE 
+            field_id IN UNNEST(@field_ids)
+        ),
+        latest_records AS (
+          SELECT 
+            r.record_timestamp,
+            r.hawk_id,
+            r.field_id,
+            r.double_value,
+            r.int_value,
+            r.char_value
+          FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.records` AS r
+          WHERE 
+            r.hawk_id IN UNNEST(@hawk_ids)
+            AND r.field_id IN UNNEST(@field_ids){conditions}
+            AND ({_HAS_VALUE})
+          QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY r.hawk_id, r.field_id
+            ORDER BY r.record_timestamp DESC
+          ) = 1
+        )
+        SELECT 
+          MAX(l.record_timestamp) OVER (PARTITION BY l.hawk_id) AS date,
+          l.hawk_id,
+          hi.value AS ticker,
+          f.field_id,
+          f.field_name,
+          l.double_value,
+          l.int_value,
+          l.char_value
+        FROM 
+          latest_records AS l
+        JOIN 
+          field_info AS f
+          ON l.field_id = f.field_id
+        LEFT JOIN 
+          `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers` AS hi
+          ON l.hawk_id = hi.hawk_id AND hi.id_type = 'TICKER'
+        ORDER BY 
+          hawk_id, field_id;
+        """
+
+        query_params = [
+            bigquery.ArrayQueryParameter("hawk_ids", "INT64", hawk_ids),
+            bigquery.ArrayQueryParameter("field_ids", "INT64", field_ids),
+        ]
+        if timestamp is not None:
+            query_params.append(bigquery.ScalarQueryParameter(
+                "timestamp", "TIMESTAMP", timestamp
+            ))
+        if start_date is not None:
+            query_params.append(bigquery.ScalarQueryParameter(
+                "start_date", "STRING", start_date
+            ))
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
+
+    def fetch_as_of(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        cutoff_micros: List[int],
+        start_date: Optional[str] = None
+    ) -> Iterator[dict]:
+        """Fetches the last record per (hawk_id, field_id) between cutoffs.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param cutoff_micros: Sorted, distinct cutoff timestamps in microseconds
+            since the epoch.
+        :param start_date: Earliest record timestamp to consider, or None for
+            all history.
+        :return: An iterator over raw data rows.
+        """
+        try:
+            return execute_job(
+                self.submit_as_of, hawk_ids, field_ids, cutoff_micros,
+                start_date
+            )
+        except Exception as e:
+            logging.error(f"Failed to fetch universal as-of data: {e}")
+            raise
+
+    def submit_as_of(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        cutoff_micros: List[int],
+        start_date: Optional[str] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query for the last records between consecutive cutoffs.
+
+        Each record is assigned to the first cutoff at or after its timestamp,
+        and only the latest record with a value per (cutoff_index, hawk_id,
+        field_id) is returned. Carrying those forward across the cutoffs gives
+        the as-of value at every cutoff, from a single scan of records.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param cutoff_micros: Sorted, distinct cutoff timestamps in microseconds
+            since the epoch.
+        :param start_date: Earliest record timestamp to consider, or None for
+            all history.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        start_condition = "" if start_date is None else \
+            "\n            AND r.record_timestamp >= @start_date"
+        query = f"""
+        WITH field_info AS (
+          SELECT 
+            field_id,
+            field_name
+          FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.fields`
+          WHERE 
+            field_id IN UNNEST(@field_ids)
+        ),
+        bucketed AS (
+          SELECT 
+            RANGE_BUCKET(UNIX_MICROS(r.record_timestamp) - 1, @cutoff_micros)
+              AS cutoff_index,
+            r.record_timestamp,
+            r.hawk_id,
+            r.field_id,
+            r.double_value,
+            r.int_value,
+            r.char_value
+          FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.records` AS r
+          WHERE 
+            r.hawk_id IN UNNEST(@hawk_ids)
+            AND r.field_id IN UNNEST(@field_ids)
+            AND r.record_timestamp <= @timestamp{start_condition}
+            AND ({_HAS_VALUE})
+        ),
+        latest_records AS (
+          SELECT 
+            cutoff_index, hawk_id, field_id, {_VALUE_COLUMNS}
+          FROM 
+            bucketed
+          QUALIFY ROW_NUMBER() OVER 
+            (PARTITION BY cutoff_index, hawk_id, field_id
+             ORDER BY record_timestamp DESC) = 1
+        )
+        SELECT 
+          l.cutoff_index,
+          l.hawk_id,
+          hi.value AS ticker,
+          f.field_id,
+          f.field_name,
+          l.double_value,
+          l.int_value,
+          l.char_value
+        FROM 
+          latest_records AS l
+        JOIN 
+          field_info AS f
+          ON l.field_id = f.field_id
+        LEFT JOIN 
+          `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers` AS hi
+          ON l.hawk_id = hi.hawk_id AND hi.id_type = 'TICKER'
+        ORDER BY 
+          cutoff_index, hawk_id, field_id;
+        """
+
+        query_params = [
+            bigquery.ArrayQueryParameter("hawk_ids", "INT64", hawk_ids),
+            bigquery.ArrayQueryParameter("field_ids", "INT64", field_ids),
+            bigquery.ArrayQueryParameter(
+                "cutoff_micros", "INT64", cutoff_micros
+            ),
+            bigquery.ScalarQueryParameter(
+                "timestamp", "TIMESTAMP",
+                _EPOCH + timedelta(microseconds=cutoff_micros[-1])
+            ),
+        ]
+        if start_date is not None:
+            query_params.append(
+                bigquery.ScalarQueryParameter(
+                    "start_date", "STRING", start_date
+                )
+            )
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
+
     def fetch_latest_snapshot(
         self,
         hawk_ids: List[int],
@@ -197,6 +887,23 @@ class UniversalRepository:
         :param field_ids: A list of field_ids to fetch data for.
         :return: An iterator over raw data rows.
         """
+        try:
+            return execute_job(self.submit_latest_snapshot, hawk_ids, field_ids)
+        except Exception as e:
+            logging.error(f"Failed to fetch latest snapshot data: {e}")
+            raise
+
+    def submit_latest_snapshot(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int]
+    ) -> bigquery.QueryJob:
+        """Submits the query for the latest data of the given hawk_ids.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
         query = f"""
         WITH field_info AS (
           SELECT 
@@ -260,12 +967,7 @@ class UniversalRepository:
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
-        try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
-        except Exception as e:
-            logging.error(f"Failed to fetch latest snapshot data: {e}")
-            raise
+        return self.backend.query(query, job_config)
 
     def fetch_field_ids_by_name(self, field_names: List[str]) -> Iterator[dict]:
         """Fetches field_ids for the given list of field names from BigQuery.
@@ -273,6 +975,20 @@ class UniversalRepository:
         :param field_names: A list of field name strings to lookup.
         :return: An iterator over raw data rows containing field_id and field_name.
         """
+        try:
+            return execute_job(self.submit_field_ids_by_name, field_names)
+        except Exception as e:
+            logging.error(f"Failed to fetch field_ids: {e}")
+            raise
+
+    def submit_field_ids_by_name(
+        self, field_names: List[str]
+    ) -> bigquery.QueryJob:
+        """Submits the query for the field_ids of the given field names.
+
+        :param field_names: A list of field name strings to lookup.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
         query = f"""
         SELECT 
             field_id,
@@ -289,18 +1005,91 @@ class UniversalRepository:
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
+        return self.backend.query(query, job_config)
+
+    def fetch_field_names(self, field_ids: List[int]) -> Iterator[dict]:
+        """Fetches field names for the given list of field_ids from BigQuery.
+
+        :param field_ids: A list of field_ids to lookup.
+        :return: An iterator over raw data rows containing field_id and
+            field_name.
+        """
+        try:
+            return execute_job(self.submit_field_names, field_ids)
+        except Exception as e:
+            logging.error(f"Failed to fetch field names: {e}")
+            raise
+
+    def submit_field_names(self, field_ids: List[int]) -> bigquery.QueryJob:
+        """Submits the query for the names of the given field_ids.
+
+        :param field_ids: A list of field_ids to lookup.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        query = f"""
+        SELECT 
+            field_id,
+            field_name
+        FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.fields`
+        WHERE 
+            field_id IN UNNEST(@field_ids)
+        """
+
+        query_params = [
+            bigquery.ArrayQueryParameter("field_ids", "INT64", field_ids),
+        ]
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
+
+    def fetch_all_tickers(self) -> Iterator[dict]:
+        """Fetches every ticker to hawk_id mapping from BigQuery.
+
+        :return: An iterator over raw data rows containing ticker and hawk_id.
+        """
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
+            return execute_job(self.submit_all_tickers)
         except Exception as e:
-            logging.error(f"Failed to fetch field_ids: {e}")
+            logging.error(f"Failed to fetch tickers: {e}")
             raise
 
+    def submit_all_tickers(self) -> bigquery.QueryJob:
+        """Submits the query for every ticker to hawk_id mapping.
+
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        query = f"""
+        SELECT 
+            value AS ticker, 
+            hawk_id
+        FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.hawk_identifiers`
+        WHERE 
+            id_type = 'TICKER'
+        ORDER BY 
+            ticker, hawk_id
+        """
+
+        return self.backend.query(query)
+
     def fetch_all_fields(self) -> Iterator[dict]:
         """Fetches all available fields from BigQuery.
 
         :return: An iterator over raw data rows containing field_id and field_name.
         """
+        try:
+            return execute_job(self.submit_all_fields)
+        except Exception as e:
+            logging.error(f"Failed to fetch fields: {e}")
+            raise
+
+    def submit_all_fields(self) -> bigquery.QueryJob:
+        """Submits the query for all available fields.
+
+        :return: The submitted QueryJob; call result() for the rows.
+        """
         query = f"""
         SELECT 
             field_id,
@@ -311,9 +1100,4 @@ class UniversalRepository:
             field_name
         """
 
-        try:
-            query_job = self.bq_client.query(query)
-            return query_job.result()
-        except Exception as e:
-            logging.error(f"Failed to fetch fields: {e}")
-            raise
+        return self.backend.query(query)
@@ -2,11 +2,53 @@
 @description: Service layer for processing and normalizing Universal data.
 @author: Rithwik Babu
 """
-from typing import List, Iterator
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Iterator,
+    Optional,
+    Tuple,
+    Union
+)
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from hawk_sdk.api.universal.repository import UniversalRepository
+from hawk_sdk.core.cache.metadata_cache import metadata_cache
+from hawk_sdk.core.common.chunking import (
+    TIMESTAMP_FORMAT,
+    chunk_list,
+    split_date_range
+)
+from hawk_sdk.core.common.columnar import (
+    iter_arrow_batches,
+    to_arrow_table,
+    to_dataframe
+)
+from hawk_sdk.core.common.compact import compact_frame, compact_table
+from hawk_sdk.core.common.constants import (
+    DEFAULT_HAWK_ID_CHUNK_SIZE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_STREAM_BATCH_ROWS
+)
+from hawk_sdk.core.common.intervals import align_range, duration_timedelta
+from hawk_sdk.core.common.jobs import run_job
+from hawk_sdk.core.common.metrics import record_phase
+from hawk_sdk.core.common.pivot import (
+    INDEX_COLUMNS,
+    assemble_wide,
+    assemble_wide_arrow,
+    pivot_records,
+    pivot_records_arrow
+)
 
 
 class UniversalService:
@@ -25,8 +67,19 @@ class UniversalService:
         field_ids: List[int],
         start_date: str,
         end_date: str,
-        interval: str
-    ) -> pd.DataFrame:
+        interval: str,
+        hawk_id_chunk_size: Optional[int] = DEFAULT_HAWK_ID_CHUNK_SIZE,
+        date_chunk_days: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        server_pivot: bool = False,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """Fetches and normalizes universal data into a pandas DataFrame.
 
         The output DataFrame has columns: date, hawk_id, ticker, and one column
@@ -37,45 +90,891 @@ class UniversalService:
         :param field_ids: A list of field_ids to fetch data for.
         :param start_date: The start date for the data query (YYYY-MM-DD). Ignored for snapshot.
         :param end_date: The end date (YYYY-MM-DD) or timestamp (YYYY-MM-DD HH:MM:SS) for snapshot.
-        :param interval: The interval for the data query. Use 'snapshot' for point-in-time data.
-        :return: A pandas DataFrame containing the normalized data.
+        :param interval: The interval for the data query. Use 'raw' for
+            unaggregated records and 'snapshot' for point-in-time data.
+        :param hawk_id_chunk_size: Max hawk_ids per query. Ignored for snapshot.
+        :param date_chunk_days: Max days per query, or None for no date split.
+            Ignored for snapshot.
+        :param max_workers: Max chunk queries running at the same time.
+        :param server_pivot: Pivot in BigQuery instead of client-side. Ignored
+            for snapshot.
+        :param aggregations: Aggregation per field_id when bucketing; defaults
+            to 'last'.
+        :param local_metadata: Skip the ticker/field_name joins in the query and
+            attach them from the metadata cache. Ignored for snapshot.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :param per_field: For snapshot, take each (hawk_id, field)'s own latest
+            record instead of only the records at the latest timestamp of the
+            request.
+        :param max_staleness: With per_field, drop values older than this before
+            the cutoff (e.g. '5d', '12h').
+        :param arrow: Return a pyarrow Table, pivoted without pandas.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
         """
         if interval == "snapshot":
-            raw_data = self.repository.fetch_snapshot(hawk_ids, field_ids, end_date)
-        else:
-            raw_data = self.repository.fetch_data(hawk_ids, field_ids, start_date, end_date, interval)
-        return self._pivot_data(raw_data)
+            start = self._latest_values_start(
+                end_date, per_field, max_staleness
+            )
+            if per_field:
+                raw_data = self.repository.fetch_latest_values(
+                    hawk_ids, field_ids, end_date, start
+                )
+            else:
+                raw_data = self.repository.fetch_snapshot(
+                    hawk_ids, field_ids, end_date
+                )
+            return self._pivot_data(raw_data, compact, float32, arrow)
 
-    def get_latest_snapshot(
+        # Date chunks must fall on bucket boundaries so no bucket is split.
+        start_date, end_date = align_range(start_date, end_date, interval)
+        fetch = (
+            self.repository.fetch_data_wide if server_pivot
+            else self.repository.fetch_data
+        )
+        raw_data = self._fetch_chunked(
+            partial(fetch, join_metadata=not local_metadata),
+            hawk_ids, field_ids, start_date, end_date, interval, aggregations,
+            hawk_id_chunk_size, date_chunk_days, max_workers
+        )
+        return self._reshape(
+            raw_data, field_ids, server_pivot, local_metadata, compact,
+            float32, arrow
+        )
+
+    async def get_data_async(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        hawk_id_chunk_size: Optional[int] = DEFAULT_HAWK_ID_CHUNK_SIZE,
+        date_chunk_days: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        server_pivot: bool = False,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """Async variant of get_data that never blocks the event loop.
+
+        Chunk queries are submitted as BigQuery jobs and awaited by polling;
+        downloads and reshaping run in worker threads. The result is the same
+        frame get_data returns.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+            Ignored for snapshot.
+        :param end_date: The end date (YYYY-MM-DD) or timestamp
+            (YYYY-MM-DD HH:MM:SS) for snapshot.
+        :param interval: The interval for the data query, 'raw' or 'snapshot'.
+        :param hawk_id_chunk_size: Max hawk_ids per query. Ignored for snapshot.
+        :param date_chunk_days: Max days per query, or None for no date split.
+            Ignored for snapshot.
+        :param max_workers: Max chunk jobs running at the same time.
+        :param server_pivot: Pivot in BigQuery instead of client-side. Ignored
+            for snapshot.
+        :param aggregations: Aggregation per field_id when bucketing; defaults
+            to 'last'.
+        :param local_metadata: Skip the ticker/field_name joins in the query and
+            attach them from the metadata cache. Ignored for snapshot.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :param per_field: For snapshot, take each (hawk_id, field)'s own latest
+            record instead of only the records at the latest timestamp of the
+            request.
+        :param max_staleness: With per_field, drop values older than this before
+            the cutoff (e.g. '5d', '12h').
+        :param arrow: Return a pyarrow Table, pivoted without pandas.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
+        """
+        if interval == "snapshot":
+            start = self._latest_values_start(
+                end_date, per_field, max_staleness
+            )
+            if per_field:
+                job = await run_job(
+                    self.repository.submit_latest_values, hawk_ids, field_ids,
+                    end_date, start
+                )
+            else:
+                job = await run_job(
+                    self.repository.submit_snapshot, hawk_ids, field_ids,
+                    end_date
+                )
+            return await asyncio.to_thread(
+                self._pivot_data, job, compact, float32, arrow
+            )
+
+        start_date, end_date = align_range(start_date, end_date, interval)
+        submit = (
+            self.repository.submit_data_wide if server_pivot
+            else self.repository.submit_data
+        )
+        chunks = self._plan_chunks(
+            hawk_ids, start_date, end_date, hawk_id_chunk_size, date_chunk_days
+        )
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch_chunk(chunk: Tuple[List[int], str, str]) -> pa.Table:
+            hawk_id_chunk, window_start, window_end = chunk
+            async with semaphore:
+                job = await run_job(
+                    submit, hawk_id_chunk, field_ids, window_start, window_end,
+                    interval, aggregations, not local_metadata
+                )
+                return await asyncio.to_thread(to_arrow_table, job, False)
+
+        tables = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        return await asyncio.to_thread(
+            self._reshape, pa.concat_tables(tables), field_ids, server_pivot,
+            local_metadata, compact, float32, arrow
+        )
+
+    def iter_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        batch_rows: int = DEFAULT_STREAM_BATCH_ROWS,
+        date_chunk_days: Optional[int] = None,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """Streams universal data as a sequence of pivoted DataFrames.
+
+        Result pages are buffered until at least ``batch_rows`` long-format
+        records are held, then everything before the last buffered date is
+        pivoted and yielded. Chunk boundaries therefore always fall between
+        dates, so no (date, hawk_id) row is split across two chunks. Every
+        chunk has a column per requested field, left empty where the chunk
+        holds no values for it, so all chunks share one layout.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            'raw').
+        :param batch_rows: Long-format records to buffer before pivoting.
+        :param date_chunk_days: Max days per query, or None for a single query.
+        :param aggregations: Aggregation per field_id when bucketing; defaults
+            to 'last'.
+        :param local_metadata: Skip the ticker/field_name joins in the query and
+            attach them from the metadata cache.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :return: An iterator of wide-format DataFrames in date order.
+        """
+        if interval == "snapshot":
+            raise ValueError(
+                "iter_data does not support interval='snapshot'; use get_data."
+            )
+
+        start_date, end_date = align_range(start_date, end_date, interval)
+        field_names = list(self.get_field_names(field_ids).values())
+        pending: List[pa.RecordBatch] = []
+        pending_rows = 0
+        windows = split_date_range(start_date, end_date, date_chunk_days)
+        for window_start, window_end in windows:
+            raw_data = self.repository.fetch_data(
+                hawk_ids, field_ids, window_start, window_end, interval,
+                aggregations, join_metadata=not local_metadata
+            )
+            if isinstance(raw_data, pa.Table):
+                # Cached results are grouped by partition rather than date.
+                raw_data = raw_data.sort_by(
+                    [('date', 'ascending'), ('hawk_id', 'ascending')]
+                )
+
+            for batch in iter_arrow_batches(raw_data):
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                if pending_rows < batch_rows:
+                    continue
+
+                complete, rest = self._split_at_last_date(
+                    pa.Table.from_batches(pending)
+                )
+                if complete.num_rows:
+                    if local_metadata:
+                        complete = self._attach_metadata(complete)
+                    yield self._with_fields(
+                        self._pivot_data(complete, compact, float32),
+                        field_names
+                    )
+                    pending = rest.to_batches()
+                    pending_rows = rest.num_rows
+
+        if pending_rows:
+            rest = pa.Table.from_batches(pending)
+            if local_metadata:
+                rest = self._attach_metadata(rest)
+            yield self._with_fields(
+                self._pivot_data(rest, compact, float32), field_names
+            )
+
+    async def iter_data_async(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        batch_rows: int = DEFAULT_STREAM_BATCH_ROWS,
+        date_chunk_days: Optional[int] = None,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False
+    ) -> AsyncIterator[pd.DataFrame]:
+        """Async variant of iter_data; each chunk is built in a worker thread.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query (e.g., '1d', '1h',
+            'raw').
+        :param batch_rows: Long-format records to buffer before pivoting.
+        :param date_chunk_days: Max days per query, or None for a single query.
+        :param aggregations: Aggregation per field_id when bucketing; defaults
+            to 'last'.
+        :param local_metadata: Attach ticker/field_name from the metadata cache.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :return: An async iterator of wide-format DataFrames in date order.
+        """
+        chunks = self.iter_data(
+            hawk_ids, field_ids, start_date, end_date, interval,
+            batch_rows, date_chunk_days, aggregations, local_metadata, compact,
+            float32
+        )
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def head_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        n: int,
+        aggregations: Optional[Dict[int, str]] = None,
+        local_metadata: bool = False,
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Fetches only the first n rows get_data would return.
+
+        The query itself is limited to the records of the first n
+        (date, hawk_id) rows, so the rest of the range is never downloaded.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+            Ignored for snapshot.
+        :param end_date: The end date (YYYY-MM-DD) or timestamp
+            (YYYY-MM-DD HH:MM:SS) for snapshot.
+        :param interval: The interval for the data query, 'raw' or 'snapshot'.
+        :param n: Number of rows to return.
+        :param aggregations: Aggregation per field_id when bucketing; defaults
+            to 'last'.
+        :param local_metadata: Attach ticker/field_name from the metadata cache.
+        :param compact: Return the compact dtype layout.
+        :param float32: With compact, downcast float fields to float32.
+        :param per_field: For snapshot, take each (hawk_id, field)'s own
+            latest record, as in get_data.
+        :param max_staleness: With per_field, drop values older than this
+            before the cutoff (e.g. '5d', '12h').
+        :return: A pandas DataFrame holding the first n rows.
+        """
+        if interval == "snapshot":
+            # A snapshot has one row per hawk_id at most, so it is fetched
+            # whole.
+            return self.get_data(
+                hawk_ids, field_ids, start_date, end_date, interval,
+                compact=compact, float32=float32, per_field=per_field,
+                max_staleness=max_staleness
+            ).head(n)
+
+        start_date, end_date = align_range(start_date, end_date, interval)
+        raw_data = self.repository.fetch_data(
+            hawk_ids, field_ids, start_date, end_date, interval, aggregations,
+            join_metadata=not local_metadata, limit=n
+        )
+        return self._reshape(
+            raw_data, field_ids, False, local_metadata, compact, float32
+        )
+
+    def count_data(
         self,
         hawk_ids: List[int],
-        field_ids: List[int]
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None
+    ) -> int:
+        """Counts the rows get_data would return, without fetching them.
+
+        :param hawk_ids: A list of hawk_ids to count data for.
+        :param field_ids: A list of field_ids to count data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+            Ignored for snapshot.
+        :param end_date: The end date (YYYY-MM-DD) or timestamp
+            (YYYY-MM-DD HH:MM:SS) for snapshot.
+        :param interval: The interval for the data query, 'raw' or 'snapshot'.
+        :param aggregations: Aggregation per field_id when bucketing; defaults
+            to 'last'.
+        :param per_field: For snapshot, take each (hawk_id, field)'s own
+            latest record, as in get_data.
+        :param max_staleness: With per_field, drop values older than this
+            before the cutoff (e.g. '5d', '12h').
+        :return: The number of (date, hawk_id) rows.
+        """
+        if interval == "snapshot":
+            return len(self.get_data(
+                hawk_ids, field_ids, start_date, end_date, interval,
+                per_field=per_field, max_staleness=max_staleness
+            ))
+
+        start_date, end_date = align_range(start_date, end_date, interval)
+        rows = self.repository.fetch_row_count(
+            hawk_ids, field_ids, start_date, end_date, interval, aggregations
+        )
+        return to_arrow_table(rows)['row_count'][0].as_py()
+
+    def get_as_of_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        timestamps: List[str],
+        start_date: Optional[str] = None,
+        compact: bool = False,
+        float32: bool = False
     ) -> pd.DataFrame:
+        """Fetches the latest value per (hawk_id, field) at many cutoffs.
+
+        One query returns the last record of every (hawk_id, field_id) between
+        consecutive cutoffs; carrying those forward across the cutoffs gives
+        the value as of each one.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamps: The cutoff timestamps (YYYY-MM-DD HH:MM:SS); naive
+            ones are UTC.
+        :param start_date: Earliest record timestamp to consider, or None for
+            all history.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :return: A pandas DataFrame with one row per (cutoff, hawk_id), dated at
+            the cutoff.
+        """
+        cutoffs = self._as_of_cutoffs(timestamps)
+        raw_data = self.repository.fetch_as_of(
+            hawk_ids, field_ids, cutoffs.asi8.tolist(), start_date
+        )
+        return self._fill_as_of(raw_data, cutoffs, compact, float32)
+
+    async def get_as_of_data_async(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        timestamps: List[str],
+        start_date: Optional[str] = None,
+        compact: bool = False,
+        float32: bool = False
+    ) -> pd.DataFrame:
+        """Async variant of get_as_of_data.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param timestamps: The cutoff timestamps (YYYY-MM-DD HH:MM:SS); naive
+            ones are UTC.
+        :param start_date: Earliest record timestamp to consider, or None for
+            all history.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :return: A pandas DataFrame with one row per (cutoff, hawk_id), dated at
+            the cutoff.
+        """
+        cutoffs = self._as_of_cutoffs(timestamps)
+        job = await run_job(
+            self.repository.submit_as_of, hawk_ids, field_ids,
+            cutoffs.asi8.tolist(), start_date
+        )
+        return await asyncio.to_thread(
+            self._fill_as_of, job, cutoffs, compact, float32
+        )
+
+    def get_latest_snapshot(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """Fetches the most recent data available for the given hawk_ids and field_ids.
 
         :param hawk_ids: A list of hawk_ids to fetch data for.
         :param field_ids: A list of field_ids to fetch data for.
-        :return: A pandas DataFrame containing the normalized data.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :param per_field: Take each (hawk_id, field)'s own latest record instead
+            of only the records at the latest timestamp of the request.
+        :param max_staleness: With per_field, drop values older than this (e.g.
+            '5d', '12h').
+        :param arrow: Return a pyarrow Table, pivoted without pandas.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
+        """
+        start = self._latest_values_start(None, per_field, max_staleness)
+        if per_field:
+            raw_data = self.repository.fetch_latest_values(
+                hawk_ids, field_ids, None, start
+            )
+        else:
+            raw_data = self.repository.fetch_latest_snapshot(
+                hawk_ids, field_ids
+            )
+        return self._pivot_data(raw_data, compact, float32, arrow)
+
+    async def get_latest_snapshot_async(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        compact: bool = False,
+        float32: bool = False,
+        per_field: bool = False,
+        max_staleness: Optional[str] = None,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """Async variant of get_latest_snapshot.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :param per_field: Take each (hawk_id, field)'s own latest record instead
+            of only the records at the latest timestamp of the request.
+        :param max_staleness: With per_field, drop values older than this (e.g.
+            '5d', '12h').
+        :param arrow: Return a pyarrow Table, pivoted without pandas.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
+        """
+        start = self._latest_values_start(None, per_field, max_staleness)
+        if per_field:
+            job = await run_job(
+                self.repository.submit_latest_values, hawk_ids, field_ids, None,
+                start
+            )
+        else:
+            job = await run_job(
+                self.repository.submit_latest_snapshot, hawk_ids, field_ids
+            )
+        return await asyncio.to_thread(
+            self._pivot_data, job, compact, float32, arrow
+        )
+
+    def get_field_names(self, field_ids: List[int]) -> Dict[int, str]:
+        """Looks up the names of the given field_ids in the metadata cache.
+
+        :param field_ids: A list of field_ids to lookup.
+        :return: Field names keyed by field_id.
         """
-        raw_data = self.repository.fetch_latest_snapshot(hawk_ids, field_ids)
-        return self._pivot_data(raw_data)
+        fields = self._load_fields()
+        fields = fields[fields['field_id'].isin(field_ids)]
+        return dict(zip(fields['field_id'], fields['field_name']))
 
     def get_field_ids(self, field_names: List[str]) -> pd.DataFrame:
-        """Fetches field_ids for the given field names.
+        """Looks up field_ids for the given field names in the metadata cache.
 
         :param field_names: A list of field name strings to lookup.
         :return: A pandas DataFrame containing field_id and field_name.
         """
-        raw_data = self.repository.fetch_field_ids_by_name(field_names)
-        return self._normalize_data(raw_data)
+        fields = self._load_fields()
+        fields = fields[fields['field_name'].isin(field_names)]
+        return fields.reset_index(drop=True)
 
     def get_all_fields(self) -> pd.DataFrame:
-        """Fetches all available fields.
+        """Returns all available fields from the metadata cache.
 
         :return: A pandas DataFrame containing all field_id and field_name pairs.
         """
-        raw_data = self.repository.fetch_all_fields()
-        return self._normalize_data(raw_data)
+        return self._load_fields().copy()
+
+    async def get_field_ids_async(self, field_names: List[str]) -> pd.DataFrame:
+        """Async variant of get_field_ids.
+
+        :param field_names: A list of field name strings to lookup.
+        :return: A pandas DataFrame containing field_id and field_name.
+        """
+        fields = await self._load_fields_async()
+        fields = fields[fields['field_name'].isin(field_names)]
+        return fields.reset_index(drop=True)
+
+    async def get_all_fields_async(self) -> pd.DataFrame:
+        """Async variant of get_all_fields.
+
+        :return: A pandas DataFrame containing all field_id and field_name
+            pairs.
+        """
+        return (await self._load_fields_async()).copy()
+
+    def invalidate_metadata(self) -> None:
+        """Drops this environment's cached metadata so it reloads on next use.
+
+        :return: None
+        """
+        metadata_cache.invalidate(self.repository.environment)
+
+    def _metadata_key(self, table: str) -> Tuple[str, str, str]:
+        """Returns the metadata cache key of a table.
+
+        :param table: The metadata table, e.g. 'fields'.
+        :return: The key, scoped to this environment and backend.
+        """
+        repository = self.repository
+        return (repository.environment, table, repository.backend.name)
+
+    def _load_fields(self) -> pd.DataFrame:
+        """Returns the fields table, loading it into the cache on a miss.
+
+        :return: A pandas DataFrame of field_id and field_name, sorted by name.
+        """
+        return metadata_cache.get(
+            self._metadata_key('fields'),
+            lambda: self._normalize_data(self.repository.fetch_all_fields())
+        )
+
+    async def _load_fields_async(self) -> pd.DataFrame:
+        """Async variant of _load_fields.
+
+        :return: A pandas DataFrame of field_id and field_name, sorted by name.
+        """
+        async def load() -> pd.DataFrame:
+            job = await run_job(self.repository.submit_all_fields)
+            return await asyncio.to_thread(self._normalize_data, job)
+
+        return await metadata_cache.get_async(
+            self._metadata_key('fields'), load
+        )
+
+    def _load_tickers(self) -> pd.DataFrame:
+        """Returns the ticker mappings, loading them into the cache on a miss.
+
+        :return: A pandas DataFrame of ticker and hawk_id, sorted by ticker.
+        """
+        return metadata_cache.get(
+            self._metadata_key('tickers'),
+            lambda: self._normalize_data(self.repository.fetch_all_tickers())
+        )
+
+    @staticmethod
+    def _with_fields(
+        wide: pd.DataFrame, field_names: List[str]
+    ) -> pd.DataFrame:
+        """Adds empty columns for requested fields a chunk has no values for.
+
+        :param wide: A pivoted chunk, field columns sorted by name.
+        :param field_names: The names of every requested field.
+        :return: The chunk with a column per field, still sorted by name.
+        """
+        present = [c for c in wide.columns if c not in INDEX_COLUMNS]
+        if wide.empty or set(field_names) <= set(present):
+            return wide
+        index = [c for c in wide.columns if c in INDEX_COLUMNS]
+        return wide.reindex(columns=index + sorted({*present, *field_names}))
+
+    def _attach_metadata(self, table: pa.Table) -> pa.Table:
+        """Adds the ticker and field_name columns a join-free query left out.
+
+        Records of field_ids missing from the fields table are dropped, as the
+        query join would. A hawk_id with several tickers gets the first one
+        alphabetically. Columns that are already present are kept as they are.
+
+        :param table: Records with date, hawk_id and optionally field_id
+            columns.
+        :return: The records in the same column layout as the joined query.
+        """
+        columns = table.column_names
+        if 'field_id' in columns and 'field_name' not in columns:
+            fields = self._load_fields()
+            positions = pc.index_in(
+                table['field_id'],
+                value_set=pa.array(fields['field_id'], pa.int64())
+            )
+            table = table.filter(pc.is_valid(positions))
+            names = pa.array(fields['field_name'], pa.string())
+            table = table.add_column(
+                table.column_names.index('field_id') + 1, 'field_name',
+                names.take(positions.filter(pc.is_valid(positions)))
+            )
+
+        if 'ticker' not in table.column_names:
+            tickers = self._load_tickers().drop_duplicates('hawk_id')
+            positions = pc.index_in(
+                table['hawk_id'],
+                value_set=pa.array(tickers['hawk_id'], pa.int64())
+            )
+            values = pa.array(tickers['ticker'], pa.string())
+            table = table.add_column(
+                table.column_names.index('hawk_id') + 1, 'ticker',
+                values.take(positions)
+            )
+        return table
+
+    def _fetch_chunked(
+        self,
+        fetch: Callable[..., Iterator[dict]],
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]],
+        hawk_id_chunk_size: Optional[int],
+        date_chunk_days: Optional[int],
+        max_workers: int
+    ) -> Union[Iterator[dict], pa.Table]:
+        """Fetches raw data, splitting the request by hawk_id and date range.
+
+        Chunks are queried concurrently on a bounded thread pool and their
+        results concatenated. Chunks never share a (date, hawk_id), so
+        pivoting the result gives the same frame as a single query would.
+
+        :param fetch: The repository method to run per chunk.
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param field_ids: A list of field_ids to fetch data for.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param interval: The interval for the data query.
+        :param aggregations: Aggregation per field_id when bucketing.
+        :param hawk_id_chunk_size: Max hawk_ids per query.
+        :param date_chunk_days: Max days per query, or None for no date split.
+        :param max_workers: Max chunk queries running at the same time.
+        :return: Raw data rows, or a pyarrow Table when chunked.
+        """
+        chunks = self._plan_chunks(
+            hawk_ids, start_date, end_date, hawk_id_chunk_size, date_chunk_days
+        )
+        if len(chunks) == 1:
+            return fetch(
+                hawk_ids, field_ids, start_date, end_date, interval,
+                aggregations
+            )
+
+        def fetch_chunk(chunk: Tuple[List[int], str, str]) -> pa.Table:
+            hawk_id_chunk, window_start, window_end = chunk
+            return to_arrow_table(fetch(
+                hawk_id_chunk, field_ids, window_start, window_end, interval,
+                aggregations
+            ), preserve_order=False)
+
+        workers = min(max_workers, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each chunk runs in a copy of the caller's context so its query
+            # metrics are recorded against the tracked call.
+            futures = [
+                pool.submit(contextvars.copy_context().run, fetch_chunk, chunk)
+                for chunk in chunks
+            ]
+            tables = [future.result() for future in futures]
+        return pa.concat_tables(tables)
+
+    def _reshape(
+        self,
+        data: Union[Iterator[dict], pa.Table],
+        field_ids: List[int],
+        server_pivot: bool,
+        local_metadata: bool,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """Turns a range query result into the get_data output frame.
+
+        :param data: Long-format records, or wide rows when server_pivot is set.
+        :param field_ids: The requested field_ids.
+        :param server_pivot: Whether data holds server-side pivoted rows.
+        :param local_metadata: Whether ticker/field_name still need attaching.
+        :param compact: Return the compact dtype layout.
+        :param float32: With compact, downcast float fields to float32.
+        :param arrow: Return a pyarrow Table, pivoted without pandas.
+        :return: A pandas DataFrame or pyarrow Table in wide format with field
+            names as columns.
+        """
+        if local_metadata:
+            data = self._attach_metadata(
+                to_arrow_table(data, preserve_order=False)
+            )
+        if server_pivot:
+            field_names = self.get_field_names(field_ids)
+            if arrow:
+                table = to_arrow_table(data, preserve_order=False)
+                with record_phase('pivot'):
+                    wide = assemble_wide_arrow(table, field_names)
+                return self._compact_table(wide, float32) if compact else wide
+            df = to_dataframe(data, preserve_order=False)
+            with record_phase('pivot'):
+                wide = assemble_wide(df, field_names)
+            # The query coalesces int_value into a FLOAT64 column, so integer
+            # fields stay float here.
+            return self._compact(wide, float32) if compact else wide
+        return self._pivot_data(data, compact, float32, arrow)
+
+    @staticmethod
+    def _plan_chunks(
+        hawk_ids: List[int],
+        start_date: str,
+        end_date: str,
+        hawk_id_chunk_size: Optional[int],
+        date_chunk_days: Optional[int]
+    ) -> List[Tuple[List[int], str, str]]:
+        """Splits a request into (hawk_ids, window_start, window_end) chunks.
+
+        :param hawk_ids: A list of hawk_ids to fetch data for.
+        :param start_date: The start date for the data query.
+        :param end_date: The end date for the data query.
+        :param hawk_id_chunk_size: Max hawk_ids per query.
+        :param date_chunk_days: Max days per query, or None for no date split.
+        :return: The chunks, never empty.
+        """
+        return [
+            (hawk_id_chunk, window_start, window_end)
+            for hawk_id_chunk in chunk_list(hawk_ids, hawk_id_chunk_size)
+            for window_start, window_end in split_date_range(
+                start_date, end_date, date_chunk_days
+            )
+        ]
+
+    @staticmethod
+    def _split_at_last_date(table: pa.Table) -> Tuple[pa.Table, pa.Table]:
+        """Splits date-ordered records before the rows of their last date.
+
+        :param table: Long-format records sorted by date.
+        :return: The records before the last date, and those on it.
+        """
+        dates = table['date']
+        last_date_rows = pc.sum(pc.equal(dates, dates[-1])).as_py()
+        cut = table.num_rows - last_date_rows
+        return table.slice(0, cut), table.slice(cut)
+
+    @staticmethod
+    def _latest_values_start(
+        timestamp: Optional[str],
+        per_field: bool,
+        max_staleness: Optional[str]
+    ) -> Optional[str]:
+        """Returns the earliest record timestamp a per-field snapshot may use.
+
+        :param timestamp: The snapshot cutoff, or None for the current time.
+        :param per_field: Whether the snapshot is taken per (hawk_id, field).
+        :param max_staleness: The oldest a value may be, e.g. '5d' or '12h'.
+        :return: The lower bound (YYYY-MM-DD HH:MM:SS.ffffff, UTC), or None
+            without one.
+        """
+        if max_staleness is None:
+            return None
+        if not per_field:
+            raise ValueError("max_staleness requires per_field=True.")
+        if timestamp is None:
+            cutoff = pd.Timestamp.now(tz='UTC')
+        else:
+            cutoff = pd.Timestamp(timestamp)
+        if cutoff.tzinfo is not None:
+            cutoff = cutoff.tz_convert('UTC').tz_localize(None)
+        start = cutoff - duration_timedelta(max_staleness)
+        return start.strftime(TIMESTAMP_FORMAT)
+
+    @staticmethod
+    def _as_of_cutoffs(timestamps: List[str]) -> pd.DatetimeIndex:
+        """Parses as-of cutoffs into sorted, distinct UTC timestamps.
+
+        :param timestamps: The cutoff timestamps; naive ones are taken as UTC.
+        :return: A microsecond-unit UTC DatetimeIndex.
+        """
+        if not len(timestamps):
+            raise ValueError("At least one as-of timestamp is required.")
+        # ISO8601 lets dates and timestamps be mixed; inferring one format from
+        # the first element would reject the others.
+        cutoffs = pd.DatetimeIndex(
+            pd.to_datetime(list(timestamps), utc=True, format='ISO8601')
+        )
+        return cutoffs.as_unit('us').unique().sort_values()
+
+    @staticmethod
+    def _fill_as_of(
+        data: Iterator[dict],
+        cutoffs: pd.DatetimeIndex,
+        compact: bool = False,
+        float32: bool = False
+    ) -> pd.DataFrame:
+        """Turns the per-cutoff last records of an as-of query into a grid.
+
+        Records are dated at their cutoff and pivoted, then every field is
+        carried forward per hawk_id across the cutoffs, so each row holds the
+        latest value at or before its cutoff. A hawk_id only appears from the
+        first cutoff at which it has any value.
+
+        :param data: Rows with cutoff_index, hawk_id, ticker, field_name and
+            values.
+        :param cutoffs: The sorted cutoffs the query was built from.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :return: A pandas DataFrame in wide format, one row per (cutoff,
+            hawk_id).
+        """
+        df = to_dataframe(data, preserve_order=False)
+        if df.empty:
+            return df
+        df.insert(0, 'date', cutoffs.take(df.pop('cutoff_index').to_numpy()))
+
+        with record_phase('pivot'):
+            wide = pivot_records(df, integer_fields=compact)
+            wide = wide.set_index(['date', 'hawk_id'])
+            grid = pd.MultiIndex.from_product(
+                [cutoffs, wide.index.unique('hawk_id')],
+                names=['date', 'hawk_id']
+            )
+            wide = wide.reindex(grid).groupby(level='hawk_id').ffill()
+            has_value = wide.drop(columns='ticker').notna().any(axis=1)
+            wide = wide[has_value].reset_index()
+        return UniversalService._compact(wide, float32) if compact else wide
 
     @staticmethod
     def _normalize_data(data: Iterator[dict]) -> pd.DataFrame:
@@ -84,40 +983,73 @@ class UniversalService:
         :param data: An iterator over raw data rows.
         :return: A pandas DataFrame containing normalized data.
         """
-        return pd.DataFrame([dict(row) for row in data])
+        return to_dataframe(data)
 
     @staticmethod
-    def _pivot_data(data: Iterator[dict]) -> pd.DataFrame:
+    def _pivot_data(
+        data: Iterator[dict],
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """Converts raw long-format data into a wide-format DataFrame.
 
         Takes data with rows like (date, hawk_id, ticker, field_name, value)
         and pivots it so each field becomes a column.
 
         :param data: An iterator over raw data rows.
-        :return: A pandas DataFrame in wide format with field names as columns.
+        :param compact: Return categorical tickers, nullable integer fields and
+            a UTC datetime index on date.
+        :param float32: With compact, downcast float fields to float32.
+        :param arrow: Pivot into a pyarrow Table without going through pandas.
+        :return: A pandas DataFrame or pyarrow Table in wide format with field
+            names as columns.
         """
-        df = pd.DataFrame([dict(row) for row in data])
+        if arrow:
+            table = to_arrow_table(data, preserve_order=False)
+            with record_phase('pivot'):
+                wide = pivot_records_arrow(table, integer_fields=compact)
+            if compact:
+                wide = UniversalService._compact_table(wide, float32)
+            return wide
 
-        if df.empty:
-            return df
+        # pivot_records sorts its output, so the result order is irrelevant.
+        df = to_dataframe(data, preserve_order=False)
+        with record_phase('pivot'):
+            wide = pivot_records(df, integer_fields=compact)
+        return UniversalService._compact(wide, float32) if compact else wide
 
-        # Coalesce the value columns into a single 'value' column
-        # Prefer double_value, then int_value, then char_value
-        df['value'] = df['double_value'].combine_first(
-            df['int_value'].astype(float)
-        ).combine_first(
-            df['char_value']
-        )
+    @staticmethod
+    def _compact(wide: pd.DataFrame, float32: bool) -> pd.DataFrame:
+        """Converts a wide frame to the compact dtype layout.
+
+        Tickers and char fields become categoricals, since both repeat a
+        small set of values across rows, and date becomes the index.
+
+        :param wide: A frame in the pivot_records layout.
+        :param float32: Downcast float fields to float32.
+        :return: The compacted frame.
+        """
+        char_fields = [
+            column for column in wide.columns
+            if column not in ('date', 'hawk_id', 'ticker')
+            and pd.api.types.is_string_dtype(wide[column])
+        ]
+        return compact_frame(wide, ['ticker'] + char_fields, 'date', float32)
 
-        # Pivot the DataFrame so each field_name becomes a column
-        pivoted = df.pivot_table(
-            index=['date', 'hawk_id', 'ticker'],
-            columns='field_name',
-            values='value',
-            aggfunc='first'
-        ).reset_index()
+    @staticmethod
+    def _compact_table(wide: pa.Table, float32: bool) -> pa.Table:
+        """Converts a wide Table to the compact layout, as _compact does frames.
 
-        # Flatten column names
-        pivoted.columns.name = None
+        Tickers and char fields are dictionary-encoded; date stays a column.
 
-        return pivoted
+        :param wide: A Table in the pivot_records_arrow layout.
+        :param float32: Downcast float fields to float32.
+        :return: The compacted Table.
+        """
+        char_fields = [
+            field.name for field in wide.schema
+            if field.name not in ('date', 'hawk_id', 'ticker')
+            and pa.types.is_string(field.type)
+        ]
+        return compact_table(wide, ['ticker'] + char_fields, float32)
@@ -0,0 +1,182 @@
+"""
+@description: Asyncio datasource API for Universal Supplemental data access.
+@author: Rithwik Babu
+"""
+from typing import List, Optional
+
+from hawk_sdk.api.universal_supplemental.repository import (
+    UniversalSupplementalRepository
+)
+from hawk_sdk.api.universal_supplemental.service import (
+    UniversalSupplementalService
+)
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.common.data_object import DataObject
+from hawk_sdk.core.common.metrics import instrumented
+
+
+class AsyncUniversalSupplemental:
+    """Asyncio counterpart of UniversalSupplemental."""
+
+    def __init__(
+        self,
+        environment="production",
+        backend: Optional[QueryBackend] = None
+    ) -> None:
+        """Initializes the Universal Supplemental datasource.
+
+        :param environment: The environment to fetch data from.
+        :param backend: The engine to run queries on, e.g. a DuckDBBackend over
+            a local mirror. Defaults to BigQuery.
+        """
+        self.repository = UniversalSupplementalRepository(
+            environment=environment, backend=backend
+        )
+        self.service = UniversalSupplementalService(self.repository)
+
+    def close(self) -> None:
+        """Releases the BigQuery client or local database of this datasource.
+
+        :return: None
+        """
+        self.repository.close()
+
+    async def __aenter__(self) -> "AsyncUniversalSupplemental":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    @instrumented('universal_supplemental.get_data')
+    async def get_data(
+        self,
+        sources: List[str],
+        series_ids: List[str],
+        start_date: str,
+        end_date: str,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> DataObject:
+        """Fetch supplemental data for specific sources and series_ids.
+
+        :param sources: A list of data source identifiers (e.g.,
+            ['eia_petroleum']).
+        :param series_ids: A list of series codes (e.g., ['WCESTUS1',
+            'WCRFPUS2']).
+        :param start_date: The start date (YYYY-MM-DD).
+        :param end_date: The end date (YYYY-MM-DD).
+        :param compact: Return a smaller frame: source and series columns as
+            categoricals, and a UTC DatetimeIndex on record_timestamp instead of
+            a column.
+        :param float32: With compact, store value as float32 (about 7
+            significant digits).
+        :param arrow: Return the data as a pyarrow Table. to_arrow() and
+            to_polars() use it without copying and to_df() converts it on
+            demand. With compact, source and series columns are
+            dictionary-encoded and record_timestamp stays a column.
+        :return: A hawk DataObject containing the data.
+        """
+        return DataObject(
+            name="supplemental_data",
+            data=await self.service.get_data_async(
+                sources, series_ids, start_date, end_date, compact, float32,
+                arrow
+            )
+        )
+
+    @instrumented('universal_supplemental.get_data_by_source')
+    async def get_data_by_source(
+        self,
+        sources: List[str],
+        start_date: str,
+        end_date: str,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> DataObject:
+        """Fetch all supplemental data for given sources.
+
+        :param sources: A list of data source identifiers (e.g.,
+            ['eia_petroleum']).
+        :param start_date: The start date (YYYY-MM-DD).
+        :param end_date: The end date (YYYY-MM-DD).
+        :param compact: Return a smaller frame: source and series columns as
+            categoricals, and a UTC DatetimeIndex on record_timestamp instead of
+            a column.
+        :param float32: With compact, store value as float32 (about 7
+            significant digits).
+        :param arrow: Return the data as a pyarrow Table. to_arrow() and
+            to_polars() use it without copying and to_df() converts it on
+            demand. With compact, source and series columns are
+            dictionary-encoded and record_timestamp stays a column.
+        :return: A hawk DataObject containing the data.
+        """
+        return DataObject(
+            name="supplemental_data_by_source",
+            data=await self.service.get_data_by_source_async(
+                sources, start_date, end_date, compact, float32, arrow
+            )
+        )
+
+    @instrumented('universal_supplemental.get_latest_data')
+    async def get_latest_data(
+        self,
+        sources: List[str],
+        series_ids: List[str],
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> DataObject:
+        """Fetch the most recent data point for each series.
+
+        :param sources: A list of data source identifiers.
+        :param series_ids: A list of series codes.
+        :param compact: Return a smaller frame: source and series columns as
+            categoricals, and a UTC DatetimeIndex on record_timestamp instead of
+            a column.
+        :param float32: With compact, store value as float32 (about 7
+            significant digits).
+        :param arrow: Return the data as a pyarrow Table. to_arrow() and
+            to_polars() use it without copying and to_df() converts it on
+            demand. With compact, source and series columns are
+            dictionary-encoded and record_timestamp stays a column.
+        :return: A hawk DataObject containing the latest data for each series.
+        """
+        return DataObject(
+            name="supplemental_latest_data",
+            data=await self.service.get_latest_data_async(
+                sources, series_ids, compact, float32, arrow
+            )
+        )
+
+    @instrumented('universal_supplemental.get_all_series')
+    async def get_all_series(self, source: Optional[str] = None) -> DataObject:
+        """Get all available series metadata.
+
+        :param source: Optional source to filter series by (e.g.,
+            'eia_petroleum').
+        :return: A hawk DataObject containing series metadata.
+        """
+        return DataObject(
+            name="supplemental_series",
+            data=await self.service.get_all_series_async(source)
+        )
+
+    @instrumented('universal_supplemental.get_available_sources')
+    async def get_available_sources(self) -> DataObject:
+        """Get all available data sources.
+
+        :return: A hawk DataObject containing unique source identifiers.
+        """
+        return DataObject(
+            name="supplemental_sources",
+            data=await self.service.get_available_sources_async()
+        )
+
+    def invalidate_metadata(self) -> None:
+        """Drop cached series metadata so the next lookup reloads it.
+
+        :return: None
+        """
+        self.service.invalidate_metadata()
@@ -0,0 +1,94 @@
+"""
+@description: Deferred Universal Supplemental queries for lazy DataObjects.
+@author: Rithwik Babu
+"""
+from typing import List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from hawk_sdk.api.universal_supplemental.service import (
+    UniversalSupplementalService
+)
+from hawk_sdk.core.common.lazy import QueryPlan
+
+
+class SupplementalDataPlan(QueryPlan):
+    """A deferred UniversalSupplemental.get_data or get_data_by_source call.
+
+    head() adds a LIMIT to the query and count() runs a COUNT(*) instead.
+    The result has few columns, so selected columns are projected locally.
+    """
+
+    def __init__(
+        self,
+        service: UniversalSupplementalService,
+        sources: List[str],
+        series_ids: Optional[List[str]],
+        start_date: str,
+        end_date: str,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> None:
+        """Initializes the plan.
+
+        :param service: The service to run the queries with.
+        :param sources: A list of data source identifiers.
+        :param series_ids: A list of series codes, or None for every series of
+            the sources.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param compact: Return the compact dtype layout.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table from fetch.
+        """
+        super().__init__(
+            'universal_supplemental.get_data' if series_ids is not None
+            else 'universal_supplemental.get_data_by_source'
+        )
+        self.service = service
+        self.sources = sources
+        self.series_ids = series_ids
+        self.start_date = start_date
+        self.end_date = end_date
+        self.compact = compact
+        self.float32 = float32
+        self.arrow = arrow
+
+    def fetch(self) -> Union[pd.DataFrame, pa.Table]:
+        """Runs the full query.
+
+        :return: The result frame or Table, projected to the selected columns.
+        """
+        if self.series_ids is None:
+            df = self.service.get_data_by_source(
+                self.sources, self.start_date, self.end_date, self.compact,
+                self.float32, self.arrow
+            )
+        else:
+            df = self.service.get_data(
+                self.sources, self.series_ids, self.start_date, self.end_date,
+                self.compact, self.float32, self.arrow
+            )
+        return self.project(df)
+
+    def head(self, n: int) -> pd.DataFrame:
+        """Fetches the first n rows.
+
+        :param n: Number of rows to return.
+        :return: A pandas DataFrame.
+        """
+        return self.project(self.service.head_data(
+            self.sources, self.series_ids, self.start_date, self.end_date, n,
+            self.compact, self.float32
+        ))
+
+    def count(self) -> int:
+        """Counts the rows in BigQuery.
+
+        :return: The row count.
+        """
+        return self.service.count_data(
+            self.sources, self.series_ids, self.start_date, self.end_date
+        )
@@ -7,26 +7,42 @@ from typing import Iterator, List, Optional
 
 from google.cloud import bigquery
 
-from hawk_sdk.core.common.utils import get_bigquery_client
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.backend.default import default_backend
+from hawk_sdk.core.common.jobs import execute_job
 
 
 class UniversalSupplementalRepository:
     """Repository for accessing supplemental data via source and series_id."""
 
-    def __init__(self, environment: str) -> None:
-        """Initializes the repository with a BigQuery client.
+    def __init__(
+        self,
+        environment: str,
+        backend: Optional[QueryBackend] = None
+    ) -> None:
+        """Initializes the repository with a query backend.
 
         :param environment: The environment to fetch data from (e.g., 'production', 'development').
+        :param backend: The engine to run queries on; defaults to BigQuery, or
+            the local mirror named by HAWK_SDK_LOCAL_MIRROR.
         """
-        self.bq_client = get_bigquery_client()
+        self.backend = backend if backend is not None else default_backend()
         self.environment = environment
 
+    def close(self) -> None:
+        """Releases the backend's client or database.
+
+        :return: None
+        """
+        self.backend.close()
+
     def fetch_data(
         self,
         sources: List[str],
         series_ids: List[str],
         start_date: str,
-        end_date: str
+        end_date: str,
+        limit: Optional[int] = None
     ) -> Iterator[dict]:
         """Fetches supplemental data from BigQuery for the given sources and series_ids.
 
@@ -34,8 +50,38 @@ class UniversalSupplementalRepository:
         :param series_ids: A list of series codes within the source (e.g., 'WCESTUS1').
         :param start_date: The start date for the data query (YYYY-MM-DD).
         :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param limit: Only return the first ``limit`` rows, e.g. for a preview.
         :return: An iterator over raw data rows.
         """
+        try:
+            return execute_job(
+                self.submit_data, sources, series_ids, start_date, end_date,
+                limit
+            )
+        except Exception as e:
+            logging.error(f"Failed to fetch supplemental data: {e}")
+            raise
+
+    def submit_data(
+        self,
+        sources: List[str],
+        series_ids: List[str],
+        start_date: str,
+        end_date: str,
+        limit: Optional[int] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query for supplemental data of the given series_ids.
+
+        :param sources: A list of data source identifiers (e.g.,
+            'eia_petroleum', 'fred').
+        :param series_ids: A list of series codes within the source (e.g.,
+            'WCESTUS1').
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param limit: Only return the first ``limit`` rows, e.g. for a preview.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        limit_clause = "" if limit is None else f"\n        LIMIT {int(limit)}"
         query = f"""
         SELECT 
             sr.source,
@@ -54,7 +100,7 @@ class UniversalSupplementalRepository:
             AND sr.series_id IN UNNEST(@series_ids)
             AND sr.record_timestamp BETWEEN @start_date AND @end_date
         ORDER BY 
-            sr.source, sr.series_id, sr.record_timestamp;
+            sr.source, sr.series_id, sr.record_timestamp{limit_clause};
         """
 
         query_params = [
@@ -66,26 +112,48 @@ class UniversalSupplementalRepository:
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
-        try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
-        except Exception as e:
-            logging.error(f"Failed to fetch supplemental data: {e}")
-            raise
+        return self.backend.query(query, job_config)
 
     def fetch_data_by_source(
         self,
         sources: List[str],
         start_date: str,
-        end_date: str
+        end_date: str,
+        limit: Optional[int] = None
     ) -> Iterator[dict]:
         """Fetches all supplemental data for given sources from BigQuery.
 
         :param sources: A list of data source identifiers (e.g., 'eia_petroleum', 'fred').
         :param start_date: The start date for the data query (YYYY-MM-DD).
         :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param limit: Only return the first ``limit`` rows, e.g. for a preview.
         :return: An iterator over raw data rows.
         """
+        try:
+            return execute_job(
+                self.submit_data_by_source, sources, start_date, end_date, limit
+            )
+        except Exception as e:
+            logging.error(f"Failed to fetch supplemental data by source: {e}")
+            raise
+
+    def submit_data_by_source(
+        self,
+        sources: List[str],
+        start_date: str,
+        end_date: str,
+        limit: Optional[int] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query for all supplemental data of the given sources.
+
+        :param sources: A list of data source identifiers (e.g.,
+            'eia_petroleum', 'fred').
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param limit: Only return the first ``limit`` rows, e.g. for a preview.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        limit_clause = "" if limit is None else f"\n        LIMIT {int(limit)}"
         query = f"""
         SELECT 
             sr.source,
@@ -103,7 +171,7 @@ class UniversalSupplementalRepository:
             sr.source IN UNNEST(@sources)
             AND sr.record_timestamp BETWEEN @start_date AND @end_date
         ORDER BY 
-            sr.source, sr.series_id, sr.record_timestamp;
+            sr.source, sr.series_id, sr.record_timestamp{limit_clause};
         """
 
         query_params = [
@@ -114,13 +182,76 @@ class UniversalSupplementalRepository:
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
+        return self.backend.query(query, job_config)
+
+    def fetch_row_count(
+        self,
+        sources: List[str],
+        start_date: str,
+        end_date: str,
+        series_ids: Optional[List[str]] = None
+    ) -> Iterator[dict]:
+        """Counts the supplemental rows in a date range, without fetching them.
+
+        :param sources: A list of data source identifiers.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param series_ids: Series codes to count, or None for every series of
+            the sources.
+        :return: An iterator over a single row holding row_count.
+        """
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
+            return execute_job(
+                self.submit_row_count, sources, start_date, end_date,
+                series_ids
+            )
         except Exception as e:
-            logging.error(f"Failed to fetch supplemental data by source: {e}")
+            logging.error(f"Failed to count supplemental data: {e}")
             raise
 
+    def submit_row_count(
+        self,
+        sources: List[str],
+        start_date: str,
+        end_date: str,
+        series_ids: Optional[List[str]] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query counting the supplemental rows in a date range.
+
+        :param sources: A list of data source identifiers.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param series_ids: Series codes to count, or None for every series of
+            the sources.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        series_filter = ""
+        query_params = [
+            bigquery.ArrayQueryParameter("sources", "STRING", sources),
+            bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
+            bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
+        ]
+        if series_ids is not None:
+            series_filter = "AND series_id IN UNNEST(@series_ids)"
+            query_params.append(bigquery.ArrayQueryParameter(
+                "series_ids", "STRING", series_ids
+            ))
+
+        query = f"""
+        SELECT 
+            COUNT(*) AS row_count
+        FROM 
+            `wsb-hc-qasap-ae2e.{self.environment}.supplemental_records`
+        WHERE 
+            source IN UNNEST(@sources)
+            AND record_timestamp BETWEEN @start_date AND @end_date
+            {series_filter};
+        """
+
+        job_config = bigquery.QueryJobConfig(query_parameters=query_params)
+
+        return self.backend.query(query, job_config)
+
     def fetch_latest_data(
         self,
         sources: List[str],
@@ -132,6 +263,23 @@ class UniversalSupplementalRepository:
         :param series_ids: A list of series codes within the source.
         :return: An iterator over raw data rows.
         """
+        try:
+            return execute_job(self.submit_latest_data, sources, series_ids)
+        except Exception as e:
+            logging.error(f"Failed to fetch latest supplemental data: {e}")
+            raise
+
+    def submit_latest_data(
+        self,
+        sources: List[str],
+        series_ids: List[str]
+    ) -> bigquery.QueryJob:
+        """Submits the query for the latest supplemental data of each series.
+
+        :param sources: A list of data source identifiers.
+        :param series_ids: A list of series codes within the source.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
         query = f"""
         WITH latest_per_series AS (
             SELECT
@@ -174,12 +322,7 @@ class UniversalSupplementalRepository:
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_params)
 
-        try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
-        except Exception as e:
-            logging.error(f"Failed to fetch latest supplemental data: {e}")
-            raise
+        return self.backend.query(query, job_config)
 
     def fetch_all_series(self, source: Optional[str] = None) -> Iterator[dict]:
         """Fetches all available series metadata from BigQuery.
@@ -187,6 +330,20 @@ class UniversalSupplementalRepository:
         :param source: Optional source to filter series by.
         :return: An iterator over raw data rows containing series metadata.
         """
+        try:
+            return execute_job(self.submit_all_series, source)
+        except Exception as e:
+            logging.error(f"Failed to fetch series metadata: {e}")
+            raise
+
+    def submit_all_series(
+        self, source: Optional[str] = None
+    ) -> bigquery.QueryJob:
+        """Submits the query for all available series metadata.
+
+        :param source: Optional source to filter series by.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
         if source:
             query = f"""
             SELECT 
@@ -223,18 +380,24 @@ class UniversalSupplementalRepository:
             """
             job_config = None
 
-        try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            return query_job.result()
-        except Exception as e:
-            logging.error(f"Failed to fetch series metadata: {e}")
-            raise
+        return self.backend.query(query, job_config)
 
     def fetch_available_sources(self) -> Iterator[dict]:
         """Fetches all available data sources from BigQuery.
 
         :return: An iterator over raw data rows containing unique sources.
         """
+        try:
+            return execute_job(self.submit_available_sources)
+        except Exception as e:
+            logging.error(f"Failed to fetch available sources: {e}")
+            raise
+
+    def submit_available_sources(self) -> bigquery.QueryJob:
+        """Submits the query for all available data sources.
+
+        :return: The submitted QueryJob; call result() for the rows.
+        """
         query = f"""
         SELECT DISTINCT
             source
@@ -244,9 +407,4 @@ class UniversalSupplementalRepository:
             source
         """
 
-        try:
-            query_job = self.bq_client.query(query)
-            return query_job.result()
-        except Exception as e:
-            logging.error(f"Failed to fetch available sources: {e}")
-            raise
+        return self.backend.query(query)
@@ -2,11 +2,17 @@
 @description: Service layer for processing and normalizing Universal Supplemental data.
 @author: Rithwik Babu
 """
-from typing import List, Iterator, Optional
+import asyncio
+from typing import List, Iterator, Optional, Tuple, Union
 
 import pandas as pd
+import pyarrow as pa
 
 from hawk_sdk.api.universal_supplemental.repository import UniversalSupplementalRepository
+from hawk_sdk.core.cache.metadata_cache import metadata_cache
+from hawk_sdk.core.common.columnar import to_arrow_table, to_dataframe
+from hawk_sdk.core.common.compact import compact_frame, compact_table
+from hawk_sdk.core.common.jobs import run_job
 
 
 class UniversalSupplementalService:
@@ -24,71 +30,321 @@ class UniversalSupplementalService:
         sources: List[str],
         series_ids: List[str],
         start_date: str,
-        end_date: str
-    ) -> pd.DataFrame:
+        end_date: str,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """Fetches and normalizes supplemental data into a pandas DataFrame.
 
         :param sources: A list of data source identifiers.
         :param series_ids: A list of series codes within the source.
         :param start_date: The start date for the data query (YYYY-MM-DD).
         :param end_date: The end date for the data query (YYYY-MM-DD).
-        :return: A pandas DataFrame containing the normalized data.
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table instead of a DataFrame.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
         """
         raw_data = self.repository.fetch_data(sources, series_ids, start_date, end_date)
-        return self._normalize_data(raw_data)
+        return self._normalize_data(raw_data, compact, float32, arrow)
 
     def get_data_by_source(
         self,
         sources: List[str],
         start_date: str,
-        end_date: str
-    ) -> pd.DataFrame:
+        end_date: str,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """Fetches all data for given sources into a pandas DataFrame.
 
         :param sources: A list of data source identifiers.
         :param start_date: The start date for the data query (YYYY-MM-DD).
         :param end_date: The end date for the data query (YYYY-MM-DD).
-        :return: A pandas DataFrame containing the normalized data.
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table instead of a DataFrame.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
         """
         raw_data = self.repository.fetch_data_by_source(sources, start_date, end_date)
-        return self._normalize_data(raw_data)
+        return self._normalize_data(raw_data, compact, float32, arrow)
 
     def get_latest_data(
         self,
         sources: List[str],
-        series_ids: List[str]
-    ) -> pd.DataFrame:
+        series_ids: List[str],
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """Fetches the most recent data for each series.
 
         :param sources: A list of data source identifiers.
         :param series_ids: A list of series codes within the source.
-        :return: A pandas DataFrame containing the latest data for each series.
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table instead of a DataFrame.
+        :return: A pandas DataFrame or pyarrow Table containing the latest data
+            for each series.
         """
         raw_data = self.repository.fetch_latest_data(sources, series_ids)
-        return self._normalize_data(raw_data)
+        return self._normalize_data(raw_data, compact, float32, arrow)
+
+    def head_data(
+        self,
+        sources: List[str],
+        series_ids: Optional[List[str]],
+        start_date: str,
+        end_date: str,
+        n: int,
+        compact: bool = False,
+        float32: bool = False
+    ) -> pd.DataFrame:
+        """Fetches only the first n rows of get_data or get_data_by_source.
+
+        :param sources: A list of data source identifiers.
+        :param series_ids: A list of series codes, or None for every series of
+            the sources.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param n: Number of rows to return.
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :return: A pandas DataFrame holding the first n rows.
+        """
+        if series_ids is None:
+            raw_data = self.repository.fetch_data_by_source(
+                sources, start_date, end_date, n
+            )
+        else:
+            raw_data = self.repository.fetch_data(
+                sources, series_ids, start_date, end_date, n
+            )
+        return self._normalize_data(raw_data, compact, float32)
+
+    def count_data(
+        self,
+        sources: List[str],
+        series_ids: Optional[List[str]],
+        start_date: str,
+        end_date: str
+    ) -> int:
+        """Counts the rows of get_data or get_data_by_source without fetching.
+
+        :param sources: A list of data source identifiers.
+        :param series_ids: A list of series codes, or None for every series of
+            the sources.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :return: The number of rows.
+        """
+        rows = self.repository.fetch_row_count(
+            sources, start_date, end_date, series_ids
+        )
+        return to_arrow_table(rows)['row_count'][0].as_py()
+
+    async def get_data_async(
+        self,
+        sources: List[str],
+        series_ids: List[str],
+        start_date: str,
+        end_date: str,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """Async variant of get_data.
+
+        :param sources: A list of data source identifiers.
+        :param series_ids: A list of series codes within the source.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table instead of a DataFrame.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
+        """
+        job = await run_job(
+            self.repository.submit_data, sources, series_ids, start_date,
+            end_date
+        )
+        return await asyncio.to_thread(
+            self._normalize_data, job, compact, float32, arrow
+        )
+
+    async def get_data_by_source_async(
+        self,
+        sources: List[str],
+        start_date: str,
+        end_date: str,
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """Async variant of get_data_by_source.
+
+        :param sources: A list of data source identifiers.
+        :param start_date: The start date for the data query (YYYY-MM-DD).
+        :param end_date: The end date for the data query (YYYY-MM-DD).
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table instead of a DataFrame.
+        :return: A pandas DataFrame or pyarrow Table containing the normalized
+            data.
+        """
+        job = await run_job(
+            self.repository.submit_data_by_source, sources, start_date, end_date
+        )
+        return await asyncio.to_thread(
+            self._normalize_data, job, compact, float32, arrow
+        )
+
+    async def get_latest_data_async(
+        self,
+        sources: List[str],
+        series_ids: List[str],
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """Async variant of get_latest_data.
+
+        :param sources: A list of data source identifiers.
+        :param series_ids: A list of series codes within the source.
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table instead of a DataFrame.
+        :return: A pandas DataFrame or pyarrow Table containing the latest data
+            for each series.
+        """
+        job = await run_job(
+            self.repository.submit_latest_data, sources, series_ids
+        )
+        return await asyncio.to_thread(
+            self._normalize_data, job, compact, float32, arrow
+        )
 
     def get_all_series(self, source: Optional[str] = None) -> pd.DataFrame:
-        """Fetches all available series metadata.
+        """Returns series metadata from the metadata cache.
 
         :param source: Optional source to filter series by.
         :return: A pandas DataFrame containing series metadata.
         """
-        raw_data = self.repository.fetch_all_series(source)
-        return self._normalize_data(raw_data)
+        series = self._load_series()
+        if source:
+            return series[series['source'] == source].reset_index(drop=True)
+        return series.copy()
 
     def get_available_sources(self) -> pd.DataFrame:
-        """Fetches all available data sources.
+        """Returns all available data sources from the metadata cache.
+
+        :return: A pandas DataFrame containing unique source identifiers.
+        """
+        sources = self._load_series()['source'].drop_duplicates()
+        return sources.to_frame().reset_index(drop=True)
+
+    async def get_all_series_async(
+        self, source: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Async variant of get_all_series.
+
+        :param source: Optional source to filter series by.
+        :return: A pandas DataFrame containing series metadata.
+        """
+        series = await self._load_series_async()
+        if source:
+            return series[series['source'] == source].reset_index(drop=True)
+        return series.copy()
+
+    async def get_available_sources_async(self) -> pd.DataFrame:
+        """Async variant of get_available_sources.
 
         :return: A pandas DataFrame containing unique source identifiers.
         """
-        raw_data = self.repository.fetch_available_sources()
-        return self._normalize_data(raw_data)
+        sources = (await self._load_series_async())['source'].drop_duplicates()
+        return sources.to_frame().reset_index(drop=True)
+
+    def invalidate_metadata(self) -> None:
+        """Drops this environment's cached metadata so it reloads on next use.
+
+        :return: None
+        """
+        metadata_cache.invalidate(self.repository.environment)
+
+    def _metadata_key(self, table: str) -> Tuple[str, str, str]:
+        """Returns the metadata cache key of a table.
+
+        :param table: The metadata table, e.g. 'supplemental_series'.
+        :return: The key, scoped to this environment and backend.
+        """
+        repository = self.repository
+        return (repository.environment, table, repository.backend.name)
+
+    def _load_series(self) -> pd.DataFrame:
+        """Returns all series metadata, loading it into the cache on a miss.
+
+        :return: A pandas DataFrame of series metadata, sorted by source and
+            series_id.
+        """
+        return metadata_cache.get(
+            self._metadata_key('supplemental_series'),
+            lambda: self._normalize_data(self.repository.fetch_all_series())
+        )
+
+    async def _load_series_async(self) -> pd.DataFrame:
+        """Async variant of _load_series.
+
+        :return: A pandas DataFrame of series metadata, sorted by source and
+            series_id.
+        """
+        async def load() -> pd.DataFrame:
+            job = await run_job(self.repository.submit_all_series)
+            return await asyncio.to_thread(self._normalize_data, job)
+
+        return await metadata_cache.get_async(
+            self._metadata_key('supplemental_series'), load
+        )
 
     @staticmethod
-    def _normalize_data(data: Iterator[dict]) -> pd.DataFrame:
+    def _normalize_data(
+        data: Iterator[dict],
+        compact: bool = False,
+        float32: bool = False,
+        arrow: bool = False
+    ) -> Union[pd.DataFrame, pa.Table]:
         """Converts raw data into a normalized pandas DataFrame.
 
         :param data: An iterator over raw data rows.
-        :return: A pandas DataFrame containing normalized data.
+        :param compact: Return categorical source/series columns and a UTC
+            datetime index on record_timestamp.
+        :param float32: With compact, downcast value to float32.
+        :param arrow: Return a pyarrow Table, with dictionary-encoded
+            source/series columns when compact, instead of a DataFrame.
+        :return: A pandas DataFrame or pyarrow Table containing normalized data.
         """
-        return pd.DataFrame([dict(row) for row in data])
+        if arrow:
+            table = to_arrow_table(data)
+            if compact:
+                table = compact_table(
+                    table, ['source', 'series_id', 'series_name'], float32
+                )
+            return table
+        df = to_dataframe(data)
+        if compact:
+            df = compact_frame(
+                df, ['source', 'series_id', 'series_name'], 'record_timestamp',
+                float32
+            )
+        return df
@@ -0,0 +1,39 @@
+"""
+@description: Query backend interface the repositories run their SQL through.
+@author: Rithwik Babu
+"""
+from typing import Any, Optional
+
+from google.cloud import bigquery
+
+
+class QueryBackend:
+    """Runs repository queries, written in BigQuery SQL, on a query engine.
+
+    query() returns a job object the way bigquery.Client.query does: its
+    result() gives the rows, either a RowIterator or a pyarrow Table, and
+    done(), error_result and the BigQuery job statistics are read when the
+    job is awaited or recorded in call metrics.
+    """
+
+    # Distinguishes metadata cached from different backends.
+    name = 'backend'
+
+    def query(
+        self,
+        query: str,
+        job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> Any:
+        """Starts a query.
+
+        :param query: BigQuery SQL with @named parameters.
+        :param job_config: Carries the query parameters, if any.
+        :return: A job whose result() holds the rows.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases the resources the backend holds.
+
+        :return: None
+        """
@@ -0,0 +1,48 @@
+"""
+@description: Query backend running repository SQL on BigQuery.
+@author: Rithwik Babu
+"""
+from typing import Optional
+
+from google.cloud import bigquery
+
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.common.utils import BigQueryClientLease
+
+
+class BigQueryBackend(QueryBackend):
+    """Runs queries as BigQuery jobs on the process-wide shared client."""
+
+    name = 'bigquery'
+
+    def __init__(self, pool_size: Optional[int] = None) -> None:
+        """Initializes the backend without acquiring a client yet.
+
+        :param pool_size: Max pooled HTTP connections for the client.
+        """
+        self.client_lease = BigQueryClientLease(pool_size)
+
+    @property
+    def client(self) -> bigquery.Client:
+        """The shared BigQuery client for this process."""
+        return self.client_lease.client
+
+    def query(
+        self,
+        query: str,
+        job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> bigquery.QueryJob:
+        """Submits a query job.
+
+        :param query: BigQuery SQL with @named parameters.
+        :param job_config: Carries the query parameters, if any.
+        :return: The submitted QueryJob; call result() for the rows.
+        """
+        return self.client.query(query, job_config=job_config)
+
+    def close(self) -> None:
+        """Releases the shared BigQuery client.
+
+        :return: None
+        """
+        self.client_lease.close()
@@ -0,0 +1,22 @@
+"""
+@description: Picks the query backend datasources use when none is given.
+@author: Rithwik Babu
+"""
+import os
+
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.backend.bigquery_backend import BigQueryBackend
+from hawk_sdk.core.backend.duckdb_backend import DuckDBBackend
+
+
+def default_backend() -> QueryBackend:
+    """Returns the backend for a datasource created without one.
+
+    Setting HAWK_SDK_LOCAL_MIRROR to a mirror directory runs every query on
+    DuckDB over that mirror, e.g. for offline CI; otherwise queries go to
+    BigQuery.
+
+    :return: A new QueryBackend.
+    """
+    root = os.environ.get('HAWK_SDK_LOCAL_MIRROR')
+    return DuckDBBackend(root) if root else BigQueryBackend()
@@ -0,0 +1,114 @@
+"""
+@description: Rewrites repository SQL from BigQuery's dialect to DuckDB's.
+@author: Rithwik Babu
+"""
+import re
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import pandas as pd
+from google.cloud import bigquery
+
+# `project.dataset.table` references, e.g.
+# `wsb-hc-qasap-ae2e.production.records`.
+_TABLE_REFERENCE = re.compile(r'`[\w-]+\.(\w+)\.(\w+)`')
+
+
+def table_references(query: str) -> Set[Tuple[str, str]]:
+    """Lists the tables a BigQuery query reads.
+
+    :param query: BigQuery SQL.
+    :return: A set of (dataset, table) pairs.
+    """
+    return set(_TABLE_REFERENCE.findall(query))
+
+
+def to_duckdb(query: str, table: Callable[[str, str], str]) -> str:
+    """Rewrites a repository query from BigQuery SQL to DuckDB SQL.
+
+    Only the constructs the repositories use are covered: table references,
+    bucketing, epoch and fingerprint functions, UNNEST of array parameters,
+    SELECT * EXCEPT and the BigQuery type names. @named parameters become $named
+    ones.
+
+    :param query: BigQuery SQL with @named parameters.
+    :param table: Maps a (dataset, table) pair to the DuckDB relation to read.
+    :return: Equivalent DuckDB SQL with $named parameters.
+    """
+    query = _TABLE_REFERENCE.sub(
+        lambda match: table(match.group(1), match.group(2)), query
+    )
+    query = re.sub(
+        r'TIMESTAMP_TRUNC\(([^,]+), (\w+)\)', r"date_trunc('\2', \1)", query
+    )
+    query = re.sub(
+        r'TIMESTAMP_SECONDS\(DIV\(UNIX_SECONDS\(([^)]+)\), (\d+)\) \* \d+\)',
+        r'to_timestamp((epoch(\1)::BIGINT // \2) * \2)', query
+    )
+    query = re.sub(r'UNIX_MICROS\(([^)]+)\)', r'epoch_us(\1)', query)
+    query = re.sub(
+        r'RANGE_BUCKET\(([^,]+), @(\w+)\)',
+        r'len(list_filter($\2, b -> b <= \1))', query
+    )
+    query = _rewrite_call(
+        query, 'FARM_FINGERPRINT',
+        # hash() is unsigned; shift it into the signed INT64 range BigQuery
+        # returns.
+        lambda arg: (
+            f'CAST(hash({arg})::HUGEINT - 9223372036854775808 AS BIGINT)'
+        )
+    )
+    query = re.sub(r'UNNEST\(@(\w+)\)', r'(SELECT UNNEST($\1))', query)
+    query = re.sub(r'@(\w+)', r'$\1', query)
+    query = query.replace('EXCEPT (', 'EXCLUDE (')
+    return query.replace('FLOAT64', 'DOUBLE').replace('INT64', 'BIGINT') \
+        .replace('AS STRING)', 'AS VARCHAR)')
+
+
+def _rewrite_call(
+    query: str,
+    function: str,
+    rewrite: Callable[[str], str]
+) -> str:
+    """Replaces every call of a function, even with parentheses in its argument.
+
+    :param query: SQL text.
+    :param function: The function name, e.g. 'FARM_FINGERPRINT'.
+    :param rewrite: Builds the replacement from the call's argument text.
+    :return: The rewritten SQL.
+    """
+    prefix = f'{function}('
+    start = query.find(prefix)
+    while start >= 0:
+        depth, end = 1, start + len(prefix)
+        while depth:
+            depth += {'(': 1, ')': -1}.get(query[end], 0)
+            end += 1
+        replacement = rewrite(query[start + len(prefix):end - 1])
+        query = query[:start] + replacement + query[end:]
+        start = query.find(prefix, start + len(replacement))
+    return query
+
+
+def duckdb_parameters(
+    job_config: Optional[bigquery.QueryJobConfig]
+) -> Dict[str, Any]:
+    """Extracts BigQuery query parameters as DuckDB values.
+
+    TIMESTAMP parameters become UTC timestamps, as BigQuery reads them; the
+    STRING dates compared against timestamp columns are cast by DuckDB.
+
+    :param job_config: The job config of the query, if any.
+    :return: Parameter values by name.
+    """
+    params = {}
+    for param in (job_config.query_parameters if job_config else []):
+        if isinstance(param, bigquery.ArrayQueryParameter):
+            params[param.name] = list(param.values)
+        elif param.type_ == 'TIMESTAMP' and param.value is not None:
+            timestamp = pd.Timestamp(param.value)
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.tz_localize('UTC')
+            params[param.name] = timestamp.to_pydatetime()
+        else:
+            params[param.name] = param.value
+    return params
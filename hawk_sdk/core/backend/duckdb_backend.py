@@ -0,0 +1,198 @@
+"""
+@description: Query backend running repository SQL on local Parquet mirrors.
+@author: Rithwik Babu
+"""
+import glob
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional, Set, Tuple
+
+import pyarrow as pa
+from google.cloud import bigquery
+
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.backend.dialect import (
+    duckdb_parameters,
+    table_references,
+    to_duckdb
+)
+
+
+class DuckDBQueryJob:
+    """A finished DuckDB query, exposing the parts of QueryJob the SDK reads."""
+
+    def __init__(
+        self,
+        table: pa.Table,
+        started: datetime,
+        ended: datetime
+    ) -> None:
+        """Initializes the job.
+
+        :param table: The query result.
+        :param started: When the query started.
+        :param ended: When the query finished.
+        """
+        self.table = table
+        self.job_id = f'duckdb-{uuid.uuid4().hex}'
+        self.created = self.started = started
+        self.ended = ended
+        self.error_result = None
+
+    def done(self, *args: Any, **kwargs: Any) -> bool:
+        return True
+
+    def result(self, *args: Any, **kwargs: Any) -> pa.Table:
+        return self.table
+
+    def to_arrow(self, *args: Any, **kwargs: Any) -> pa.Table:
+        return self.table
+
+
+class DuckDBBackend(QueryBackend):
+    """Runs repository queries in an embedded DuckDB over Parquet files.
+
+    The mirror directory holds one folder of Parquet files per environment
+    and table, e.g. ``<root>/production/records/*.parquet``, with the same
+    columns as the BigQuery tables (records, fields, hawk_identifiers,
+    supplemental_records and supplemental_series). Each table is exposed as
+    a view over its files, so files added to the mirror are picked up by the
+    next query. Queries run synchronously and return pyarrow Tables, with
+    no job round trips.
+    """
+
+    def __init__(self, root: str, threads: Optional[int] = None) -> None:
+        """Initializes the backend without opening the database yet.
+
+        :param root: The mirror directory.
+        :param threads: Max DuckDB worker threads, or None for DuckDB's default.
+        """
+        self.root = os.path.abspath(root)
+        self.name = f'duckdb:{self.root}'
+        self.threads = threads
+        self._connection = None
+        self._views: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def query(
+        self,
+        query: str,
+        job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> DuckDBQueryJob:
+        """Runs a query to completion.
+
+        :param query: BigQuery SQL with @named parameters.
+        :param job_config: Carries the query parameters, if any.
+        :return: A finished DuckDBQueryJob holding the result.
+        """
+        with self._lock:
+            connection = self._connect()
+            for dataset, table in table_references(query) - self._views:
+                self._create_view(connection, dataset, table)
+            # Each query gets its own cursor, so queries from several threads
+            # run side by side on the shared database.
+            cursor = connection.cursor()
+
+        started = datetime.now(timezone.utc)
+        try:
+            table = cursor.execute(
+                to_duckdb(query, self._view_name), duckdb_parameters(job_config)
+            ).fetch_arrow_table()
+        finally:
+            cursor.close()
+        ended = datetime.now(timezone.utc)
+        return DuckDBQueryJob(self._normalize(table), started, ended)
+
+    def close(self) -> None:
+        """Closes the database; the next query opens it again.
+
+        :return: None
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+            self._views.clear()
+
+    def table_path(self, dataset: str, table: str) -> str:
+        """Returns the mirror folder of a table.
+
+        :param dataset: The environment, e.g. 'production'.
+        :param table: The table name, e.g. 'records'.
+        :return: The folder holding the table's Parquet files.
+        """
+        return os.path.join(self.root, dataset, table)
+
+    def _connect(self) -> Any:
+        """Opens the in-memory database on first use.
+
+        :return: The DuckDB connection.
+        """
+        if self._connection is None:
+            try:
+                import duckdb
+            except ImportError as e:
+                raise ImportError(
+                    "DuckDBBackend requires duckdb; install it with "
+                    "`pip install hawk-sdk[duckdb]`."
+                ) from e
+            connection = duckdb.connect()
+            connection.execute("SET TimeZone = 'UTC'")
+            if self.threads is not None:
+                connection.execute(f"SET threads = {int(self.threads)}")
+            self._connection = connection
+        return self._connection
+
+    def _create_view(self, connection: Any, dataset: str, table: str) -> None:
+        """Exposes a mirrored table as a view over its Parquet files.
+
+        :param connection: The DuckDB connection.
+        :param dataset: The environment the table belongs to.
+        :param table: The table name.
+        :return: None
+        """
+        folder = self.table_path(dataset, table)
+        pattern = os.path.join(folder, '**', '*.parquet')
+        if not glob.glob(pattern, recursive=True):
+            raise FileNotFoundError(
+                f"No Parquet files for {dataset}.{table} under {folder}."
+            )
+        source = pattern.replace("'", "''")
+        connection.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset}"')
+        connection.execute(
+            f"""CREATE OR REPLACE VIEW {self._view_name(dataset, table)} AS """
+            f"SELECT * FROM read_parquet('{source}', "
+            "hive_partitioning = false, union_by_name = true)"
+        )
+        self._views.add((dataset, table))
+
+    @staticmethod
+    def _view_name(dataset: str, table: str) -> str:
+        """Returns the view a BigQuery table reference reads from.
+
+        :param dataset: The environment the table belongs to.
+        :param table: The table name.
+        :return: The quoted view name.
+        """
+        return f'"{dataset}"."{table}"'
+
+    @staticmethod
+    def _normalize(table: pa.Table) -> pa.Table:
+        """Gives a result the column types a BigQuery result would have.
+
+        :param table: A DuckDB result.
+        :return: The table with UTC microsecond timestamps and plain strings.
+        """
+        fields = []
+        for field in table.schema:
+            if pa.types.is_timestamp(field.type):
+                field = field.with_type(pa.timestamp('us', tz='UTC'))
+            elif (
+                pa.types.is_string_view(field.type)
+                or pa.types.is_large_string(field.type)
+            ):
+                field = field.with_type(pa.string())
+            fields.append(field)
+        return table.cast(pa.schema(fields))
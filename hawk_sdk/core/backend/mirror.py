@@ -0,0 +1,581 @@
+"""
+@description: Syncs a local Parquet mirror of the Hawk tables for DuckDBBackend.
+@author: Rithwik Babu
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from google.cloud import bigquery
+
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.backend.bigquery_backend import BigQueryBackend
+from hawk_sdk.core.cache.parquet_cache import (
+    Range,
+    iter_months,
+    subtract_ranges,
+    to_micros
+)
+from hawk_sdk.core.common.chunking import chunk_list
+from hawk_sdk.core.common.columnar import to_arrow_table
+from hawk_sdk.core.common.constants import DEFAULT_MAX_WORKERS
+
+# Small tables copied whole on every sync.
+METADATA_TABLES = ['fields', 'hawk_identifiers', 'supplemental_series']
+
+# Large tables split into month partitions, one file per value of a key
+# column, as (key column, BigQuery type of the key).
+PARTITIONED_TABLES = {
+    'records': ('field_id', 'INT64'),
+    'supplemental_records': ('source', 'STRING'),
+}
+
+MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    environment TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    partition_key TEXT NOT NULL,
+    month TEXT NOT NULL,
+    start_us INTEGER NOT NULL,
+    end_us INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (environment, table_name, partition_key, month)
+);
+"""
+
+# One query: a table, a month and a range inside it, and the keys to fetch.
+Unit = Tuple[str, str, int, int, List[Any]]
+
+
+class MirrorSync:
+    """Downloads the Hawk tables into a local mirror for DuckDBBackend.
+
+    Metadata tables are copied whole to ``<root>/<environment>/<table>/``.
+    records and supplemental_records are split by month and field_id or source,
+    e.g. ``<root>/production/records/month=2024-01/field_id=17.parquet``.
+    Partitions are downloaded in parallel, each by its own query.
+
+    A SQLite manifest under ``root`` records, per partition, the range of
+    record_timestamp already mirrored. A new sync only queries what lies
+    outside it, so an interrupted sync resumes where it stopped and running
+    the same sync again later fetches just the new records. Records from the
+    last ``lookback_days`` before a sync may still arrive late, so they are
+    fetched again by the next one.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        environment: str = "production",
+        backend: Optional[QueryBackend] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        keys_per_query: Optional[int] = None,
+        lookback_days: float = 3.0
+    ) -> None:
+        """Initializes the sync, creating the mirror directory and manifest.
+
+        :param root: The mirror directory.
+        :param environment: The environment to mirror.
+        :param backend: Where to download from. Defaults to BigQuery.
+        :param max_workers: Max partition queries running at the same time.
+        :param keys_per_query: Max fields or sources per query, or None for all
+            of them.
+        :param lookback_days: Days before a sync whose records are fetched again
+            next time.
+        """
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.environment = environment
+        self.backend = backend if backend is not None else BigQueryBackend()
+        self.max_workers = max_workers
+        self.keys_per_query = keys_per_query
+        self.lookback_days = lookback_days
+        self._file_locks: Dict[str, threading.Lock] = defaultdict(
+            threading.Lock
+        )
+        self._lock = threading.Lock()
+
+        os.makedirs(self.root, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(MANIFEST_SCHEMA)
+
+    def close(self) -> None:
+        """Releases the backend's client or database.
+
+        :return: None
+        """
+        self.backend.close()
+
+    def __enter__(self) -> "MirrorSync":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sync(
+        self,
+        start_date: str,
+        end_date: Optional[str] = None,
+        field_ids: Optional[List[int]] = None,
+        sources: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """Mirrors the metadata tables and the records of a date range.
+
+        :param start_date: The start date (YYYY-MM-DD) or timestamp of the
+            records to mirror.
+        :param end_date: The end date (YYYY-MM-DD) or timestamp, or None for
+            now.
+        :param field_ids: The fields of records to mirror. None mirrors every
+            field and an empty list skips records.
+        :param sources: The sources of supplemental_records to mirror. None
+            mirrors every source and an empty list skips supplemental_records.
+        :return: Rows downloaded, by table.
+        """
+        downloaded = self.sync_metadata()
+        if field_ids is None:
+            field_ids = self._all_keys('fields', 'field_id')
+        if sources is None:
+            sources = self._all_keys('supplemental_series', 'source')
+        downloaded['records'] = self.sync_table(
+            'records', field_ids, start_date, end_date
+        )
+        downloaded['supplemental_records'] = self.sync_table(
+            'supplemental_records', sources, start_date, end_date
+        )
+        return downloaded
+
+    def sync_metadata(self) -> Dict[str, int]:
+        """Replaces the mirrored metadata tables.
+
+        These are fields, hawk_identifiers and supplemental_series.
+
+        :return: Rows downloaded, by table.
+        """
+        downloaded = {}
+        for table_name in METADATA_TABLES:
+            source = f"`wsb-hc-qasap-ae2e.{self.environment}.{table_name}`"
+            table = to_arrow_table(
+                self.backend.query(f"SELECT * FROM {source}")
+            )
+            path = os.path.join(
+                self._table_dir(table_name), f'{table_name}.parquet'
+            )
+            _write_atomic(table, path)
+            downloaded[table_name] = table.num_rows
+        return downloaded
+
+    def sync_table(
+        self,
+        table_name: str,
+        keys: Sequence[Any],
+        start_date: str,
+        end_date: Optional[str] = None
+    ) -> int:
+        """Mirrors the records of some fields or sources over a date range.
+
+        Only the parts of the range not mirrored yet, or within the lookback of
+        the last sync, are downloaded.
+
+        :param table_name: 'records' or 'supplemental_records'.
+        :param keys: The field_ids (records) or sources (supplemental_records)
+            to mirror.
+        :param start_date: The start date (YYYY-MM-DD) or timestamp.
+        :param end_date: The end date (YYYY-MM-DD) or timestamp, or None for
+            now.
+        :return: Rows downloaded.
+        """
+        if table_name not in PARTITIONED_TABLES:
+            raise ValueError(
+                f"Unsupported table: {table_name}. "
+                f"Use one of: {', '.join(PARTITIONED_TABLES)}."
+            )
+        start_us = to_micros(start_date)
+        end_us = to_micros(end_date) if end_date else _now_micros()
+        if start_us > end_us:
+            raise ValueError("start_date must not be after end_date.")
+        if not keys:
+            return 0
+
+        units = self._plan(table_name, list(keys), start_us, end_us)
+        if not units:
+            logging.info(f"{self.environment}.{table_name} is up to date.")
+            return 0
+
+        logging.info(
+            f"Syncing {len(units)} partition queries of "
+            f"{self.environment}.{table_name}."
+        )
+        downloaded = 0
+        max_workers = min(self.max_workers, len(units))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(self._sync_unit, *unit) for unit in units]
+            for future in as_completed(futures):
+                downloaded += future.result()
+        return downloaded
+
+    def _plan(
+        self,
+        table_name: str,
+        keys: List[Any],
+        start_us: int,
+        end_us: int
+    ) -> List[Unit]:
+        """Lists the queries needed to mirror a range, skipping what is held.
+
+        Keys missing the same part of a month share one query.
+
+        :param table_name: The partitioned table.
+        :param keys: The field_ids or sources to mirror.
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :return: The query units, oldest month first.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT partition_key, month, start_us, end_us "
+                "FROM partitions WHERE environment = ? AND table_name = ?",
+                (self.environment, table_name)
+            )
+            synced = {
+                (partition_key, month): (synced_start, synced_end)
+                for partition_key, month, synced_start, synced_end in rows
+            }
+
+        gaps: Dict[Tuple[str, int, int], List[Any]] = defaultdict(list)
+        for month, month_start, month_end in iter_months(start_us, end_us):
+            wanted = (max(start_us, month_start), min(end_us, month_end))
+            for key in keys:
+                for gap in _missing(wanted, synced.get((str(key), month))):
+                    gaps[(month, *gap)].append(key)
+
+        return [
+            (table_name, month, gap_start, gap_end, chunk)
+            for (month, gap_start, gap_end), gap_keys in sorted(gaps.items())
+            for chunk in chunk_list(gap_keys, self.keys_per_query)
+        ]
+
+    def _sync_unit(
+        self,
+        table_name: str,
+        month: str,
+        start_us: int,
+        end_us: int,
+        keys: List[Any]
+    ) -> int:
+        """Downloads one range of a month and merges it into the key partitions.
+
+        :param table_name: The partitioned table.
+        :param month: The month (YYYY-MM) the range lies in.
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :param keys: The field_ids or sources to download.
+        :return: Rows downloaded.
+        """
+        key_column, key_type = PARTITIONED_TABLES[table_name]
+        query = f"""
+        SELECT *
+        FROM `wsb-hc-qasap-ae2e.{self.environment}.{table_name}`
+        WHERE {key_column} IN UNNEST(@partition_keys)
+          AND record_timestamp BETWEEN @start_date AND @end_date
+        """
+        job_config = bigquery.QueryJobConfig(query_parameters=[
+            bigquery.ArrayQueryParameter("partition_keys", key_type, keys),
+            bigquery.ScalarQueryParameter(
+                "start_date", "TIMESTAMP", _to_datetime(start_us)
+            ),
+            bigquery.ScalarQueryParameter(
+                "end_date", "TIMESTAMP", _to_datetime(end_us)
+            ),
+        ])
+        table = to_arrow_table(
+            self.backend.query(query, job_config), preserve_order=False
+        )
+        fetched_at = time.time()
+
+        groups = _group_by_key(table, key_column)
+        for key in keys:
+            indices = groups.get(key)
+            if indices is not None:
+                rows = table.take(indices)
+            else:
+                rows = table.schema.empty_table()
+            self._merge_partition(
+                table_name, key_column, key, month, start_us, end_us, rows
+            )
+            self._mark_synced(
+                table_name, key, month, start_us, end_us, fetched_at
+            )
+
+        logging.info(
+            f"Synced {table.num_rows} rows of {self.environment}.{table_name} "
+            f"for {month} ({len(keys)} {key_column} values)."
+        )
+        return table.num_rows
+
+    def _merge_partition(
+        self,
+        table_name: str,
+        key_column: str,
+        key: Any,
+        month: str,
+        start_us: int,
+        end_us: int,
+        rows: pa.Table
+    ) -> None:
+        """Replaces one range of a partition file with freshly downloaded rows.
+
+        :param table_name: The partitioned table.
+        :param key_column: The column the table is split by.
+        :param key: The partition's field_id or source.
+        :param month: The partition's month (YYYY-MM).
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :param rows: The rows downloaded for the range.
+        :return: None
+        """
+        path = os.path.join(
+            self._table_dir(table_name), f'month={month}',
+            f'{key_column}={quote(str(key), safe="")}.parquet'
+        )
+        with self._file_lock(path):
+            if os.path.exists(path):
+                existing = pq.read_table(path)
+                timestamps = existing['record_timestamp']
+                start = pa.scalar(start_us, timestamps.type)
+                end = pa.scalar(end_us, timestamps.type)
+                in_range = pc.and_(
+                    pc.greater_equal(timestamps, start),
+                    pc.less_equal(timestamps, end)
+                )
+                rows = pa.concat_tables(
+                    [existing.filter(pc.invert(in_range)), rows],
+                    promote_options='default'
+                )
+                if rows.num_rows == 0:
+                    os.remove(path)
+                    return
+            elif rows.num_rows == 0:
+                return
+            _write_atomic(rows.sort_by('record_timestamp'), path)
+
+    def _mark_synced(
+        self,
+        table_name: str,
+        key: Any,
+        month: str,
+        start_us: int,
+        end_us: int,
+        fetched_at: float
+    ) -> None:
+        """Extends a partition's mirrored range by a downloaded range.
+
+        The part of the range within the lookback of the download is left out,
+        so the next sync fetches it again.
+
+        :param table_name: The partitioned table.
+        :param key: The partition's field_id or source.
+        :param month: The partition's month (YYYY-MM).
+        :param start_us: Inclusive downloaded range start in microseconds.
+        :param end_us: Inclusive downloaded range end in microseconds.
+        :param fetched_at: When the range was downloaded, in seconds since the
+            epoch.
+        :return: None
+        """
+        settled_us = int((fetched_at - self.lookback_days * 86400) * 1_000_000)
+        settled_end = min(end_us, settled_us)
+        partition = (self.environment, table_name, str(key), month)
+
+        # BEGIN IMMEDIATE serializes the read and update against other writers.
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                synced = conn.execute(
+                    "SELECT start_us, end_us FROM partitions "
+                    "WHERE environment = ? AND table_name = ? "
+                    "AND partition_key = ? AND month = ?",
+                    partition
+                ).fetchone()
+                if synced is not None and synced[0] <= synced[1]:
+                    start_us = min(start_us, synced[0])
+                    settled_end = max(settled_end, synced[1])
+                conn.execute(
+                    "INSERT OR REPLACE INTO partitions "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*partition, start_us, settled_end, fetched_at)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _all_keys(self, table_name: str, column: str) -> List[Any]:
+        """Lists every value of a metadata column, e.g. all field_ids.
+
+        :param table_name: The metadata table.
+        :param column: The column to list.
+        :return: The distinct values, sorted.
+        """
+        source = f"`wsb-hc-qasap-ae2e.{self.environment}.{table_name}`"
+        table = to_arrow_table(
+            self.backend.query(f"SELECT DISTINCT {column} FROM {source}")
+        )
+        return sorted(table[column].to_pylist())
+
+    def _table_dir(self, table_name: str) -> str:
+        """Returns the mirror folder of a table, as DuckDBBackend reads it.
+
+        :param table_name: The table name.
+        :return: The folder path.
+        """
+        return os.path.join(self.root, self.environment, table_name)
+
+    @contextmanager
+    def _file_lock(self, path: str) -> Iterator[None]:
+        """Serializes rewrites of one partition file between worker threads.
+
+        :param path: The partition file.
+        :return: A context manager holding the file's lock.
+        """
+        with self._lock:
+            lock = self._file_locks[path]
+        with lock:
+            yield
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a manifest connection in autocommit mode.
+
+        :return: A context manager yielding a sqlite3 Connection.
+        """
+        conn = sqlite3.connect(
+            os.path.join(self.root, 'manifest.sqlite'),
+            timeout=60,
+            isolation_level=None
+        )
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def _missing(wanted: Range, synced: Optional[Range]) -> List[Range]:
+    """Finds the parts of a partition's range that have to be downloaded.
+
+    Gaps between the mirrored range and the wanted one are filled as well,
+    so each partition's mirrored range stays contiguous.
+
+    :param wanted: The inclusive range requested for the partition.
+    :param synced: The inclusive range already mirrored, if any.
+    :return: The ranges to download.
+    """
+    if synced is None or synced[0] > synced[1]:
+        return [wanted]
+    span = (min(wanted[0], synced[0]), max(wanted[1], synced[1]))
+    return subtract_ranges(span, [synced])
+
+
+def _group_by_key(table: pa.Table, column: str) -> Dict[Any, Any]:
+    """Groups row positions by the value of a column.
+
+    :param table: A downloaded range.
+    :param column: The key column.
+    :return: Row positions per key.
+    """
+    if table.num_rows == 0:
+        return {}
+    keys = pd.Series(table[column].to_numpy(zero_copy_only=False))
+    return dict(keys.groupby(keys).indices)
+
+
+def _write_atomic(table: pa.Table, path: str) -> None:
+    """Writes a Parquet file so readers never see a partial one.
+
+    :param table: The rows to write.
+    :param path: The destination file.
+    :return: None
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _to_datetime(micros: int) -> datetime:
+    """Converts microseconds since the epoch to a UTC datetime.
+
+    :param micros: Microseconds since the epoch.
+    :return: A timezone-aware datetime.
+    """
+    return pd.Timestamp(micros, unit='us', tz='UTC').to_pydatetime()
+
+
+def _now_micros() -> int:
+    """Returns the current time in microseconds since the epoch.
+
+    :return: Microseconds since the epoch.
+    """
+    return int(datetime.now(timezone.utc).timestamp() * 1_000_000)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs a sync from the command line.
+
+    Usage: python -m hawk_sdk.core.backend.mirror ROOT
+               --start-date YYYY-MM-DD [--end-date YYYY-MM-DD]
+               [--environment NAME ...] [--fields ID ...] [--sources NAME ...]
+               [--max-workers N] [--keys-per-query N] [--lookback-days N]
+
+    :param argv: Command-line arguments, or None for sys.argv.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(
+        description="Sync a local Parquet mirror of the Hawk tables."
+    )
+    parser.add_argument('root', help='The mirror directory')
+    parser.add_argument('--start-date', required=True)
+    parser.add_argument('--end-date', help='Defaults to now')
+    parser.add_argument(
+        '--environment', action='append', dest='environments',
+        help='Environment to mirror; repeat for several (default production)'
+    )
+    parser.add_argument(
+        '--fields', nargs='*', type=int,
+        help='field_ids to mirror (default all; pass no values to skip records)'
+    )
+    parser.add_argument(
+        '--sources', nargs='*',
+        help='Supplemental sources to mirror '
+             '(default all; pass no values to skip)'
+    )
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument('--keys-per-query', type=int, default=None)
+    parser.add_argument('--lookback-days', type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    for environment in args.environments or ['production']:
+        with MirrorSync(
+            args.root, environment, max_workers=args.max_workers,
+            keys_per_query=args.keys_per_query, lookback_days=args.lookback_days
+        ) as mirror:
+            downloaded = mirror.sync(
+                args.start_date, args.end_date, args.fields, args.sources
+            )
+        for table_name, rows in downloaded.items():
+            print(f"{environment}.{table_name}: {rows:,} rows downloaded")
+
+
+if __name__ == '__main__':
+    main()
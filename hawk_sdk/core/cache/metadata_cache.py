@@ -0,0 +1,132 @@
+"""
+@description: Process-wide in-memory cache for rarely changing metadata tables.
+@author: Rithwik Babu
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple, TypeVar
+
+from hawk_sdk.core.common.constants import (
+    DEFAULT_METADATA_MAX_ENTRIES,
+    DEFAULT_METADATA_TTL
+)
+
+T = TypeVar('T')
+
+
+class MetadataCache:
+    """LRU cache of metadata lookups with a time-to-live.
+
+    Entries are keyed by tuples whose first element is the environment, so
+    a whole environment can be invalidated at once. Loading happens outside
+    the lock; two threads missing the same key at the same time may both
+    load it, which is harmless for read-only metadata.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: int = DEFAULT_METADATA_MAX_ENTRIES
+    ) -> None:
+        """Initializes an empty cache.
+
+        :param ttl: Seconds an entry stays valid. Defaults to the
+            HAWK_SDK_METADATA_TTL environment variable or DEFAULT_METADATA_TTL.
+        :param max_entries: Max entries kept before the least recently used is
+            dropped.
+        """
+        if ttl is None:
+            ttl = float(os.environ.get(
+                'HAWK_SDK_METADATA_TTL', DEFAULT_METADATA_TTL
+            ))
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: (
+            "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]"
+        ) = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...], loader: Callable[[], T]) -> T:
+        """Returns the cached value for a key, loading it on a miss or expiry.
+
+        :param key: The entry key; its first element is the environment.
+        :param loader: Called without arguments to load the value.
+        :return: The cached or freshly loaded value.
+        """
+        found, value = self._lookup(key)
+        if not found:
+            value = loader()
+            self._store(key, value)
+        return value
+
+    async def get_async(
+        self,
+        key: Tuple[Hashable, ...],
+        loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Async variant of get for loaders that are coroutines.
+
+        :param key: The entry key; its first element is the environment.
+        :param loader: Called without arguments; its result is awaited to load
+            the value.
+        :return: The cached or freshly loaded value.
+        """
+        found, value = self._lookup(key)
+        if not found:
+            value = await loader()
+            self._store(key, value)
+        return value
+
+    def _lookup(self, key: Tuple[Hashable, ...]) -> Tuple[bool, Any]:
+        """Looks a key up, marking it recently used when it is still valid.
+
+        :param key: The entry key.
+        :return: Whether a valid entry was found, and its value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def _store(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Stores a freshly loaded value, evicting least recently used entries.
+
+        :param key: The entry key.
+        :param value: The loaded value.
+        :return: None
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, environment: Optional[str] = None) -> None:
+        """Drops cached entries so the next lookup reloads them.
+
+        :param environment: Only drop entries of this environment, or None for
+            all.
+        :return: None
+        """
+        with self._lock:
+            if environment is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == environment]:
+                del self._entries[key]
+
+
+metadata_cache = MetadataCache()
+
+
+def invalidate_metadata(environment: Optional[str] = None) -> None:
+    """Drops the process-wide metadata cache, e.g. after new fields are added.
+
+    :param environment: Only drop entries of this environment, or None for all.
+    :return: None
+    """
+    metadata_cache.invalidate(environment)
@@ -0,0 +1,691 @@
+"""
+@description: Local Parquet-backed cache for long-format Universal records.
+@author: Rithwik Babu
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+RECORD_SCHEMA = pa.schema([
+    ('date', pa.timestamp('us', tz='UTC')),
+    ('hawk_id', pa.int64()),
+    ('ticker', pa.string()),
+    ('field_id', pa.int64()),
+    ('field_name', pa.string()),
+    ('double_value', pa.float64()),
+    ('int_value', pa.int64()),
+    ('char_value', pa.string()),
+])
+
+# Inclusive (start, end) range in microseconds since the epoch, UTC.
+Range = Tuple[int, int]
+
+MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    environment TEXT NOT NULL,
+    field_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (environment, field_id, month)
+);
+CREATE TABLE IF NOT EXISTS hawk_sets (
+    id TEXT PRIMARY KEY,
+    hawk_ids TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    environment TEXT NOT NULL,
+    field_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    hawk_set TEXT NOT NULL,
+    start_us INTEGER NOT NULL,
+    end_us INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_by_field
+    ON coverage (environment, field_id, start_us, end_us);
+CREATE INDEX IF NOT EXISTS coverage_by_slice
+    ON coverage (environment, field_id, month, hawk_set);
+"""
+
+# A coverage entry is settled if it ended more than recent_days before it
+# was fetched. Parameterized by the recent window in microseconds.
+SETTLED = "end_us < CAST(fetched_at * 1000000 AS INTEGER) - ?"
+
+
+def to_micros(value: str) -> int:
+    """Converts a date or timestamp string to microseconds since the epoch.
+
+    Naive values are taken to be UTC, matching BigQuery.
+
+    :param value: A date (YYYY-MM-DD) or timestamp string.
+    :return: Microseconds since the epoch.
+    """
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return ts.value // 1000
+
+
+def from_micros(value: int) -> str:
+    """Converts microseconds since the epoch to a UTC timestamp string.
+
+    :param value: Microseconds since the epoch.
+    :return: A timestamp string (YYYY-MM-DD HH:MM:SS.ffffff).
+    """
+    return pd.Timestamp(value, unit='us').strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+class ParquetCache:
+    """On-disk cache of long-format Universal records.
+
+    Records are stored as one Parquet file per (environment, field_id,
+    month) partition under ``root``. A SQLite manifest next to them records
+    which (hawk_id, time range) slices each partition holds, the partition
+    sizes and their last access time.
+
+    Partitions are evicted least recently used first once the cache grows
+    past ``max_bytes``. Slices that end within ``recent_days`` of when they
+    were fetched may still change upstream, so they only count as cached for
+    ``recent_ttl`` seconds; expired ones are dropped from the manifest on
+    the next write. Settled slices of the same hawk_ids are merged into one
+    coverage entry per partition.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_bytes: Optional[int] = None,
+        recent_days: int = 3,
+        recent_ttl: float = 3600.0
+    ) -> None:
+        """Initializes the cache, creating its directory and manifest.
+
+        :param root: Directory holding the Parquet files and manifest.
+        :param max_bytes: Max total size of cached files, or None for no limit.
+        :param recent_days: Age in days below which data may still change.
+        :param recent_ttl: Seconds recent slices stay valid after a fetch.
+        """
+        self.root = os.path.expanduser(root)
+        self.max_bytes = max_bytes
+        self.recent_days = recent_days
+        self.recent_ttl = recent_ttl
+        self._hawk_sets: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.root, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(MANIFEST_SCHEMA)
+
+    def missing_ranges(
+        self,
+        environment: str,
+        field_id: int,
+        hawk_ids: Sequence[int],
+        start_us: int,
+        end_us: int,
+        bucket_us: Optional[int] = None
+    ) -> Dict[int, List[Range]]:
+        """Finds the parts of a request that the cache does not hold.
+
+        :param environment: The environment the records come from.
+        :param field_id: The field to check.
+        :param hawk_ids: The hawk_ids to check.
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :param bucket_us: Bucket length of aggregated records, or None for raw
+            ones. Coverage then only counts for the whole buckets it spans, so
+            the ranges returned for an aligned request are aligned too.
+        :return: Uncovered ranges per hawk_id; hawk_ids fully held are omitted.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT hawk_set, start_us, end_us FROM coverage "
+                "WHERE environment = ? AND field_id = ? "
+                "AND end_us >= ? AND start_us <= ? "
+                f"AND ({SETTLED} OR fetched_at >= ?)",
+                (environment, field_id, start_us, end_us,
+                 self._recent_span_us(), time.time() - self.recent_ttl)
+            ).fetchall()
+            ranges_by_set: Dict[str, List[Range]] = {}
+            for hawk_set, entry_start, entry_end in rows:
+                if bucket_us is not None:
+                    entry_start, entry_end = _whole_buckets(
+                        entry_start, entry_end, bucket_us
+                    )
+                    if entry_start > entry_end:
+                        continue
+                ranges_by_set.setdefault(hawk_set, []).append(
+                    (entry_start, entry_end)
+                )
+            members = {
+                set_id: self._load_hawk_set(conn, set_id)
+                for set_id in ranges_by_set
+            }
+
+        hawk_array = np.asarray(hawk_ids, dtype=np.int64)
+        if not ranges_by_set:
+            return {
+                int(hawk_id): [(start_us, end_us)] for hawk_id in hawk_array
+            }
+
+        # hawk_ids belonging to the same coverage sets share their gaps, so
+        # the ranges are subtracted once per distinct membership pattern.
+        set_ids = list(ranges_by_set)
+        membership = np.stack(
+            [np.isin(hawk_array, members[set_id]) for set_id in set_ids],
+            axis=1
+        )
+        patterns, inverse = np.unique(membership, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+        missing = {}
+        for j, pattern in enumerate(patterns):
+            covered = [
+                entry
+                for set_id, member in zip(set_ids, pattern) if member
+                for entry in ranges_by_set[set_id]
+            ]
+            gaps = subtract_ranges((start_us, end_us), covered)
+            if gaps:
+                for hawk_id in hawk_array[inverse == j]:
+                    missing[int(hawk_id)] = gaps
+        return missing
+
+    def covers(
+        self,
+        environment: str,
+        field_ids: Sequence[int],
+        hawk_ids: Sequence[int],
+        start_us: int,
+        end_us: int,
+        bucket_us: Optional[int] = None
+    ) -> bool:
+        """Checks whether every requested slice is held by the cache.
+
+        :param environment: The environment the records come from.
+        :param field_ids: The fields to check.
+        :param hawk_ids: The hawk_ids to check.
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :param bucket_us: Bucket length of aggregated records, or None for raw
+            ones; see missing_ranges.
+        :return: True if the whole request can be served from the cache.
+        """
+        return not any(
+            self.missing_ranges(
+                environment, field_id, hawk_ids, start_us, end_us, bucket_us
+            )
+            for field_id in field_ids
+        )
+
+    def read(
+        self,
+        environment: str,
+        field_ids: Sequence[int],
+        hawk_ids: Sequence[int],
+        start_us: int,
+        end_us: int
+    ) -> pa.Table:
+        """Reads cached records for the given fields, hawk_ids and range.
+
+        :param environment: The environment the records come from.
+        :param field_ids: The fields to read.
+        :param hawk_ids: The hawk_ids to read.
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :return: A pyarrow Table with RECORD_SCHEMA columns.
+        """
+        date_type = RECORD_SCHEMA.field('date').type
+        row_filter = (
+            pc.field('hawk_id').isin(list(hawk_ids))
+            & (pc.field('date') >= pa.scalar(start_us, type=date_type))
+            & (pc.field('date') <= pa.scalar(end_us, type=date_type))
+        )
+
+        tables = [RECORD_SCHEMA.empty_table()]
+        for field_id in field_ids:
+            for month, _, _ in iter_months(start_us, end_us):
+                path = self._partition_path(environment, field_id, month)
+                if os.path.exists(path):
+                    tables.append(pq.read_table(path, filters=row_filter))
+
+        self.touch(environment, field_ids, start_us, end_us)
+        return pa.concat_tables(tables)
+
+    def touch(
+        self,
+        environment: str,
+        field_ids: Sequence[int],
+        start_us: int,
+        end_us: int
+    ) -> None:
+        """Marks the partitions of a range as just used, for LRU eviction.
+
+        :param environment: The environment the records come from.
+        :param field_ids: The fields of the partitions.
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :return: None
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE partitions SET last_access = ? "
+                "WHERE environment = ? AND field_id = ? AND month = ?",
+                [
+                    (now, environment, field_id, month)
+                    for field_id in field_ids
+                    for month, _, _ in iter_months(start_us, end_us)
+                ]
+            )
+
+    def write(
+        self,
+        environment: str,
+        field_ids: Sequence[int],
+        hawk_ids: Sequence[int],
+        start_us: int,
+        end_us: int,
+        table: pa.Table,
+        bucket_us: Optional[int] = None
+    ) -> None:
+        """Stores freshly fetched records and marks their slice as covered.
+
+        ``table`` must hold every record for the given fields, hawk_ids and
+        range. Previously cached records inside that slice are replaced.
+
+        :param environment: The environment the records come from.
+        :param field_ids: The fields that were fetched.
+        :param hawk_ids: The hawk_ids that were fetched.
+        :param start_us: Inclusive range start in microseconds.
+        :param end_us: Inclusive range end in microseconds.
+        :param table: The fetched long-format records.
+        :param bucket_us: Bucket length of aggregated records, or None for raw
+            ones. The range must then start and end on bucket boundaries.
+        :return: None
+        """
+        table = as_records(table)
+        groups = _group_by_partition(table)
+        now = time.time()
+
+        # BEGIN IMMEDIATE takes SQLite's write lock, which also serializes
+        # partition file rewrites between processes sharing the cache.
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                hawk_set = self._store_hawk_set(conn, hawk_ids)
+                months = list(iter_months(start_us, end_us))
+                for field_id in field_ids:
+                    for month, month_start, month_end in months:
+                        slice_start = max(start_us, month_start)
+                        slice_end = min(end_us, month_end)
+                        indices = groups.get((field_id, month))
+                        rows = (
+                            table.take(indices) if indices is not None
+                            else RECORD_SCHEMA.empty_table()
+                        )
+                        size = self._merge_partition(
+                            environment, field_id, month, hawk_ids,
+                            slice_start, slice_end, rows
+                        )
+                        conn.execute(
+                            "INSERT OR REPLACE INTO partitions "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (environment, field_id, month, size, now)
+                        )
+                        self._cover(
+                            conn, (environment, field_id, month, hawk_set),
+                            slice_start, slice_end, now, bucket_us
+                        )
+                conn.execute(
+                    f"DELETE FROM coverage WHERE NOT ({SETTLED}) "
+                    "AND fetched_at < ?",
+                    (self._recent_span_us(), now - self.recent_ttl)
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        """Deletes every cached partition and coverage entry.
+
+        :return: None
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for environment, field_id, month in conn.execute(
+                "SELECT environment, field_id, month FROM partitions"
+            ).fetchall():
+                self._delete_partition(conn, environment, field_id, month)
+            conn.execute("DELETE FROM hawk_sets")
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a manifest connection in autocommit mode.
+
+        :return: A context manager yielding a sqlite3 Connection.
+        """
+        conn = sqlite3.connect(
+            os.path.join(self.root, 'manifest.sqlite'),
+            timeout=60,
+            isolation_level=None
+        )
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _partition_path(
+        self,
+        environment: str,
+        field_id: int,
+        month: str
+    ) -> str:
+        """Builds the Parquet file path of a partition.
+
+        :param environment: The environment the records come from.
+        :param field_id: The partition's field.
+        :param month: The partition's month (YYYY-MM).
+        :return: The absolute file path.
+        """
+        return os.path.join(
+            self.root, environment, f'field_id={field_id}', f'{month}.parquet'
+        )
+
+    def _merge_partition(
+        self,
+        environment: str,
+        field_id: int,
+        month: str,
+        hawk_ids: Sequence[int],
+        slice_start: int,
+        slice_end: int,
+        rows: pa.Table
+    ) -> int:
+        """Replaces one slice of a partition file with freshly fetched rows.
+
+        :param environment: The environment the records come from.
+        :param field_id: The partition's field.
+        :param month: The partition's month (YYYY-MM).
+        :param hawk_ids: The hawk_ids of the slice.
+        :param slice_start: Inclusive slice start in microseconds.
+        :param slice_end: Inclusive slice end in microseconds.
+        :param rows: The records fetched for the slice.
+        :return: The size of the partition file in bytes.
+        """
+        path = self._partition_path(environment, field_id, month)
+        if os.path.exists(path):
+            existing = pq.read_table(path)
+            date_type = RECORD_SCHEMA.field('date').type
+            dates = existing['date']
+            in_slice = pc.and_(
+                pc.is_in(
+                    existing['hawk_id'],
+                    pa.array(list(hawk_ids), pa.int64())
+                ),
+                pc.and_(
+                    pc.greater_equal(dates, pa.scalar(slice_start, date_type)),
+                    pc.less_equal(dates, pa.scalar(slice_end, date_type))
+                )
+            )
+            kept = existing.filter(pc.invert(in_slice))
+            rows = pa.concat_tables([kept, rows])
+        elif rows.num_rows == 0:
+            return 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        pq.write_table(rows, tmp_path)
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def _cover(
+        self,
+        conn: sqlite3.Connection,
+        key: Tuple[str, int, str, str],
+        start_us: int,
+        end_us: int,
+        now: float,
+        bucket_us: Optional[int] = None
+    ) -> None:
+        """Records a freshly written slice in the coverage table.
+
+        The settled part of the slice is merged with the settled entries it
+        overlaps or touches, so each partition keeps one entry per run of
+        covered time. The recent part gets its own entry, replacing recent
+        entries it contains. For aggregated records the two parts are split
+        on a bucket boundary, so a refetch of the recent part never starts
+        inside a bucket.
+
+        :param conn: A manifest connection inside a write transaction.
+        :param key: The (environment, field_id, month, hawk_set) of the slice.
+        :param start_us: Inclusive slice start in microseconds.
+        :param end_us: Inclusive slice end in microseconds.
+        :param now: The fetch time in seconds since the epoch.
+        :param bucket_us: Bucket length of aggregated records, or None.
+        :return: None
+        """
+        recent_span_us = self._recent_span_us()
+        recent_start = int(now * 1_000_000) - recent_span_us
+        if bucket_us is not None:
+            recent_start = recent_start // bucket_us * bucket_us
+        settled_end = min(end_us, recent_start - 1)
+        where = (
+            "environment = ? AND field_id = ? AND month = ? AND hawk_set = ?"
+        )
+
+        if start_us <= settled_end:
+            touching = conn.execute(
+                f"SELECT rowid, start_us, end_us FROM coverage WHERE {where} "
+                f"AND {SETTLED} AND start_us <= ? AND end_us >= ?",
+                (*key, recent_span_us, settled_end + 1, start_us - 1)
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM coverage WHERE rowid = ?",
+                [(rowid,) for rowid, _, _ in touching]
+            )
+            conn.execute(
+                "INSERT INTO coverage VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, min([start_us] + [s for _, s, _ in touching]),
+                 max([settled_end] + [e for _, _, e in touching]), now)
+            )
+
+        if settled_end < end_us:
+            recent_start = max(start_us, settled_end + 1)
+            conn.execute(
+                f"DELETE FROM coverage WHERE {where} "
+                "AND start_us >= ? AND end_us <= ?",
+                (*key, recent_start, end_us)
+            )
+            conn.execute(
+                "INSERT INTO coverage VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, recent_start, end_us, now)
+            )
+
+    def _recent_span_us(self) -> int:
+        """The length of the recent window in microseconds.
+
+        :return: recent_days in microseconds.
+        """
+        return int(self.recent_days * 86400 * 1_000_000)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Deletes least recently used partitions until under max_bytes.
+
+        :param conn: A manifest connection inside a write transaction.
+        :return: None
+        """
+        if self.max_bytes is None:
+            return
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM partitions"
+        ).fetchone()[0]
+        lru = conn.execute(
+            "SELECT environment, field_id, month, size FROM partitions "
+            "ORDER BY last_access"
+        ).fetchall()
+        for environment, field_id, month, size in lru:
+            if total <= self.max_bytes:
+                break
+            self._delete_partition(conn, environment, field_id, month)
+            total -= size
+
+    def _delete_partition(
+        self,
+        conn: sqlite3.Connection,
+        environment: str,
+        field_id: int,
+        month: str
+    ) -> None:
+        """Deletes a partition file along with its manifest entries.
+
+        :param conn: A manifest connection inside a write transaction.
+        :param environment: The environment the records come from.
+        :param field_id: The partition's field.
+        :param month: The partition's month (YYYY-MM).
+        :return: None
+        """
+        path = self._partition_path(environment, field_id, month)
+        if os.path.exists(path):
+            os.remove(path)
+        key = (environment, field_id, month)
+        for table in ('coverage', 'partitions'):
+            conn.execute(
+                f"DELETE FROM {table} "
+                "WHERE environment = ? AND field_id = ? AND month = ?", key
+            )
+
+    def _store_hawk_set(
+        self,
+        conn: sqlite3.Connection,
+        hawk_ids: Sequence[int]
+    ) -> str:
+        """Stores a hawk_id set once and returns its content-derived id.
+
+        :param conn: A manifest connection.
+        :param hawk_ids: The hawk_ids of the set.
+        :return: The id of the stored set.
+        """
+        encoded = json.dumps(sorted({int(hawk_id) for hawk_id in hawk_ids}))
+        set_id = hashlib.sha1(encoded.encode()).hexdigest()
+        conn.execute(
+            "INSERT OR IGNORE INTO hawk_sets VALUES (?, ?)", (set_id, encoded)
+        )
+        return set_id
+
+    def _load_hawk_set(
+        self, conn: sqlite3.Connection, set_id: str
+    ) -> np.ndarray:
+        """Loads a stored hawk_id set, memoized since sets never change.
+
+        :param conn: A manifest connection.
+        :param set_id: The id of the set.
+        :return: The sorted hawk_ids of the set.
+        """
+        hawk_set = self._hawk_sets.get(set_id)
+        if hawk_set is None:
+            encoded = conn.execute(
+                "SELECT hawk_ids FROM hawk_sets WHERE id = ?", (set_id,)
+            ).fetchone()[0]
+            hawk_set = np.array(json.loads(encoded), dtype=np.int64)
+            self._hawk_sets[set_id] = hawk_set
+        return hawk_set
+
+
+def _whole_buckets(start_us: int, end_us: int, bucket_us: int) -> Range:
+    """Shrinks an inclusive range to the whole buckets inside it.
+
+    Buckets are aligned to the epoch, like the query's bucket expression.
+
+    :param start_us: Inclusive range start in microseconds.
+    :param end_us: Inclusive range end in microseconds.
+    :param bucket_us: Bucket length in microseconds.
+    :return: The shrunk range; its start exceeds its end if no bucket fits.
+    """
+    start = -(-start_us // bucket_us) * bucket_us
+    end = (end_us + 1) // bucket_us * bucket_us - 1
+    return start, end
+
+
+def as_records(table: pa.Table) -> pa.Table:
+    """Selects and casts fetched records to the cached RECORD_SCHEMA layout.
+
+    :param table: Long-format records from a repository fetch.
+    :return: The records with RECORD_SCHEMA columns.
+    """
+    return table.select(RECORD_SCHEMA.names).cast(RECORD_SCHEMA)
+
+
+def iter_months(start_us: int, end_us: int) -> Iterator[Tuple[str, int, int]]:
+    """Yields the calendar months overlapping an inclusive range.
+
+    :param start_us: Inclusive range start in microseconds.
+    :param end_us: Inclusive range end in microseconds.
+    :return: An iterator of (YYYY-MM, month start, month end) tuples.
+    """
+    month = pd.Timestamp(start_us, unit='us').to_period('M')
+    last = pd.Timestamp(end_us, unit='us').to_period('M')
+    while month <= last:
+        month_start = month.start_time.value // 1000
+        month_end = (month + 1).start_time.value // 1000 - 1
+        yield str(month), month_start, month_end
+        month += 1
+
+
+def subtract_ranges(target: Range, covered: List[Range]) -> List[Range]:
+    """Removes covered ranges from an inclusive target range.
+
+    :param target: The (start, end) range to fill.
+    :param covered: Inclusive (start, end) ranges already held.
+    :return: The uncovered parts of the target, in order.
+    """
+    start, end = target
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in sorted(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - 1))
+        cursor = max(cursor, covered_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _group_by_partition(table: pa.Table) -> Dict[Tuple[int, str], np.ndarray]:
+    """Groups record row positions by (field_id, month) partition.
+
+    :param table: Records with RECORD_SCHEMA columns.
+    :return: Row positions per (field_id, YYYY-MM) key.
+    """
+    if table.num_rows == 0:
+        return {}
+    keys = pd.DataFrame({
+        'field_id': table['field_id'].to_numpy(),
+        'month': table['date'].to_numpy().astype('datetime64[M]').astype(str),
+    })
+    groups = keys.groupby(['field_id', 'month']).indices
+    return {
+        (int(field_id), month): indices
+        for (field_id, month), indices in groups.items()
+    }
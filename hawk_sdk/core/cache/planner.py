@@ -0,0 +1,51 @@
+"""
+@description: Planner turning cache coverage gaps into a minimal set of fetches.
+@author: Rithwik Babu
+"""
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, NamedTuple, Set, Tuple
+
+from hawk_sdk.core.cache.parquet_cache import Range
+
+
+class GapFetch(NamedTuple):
+    """One range query needed to fill the cache."""
+
+    hawk_ids: List[int]
+    field_ids: List[int]
+    start_us: int
+    end_us: int
+
+
+def plan_gap_fetches(
+    missing: Dict[int, Dict[int, List[Range]]]
+) -> List[GapFetch]:
+    """Groups missing (hawk_id, field_id, range) slices into range queries.
+
+    Slices sharing a range are batched together: fields missing the same
+    range for the same hawk_ids become one query, so nothing already cached
+    is fetched again. A typical refresh where every hawk_id lacks the same
+    recent tail therefore collapses into a single query.
+
+    :param missing: Uncovered ranges per field_id, then per hawk_id.
+    :return: The range queries to run, ordered by range.
+    """
+    hawk_ids_by_range: Dict[Tuple[Range, int], Set[int]] = defaultdict(set)
+    for field_id, ranges_by_hawk_id in missing.items():
+        for hawk_id, ranges in ranges_by_hawk_id.items():
+            for gap in ranges:
+                hawk_ids_by_range[(gap, field_id)].add(hawk_id)
+
+    field_ids_by_group: Dict[Tuple[Range, FrozenSet[int]], List[int]] = (
+        defaultdict(list)
+    )
+    for (gap, field_id), hawk_ids in hawk_ids_by_range.items():
+        field_ids_by_group[(gap, frozenset(hawk_ids))].append(field_id)
+
+    return [
+        GapFetch(sorted(hawk_ids), sorted(field_ids), gap[0], gap[1])
+        for (gap, hawk_ids), field_ids in sorted(
+            field_ids_by_group.items(),
+            key=lambda item: (item[0][0], min(item[0][1]))
+        )
+    ]
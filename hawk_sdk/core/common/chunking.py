@@ -0,0 +1,76 @@
+"""
+@description: Helpers for splitting large requests into smaller query chunks.
+@author: Rithwik Babu
+"""
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+import pandas as pd
+
+T = TypeVar('T')
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def utc_timestamp(value: str) -> pd.Timestamp:
+    """Parses a date or timestamp string as a naive UTC timestamp.
+
+    Values carrying an offset are converted to UTC; naive values are taken
+    to be UTC already, matching BigQuery.
+
+    :param value: A date (YYYY-MM-DD) or timestamp string.
+    :return: A timezone-naive pandas Timestamp in UTC.
+    """
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts
+
+
+def chunk_list(items: Sequence[T], size: Optional[int]) -> List[List[T]]:
+    """Splits a sequence into consecutive chunks of at most ``size`` items.
+
+    :param items: The items to split.
+    :param size: Max items per chunk. None or 0 keeps a single chunk.
+    :return: A list of chunks, never empty.
+    """
+    if not size or len(items) <= size:
+        return [list(items)]
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def split_date_range(
+    start_date: str,
+    end_date: str,
+    days: Optional[int]
+) -> List[Tuple[str, str]]:
+    """Splits an inclusive date range into non-overlapping windows.
+
+    Every window but the last ends one microsecond before the next one
+    starts, so a record on a boundary falls into exactly one window under
+    ``BETWEEN`` semantics. The first start and last end are passed through
+    unchanged; the boundaries between windows are UTC timestamps.
+
+    :param start_date: The start date (YYYY-MM-DD or a timestamp).
+    :param end_date: The end date (YYYY-MM-DD or a timestamp).
+    :param days: Window length in days. None or 0 keeps a single window.
+    :return: A list of (start, end) string pairs.
+    """
+    if not days:
+        return [(start_date, end_date)]
+
+    start = utc_timestamp(start_date)
+    end = utc_timestamp(end_date)
+    step = pd.Timedelta(days=days)
+    one_us = pd.Timedelta(microseconds=1)
+
+    windows = []
+    window_start, window_start_str = start, start_date
+    while window_start + step < end:
+        next_start = window_start + step
+        windows.append(
+            (window_start_str, (next_start - one_us).strftime(TIMESTAMP_FORMAT))
+        )
+        window_start = next_start
+        window_start_str = next_start.strftime(TIMESTAMP_FORMAT)
+    windows.append((window_start_str, end_date))
+    return windows
@@ -0,0 +1,170 @@
+"""
+@description: Sharing of in-flight queries between concurrent callers.
+@author: Rithwik Babu
+"""
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Set
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from hawk_sdk.core.common.constants import (
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_HAWK_ID_CHUNK_SIZE,
+)
+from hawk_sdk.core.common.metrics import record_coalesced
+
+
+class _Batch:
+    """One query and the callers waiting on it."""
+
+    def __init__(self, hawk_ids: Set[int], closed: bool) -> None:
+        """Initializes a batch opened by its first caller.
+
+        :param hawk_ids: The hawk_ids of the first caller.
+        :param closed: Whether the batch takes no further hawk_ids.
+        """
+        self.hawk_ids = hawk_ids
+        self.closed = closed
+        self.done = threading.Event()
+        self.full = threading.Event()
+        self.result: Optional[pa.Table] = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """Lets concurrent callers share queries instead of each running its own.
+
+    Queries are grouped under a key holding everything but their hawk_ids.
+    A caller whose query is already running for a superset of its hawk_ids
+    waits for that job and takes its rows. Queries that can be split by
+    hawk_id are also merged: a caller that finds another query with the same
+    key already running waits up to ``window`` seconds for others, then runs
+    one query for the union of their hawk_ids, and each caller receives only
+    its own rows. A caller with no such query in flight runs at once.
+
+    One coalescer can be shared by several datasources; their environment
+    and backend are part of the key.
+    """
+
+    def __init__(
+        self,
+        window: float = DEFAULT_COALESCE_WINDOW,
+        max_hawk_ids: int = DEFAULT_HAWK_ID_CHUNK_SIZE
+    ) -> None:
+        """Initializes the coalescer.
+
+        :param window: Max seconds a mergeable query waits for others before it
+            runs, when another query with its key is in flight.
+        :param max_hawk_ids: Max hawk_ids in a merged query.
+        """
+        self.window = window
+        self.max_hawk_ids = max_hawk_ids
+        self._batches: Dict[Hashable, List[_Batch]] = {}
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        key: Hashable,
+        hawk_ids: List[int],
+        fetch: Callable[[List[int]], pa.Table],
+        merge: bool = True
+    ) -> pa.Table:
+        """Runs a query, or joins a running or pending one that answers it.
+
+        :param key: Identifies the query apart from its hawk_ids.
+        :param hawk_ids: The hawk_ids the caller wants.
+        :param fetch: Runs the query for a list of hawk_ids and returns its
+            rows.
+        :param merge: Whether the query's rows for a hawk_id do not depend on
+            the other hawk_ids, so it may be merged with others and filtered
+            by hawk_id. When False only queries for exactly the same hawk_ids
+            are shared.
+        :return: The rows of the caller's hawk_ids, as a pyarrow Table.
+        """
+        wanted = set(hawk_ids)
+        with self._lock:
+            batch = self._find(key, wanted, merge)
+            leader = batch is None
+            if leader:
+                # Merging only pays off in a burst; a lone query runs at once.
+                wait = merge and self.window > 0 and key in self._batches
+                batch = _Batch(set(wanted), closed=not wait)
+                self._batches.setdefault(key, []).append(batch)
+            else:
+                batch.hawk_ids |= wanted
+                full = len(batch.hawk_ids) >= self.max_hawk_ids
+                if full and not batch.closed:
+                    batch.full.set()
+
+        if leader:
+            self._run(key, batch, fetch, wait)
+        else:
+            record_coalesced()
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        if wanted == batch.hawk_ids or batch.result.num_rows == 0:
+            return batch.result
+        value_set = pa.array(sorted(wanted), pa.int64())
+        return batch.result.filter(
+            pc.is_in(batch.result['hawk_id'], value_set=value_set)
+        )
+
+    def _find(
+        self,
+        key: Hashable,
+        wanted: Set[int],
+        merge: bool
+    ) -> Optional[_Batch]:
+        """Finds a batch a query can join. Must be called holding the lock.
+
+        :param key: Identifies the query apart from its hawk_ids.
+        :param wanted: The hawk_ids of the query.
+        :param merge: Whether the query may be merged with others.
+        :return: The batch to join, or None to start a new one.
+        """
+        for batch in self._batches.get(key, ()):
+            if not merge:
+                if batch.hawk_ids == wanted:
+                    return batch
+            elif batch.closed:
+                if wanted <= batch.hawk_ids:
+                    return batch
+            elif len(batch.hawk_ids | wanted) <= self.max_hawk_ids:
+                return batch
+        return None
+
+    def _run(
+        self,
+        key: Hashable,
+        batch: _Batch,
+        fetch: Callable[[List[int]], pa.Table],
+        wait: bool
+    ) -> None:
+        """Waits out the merge window if asked to, then runs the batch's query.
+
+        :param key: The key the batch is registered under.
+        :param batch: The batch this caller opened.
+        :param fetch: Runs the query for a list of hawk_ids.
+        :param wait: Whether to wait for other queries' hawk_ids first. The
+            wait ends early once the batch is full.
+        :return: None
+        """
+        try:
+            if wait:
+                batch.full.wait(self.window)
+            with self._lock:
+                batch.closed = True
+                hawk_ids = sorted(batch.hawk_ids)
+            batch.result = fetch(hawk_ids)
+        except BaseException as e:
+            batch.error = e
+        finally:
+            with self._lock:
+                batches = self._batches[key]
+                batches.remove(batch)
+                if not batches:
+                    del self._batches[key]
+            batch.done.set()
@@ -0,0 +1,127 @@
+"""
+@description: Columnar ingestion of BigQuery results into Arrow and pandas.
+@author: Rithwik Babu
+"""
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+import pandas as pd
+import pyarrow as pa
+
+from hawk_sdk.core.common.download import get_downloader
+from hawk_sdk.core.common.metrics import record_phase, record_rows
+
+
+def to_arrow_table(data: Any, preserve_order: bool = True) -> pa.Table:
+    """Converts a query result into a pyarrow Table without per-row dicts.
+
+    BigQuery results (a ``RowIterator`` or a finished ``QueryJob``) are
+    downloaded straight into Arrow record batches by the active downloader:
+    over REST for small results, over Storage Read API streams for large ones.
+    Tables are passed through untouched, and any other iterable of
+    mapping-like rows is transposed into columns.
+
+    :param data: A RowIterator, a finished QueryJob, a pyarrow Table or an
+        iterable of rows.
+    :param preserve_order: Keep the query's ORDER BY. Pass False when the rows
+        are re-sorted anyway, so large results can be read over parallel
+        streams.
+    :return: A pyarrow Table holding the result columns.
+    """
+    if hasattr(data, 'result'):
+        data = data.result()
+        if isinstance(data, pa.Table):
+            # Jobs of local backends hold their result as a Table already.
+            record_rows(data.num_rows)
+            return data
+
+    if isinstance(data, pa.Table):
+        return data
+
+    with record_phase('download'):
+        if hasattr(data, 'to_arrow'):
+            table = get_downloader().to_arrow(data, preserve_order)
+        else:
+            table = _rows_to_arrow(data)
+    record_rows(table.num_rows)
+    return table
+
+
+def to_dataframe(data: Any, preserve_order: bool = True) -> pd.DataFrame:
+    """Converts a query result into a pandas DataFrame via Arrow columns.
+
+    :param data: A RowIterator, a finished QueryJob, a pyarrow Table or an
+        iterable of rows.
+    :param preserve_order: Keep the query's ORDER BY; see to_arrow_table.
+    :return: A pandas DataFrame containing the result.
+    """
+    # Tables we build ourselves can be released column by column while
+    # pandas takes ownership, which keeps peak memory close to one copy.
+    owned = not isinstance(data, pa.Table)
+    table = to_arrow_table(data, preserve_order)
+    with record_phase('normalize'):
+        return table.to_pandas(split_blocks=owned, self_destruct=owned)
+
+
+def iter_arrow_batches(
+    data: Any,
+    rows_per_batch: int = 100_000
+) -> Iterator[pa.RecordBatch]:
+    """Streams a query result as Arrow record batches.
+
+    RowIterator results are streamed by the active downloader in query
+    order, so only the batches not yet consumed stay on the server side.
+
+    :param data: A RowIterator, a pyarrow Table or an iterable of rows.
+    :param rows_per_batch: Rows per batch when transposing plain rows.
+    :return: An iterator of pyarrow RecordBatches.
+    """
+    if isinstance(data, pa.Table):
+        yield from data.to_batches()
+    elif hasattr(data, 'to_arrow_iterable'):
+        yield from _timed_batches(iter(get_downloader().iter_batches(data)))
+    else:
+        rows = iter(data)
+        while True:
+            with record_phase('download'):
+                table = _rows_to_arrow(islice(rows, rows_per_batch))
+            if table.num_rows == 0:
+                return
+            record_rows(table.num_rows)
+            yield from table.to_batches()
+
+
+def _timed_batches(
+    batches: Iterator[pa.RecordBatch]
+) -> Iterator[pa.RecordBatch]:
+    """Passes record batches through, counting their download time and rows.
+
+    :param batches: An iterator of downloaded record batches.
+    :return: The same batches.
+    """
+    while True:
+        with record_phase('download'):
+            batch = next(batches, None)
+        if batch is None:
+            return
+        record_rows(batch.num_rows)
+        yield batch
+
+
+def _rows_to_arrow(rows: Iterable[Any]) -> pa.Table:
+    """Transposes an iterable of mapping-like rows into a pyarrow Table.
+
+    :param rows: An iterable of rows exposing ``keys()`` and ``values()``.
+    :return: A pyarrow Table with one column per row key.
+    """
+    names: List[str] = []
+    columns: Dict[str, List[Any]] = {}
+
+    for row in rows:
+        if not names:
+            names = list(row.keys())
+            columns = {name: [] for name in names}
+        for name, value in zip(names, row.values()):
+            columns[name].append(value)
+
+    return pa.table({name: columns[name] for name in names})
@@ -0,0 +1,69 @@
+"""
+@description: Memory-compact dtypes for output DataFrames and Tables.
+@author: Rithwik Babu
+"""
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    categorical_columns: List[str],
+    index_column: str,
+    float32: bool = False
+) -> pd.DataFrame:
+    """Shrinks a DataFrame's repeated strings and indexes it by time.
+
+    Identifier columns repeated on every row become categoricals, which store
+    each distinct value once, and the timestamp column becomes a
+    datetime64 index. With ``float32`` float64 columns are halved in size,
+    at the cost of precision beyond about 7 significant digits.
+
+    :param df: The frame to compact; it is modified in place where possible.
+    :param categorical_columns: Columns to convert to categoricals, if present.
+    :param index_column: The datetime column to index by.
+    :param float32: Downcast float64 columns to float32.
+    :return: The compacted frame.
+    """
+    for column in categorical_columns:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    if float32:
+        for column in df.columns[df.dtypes == np.float64]:
+            df[column] = df[column].astype(np.float32)
+
+    if index_column in df.columns:
+        df[index_column] = pd.to_datetime(df[index_column], utc=True)
+        df = df.set_index(index_column)
+    return df
+
+
+def compact_table(
+    table: pa.Table,
+    dictionary_columns: List[str],
+    float32: bool = False
+) -> pa.Table:
+    """Shrinks a pyarrow Table's repeated strings, like compact_frame.
+
+    Tables have no index, so the timestamp column stays a column.
+
+    :param table: The table to compact.
+    :param dictionary_columns: Columns to dictionary-encode, if present.
+    :param float32: Downcast float64 columns to float32.
+    :return: The compacted table.
+    """
+    for i, field in enumerate(table.schema):
+        column = table.column(i)
+        if field.name in dictionary_columns:
+            column = pc.dictionary_encode(column)
+        elif float32 and field.type == pa.float64():
+            column = column.cast(pa.float32())
+        else:
+            continue
+        table = table.set_column(i, field.name, column)
+    return table
@@ -1 +1,14 @@
 PROJECT_ID = 'wsb-hc-qasap-ae2e'
+DEFAULT_HTTP_POOL_SIZE = 10
+DEFAULT_HAWK_ID_CHUNK_SIZE = 5000
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_STREAM_BATCH_ROWS = 1_000_000
+DEFAULT_METADATA_TTL = 3600.0
+DEFAULT_METADATA_MAX_ENTRIES = 256
+DEFAULT_POLL_INTERVAL = 0.2
+DEFAULT_MAX_POLL_INTERVAL = 2.0
+DEFAULT_STORAGE_READ_MIN_ROWS = 200_000
+DEFAULT_STORAGE_READ_MAX_STREAMS = 8
+DEFAULT_CSV_CHUNK_ROWS = 100_000
+DEFAULT_IDENTIFIER_BUCKETS = 1024
+DEFAULT_COALESCE_WINDOW = 0.02
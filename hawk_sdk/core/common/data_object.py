@@ -2,28 +2,126 @@
 @description: Data Object class to handle output transformations.
 @author: Rithwik Babu
 """
+from typing import Any, List, Optional, Union
+
 import pandas as pd
+import pyarrow as pa
+
+from hawk_sdk.core.common.constants import DEFAULT_MAX_WORKERS
+from hawk_sdk.core.common.export import (
+    frame_to_table,
+    has_named_index,
+    write_arrow,
+    write_csv,
+    write_feather,
+    write_parquet
+)
+from hawk_sdk.core.common.metrics import CallMetrics
 
 
 class DataObject:
-    def __init__(self, name, data):
+    """The result of a datasource call, as a pandas DataFrame or pyarrow Table.
+
+    A Table is only converted to pandas when to_df() or a pandas-based
+    export asks for it, and the frame is then kept. to_arrow() and
+    to_polars() hand out a held Table without copying it.
+    """
+
+    def __init__(self, name, data, metrics: Optional[CallMetrics] = None):
         self.__name = name
         self.__data = data
+        self.__frame: Optional[pd.DataFrame] = None
+        # Timings and BigQuery job stats of the call that produced the data.
+        self.metrics = metrics
 
     def to_df(self) -> pd.DataFrame:
         """Exports data to a pandas DataFrame.
 
         :return: pd.Dataframe
         """
-        return self.__data
+        data = self._load()
+        if isinstance(data, pd.DataFrame):
+            return data
+        if self.__frame is None:
+            self.__frame = data.to_pandas()
+        return self.__frame
 
-    def to_csv(self, file_name):
-        """Exports data to an Excel file.
+    def to_polars(self) -> Any:
+        """Exports data to a polars DataFrame, sharing Arrow buffers if possible.
 
-        :param file_name: The name of the output Excel file.
+        :return: polars.DataFrame
+        """
+        try:
+            import polars
+        except ImportError as e:
+            raise ImportError(
+                "to_polars requires polars; install it with "
+                "`pip install hawk-sdk[polars]`."
+            ) from e
+        return polars.from_arrow(self.to_arrow())
+
+    @property
+    def name(self) -> str:
+        """The name of the call that produced the data."""
+        return self.__name
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Returns the first n rows of the data.
+
+        :param n: Number of rows to return.
+        :return: pd.DataFrame
+        """
+        data = self._load()
+        if isinstance(data, pa.Table) and self.__frame is None:
+            return data.slice(0, n).to_pandas()
+        return self.to_df().head(n)
+
+    def count(self) -> int:
+        """Returns the number of rows of the data.
+
+        :return: The row count.
+        """
+        data = self._load()
+        return data.num_rows if isinstance(data, pa.Table) else len(data)
+
+    def select(self, columns: List[str]) -> "DataObject":
+        """Returns a DataObject holding only the given columns.
+
+        Columns that form the index, such as date in compact frames, stay in
+        the index.
+
+        :param columns: The columns to keep, in order.
+        :return: A new DataObject.
+        """
+        data = self._load()
+        if isinstance(data, pa.Table):
+            return DataObject(self.__name, data.select(columns))
+        columns = [
+            column for column in columns if column not in data.index.names
+        ]
+        return DataObject(self.__name, data[columns])
+
+    def to_csv(
+        self,
+        file_name,
+        chunk_rows: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS
+    ):
+        """Exports data to a CSV file.
+
+        :param file_name: The name of the output CSV file.
+        :param chunk_rows: Write through Arrow in chunks of this many rows,
+            formatted on a thread pool. Much faster for large frames; timestamps
+            are then written as ``2024-01-02 00:00:00.000000Z``. None uses
+            pandas.
+        :param max_workers: Max chunks formatted at the same time.
         :return: None
         """
-        self.__data.to_csv(file_name, index=False)
+        if chunk_rows:
+            write_csv(self._load(), file_name, chunk_rows, max_workers)
+        else:
+            data = self.to_df()
+            data.to_csv(file_name, index=has_named_index(data))
 
     def to_xlsx(self, file_name):
         """Exports data to an Excel file.
@@ -31,7 +129,76 @@ class DataObject:
         :param file_name: The name of the output Excel file.
         :return: None
         """
-        self.__data.to_excel(file_name, index=False)
+        data = self.to_df()
+        data.to_excel(file_name, index=has_named_index(data))
+
+    def to_parquet(
+        self,
+        file_name,
+        compression: Optional[str] = 'zstd',
+        compression_level: Optional[int] = None,
+        row_group_size: Optional[int] = None
+    ):
+        """Exports data to a Parquet file, keeping column dtypes.
+
+        :param file_name: The name of the output Parquet file.
+        :param compression: Codec: 'zstd', 'snappy', 'gzip', 'brotli', 'lz4' or
+            None.
+        :param compression_level: Codec-specific level, or None for its default.
+        :param row_group_size: Max rows per row group, or None for pyarrow's
+            default.
+        :return: None
+        """
+        write_parquet(
+            self._load(), file_name, compression, compression_level,
+            row_group_size
+        )
+
+    def to_feather(
+        self,
+        file_name,
+        compression: Optional[str] = 'lz4',
+        compression_level: Optional[int] = None
+    ):
+        """Exports data to a Feather file, keeping column dtypes.
+
+        :param file_name: The name of the output Feather file.
+        :param compression: Codec: 'lz4', 'zstd' or None. Uncompressed files can
+            be memory-mapped with read_arrow.
+        :param compression_level: Codec-specific level, or None for its default.
+        :return: None
+        """
+        write_feather(self._load(), file_name, compression, compression_level)
+
+    def to_arrow(
+        self,
+        file_name: Optional[str] = None,
+        compression: Optional[str] = None,
+        batch_rows: Optional[int] = None
+    ) -> Optional[pa.Table]:
+        """Returns the data as a pyarrow Table, or exports it to an Arrow file.
+
+        A held Table is returned as it is; a DataFrame is converted, keeping a
+        named index as a column. Files can be memory-mapped and reloaded
+        zero-copy with hawk_sdk.core.common.export.read_arrow.
+
+        :param file_name: The name of the output Arrow file, or None to return
+            the Table.
+        :param compression: Codec: None, 'lz4' or 'zstd'. Compressed files are
+            decompressed on read instead of mapped.
+        :param batch_rows: Max rows per record batch.
+        :return: The pyarrow Table when no file_name is given, else None.
+        """
+        if file_name is None:
+            return frame_to_table(self._load())
+        write_arrow(self._load(), file_name, compression, batch_rows)
+
+    def _load(self) -> Union[pd.DataFrame, pa.Table]:
+        """Returns the held data.
+
+        :return: A pandas DataFrame or pyarrow Table.
+        """
+        return self.__data
 
     def show(self, n=5):
         """Print the first n rows of the data.
@@ -40,4 +207,4 @@ class DataObject:
         :return: None, prints the head of the data.
         """
         print(self.__name)
-        print(self.__data.head(n))
+        print(self.head(n))
@@ -0,0 +1,251 @@
+"""
+@description: Pluggable download paths for BigQuery query results.
+@author: Rithwik Babu
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Iterator, Optional
+
+import pyarrow as pa
+from google.api_core.exceptions import (
+    Forbidden,
+    GoogleAPICallError,
+    PermissionDenied
+)
+from google.cloud.bigquery.table import RowIterator
+
+from hawk_sdk.core.common.constants import (
+    DEFAULT_STORAGE_READ_MAX_STREAMS,
+    DEFAULT_STORAGE_READ_MIN_ROWS
+)
+from hawk_sdk.core.common.utils import get_bigquery_read_client
+
+
+class RestDownloader:
+    """Downloads results page by page through the tabledata.list REST API."""
+
+    def to_arrow(
+        self, rows: RowIterator, preserve_order: bool = True
+    ) -> pa.Table:
+        """Downloads a whole result into a pyarrow Table.
+
+        :param rows: The result rows of a finished query.
+        :param preserve_order: Whether the query's ORDER BY must be kept.
+        :return: A pyarrow Table holding the result.
+        """
+        return rows.to_arrow(create_bqstorage_client=False)
+
+    def iter_batches(
+        self, rows: RowIterator, preserve_order: bool = True
+    ) -> Iterator[pa.RecordBatch]:
+        """Downloads a result as a stream of record batches.
+
+        :param rows: The result rows of a finished query.
+        :param preserve_order: Whether the query's ORDER BY must be kept.
+        :return: An iterator of pyarrow RecordBatches.
+        """
+        return rows.to_arrow_iterable()
+
+
+class StorageReadDownloader(RestDownloader):
+    """Downloads large results as Arrow streams through the Storage Read API.
+
+    Results of at least ``min_rows`` rows are read over up to
+    ``max_stream_count`` streams at once; smaller ones take the REST path,
+    where the extra read session would cost more than it saves. Callers that
+    do not need the query's ORDER BY should pass ``preserve_order=False``,
+    since an ordered result can only be read over a single stream.
+
+    When google-cloud-bigquery-storage is not installed, or the read session
+    fails before any data has arrived, the REST path is used instead. A
+    permission error disables the Storage Read API for the rest of the process.
+    """
+
+    def __init__(
+        self,
+        min_rows: Optional[int] = None,
+        max_stream_count: int = DEFAULT_STORAGE_READ_MAX_STREAMS
+    ) -> None:
+        """Initializes the downloader.
+
+        :param min_rows: Smallest result read through the Storage Read API.
+            Defaults to the HAWK_SDK_STORAGE_READ_MIN_ROWS environment variable
+            or DEFAULT_STORAGE_READ_MIN_ROWS.
+        :param max_stream_count: Max streams read at the same time.
+        """
+        if min_rows is None:
+            min_rows = int(os.environ.get(
+                'HAWK_SDK_STORAGE_READ_MIN_ROWS', DEFAULT_STORAGE_READ_MIN_ROWS
+            ))
+        self.min_rows = min_rows
+        self.max_stream_count = max_stream_count
+        self.disabled = False
+
+    def to_arrow(
+        self, rows: RowIterator, preserve_order: bool = True
+    ) -> pa.Table:
+        """Downloads a whole result into a pyarrow Table.
+
+        :param rows: The result rows of a finished query.
+        :param preserve_order: Whether the query's ORDER BY must be kept.
+        :return: A pyarrow Table holding the result.
+        """
+        read_client = self._read_client(rows)
+        if read_client is None:
+            return super().to_arrow(rows, preserve_order)
+        try:
+            batches = list(
+                self._read_batches(rows, read_client, preserve_order)
+            )
+        except GoogleAPICallError as e:
+            self._fall_back(e)
+            return super().to_arrow(rows, preserve_order)
+        if not batches:
+            return super().to_arrow(rows, preserve_order)
+        return pa.Table.from_batches(batches)
+
+    def iter_batches(
+        self, rows: RowIterator, preserve_order: bool = True
+    ) -> Iterator[pa.RecordBatch]:
+        """Downloads a result as a stream of record batches.
+
+        :param rows: The result rows of a finished query.
+        :param preserve_order: Whether the query's ORDER BY must be kept.
+        :return: An iterator of pyarrow RecordBatches.
+        """
+        read_client = self._read_client(rows)
+        if read_client is None:
+            yield from super().iter_batches(rows, preserve_order)
+            return
+        started = False
+        try:
+            for batch in self._read_batches(rows, read_client, preserve_order):
+                started = True
+                yield batch
+        except GoogleAPICallError as e:
+            if started:
+                raise
+            self._fall_back(e)
+            yield from super().iter_batches(rows, preserve_order)
+
+    def _read_client(self, rows: RowIterator) -> Optional[Any]:
+        """Picks the Storage Read API client for a result, if it should be used.
+
+        :param rows: The result rows of a finished query.
+        :return: A BigQueryReadClient, or None to take the REST path.
+        """
+        if self.disabled or rows.client is None:
+            return None
+        if rows.total_rows is None or rows.total_rows < self.min_rows:
+            return None
+        read_client = get_bigquery_read_client(rows.client)
+        if read_client is None:
+            logging.info(
+                "No Storage Read API client (google-cloud-bigquery-storage is "
+                "not installed or the client is not shared); downloading over "
+                "REST."
+            )
+            self.disabled = True
+        return read_client
+
+    def _read_batches(
+        self,
+        rows: RowIterator,
+        read_client: Any,
+        preserve_order: bool
+    ) -> Iterator[pa.RecordBatch]:
+        """Reads a result over Storage Read API streams.
+
+        :param rows: The result rows of a finished query.
+        :param read_client: The BigQueryReadClient to read with.
+        :param preserve_order: Whether the query's ORDER BY must be kept.
+        :return: An iterator of pyarrow RecordBatches.
+        """
+        # The client library reads a single stream whenever the query has an
+        # ORDER BY, so unordered reads open their own read session.
+        destination = None
+        if not preserve_order and rows.job_id is not None:
+            destination = rows.client.get_job(
+                rows.job_id, project=rows.project, location=rows.location
+            ).destination
+        if destination is None:
+            return rows.to_arrow_iterable(
+                bqstorage_client=read_client,
+                max_stream_count=self.max_stream_count
+            )
+        return self._read_session(rows, read_client, destination)
+
+    def _read_session(
+        self,
+        rows: RowIterator,
+        read_client: Any,
+        destination: Any
+    ) -> Iterator[pa.RecordBatch]:
+        """Reads a query's destination table over parallel streams.
+
+        Streams are read side by side and yielded as each one completes, so
+        the batches are in no particular order.
+
+        :param rows: The result rows of a finished query.
+        :param read_client: The BigQueryReadClient to read with.
+        :param destination: The TableReference holding the query result.
+        :return: An iterator of pyarrow RecordBatches.
+        """
+        from google.cloud import bigquery_storage
+
+        session = read_client.create_read_session(
+            parent=f"projects/{rows.client.project}",
+            read_session=bigquery_storage.types.ReadSession(
+                table=destination.to_bqstorage(),
+                data_format=bigquery_storage.types.DataFormat.ARROW,
+            ),
+            max_stream_count=self.max_stream_count,
+        )
+        if not session.streams:
+            return
+
+        def read(stream: Any) -> pa.Table:
+            return read_client.read_rows(stream.name).to_arrow(session)
+
+        with ThreadPoolExecutor(max_workers=len(session.streams)) as pool:
+            futures = [pool.submit(read, stream) for stream in session.streams]
+            for future in as_completed(futures):
+                yield from future.result().to_batches()
+
+    def _fall_back(self, error: GoogleAPICallError) -> None:
+        """Logs a failed Storage Read API download before retrying over REST.
+
+        :param error: The error the read session raised.
+        :return: None
+        """
+        logging.warning(
+            f"Storage Read API download failed, falling back to REST: {error}"
+        )
+        if isinstance(error, (PermissionDenied, Forbidden)):
+            self.disabled = True
+
+
+_downloader: RestDownloader = StorageReadDownloader()
+
+
+def get_downloader() -> RestDownloader:
+    """Returns the downloader used for every query result in the process.
+
+    :return: The active downloader.
+    """
+    return _downloader
+
+
+def set_downloader(downloader: RestDownloader) -> None:
+    """Replaces the downloader used for every query result in the process.
+
+    Pass RestDownloader() to always use the REST API, a StorageReadDownloader
+    with a different threshold, or any object with the same two methods, for
+    example a local stand-in in benchmarks.
+
+    :param downloader: The downloader to use.
+    :return: None
+    """
+    global _downloader
+    _downloader = downloader
@@ -0,0 +1,182 @@
+"""
+@description: Columnar file exports for result DataFrames and Tables.
+@author: Rithwik Babu
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from hawk_sdk.core.common.constants import (
+    DEFAULT_CSV_CHUNK_ROWS,
+    DEFAULT_MAX_WORKERS
+)
+
+
+def has_named_index(df: pd.DataFrame) -> bool:
+    """Whether a frame's index holds data, e.g. compact frames' date index.
+
+    :param df: The frame to check.
+    :return: True if any index level is named.
+    """
+    return any(name is not None for name in df.index.names)
+
+
+def frame_to_table(df: Union[pd.DataFrame, pa.Table]) -> pa.Table:
+    """Converts a result frame to a pyarrow Table, keeping a named index.
+
+    Categoricals become dictionary arrays and nullable integers stay
+    integers, so the table round-trips through to_pandas with the same
+    dtypes. Field columns mixing numbers and strings are written as strings.
+    Tables are returned as they are.
+
+    :param df: The frame to convert, or a pyarrow Table.
+    :return: A pyarrow Table.
+    """
+    if isinstance(df, pa.Table):
+        return df
+    try:
+        return pa.Table.from_pandas(df, preserve_index=has_named_index(df))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].map(
+                lambda value: value if pd.isna(value) else str(value)
+            )
+        return pa.Table.from_pandas(df, preserve_index=has_named_index(df))
+
+
+def write_parquet(
+    df: Union[pd.DataFrame, pa.Table],
+    file_name: str,
+    compression: Optional[str] = 'zstd',
+    compression_level: Optional[int] = None,
+    row_group_size: Optional[int] = None
+) -> None:
+    """Writes a frame to a Parquet file.
+
+    :param df: The frame or pyarrow Table to write.
+    :param file_name: The name of the output file.
+    :param compression: Codec: 'zstd', 'snappy', 'gzip', 'brotli', 'lz4' or
+        None.
+    :param compression_level: Codec-specific level, or None for its default.
+    :param row_group_size: Max rows per row group, or None for pyarrow's
+        default.
+    :return: None
+    """
+    pq.write_table(
+        frame_to_table(df), file_name, compression=compression or 'none',
+        compression_level=compression_level, row_group_size=row_group_size
+    )
+
+
+def write_feather(
+    df: Union[pd.DataFrame, pa.Table],
+    file_name: str,
+    compression: Optional[str] = 'lz4',
+    compression_level: Optional[int] = None
+) -> None:
+    """Writes a frame to a Feather (Arrow IPC) file.
+
+    :param df: The frame or pyarrow Table to write.
+    :param file_name: The name of the output file.
+    :param compression: Codec: 'lz4', 'zstd' or None.
+    :param compression_level: Codec-specific level, or None for its default.
+    :return: None
+    """
+    feather.write_feather(
+        frame_to_table(df), file_name,
+        compression=compression or 'uncompressed',
+        compression_level=compression_level
+    )
+
+
+def write_arrow(
+    df: Union[pd.DataFrame, pa.Table],
+    file_name: str,
+    compression: Optional[str] = None,
+    batch_rows: Optional[int] = None
+) -> None:
+    """Writes a frame to an Arrow IPC file laid out for memory-mapping.
+
+    Uncompressed files can be memory-mapped with read_arrow without copying
+    or parsing anything. Compressed buffers have to be decompressed on read.
+
+    :param df: The frame or pyarrow Table to write.
+    :param file_name: The name of the output file.
+    :param compression: Codec: None, 'lz4' or 'zstd'.
+    :param batch_rows: Max rows per record batch, or None for one batch per
+        chunk.
+    :return: None
+    """
+    table = frame_to_table(df)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(file_name, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table, max_chunksize=batch_rows)
+
+
+def read_arrow(file_name: str) -> pa.Table:
+    """Memory-maps an Arrow IPC or uncompressed Feather file.
+
+    The table's buffers point into the mapped file, so loading takes no time
+    or memory up front; pages are read as they are touched. Call to_pandas()
+    on the result for a DataFrame, including any named index.
+
+    :param file_name: The name of the file written by write_arrow or
+        write_feather.
+    :return: A pyarrow Table backed by the file.
+    """
+    with pa.memory_map(file_name, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def write_csv(
+    df: Union[pd.DataFrame, pa.Table],
+    file_name: str,
+    chunk_rows: int = DEFAULT_CSV_CHUNK_ROWS,
+    max_workers: int = DEFAULT_MAX_WORKERS
+) -> None:
+    """Writes a frame to CSV in row chunks formatted on a thread pool.
+
+    The frame is converted to Arrow once. Each chunk is then formatted by
+    Arrow's CSV writer, which releases the GIL, and the chunks are written
+    to the file in order. At most ``max_workers`` formatted chunks are held
+    at a time. Timestamps are written in ISO 8601 form, e.g.
+    ``2024-01-02 00:00:00.000000Z``.
+
+    :param df: The frame or pyarrow Table to write.
+    :param file_name: The name of the output file.
+    :param chunk_rows: Rows formatted per task.
+    :param max_workers: Max chunks formatted at the same time.
+    :return: None
+    """
+    # Index columns lead, as in DataFrame.to_csv.
+    if isinstance(df, pd.DataFrame) and has_named_index(df):
+        df = df.reset_index()
+    table = frame_to_table(df)
+
+    def render(offset: int) -> pa.Buffer:
+        sink = pa.BufferOutputStream()
+        pa_csv.write_csv(
+            table.slice(offset, chunk_rows), sink,
+            pa_csv.WriteOptions(include_header=offset == 0)
+        )
+        return sink.getvalue()
+
+    # An empty frame still gets its header line.
+    offsets = range(0, max(table.num_rows, 1), chunk_rows)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        with open(file_name, 'wb') as f:
+            pending: Deque = deque()
+            for offset in offsets:
+                pending.append(pool.submit(render, offset))
+                if len(pending) >= max_workers:
+                    f.write(pending.popleft().result())
+            while pending:
+                f.write(pending.popleft().result())
@@ -0,0 +1,131 @@
+"""
+@description: Interval parsing and bucketing helpers for time-series queries.
+@author: Rithwik Babu
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from hawk_sdk.core.common.chunking import TIMESTAMP_FORMAT, utc_timestamp
+
+RAW_INTERVAL = 'raw'
+
+DEFAULT_AGGREGATION = 'last'
+
+# OHLC names are aliases of the plain aggregations they correspond to.
+AGGREGATION_ALIASES = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'avg': 'mean',
+}
+
+AGGREGATIONS = {'first', 'last', 'min', 'max', 'sum', 'mean', 'count'}
+
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400}
+_TRUNC_PARTS = {60: 'MINUTE', 3600: 'HOUR', 86400: 'DAY'}
+
+
+def interval_seconds(interval: str) -> int:
+    """Parses an interval such as '1m', '15m', '1h' or '1d' into seconds.
+
+    Buckets must tile a day exactly so that bucket boundaries always line up
+    with the day boundaries used for date chunking and caching.
+
+    :param interval: The interval string.
+    :return: The bucket width in seconds.
+    """
+    match = re.fullmatch(r'(\d+)([mhd])', interval)
+    if not match:
+        raise ValueError(
+            f"Unsupported interval '{interval}'. Use e.g. '1m', '15m', '1h', "
+            f"'1d', '{RAW_INTERVAL}' or 'snapshot'."
+        )
+    seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    if seconds == 0 or 86400 % seconds:
+        raise ValueError(f"Interval '{interval}' must divide a day evenly.")
+    return seconds
+
+
+def duration_timedelta(duration: str) -> pd.Timedelta:
+    """Parses a duration written like an interval, e.g. '15m', '12h' or '5d'.
+
+    Unlike intervals, durations need not divide a day.
+
+    :param duration: The duration string.
+    :return: The duration as a pandas Timedelta.
+    """
+    match = re.fullmatch(r'(\d+)([mhd])', duration)
+    if not match:
+        raise ValueError(
+            f"Unsupported duration '{duration}'. "
+            "Use e.g. '15m', '12h' or '5d'."
+        )
+    seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    return pd.Timedelta(seconds=seconds)
+
+
+def bucket_expression(column: str, interval: str) -> str:
+    """Builds the SQL expression mapping a timestamp to its bucket start.
+
+    :param column: The timestamp column to bucket.
+    :param interval: The interval string.
+    :return: A BigQuery SQL expression.
+    """
+    seconds = interval_seconds(interval)
+    if seconds in _TRUNC_PARTS:
+        return f"TIMESTAMP_TRUNC({column}, {_TRUNC_PARTS[seconds]})"
+    return (
+        f"TIMESTAMP_SECONDS(DIV(UNIX_SECONDS({column}), {seconds}) "
+        f"* {seconds})"
+    )
+
+
+def align_range(
+    start_date: str, end_date: str, interval: str
+) -> Tuple[str, str]:
+    """Widens a date range to whole buckets.
+
+    The start moves back to the start of its bucket and the end forward to
+    the last microsecond of its bucket, so every bucket in the range is
+    aggregated over all of its records. Buckets are aligned in UTC, so
+    timestamps with an offset are converted first. Raw ranges are returned
+    unchanged.
+
+    :param start_date: The start date (YYYY-MM-DD or a timestamp).
+    :param end_date: The end date (YYYY-MM-DD or a timestamp).
+    :param interval: The interval string.
+    :return: The aligned (start, end) UTC timestamp strings.
+    """
+    if interval == RAW_INTERVAL:
+        return start_date, end_date
+    bucket = pd.Timedelta(seconds=interval_seconds(interval))
+    start = utc_timestamp(start_date).floor(bucket)
+    end = utc_timestamp(end_date).floor(bucket) + bucket
+    end -= pd.Timedelta(microseconds=1)
+    return start.strftime(TIMESTAMP_FORMAT), end.strftime(TIMESTAMP_FORMAT)
+
+
+def group_fields_by_aggregation(
+    field_ids: List[int],
+    aggregations: Optional[Dict[int, str]]
+) -> Dict[str, List[int]]:
+    """Resolves the aggregation of every field and groups fields by it.
+
+    :param field_ids: The requested field_ids.
+    :param aggregations: Aggregation per field_id; unlisted fields use 'last'.
+    :return: field_ids keyed by canonical aggregation name.
+    """
+    groups: Dict[str, List[int]] = {}
+    for field_id in field_ids:
+        name = (aggregations or {}).get(field_id, DEFAULT_AGGREGATION).lower()
+        name = AGGREGATION_ALIASES.get(name, name)
+        if name not in AGGREGATIONS:
+            raise ValueError(
+                f"Unsupported aggregation '{name}' for field_id {field_id}. "
+                f"Use one of {sorted(AGGREGATIONS | set(AGGREGATION_ALIASES))}."
+            )
+        groups.setdefault(name, []).append(field_id)
+    return groups
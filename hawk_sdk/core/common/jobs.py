@@ -0,0 +1,84 @@
+"""
+@description: Helpers for running and awaiting BigQuery jobs.
+@author: Rithwik Babu
+"""
+import asyncio
+import logging
+from typing import Any, Callable
+
+import pyarrow as pa
+from google.cloud import bigquery
+
+from hawk_sdk.core.common.constants import (
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL
+)
+from hawk_sdk.core.common.metrics import record_job, record_phase, record_rows
+
+
+def execute_job(
+    submit: Callable[..., bigquery.QueryJob], *args: Any
+) -> bigquery.table.RowIterator:
+    """Submits a query, blocks until it finishes and returns its rows.
+
+    :param submit: A repository ``submit_*`` method.
+    :param args: Arguments for ``submit``.
+    :return: The job's result rows.
+    """
+    with record_phase('submit'):
+        job = submit(*args)
+    with record_phase('execute'):
+        rows = job.result()
+    record_job(job)
+    if isinstance(rows, pa.Table):
+        # Local backends return their result as a Table, which is not
+        # downloaded.
+        record_rows(rows.num_rows)
+    return rows
+
+
+async def wait_for_job(
+    job: bigquery.QueryJob,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL
+) -> bigquery.QueryJob:
+    """Waits for a BigQuery job without blocking the event loop.
+
+    The job state is polled from a worker thread, doubling the delay between
+    polls up to ``max_poll_interval``, so many jobs can be awaited at once.
+
+    :param job: The submitted QueryJob.
+    :param poll_interval: Seconds before the first re-poll.
+    :param max_poll_interval: Upper bound for the delay between polls.
+    :return: The finished QueryJob.
+    """
+    delay = poll_interval
+    with record_phase('execute'):
+        while not await asyncio.to_thread(job.done):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+
+    if job.error_result is not None:
+        logging.error(
+            f"BigQuery job {job.job_id} failed: "
+            f"{job.error_result.get('message')}"
+        )
+        # result() raises the job's error as the matching google.api_core
+        # exception.
+        await asyncio.to_thread(job.result)
+    record_job(job)
+    return job
+
+
+async def run_job(
+    submit: Callable[..., bigquery.QueryJob], *args: Any
+) -> bigquery.QueryJob:
+    """Submits a query from a worker thread and waits for it to finish.
+
+    :param submit: A repository ``submit_*`` method.
+    :param args: Arguments for ``submit``.
+    :return: The finished QueryJob; its result() holds the rows.
+    """
+    with record_phase('submit'):
+        job = await asyncio.to_thread(submit, *args)
+    return await wait_for_job(job)
@@ -0,0 +1,165 @@
+"""
+@description: Lazy DataObject that runs its query on first access.
+@author: Rithwik Babu
+"""
+import copy
+import threading
+from typing import Any, Callable, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+
+from hawk_sdk.core.common.data_object import DataObject
+from hawk_sdk.core.common.metrics import track
+
+
+class QueryPlan:
+    """A deferred datasource call that a LazyDataObject runs when needed.
+
+    Subclasses implement fetch and push head, count and column selection
+    down into the query where they can; the defaults here fall back to
+    fetching the whole result.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initializes the plan.
+
+        :param name: The datasource call the plan stands for, e.g.
+            'universal.get_data'.
+        """
+        self.name = name
+        self.columns: Optional[List[str]] = None
+
+    def fetch(self) -> Union[pd.DataFrame, pa.Table]:
+        """Runs the full query.
+
+        :return: The data the eager call would return, projected to the selected
+            columns.
+        """
+        raise NotImplementedError
+
+    def head(self, n: int) -> pd.DataFrame:
+        """Fetches the first n rows.
+
+        :param n: Number of rows to return.
+        :return: A pandas DataFrame.
+        """
+        data = self.fetch()
+        if isinstance(data, pa.Table):
+            return data.slice(0, n).to_pandas()
+        return data.head(n)
+
+    def count(self) -> int:
+        """Counts the rows fetch would return.
+
+        :return: The row count.
+        """
+        return len(self.fetch())
+
+    def select(self, columns: List[str]) -> "QueryPlan":
+        """Returns a copy of the plan that only produces the given columns.
+
+        :param columns: The columns to keep, in order.
+        :return: A new QueryPlan.
+        """
+        plan = copy.copy(self)
+        plan.columns = list(columns)
+        return plan
+
+    def project(
+        self,
+        df: Union[pd.DataFrame, pa.Table]
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """Narrows a fetched frame or Table to the selected columns.
+
+        :param df: A frame or pyarrow Table produced by the plan's query.
+        :return: The data with only the selected columns, if any were selected.
+        """
+        if self.columns is None:
+            return df
+        if isinstance(df, pa.Table):
+            return df.select(self.columns)
+        return df[[
+            column for column in self.columns if column not in df.index.names
+        ]]
+
+
+class LazyDataObject(DataObject):
+    """A DataObject that holds a query plan instead of data.
+
+    Nothing runs until the data is needed. to_df() and the exports run the
+    full query once and keep the result. head(), show() and count() issue a
+    LIMIT or COUNT(*) query instead while the data has not been loaded, and
+    select() narrows the plan so only the requested fields are queried.
+
+    ``metrics`` describes the most recent query the object ran.
+    """
+
+    def __init__(self, name: str, plan: QueryPlan) -> None:
+        """Initializes the object without running anything.
+
+        :param name: The name of the call that produces the data.
+        :param plan: The deferred query.
+        """
+        super().__init__(name, None)
+        self.plan = plan
+        self._data: Optional[Union[pd.DataFrame, pa.Table]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the full query has run."""
+        return self._data is not None
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """Returns the first n rows, fetching only those if nothing is loaded.
+
+        :param n: Number of rows to return.
+        :return: pd.DataFrame
+        """
+        if self._data is not None:
+            return super().head(n)
+        return self._run('head', self.plan.head, n)
+
+    def count(self) -> int:
+        """Returns the number of rows, counting them in the query if not loaded.
+
+        :return: The row count.
+        """
+        if self._data is not None:
+            return super().count()
+        return self._run('count', self.plan.count)
+
+    def select(self, columns: List[str]) -> DataObject:
+        """Returns a lazy object whose query only produces the given columns.
+
+        :param columns: The columns to keep, in order.
+        :return: A new LazyDataObject, or a plain DataObject if the data is
+            loaded.
+        """
+        if self._data is not None:
+            return super().select(columns)
+        return LazyDataObject(self.name, self.plan.select(columns))
+
+    def _load(self) -> Union[pd.DataFrame, pa.Table]:
+        """Runs the full query on first use and returns its result.
+
+        :return: A pandas DataFrame, or a pyarrow Table for Arrow output.
+        """
+        with self._lock:
+            if self._data is None:
+                self._data = self._run('fetch', self.plan.fetch)
+        return self._data
+
+    def _run(self, step: str, query: Callable[..., Any], *args) -> Any:
+        """Runs one of the plan's queries and records its metrics.
+
+        :param step: The operation, reported as '<plan name>.<step>'.
+        :param query: The plan method to run.
+        :param args: Arguments for the plan method.
+        :return: The plan method's result.
+        """
+        with track(f'{self.plan.name}.{step}') as metrics:
+            result = query(*args)
+        self.metrics = metrics
+        return result
@@ -0,0 +1,262 @@
+"""
+@description: Per-call instrumentation of query phases and BigQuery jobs.
+@author: Rithwik Babu
+"""
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, DefaultDict, Dict, Iterator, List, Optional
+
+_current: contextvars.ContextVar[Optional["CallMetrics"]] = (
+    contextvars.ContextVar('hawk_sdk_call_metrics', default=None)
+)
+_sinks: List[Callable[["CallMetrics"], None]] = []
+
+
+class CallMetrics:
+    """Timings and BigQuery job statistics collected for one datasource call.
+
+    Phase times are summed over every query the call ran (submit, execute,
+    download, normalize, pivot), so with parallel chunks they can add up to
+    more than ``wall_time``.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initializes empty metrics.
+
+        :param name: The datasource call, e.g. 'universal.get_data'.
+        """
+        self.name = name
+        self.wall_time = 0.0
+        self.phases: DefaultDict[str, float] = defaultdict(float)
+        self.jobs: List[Dict[str, Any]] = []
+        self.rows = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes_processed(self) -> int:
+        """Bytes processed by all jobs of the call."""
+        return sum(job['total_bytes_processed'] or 0 for job in self.jobs)
+
+    @property
+    def total_bytes_billed(self) -> int:
+        """Bytes billed for all jobs of the call."""
+        return sum(job['total_bytes_billed'] or 0 for job in self.jobs)
+
+    @property
+    def cache_hits(self) -> int:
+        """Number of jobs answered from BigQuery's result cache."""
+        return sum(1 for job in self.jobs if job['cache_hit'])
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Adds time spent in a phase.
+
+        :param phase: The phase name.
+        :param seconds: Elapsed seconds.
+        :return: None
+        """
+        with self._lock:
+            self.phases[phase] += seconds
+
+    def add_rows(self, rows: int) -> None:
+        """Adds downloaded result rows.
+
+        :param rows: Number of rows.
+        :return: None
+        """
+        with self._lock:
+            self.rows += rows
+
+    def add_job(self, stats: Dict[str, Any]) -> None:
+        """Adds the statistics of a finished BigQuery job.
+
+        :param stats: The job statistics.
+        :return: None
+        """
+        with self._lock:
+            self.jobs.append(stats)
+
+    def add_coalesced(self) -> None:
+        """Counts a query answered by a job another call started.
+
+        :return: None
+        """
+        with self._lock:
+            self.coalesced += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the metrics as plain values, e.g. for logging.
+
+        :return: A dict of the call's metrics.
+        """
+        return {
+            'name': self.name,
+            'wall_time': self.wall_time,
+            'phases': dict(self.phases),
+            'rows': self.rows,
+            'total_bytes_processed': self.total_bytes_processed,
+            'total_bytes_billed': self.total_bytes_billed,
+            'cache_hits': self.cache_hits,
+            'coalesced': self.coalesced,
+            'jobs': list(self.jobs),
+        }
+
+    def __repr__(self) -> str:
+        phases = ', '.join(
+            f"{phase}={seconds:.3f}s" for phase, seconds in self.phases.items()
+        )
+        return (
+            f"CallMetrics({self.name}: wall_time={self.wall_time:.3f}s, "
+            f"{phases}, rows={self.rows}, jobs={len(self.jobs)}, "
+            f"bytes_processed={self.total_bytes_processed}, "
+            f"cache_hits={self.cache_hits}, "
+            f"coalesced={self.coalesced})"
+        )
+
+
+def add_metrics_sink(sink: Callable[[CallMetrics], None]) -> None:
+    """Registers a callback that receives the metrics of every datasource call.
+
+    :param sink: Called with the CallMetrics once a call finishes.
+    :return: None
+    """
+    _sinks.append(sink)
+
+
+def remove_metrics_sink(sink: Callable[[CallMetrics], None]) -> None:
+    """Unregisters a callback added with add_metrics_sink.
+
+    :param sink: The callback to remove.
+    :return: None
+    """
+    _sinks.remove(sink)
+
+
+@contextmanager
+def track(name: str) -> Iterator[CallMetrics]:
+    """Collects metrics for everything run inside the block.
+
+    Worker threads started with a copy of the current context (as
+    asyncio.to_thread does) report into the same metrics. When the block
+    exits the metrics are handed to every registered sink.
+
+    :param name: The datasource call being tracked.
+    :return: The CallMetrics being filled.
+    """
+    metrics = CallMetrics(name)
+    token = _current.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.wall_time = time.perf_counter() - start
+        _current.reset(token)
+        for sink in list(_sinks):
+            try:
+                sink(metrics)
+            except Exception as e:
+                logging.error(f"Metrics sink failed: {e}")
+
+
+@contextmanager
+def record_phase(phase: str) -> Iterator[None]:
+    """Times the block as a phase of the current call, if one is tracked.
+
+    :param phase: The phase name (e.g., 'submit', 'execute', 'download').
+    :return: None
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_phase(phase, time.perf_counter() - start)
+
+
+def record_rows(rows: int) -> None:
+    """Counts downloaded rows towards the current call, if one is tracked.
+
+    :param rows: Number of rows.
+    :return: None
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add_rows(rows)
+
+
+def record_coalesced() -> None:
+    """Counts a query shared with another call towards the current one, if any.
+
+    :return: None
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add_coalesced()
+
+
+def record_job(job: Any) -> None:
+    """Records the statistics of a finished BigQuery job, if a call is tracked.
+
+    :param job: A finished QueryJob.
+    :return: None
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return
+    created, started, ended = (
+        getattr(job, name, None) for name in ('created', 'started', 'ended')
+    )
+    queued = execution = None
+    if created and started:
+        queued = (started - created).total_seconds()
+    if started and ended:
+        execution = (ended - started).total_seconds()
+    metrics.add_job({
+        'job_id': getattr(job, 'job_id', None),
+        'total_bytes_processed': getattr(job, 'total_bytes_processed', None),
+        'total_bytes_billed': getattr(job, 'total_bytes_billed', None),
+        'slot_millis': getattr(job, 'slot_millis', None),
+        'cache_hit': getattr(job, 'cache_hit', None),
+        'queued_seconds': queued,
+        'execution_seconds': execution,
+    })
+
+
+def instrumented(name: str) -> Callable:
+    """Decorates a datasource method so each call is tracked.
+
+    The CallMetrics are attached to the returned DataObject as ``metrics``.
+    Works for plain and coroutine methods.
+
+    :param name: The name the call is reported under, e.g. 'universal.get_data'.
+    :return: The decorator.
+    """
+    def decorate(method: Callable) -> Callable:
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(*args, **kwargs):
+                with track(name) as metrics:
+                    result = await method(*args, **kwargs)
+                result.metrics = metrics
+                return result
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with track(name) as metrics:
+                result = method(*args, **kwargs)
+            result.metrics = metrics
+            return result
+        return wrapper
+
+    return decorate
+
@@ -0,0 +1,333 @@
+"""
+@description: Vectorized long-to-wide pivot engine for Universal records.
+@author: Rithwik Babu
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+INDEX_COLUMNS = ['date', 'hawk_id', 'ticker']
+
+
+def pivot_records(
+    df: pd.DataFrame, integer_fields: bool = False
+) -> pd.DataFrame:
+    """Pivots long-format records into one column per field.
+
+    Instead of a groupby-aggregate the rows are factorized into integer
+    codes and their values scattered into a preallocated (row x field)
+    array. A (date, hawk_id, field_name) triple appearing more than once
+    keeps its first value, like ``pivot_table(aggfunc='first')``. Numeric fields
+    come out as float64 (double_value, else int_value); fields carrying
+    char_value come out as object columns. Records without any value are
+    dropped, so dates or fields that only have empty values do not appear.
+
+    Output rows are sorted by (date, hawk_id) and field columns by name.
+
+    :param df: A DataFrame with date, hawk_id, ticker, field_name,
+        double_value, int_value and char_value columns.
+    :param integer_fields: Return fields that only carry int_value as nullable
+        Int64 columns instead of float64.
+    :return: A DataFrame in wide format with field names as columns.
+    """
+    if df.empty:
+        return df
+
+    double_values = df['double_value'].to_numpy(dtype=float, na_value=np.nan)
+    int_values = df['int_value'].astype(float).to_numpy()
+    numeric = np.where(np.isnan(double_values), int_values, double_values)
+    has_numeric = ~np.isnan(numeric)
+    has_double = ~np.isnan(double_values)
+    has_char = df['char_value'].notna().to_numpy()
+
+    keep = has_numeric | has_char
+    if not keep.all():
+        df = df[keep]
+        numeric = numeric[keep]
+        has_numeric = has_numeric[keep]
+        has_double = has_double[keep]
+        has_char = has_char[keep]
+
+    date_codes, dates = pd.factorize(df['date'], sort=True)
+    hawk_codes, hawk_ids = pd.factorize(df['hawk_id'], sort=True)
+    field_codes, field_names = pd.factorize(df['field_name'], sort=True)
+
+    # One integer key per (date, hawk_id); sorting the unique keys gives the
+    # output row order without a lexsort over the full record set.
+    n_hawk_ids = len(hawk_ids)
+    keys = date_codes.astype(np.int64) * n_hawk_ids + hawk_codes
+    row_codes, row_keys = pd.factorize(keys, sort=True)
+    n_rows = len(row_keys)
+    has_numeric, has_char = _first_values(
+        row_codes, field_codes, len(field_names), has_numeric, has_char
+    )
+
+    values = np.full((n_rows, len(field_names)), np.nan, order='F')
+    values[row_codes[has_numeric], field_codes[has_numeric]] = \
+        numeric[has_numeric]
+
+    tickers = np.empty(n_rows, dtype=object)
+    tickers[row_codes] = df['ticker'].to_numpy(dtype=object)
+
+    columns = {
+        'date': dates.take(row_keys // n_hawk_ids),
+        'hawk_id': hawk_ids.take(row_keys % n_hawk_ids),
+        'ticker': tickers,
+    }
+    for j, field_name in enumerate(field_names):
+        columns[field_name] = values[:, j]
+
+    if integer_fields:
+        int_only = np.setdiff1d(
+            field_codes[has_numeric], field_codes[has_double]
+        )
+        for j in int_only:
+            column = values[:, j]
+            missing = np.isnan(column)
+            columns[field_names[j]] = pd.arrays.IntegerArray(
+                np.where(missing, 0, column).astype(np.int64), missing
+            )
+
+    char_only = has_char & ~has_numeric
+    if char_only.any():
+        char_values = df['char_value'].to_numpy(dtype=object)
+        for j in np.unique(field_codes[char_only]):
+            mask = char_only & (field_codes == j)
+            column = values[:, j].astype(object)
+            column[row_codes[mask]] = char_values[mask]
+            columns[field_names[j]] = column
+
+    return pd.DataFrame(columns)
+
+
+def assemble_wide(
+    df: pd.DataFrame, field_names: Dict[int, str]
+) -> pd.DataFrame:
+    """Turns a server-side pivot result into the pivot_records layout.
+
+    The query returns ``n_<field_id>`` (numeric) and ``c_<field_id>`` (char)
+    columns per field. Each pair is collapsed into one column named after
+    the field, and rows and fields without any value are dropped, so the
+    output matches pivoting the same records client-side.
+
+    :param df: A DataFrame with date, hawk_id, ticker and per-field columns.
+    :param field_names: Field names keyed by field_id.
+    :return: A DataFrame in wide format with field names as columns.
+    """
+    if df.empty:
+        return df
+
+    columns = {name: df[name] for name in INDEX_COLUMNS}
+    by_name = sorted(field_names.items(), key=lambda item: item[1])
+    for field_id, field_name in by_name:
+        numeric = df[f'n_{field_id}'].astype(float)
+        chars = df[f'c_{field_id}']
+        if chars.notna().any():
+            column = numeric.astype(object).where(
+                numeric.notna(), chars.astype(object)
+            )
+            column = column.where(column.notna(), np.nan)
+            # Rebuilding from a plain object array infers the same dtype as
+            # the columns pivot_records builds, e.g. str for char fields.
+            column = pd.Series(column.to_numpy(), index=column.index)
+        else:
+            column = numeric
+        if column.notna().any():
+            columns[field_name] = column
+
+    wide = pd.DataFrame(columns)
+    has_value = wide.drop(columns=INDEX_COLUMNS).notna().any(axis=1)
+    wide = wide[has_value].sort_values(['date', 'hawk_id'])
+    return wide.reset_index(drop=True)
+
+
+def pivot_records_arrow(
+    table: pa.Table, integer_fields: bool = False
+) -> pa.Table:
+    """Pivots long-format records into one column per field, without pandas.
+
+    Works like pivot_records on a pyarrow Table: rows are factorized with
+    Arrow kernels and values scattered into a preallocated array, then
+    each field column is handed back to Arrow. Missing values are nulls.
+    Fields carrying char_value come out as string columns, with any numeric
+    values of the same field written as strings. Repeated (date, hawk_id,
+    field_name) triples keep their first value.
+
+    Output rows are sorted by (date, hawk_id) and field columns by name.
+
+    :param table: A Table with date, hawk_id, ticker, field_name, double_value,
+        int_value and char_value columns.
+    :param integer_fields: Return fields that only carry int_value as int64
+        columns instead of float64.
+    :return: A pyarrow Table in wide format with field names as columns.
+    """
+    if table.num_rows == 0:
+        return table
+
+    double_values = _float_values(table['double_value'])
+    int_values = _float_values(table['int_value'])
+    numeric = np.where(np.isnan(double_values), int_values, double_values)
+    has_numeric = ~np.isnan(numeric)
+    has_double = ~np.isnan(double_values)
+    has_char = pc.is_valid(table['char_value']).to_numpy(zero_copy_only=False)
+
+    keep = has_numeric | has_char
+    if not keep.all():
+        table = table.filter(pa.array(keep))
+        numeric = numeric[keep]
+        has_numeric = has_numeric[keep]
+        has_double = has_double[keep]
+        has_char = has_char[keep]
+
+    date_codes, dates = _factorize(table['date'])
+    hawk_codes, hawk_ids = _factorize(table['hawk_id'])
+    field_codes, field_names = _factorize(table['field_name'])
+
+    n_hawk_ids = len(hawk_ids)
+    keys = date_codes * n_hawk_ids + hawk_codes
+    row_keys, row_codes = np.unique(keys, return_inverse=True)
+    n_rows = len(row_keys)
+    has_numeric, has_char = _first_values(
+        row_codes, field_codes, len(field_names), has_numeric, has_char
+    )
+
+    values = np.full((n_rows, len(field_names)), np.nan, order='F')
+    values[row_codes[has_numeric], field_codes[has_numeric]] = \
+        numeric[has_numeric]
+
+    # The ticker of each output row is taken from one of its records.
+    sources = np.empty(n_rows, dtype=np.int64)
+    sources[row_codes] = np.arange(table.num_rows)
+
+    columns = {
+        'date': dates.take(pa.array(row_keys // n_hawk_ids)),
+        'hawk_id': hawk_ids.take(pa.array(row_keys % n_hawk_ids)),
+        'ticker': table['ticker'].take(pa.array(sources)),
+    }
+    int_only = set()
+    if integer_fields:
+        int_only = set(np.setdiff1d(
+            field_codes[has_numeric], field_codes[has_double]
+        ))
+    char_only = has_char & ~has_numeric
+    char_fields = set(np.unique(field_codes[char_only]))
+    for j, field_name in enumerate(field_names.to_pylist()):
+        column = values[:, j]
+        missing = np.isnan(column)
+        if j in char_fields:
+            columns[field_name] = _char_column(
+                table['char_value'], column, missing, row_codes,
+                char_only & (field_codes == j)
+            )
+        elif j in int_only:
+            integers = np.where(missing, 0, column).astype(np.int64)
+            columns[field_name] = pa.array(integers, mask=missing)
+        else:
+            columns[field_name] = pa.array(column, mask=missing)
+    return pa.table(columns)
+
+
+def assemble_wide_arrow(
+    table: pa.Table, field_names: Dict[int, str]
+) -> pa.Table:
+    """Turns a server-side pivot result into the pivot_records_arrow layout.
+
+    :param table: A Table with date, hawk_id, ticker and per-field columns.
+    :param field_names: Field names keyed by field_id.
+    :return: A pyarrow Table in wide format with field names as columns.
+    """
+    if table.num_rows == 0:
+        return table
+
+    columns = {name: table[name] for name in INDEX_COLUMNS}
+    by_name = sorted(field_names.items(), key=lambda item: item[1])
+    for field_id, field_name in by_name:
+        numeric = table[f'n_{field_id}'].cast(pa.float64())
+        chars = table[f'c_{field_id}']
+        if chars.null_count < len(chars):
+            column = pc.if_else(
+                pc.is_valid(numeric), numeric.cast(pa.string()), chars
+            )
+        else:
+            column = numeric
+        if column.null_count < len(column):
+            columns[field_name] = column
+
+    wide = pa.table(columns)
+    has_value = np.zeros(wide.num_rows, dtype=bool)
+    for name in wide.column_names[len(INDEX_COLUMNS):]:
+        has_value |= pc.is_valid(wide[name]).to_numpy(zero_copy_only=False)
+    wide = wide.filter(pa.array(has_value))
+    return wide.sort_by([('date', 'ascending'), ('hawk_id', 'ascending')])
+
+
+def _first_values(
+    row_codes: np.ndarray,
+    field_codes: np.ndarray,
+    n_fields: int,
+    has_numeric: np.ndarray,
+    has_char: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Clears the value flags of records repeating an earlier (row, field) cell.
+
+    :param row_codes: The output row of each record.
+    :param field_codes: The field of each record.
+    :param n_fields: The number of distinct fields.
+    :param has_numeric: Whether each record has a numeric value.
+    :param has_char: Whether each record has a char value.
+    :return: The has_numeric and has_char flags with repeated records cleared.
+    """
+    cells = row_codes.astype(np.int64) * n_fields + field_codes
+    repeated = pd.Index(cells).duplicated(keep='first')
+    if not repeated.any():
+        return has_numeric, has_char
+    return has_numeric & ~repeated, has_char & ~repeated
+
+
+def _float_values(column: pa.ChunkedArray) -> np.ndarray:
+    """Converts a numeric column to float64 with NaN for nulls.
+
+    :param column: A numeric Arrow column.
+    :return: A float64 numpy array.
+    """
+    return pc.fill_null(column.cast(pa.float64()), np.nan).to_numpy()
+
+
+def _factorize(column: pa.ChunkedArray) -> Tuple[np.ndarray, pa.Array]:
+    """Encodes a column as codes into its sorted distinct values.
+
+    :param column: The Arrow column to encode.
+    :return: The int64 code of each row, and the sorted distinct values.
+    """
+    uniques = pc.unique(column)
+    uniques = uniques.take(pc.array_sort_indices(uniques))
+    codes = pc.index_in(column, value_set=uniques)
+    return codes.to_numpy().astype(np.int64), uniques
+
+
+def _char_column(
+    char_values: pa.ChunkedArray,
+    numeric: np.ndarray,
+    missing: np.ndarray,
+    row_codes: np.ndarray,
+    char_records: np.ndarray
+) -> pa.Array:
+    """Builds the string column of a field carrying char values.
+
+    :param char_values: The char_value column of the records.
+    :param numeric: The field's numeric value per output row, NaN if none.
+    :param missing: Whether each output row lacks a numeric value.
+    :param row_codes: The output row of each record.
+    :param char_records: Whether each record is a char value of the field.
+    :return: A string array with one value per output row.
+    """
+    sources = np.full(len(numeric), -1, dtype=np.int64)
+    sources[row_codes[char_records]] = np.flatnonzero(char_records)
+    chars = char_values.take(pa.array(sources, mask=sources < 0))
+    if missing.all():
+        return chars.combine_chunks()
+    numbers = pa.array(numeric, mask=missing).cast(pa.string())
+    return pc.if_else(pa.array(~missing), numbers, chars).combine_chunks()
@@ -1,23 +1,252 @@
+import hashlib
 import json
 import os
+import threading
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Optional, Tuple
 
+import google.auth
+import requests
+from google.auth.credentials import Credentials, with_scopes_if_required
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
 from google.oauth2 import service_account
 
-from hawk_sdk.core.common.constants import PROJECT_ID
+from hawk_sdk.core.common.constants import DEFAULT_HTTP_POOL_SIZE, PROJECT_ID
 
+ClientKey = Tuple[str, str, int]
 
-def get_bigquery_client() -> bigquery.Client:
+_clients: Dict[ClientKey, bigquery.Client] = {}
+_credentials: Dict[ClientKey, Credentials] = {}
+_leases: DefaultDict[ClientKey, int] = defaultdict(int)
+# Storage Read API clients by the key of the BigQuery client they read for.
+_read_clients: Dict[ClientKey, Optional[Any]] = {}
+_lock = threading.Lock()
+
+
+def get_bigquery_client(pool_size: Optional[int] = None) -> bigquery.Client:
+    """Returns the process-wide BigQuery client for the current credentials.
+
+    Clients are shared by every datasource in the process, keyed by project,
+    credentials and HTTP pool size, so authentication and TLS setup happen
+    once. Callers should hand the client back with release_bigquery_client,
+    which closes it when no one else holds it.
+
+    :param pool_size: Max pooled HTTP connections. Defaults to the
+        HAWK_SDK_HTTP_POOL_SIZE environment variable or DEFAULT_HTTP_POOL_SIZE.
+    :return: A shared bigquery.Client.
+    """
     service_account_json = os.environ.get('SERVICE_ACCOUNT_JSON')
+    if pool_size is None:
+        pool_size = int(os.environ.get(
+            'HAWK_SDK_HTTP_POOL_SIZE', DEFAULT_HTTP_POOL_SIZE
+        ))
+    key = (PROJECT_ID, _credentials_key(service_account_json), pool_size)
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client, credentials = _create_client(
+                service_account_json, pool_size
+            )
+            _clients[key] = client
+            _credentials[key] = credentials
+        _leases[key] += 1
+        return client
+
+
+def release_bigquery_client(client: bigquery.Client) -> None:
+    """Hands a client obtained from get_bigquery_client back to the registry.
+
+    Once every holder has released it the client is dropped from the
+    registry and closed, along with its Storage Read API client.
+
+    :param client: The client to release.
+    :return: None
+    """
+    with _lock:
+        for key, shared in _clients.items():
+            if shared is client:
+                break
+        else:
+            return
+        _leases[key] -= 1
+        if _leases[key] > 0:
+            return
+        del _clients[key]
+        del _credentials[key]
+        del _leases[key]
+        read_client = _read_clients.pop(key, None)
+    client.close()
+    _close_read_client(read_client)
+
+
+def get_bigquery_read_client(client: bigquery.Client) -> Optional[Any]:
+    """Returns the process-wide Storage Read API client for a BigQuery client.
+
+    The read client is built with the credentials the registry created the
+    BigQuery client with, and is created once, since opening its gRPC
+    channel is expensive.
+
+    :param client: A BigQuery client obtained from get_bigquery_client.
+    :return: A BigQueryReadClient, or None when google-cloud-bigquery-storage
+        is not installed or the client did not come from the registry.
+    """
+    with _lock:
+        key = next(
+            (key for key, shared in _clients.items() if shared is client),
+            None
+        )
+        if key is None:
+            return None
+        if key not in _read_clients:
+            _read_clients[key] = _create_read_client(_credentials[key])
+        return _read_clients[key]
+
+
+def close_bigquery_clients() -> None:
+    """Closes every shared client and empties the registry.
+
+    :return: None
+    """
+    with _lock:
+        clients = list(_clients.values())
+        read_clients = list(_read_clients.values())
+        _clients.clear()
+        _credentials.clear()
+        _leases.clear()
+        _read_clients.clear()
+    for client in clients:
+        client.close()
+    for read_client in read_clients:
+        _close_read_client(read_client)
+
+
+class BigQueryClientLease:
+    """A repository's handle on the shared BigQuery client.
+
+    The client is acquired lazily and re-acquired in a forked child process,
+    whose registry starts out empty, so connections are never shared across
+    processes.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None) -> None:
+        """Initializes the lease without acquiring a client yet.
+
+        :param pool_size: Max pooled HTTP connections for the client.
+        """
+        self._pool_size = pool_size
+        self._client: Optional[bigquery.Client] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+
+    @property
+    def client(self) -> bigquery.Client:
+        """The shared client for this process.
+
+        :return: A shared bigquery.Client.
+        """
+        if self._closed:
+            raise RuntimeError("BigQuery client lease has been closed.")
+        if self._client is None or self._pid != os.getpid():
+            self._client = get_bigquery_client(self._pool_size)
+            self._pid = os.getpid()
+        return self._client
+
+    def close(self) -> None:
+        """Releases the client back to the registry.
+
+        :return: None
+        """
+        if self._client is not None and self._pid == os.getpid():
+            release_bigquery_client(self._client)
+        self._client = None
+        self._closed = True
+
+
+def _close_read_client(read_client: Optional[Any]) -> None:
+    """Closes the gRPC channel of a Storage Read API client.
+
+    :param read_client: A BigQueryReadClient, or None.
+    :return: None
+    """
+    if read_client is not None:
+        read_client.transport.close()
+
+
+def _credentials_key(service_account_json: Optional[str]) -> str:
+    """Builds a registry key that identifies the active credentials.
+
+    :param service_account_json: The SERVICE_ACCOUNT_JSON value, if set.
+    :return: A string that changes whenever the credentials change.
+    """
+    if service_account_json:
+        digest = hashlib.sha256(service_account_json.encode()).hexdigest()
+        return f'service_account:{digest}'
+    adc_path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS', '')
+    return f'adc:{adc_path}'
+
+
+def _create_client(
+    service_account_json: Optional[str],
+    pool_size: int
+) -> Tuple[bigquery.Client, Credentials]:
+    """Creates a BigQuery client backed by a sized HTTP connection pool.
+
+    :param service_account_json: The SERVICE_ACCOUNT_JSON value, if set.
+    :param pool_size: Max pooled HTTP connections.
+    :return: A new bigquery.Client and the credentials it uses.
+    """
     if service_account_json:
         # Use credentials provided in SERVICE_ACCOUNT_JSON
         credentials = service_account.Credentials.from_service_account_info(
             json.loads(service_account_json)
         )
-        return bigquery.Client(project=PROJECT_ID, credentials=credentials)
     else:
         # Rely on Application Default Credentials (ADC),
         # which will automatically use GOOGLE_APPLICATION_CREDENTIALS if set,
         # or use the built-in credentials if running in GCP.
-        return bigquery.Client(project=PROJECT_ID)
+        credentials, _ = google.auth.default()
+    credentials = with_scopes_if_required(credentials, bigquery.Client.SCOPE)
+
+    session = AuthorizedSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount('https://', adapter)
+
+    client = bigquery.Client(
+        project=PROJECT_ID, credentials=credentials, _http=session
+    )
+    return client, credentials
+
+
+def _create_read_client(credentials: Credentials) -> Optional[Any]:
+    """Creates a Storage Read API client, if the library is installed.
+
+    :param credentials: The credentials of the BigQuery client it reads for.
+    :return: A new BigQueryReadClient, or None without
+        google-cloud-bigquery-storage.
+    """
+    try:
+        from google.cloud import bigquery_storage
+    except ImportError:
+        return None
+    return bigquery_storage.BigQueryReadClient(credentials=credentials)
+
+
+def _reset_after_fork() -> None:
+    """Drops the parent's clients in a forked child.
+
+    The parent's sockets must not be used or closed from the child, so the
+    registry is simply emptied and clients are rebuilt on next use.
+    """
+    global _lock
+    _clients.clear()
+    _credentials.clear()
+    _leases.clear()
+    _read_clients.clear()
+    _lock = threading.Lock()
+
 
+os.register_at_fork(after_in_child=_reset_after_fork)
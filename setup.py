@@ -6,6 +6,12 @@ setup(
     packages=find_packages(),
     install_requires=[
         'google-cloud-bigquery',
-        'pandas'
+        'pandas',
+        'pyarrow'
     ],
+    extras_require={
+        'storage': ['google-cloud-bigquery[bqstorage]'],
+        'duckdb': ['duckdb'],
+        'polars': ['polars'],
+    },
 )
@@ -0,0 +1,125 @@
+"""
+@description: Shared fixtures, including a small local mirror for DuckDBBackend.
+@author: Rithwik Babu
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from hawk_sdk.core.backend.duckdb_backend import DuckDBBackend
+
+MIRROR_FIELDS = {1: 'close', 2: 'volume', 3: 'rating'}
+MIRROR_TICKERS = {1: 'AAA', 2: 'BBB', 3: 'CCC'}
+MIRROR_SERIES = [('fred', 'GDP'), ('fred', 'CPI'), ('eia', 'WCESTUS1')]
+
+
+def mirror_records() -> pa.Table:
+    """Builds three days of hourly records for the mirror.
+
+    close is a double every hour, volume an integer every sixth hour and
+    rating a string at midnight. hawk_id 3 stops updating after the second
+    day, so its latest values predate everyone else's.
+
+    :return: The records table, sorted by record_timestamp.
+    """
+    dates = pd.date_range('2024-01-01', periods=72, freq='h', tz='UTC')
+    rows = []
+    for i, date in enumerate(dates):
+        for hawk_id in MIRROR_TICKERS:
+            if hawk_id == 3 and i >= 48:
+                continue
+            rows.append((date, hawk_id, 1, hawk_id * 100.0 + i, None, None))
+            if i % 6 == 0:
+                rows.append((date, hawk_id, 2, None, hawk_id * 1000 + i, None))
+            if i % 24 == 0:
+                rows.append((date, hawk_id, 3, None, None, f'R{hawk_id}{i}'))
+    columns = list(zip(*rows))
+    return pa.table({
+        'record_timestamp': pa.array(columns[0], pa.timestamp('us', tz='UTC')),
+        'hawk_id': pa.array(columns[1], pa.int64()),
+        'field_id': pa.array(columns[2], pa.int64()),
+        'double_value': pa.array(columns[3], pa.float64()),
+        'int_value': pa.array(columns[4], pa.int64()),
+        'char_value': pa.array(columns[5], pa.string()),
+    })
+
+
+def mirror_supplemental_records() -> pa.Table:
+    """Builds a week of daily supplemental records for MIRROR_SERIES.
+
+    :return: The supplemental_records table.
+    """
+    dates = pd.date_range('2024-01-01', periods=7, freq='D', tz='UTC')
+    rows = [
+        (source, series_id, date, float(i * 10 + j), None)
+        for i, date in enumerate(dates)
+        for j, (source, series_id) in enumerate(MIRROR_SERIES)
+    ]
+    columns = list(zip(*rows))
+    return pa.table({
+        'source': pa.array(columns[0]),
+        'series_id': pa.array(columns[1]),
+        'record_timestamp': pa.array(
+            columns[2], pa.timestamp('us', tz='UTC')
+        ),
+        'value': pa.array(columns[3], pa.float64()),
+        'char_value': pa.array(columns[4], pa.string()),
+    })
+
+
+def write_table(root: str, table_name: str, table: pa.Table) -> None:
+    """Writes a table into the production folder of a mirror.
+
+    :param root: The mirror directory.
+    :param table_name: The table name, e.g. 'records'.
+    :param table: The rows to write.
+    :return: None
+    """
+    folder = os.path.join(root, 'production', table_name)
+    os.makedirs(folder, exist_ok=True)
+    pq.write_table(table, os.path.join(folder, 'part-0.parquet'))
+
+
+@pytest.fixture
+def mirror(tmp_path) -> str:
+    """Writes every table a repository reads into a mirror directory.
+
+    :return: The mirror directory.
+    """
+    root = str(tmp_path / 'mirror')
+    write_table(root, 'records', mirror_records())
+    write_table(root, 'fields', pa.table({
+        'field_id': pa.array(list(MIRROR_FIELDS), pa.int64()),
+        'field_name': pa.array(list(MIRROR_FIELDS.values())),
+    }))
+    write_table(root, 'hawk_identifiers', pa.table({
+        'hawk_id': pa.array(list(MIRROR_TICKERS), pa.int64()),
+        'id_type': pa.array(['TICKER'] * len(MIRROR_TICKERS)),
+        'value': pa.array(list(MIRROR_TICKERS.values())),
+    }))
+    write_table(root, 'supplemental_records', mirror_supplemental_records())
+    sources, series_ids = zip(*MIRROR_SERIES)
+    write_table(root, 'supplemental_series', pa.table({
+        'source': pa.array(sources),
+        'series_id': pa.array(series_ids),
+        'name': pa.array([f'{s} name' for s in series_ids]),
+        'description': pa.array([f'{s} description' for s in series_ids]),
+        'frequency': pa.array(['daily'] * len(series_ids)),
+        'unit': pa.array(['units'] * len(series_ids)),
+    }))
+    return root
+
+
+@pytest.fixture
+def duckdb_backend(mirror) -> DuckDBBackend:
+    """Opens a DuckDBBackend over the mirror fixture.
+
+    :return: The backend; it is closed after the test.
+    """
+    backend = DuckDBBackend(mirror, threads=1)
+    yield backend
+    backend.close()
+
@@ -0,0 +1,26 @@
+"""
+@description: Tests for parsing as-of cutoffs.
+@author: Rithwik Babu
+"""
+import pandas as pd
+import pytest
+
+from hawk_sdk.api.universal.service import UniversalService
+
+
+def test_mixed_formats_are_parsed():
+    cutoffs = UniversalService._as_of_cutoffs(
+        ['2020-01-10', '2020-01-05 12:00:00', '2020-01-06T01:00:00-05:00',
+         '2020-01-05 12:00:00']
+    )
+    assert list(cutoffs) == [
+        pd.Timestamp('2020-01-05 12:00:00', tz='UTC'),
+        pd.Timestamp('2020-01-06 06:00:00', tz='UTC'),
+        pd.Timestamp('2020-01-10', tz='UTC'),
+    ]
+    assert cutoffs.unit == 'us'
+
+
+def test_no_cutoffs_is_an_error():
+    with pytest.raises(ValueError):
+        UniversalService._as_of_cutoffs([])
@@ -0,0 +1,103 @@
+"""
+@description: Tests for running requests across datasources as one batch.
+@author: Rithwik Babu
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from hawk_sdk import BatchRequest, batch, batch_async
+from hawk_sdk.api.batch import DATASOURCES
+from hawk_sdk.api.system.main import System
+from hawk_sdk.api.universal.main import Universal
+from hawk_sdk.api.universal_supplemental.main import UniversalSupplemental
+
+DATA = dict(
+    hawk_ids=[1, 2], field_ids=[1, 2], start_date='2024-01-01',
+    end_date='2024-01-02', interval='raw'
+)
+SUPPLEMENTAL = dict(
+    sources=['fred'], series_ids=['GDP'], start_date='2024-01-01',
+    end_date='2024-01-07'
+)
+
+
+@pytest.fixture
+def local_mirror(mirror, monkeypatch) -> str:
+    """Points datasources created without a backend at the mirror fixture."""
+    monkeypatch.setenv('HAWK_SDK_LOCAL_MIRROR', mirror)
+    return mirror
+
+
+def test_results_match_direct_calls_in_request_order(local_mirror):
+    results = batch([
+        BatchRequest('universal', 'get_data', DATA),
+        BatchRequest('system', 'get_hawk_ids', dict(tickers=['BBB', 'AAA'])),
+        BatchRequest('universal_supplemental', 'get_data', SUPPLEMENTAL),
+        BatchRequest('universal', 'get_data', {**DATA, 'interval': '6h'}),
+    ])
+
+    with Universal() as universal, System() as system, \
+            UniversalSupplemental() as supplemental:
+        expected = [
+            universal.get_data(**DATA),
+            system.get_hawk_ids(['BBB', 'AAA']),
+            supplemental.get_data(**SUPPLEMENTAL),
+            universal.get_data(**{**DATA, 'interval': '6h'}),
+        ]
+    assert [result.request.method for result in results] == [
+        'get_data', 'get_hawk_ids', 'get_data', 'get_data'
+    ]
+    for result, data in zip(results, expected):
+        assert result.ok and result.error is None
+        pd.testing.assert_frame_equal(result.data.to_df(), data.to_df())
+
+
+def test_failing_request_does_not_cancel_the_others(local_mirror):
+    results = batch([
+        BatchRequest('universal', 'get_data', DATA),
+        BatchRequest('universal', 'get_data', {**DATA, 'interval': '7x'}),
+        BatchRequest('universal', 'get_data', {**DATA, 'unknown': True}),
+        BatchRequest('system', 'get_hawk_ids', dict(tickers=['AAA'])),
+    ])
+
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert isinstance(results[2].error, TypeError)
+    assert results[1].data is None
+    assert not results[0].data.to_df().empty
+    assert results[3].data.to_df()['hawk_id'].tolist() == [1]
+
+
+@pytest.mark.parametrize('request_, message', [
+    (BatchRequest('prices', 'get_data'), 'Unknown datasource'),
+    (BatchRequest('universal', 'close'), 'not a batchable'),
+    (BatchRequest('universal', '_reshape'), 'not a batchable'),
+    (BatchRequest('universal', 'iter_data', DATA), 'not a batchable'),
+    (BatchRequest('universal', 'get_everything'), 'not a batchable'),
+])
+def test_invalid_requests_fail_before_anything_runs(
+    local_mirror, monkeypatch, request_, message
+):
+    def refuse(*args, **kwargs) -> None:
+        raise AssertionError('no datasource should be created')
+
+    for datasource in DATASOURCES.values():
+        monkeypatch.setattr(datasource, '__init__', refuse)
+    with pytest.raises(ValueError, match=message):
+        batch([BatchRequest('system', 'get_hawk_ids', {}), request_])
+
+
+def test_batch_async_runs_in_an_existing_event_loop(local_mirror):
+    async def run() -> list:
+        return await batch_async([
+            BatchRequest('universal', 'get_data', DATA),
+            BatchRequest('universal', 'get_all_fields'),
+        ])
+
+    data, fields = asyncio.run(run())
+    assert data.ok and fields.ok
+    assert fields.data.to_df()['field_name'].tolist() == [
+        'close', 'rating', 'volume'
+    ]
@@ -0,0 +1,181 @@
+"""
+@description: Tests that chunked Universal requests match single queries.
+@author: Rithwik Babu
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from hawk_sdk.api.universal.service import UniversalService
+from hawk_sdk.core.common.chunking import chunk_list, split_date_range
+from hawk_sdk.core.common.intervals import align_range
+
+HAWK_IDS = list(range(1, 8))
+FIELDS = {1: 'close', 2: 'volume'}
+
+
+class FakeUniversalRepository:
+    """In-memory UniversalRepository serving records every six hours."""
+
+    def __init__(self) -> None:
+        """Builds ten days of records for HAWK_IDS and FIELDS."""
+        rng = np.random.default_rng(0)
+        dates = pd.date_range('2024-01-01', periods=40, freq='6h', tz='UTC')
+        date, hawk_id, field_id = (a.ravel() for a in np.meshgrid(
+            dates, np.array(HAWK_IDS), np.array(list(FIELDS)), indexing='ij'))
+        n = len(date)
+        double_value = np.where(field_id == 1, rng.normal(size=n), np.nan)
+        int_value = pd.array(
+            np.where(field_id == 2, rng.integers(0, 1000, size=n), 0),
+            dtype='Int64'
+        )
+        int_value[field_id != 2] = pd.NA
+        self.records = pd.DataFrame({
+            'date': pd.DatetimeIndex(date),
+            'hawk_id': hawk_id.astype('int64'),
+            'ticker': pd.Series('T' + hawk_id.astype(str), dtype=object),
+            'field_id': field_id.astype('int64'),
+            'field_name': pd.Series(
+                [FIELDS[f] for f in field_id], dtype=object
+            ),
+            'double_value': double_value,
+            'int_value': int_value,
+            'char_value': pd.Series([None] * n, dtype=object),
+        })
+        self.calls = []
+
+    def fetch_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True
+    ) -> pa.Table:
+        """Returns the records in range, keeping each day's last for '1d'.
+
+        :param hawk_ids: The hawk_ids to fetch.
+        :param field_ids: The field_ids to fetch.
+        :param start_date: The inclusive start of the range.
+        :param end_date: The inclusive end of the range.
+        :param interval: 'raw' or '1d'.
+        :param aggregations: Ignored; every field takes its last value.
+        :param join_metadata: Ignored; tickers and field names are always
+            present.
+        :return: A pyarrow Table of long-format records.
+        """
+        self.calls.append((list(hawk_ids), start_date, end_date))
+        df = self.records
+        df = df[
+            df['hawk_id'].isin(hawk_ids)
+            & df['field_id'].isin(field_ids)
+            & (df['date'] >= pd.Timestamp(start_date, tz='UTC'))
+            & (df['date'] <= pd.Timestamp(end_date, tz='UTC'))
+        ]
+        if interval == '1d':
+            df = df.assign(date=df['date'].dt.floor('1D'))
+            df = df.groupby(
+                ['date', 'hawk_id', 'field_id'], as_index=False
+            ).last()
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+@pytest.mark.parametrize('interval', ['raw', '1d'])
+@pytest.mark.parametrize('hawk_id_chunk_size', [None, 1, 3, 100])
+@pytest.mark.parametrize('date_chunk_days', [None, 1, 3, 30])
+def test_chunked_get_data_matches_single_query(
+    interval, hawk_id_chunk_size, date_chunk_days
+):
+    start_date, end_date = '2024-01-01', '2024-01-09'
+    single = UniversalService(FakeUniversalRepository()).get_data(
+        HAWK_IDS, list(FIELDS), start_date, end_date, interval,
+        hawk_id_chunk_size=None, date_chunk_days=None
+    )
+
+    repository = FakeUniversalRepository()
+    chunked = UniversalService(repository).get_data(
+        HAWK_IDS, list(FIELDS), start_date, end_date, interval,
+        hawk_id_chunk_size=hawk_id_chunk_size,
+        date_chunk_days=date_chunk_days, max_workers=4
+    )
+
+    assert not single.empty
+    pd.testing.assert_frame_equal(chunked, single)
+    planned = UniversalService._plan_chunks(
+        HAWK_IDS, *align_range(start_date, end_date, interval),
+        hawk_id_chunk_size, date_chunk_days
+    )
+    assert sorted(repository.calls) == sorted(planned)
+
+
+def test_plan_chunks_covers_every_hawk_id_and_window():
+    chunks = UniversalService._plan_chunks(
+        [1, 2, 3], '2024-01-01', '2024-01-03', 2, 1
+    )
+    assert chunks == [
+        ([1, 2], '2024-01-01', '2024-01-01 23:59:59.999999'),
+        ([1, 2], '2024-01-02 00:00:00.000000', '2024-01-03'),
+        ([3], '2024-01-01', '2024-01-01 23:59:59.999999'),
+        ([3], '2024-01-02 00:00:00.000000', '2024-01-03'),
+    ]
+
+
+def test_split_date_range_one_day():
+    assert split_date_range('2024-01-01', '2024-01-01', 1) == [
+        ('2024-01-01', '2024-01-01')
+    ]
+    assert split_date_range(
+        '2024-01-01 00:00:00', '2024-01-01 23:59:59', 1
+    ) == [('2024-01-01 00:00:00', '2024-01-01 23:59:59')]
+
+
+def test_split_date_range_window_longer_than_range():
+    assert split_date_range('2024-01-01', '2024-01-05', 30) == [
+        ('2024-01-01', '2024-01-05')
+    ]
+
+
+@pytest.mark.parametrize('days', [None, 0])
+def test_split_date_range_without_window(days):
+    assert split_date_range('2024-01-01', '2024-03-01', days) == [
+        ('2024-01-01', '2024-03-01')
+    ]
+
+
+def test_split_date_range_windows_are_contiguous():
+    windows = split_date_range('2024-01-01', '2024-01-10 12:00:00', 3)
+    assert windows[0][0] == '2024-01-01'
+    assert windows[-1][1] == '2024-01-10 12:00:00'
+    assert len(windows) == 4
+    for (_, end), (start, _) in zip(windows, windows[1:]):
+        gap = pd.Timestamp(start) - pd.Timestamp(end)
+        assert gap == pd.Timedelta(microseconds=1)
+
+
+def test_chunk_list_empty():
+    assert chunk_list([], 3) == [[]]
+
+
+@pytest.mark.parametrize('size', [None, 0, 5, 100])
+def test_chunk_list_single_chunk(size):
+    assert chunk_list([1, 2, 3, 4, 5], size) == [[1, 2, 3, 4, 5]]
+
+
+def test_chunk_list_splits_in_order():
+    assert chunk_list([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    assert chunk_list((1, 2, 3, 4), 2) == [[1, 2], [3, 4]]
+
+
+def test_split_date_range_with_offsets():
+    windows = split_date_range(
+        '2024-01-01T20:00:00+10:00', '2024-01-02T21:00:00+10:00', 1
+    )
+    assert windows == [
+        ('2024-01-01T20:00:00+10:00', '2024-01-02 09:59:59.999999'),
+        ('2024-01-02 10:00:00.000000', '2024-01-02T21:00:00+10:00'),
+    ]
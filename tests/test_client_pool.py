@@ -0,0 +1,58 @@
+"""
+@description: Tests for the process-wide BigQuery client registry.
+@author: Rithwik Babu
+"""
+from unittest import mock
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from hawk_sdk.core.common import utils
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Replaces client creation with mocks.
+
+    :return: The (client, credentials) pairs made.
+    """
+    made = []
+
+    def create(service_account_json, pool_size):
+        made.append((mock.MagicMock(), AnonymousCredentials()))
+        return made[-1]
+
+    monkeypatch.setattr(utils, '_create_client', create)
+    yield made
+    utils.close_bigquery_clients()
+
+
+def test_client_is_closed_with_its_last_lease(created):
+    first, second = utils.BigQueryClientLease(), utils.BigQueryClientLease()
+    client = first.client
+    assert second.client is client and len(created) == 1
+
+    first.close()
+    assert not client.close.called
+    second.close()
+    assert client.close.called
+
+    third = utils.BigQueryClientLease()
+    assert third.client is not client
+    third.close()
+
+
+def test_read_client_uses_the_pooled_credentials(created):
+    read_client = mock.MagicMock()
+    lease = utils.BigQueryClientLease()
+    client = lease.client
+    with mock.patch.object(
+        utils, '_create_read_client', return_value=read_client
+    ) as create:
+        assert utils.get_bigquery_read_client(client) is read_client
+        assert utils.get_bigquery_read_client(client) is read_client
+        assert utils.get_bigquery_read_client(mock.MagicMock()) is None
+    create.assert_called_once_with(created[0][1])
+
+    lease.close()
+    assert read_client.transport.close.called
@@ -0,0 +1,204 @@
+"""
+@description: Tests for sharing in-flight queries between concurrent callers.
+@author: Rithwik Babu
+"""
+import threading
+import time
+from typing import Callable, List
+
+import pyarrow as pa
+import pytest
+
+from hawk_sdk.core.common import coalesce
+from hawk_sdk.core.common.coalesce import RequestCoalescer
+
+KEY = ('production', 'fetch_data')
+
+
+class FakeQuery:
+    """Returns one row per hawk_id, optionally blocking until released."""
+
+    def __init__(self, block: bool = False) -> None:
+        """Initializes the fake query.
+
+        :param block: Whether calls wait for ``released`` before returning.
+        """
+        self.calls: List[List[int]] = []
+        self.started = threading.Event()
+        self.released = threading.Event()
+        if not block:
+            self.released.set()
+
+    def __call__(self, hawk_ids: List[int]) -> pa.Table:
+        """Runs the query.
+
+        :param hawk_ids: The hawk_ids to return rows for.
+        :return: A table with hawk_id and value columns.
+        """
+        self.calls.append(list(hawk_ids))
+        self.started.set()
+        self.released.wait()
+        return pa.table({
+            'hawk_id': pa.array(hawk_ids, pa.int64()),
+            'value': pa.array([h * 10 for h in hawk_ids], pa.int64()),
+        })
+
+
+def start(target: Callable[[], pa.Table]) -> dict:
+    """Runs a call on a thread and keeps its result or error.
+
+    :param target: The call to run.
+    :return: A dict filled with 'result' or 'error' once the thread ends,
+        holding the thread itself under 'thread'.
+    """
+    outcome = {}
+
+    def run() -> None:
+        try:
+            outcome['result'] = target()
+        except BaseException as e:
+            outcome['error'] = e
+
+    outcome['thread'] = threading.Thread(target=run)
+    outcome['thread'].start()
+    return outcome
+
+
+def wait_for(condition: Callable[[], bool]) -> None:
+    """Polls until a condition holds.
+
+    :param condition: The condition to wait for.
+    :return: None
+    """
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def joined(monkeypatch) -> List[None]:
+    """Lists a None for every caller that joined another's batch."""
+    joins = []
+    monkeypatch.setattr(
+        coalesce, 'record_coalesced', lambda: joins.append(None)
+    )
+    return joins
+
+
+def hawk_ids_of(table: pa.Table) -> List[int]:
+    """Lists the hawk_ids of a result.
+
+    :param table: The result.
+    :return: Its hawk_id column as a list.
+    """
+    return table['hawk_id'].to_pylist()
+
+
+def test_lone_query_runs_without_waiting():
+    coalescer = RequestCoalescer(window=5.0)
+    query = FakeQuery()
+
+    began = time.monotonic()
+    result = coalescer.fetch(KEY, [1, 2], query)
+
+    assert time.monotonic() - began < 1.0
+    assert hawk_ids_of(result) == [1, 2]
+    assert query.calls == [[1, 2]]
+
+
+def test_subset_query_joins_running_batch(joined):
+    coalescer = RequestCoalescer()
+    query = FakeQuery(block=True)
+
+    first = start(lambda: coalescer.fetch(KEY, [1, 2, 3], query))
+    query.started.wait()
+    second = start(lambda: coalescer.fetch(KEY, [2], query))
+    wait_for(lambda: joined)
+    query.released.set()
+    for outcome in (first, second):
+        outcome['thread'].join()
+
+    assert query.calls == [[1, 2, 3]]
+    assert hawk_ids_of(first['result']) == [1, 2, 3]
+    assert second['result'].to_pydict() == {'hawk_id': [2], 'value': [20]}
+
+
+def test_queries_arriving_during_a_run_are_merged_and_filtered():
+    coalescer = RequestCoalescer(window=5.0, max_hawk_ids=3)
+    running, merged = FakeQuery(block=True), FakeQuery()
+
+    first = start(lambda: coalescer.fetch(KEY, [1], running))
+    running.started.wait()
+    # A query with the key is in flight, so these wait for each other and
+    # run as soon as the merged batch is full.
+    began = time.monotonic()
+    second = start(lambda: coalescer.fetch(KEY, [2, 3], merged))
+    wait_for(lambda: len(coalescer._batches[KEY]) == 2)
+    third = start(lambda: coalescer.fetch(KEY, [4], merged))
+    for outcome in (second, third):
+        outcome['thread'].join()
+    running.released.set()
+    first['thread'].join()
+
+    assert time.monotonic() - began < 2.5
+    assert merged.calls == [[2, 3, 4]]
+    assert hawk_ids_of(second['result']) == [2, 3]
+    assert third['result'].to_pydict() == {'hawk_id': [4], 'value': [40]}
+    assert hawk_ids_of(first['result']) == [1]
+
+
+def test_merge_window_expires_without_a_full_batch():
+    coalescer = RequestCoalescer(window=0.05)
+    running, merged = FakeQuery(block=True), FakeQuery()
+
+    first = start(lambda: coalescer.fetch(KEY, [1], running))
+    running.started.wait()
+    assert hawk_ids_of(coalescer.fetch(KEY, [2], merged)) == [2]
+    running.released.set()
+    first['thread'].join()
+
+    assert merged.calls == [[2]]
+
+
+def test_unmergeable_queries_share_only_identical_hawk_ids(joined):
+    coalescer = RequestCoalescer()
+    query = FakeQuery(block=True)
+
+    first = start(lambda: coalescer.fetch(KEY, [1, 2], query, merge=False))
+    query.started.wait()
+    same = start(lambda: coalescer.fetch(KEY, [2, 1], query, merge=False))
+    subset = start(lambda: coalescer.fetch(KEY, [1], query, merge=False))
+    wait_for(lambda: joined and len(query.calls) == 2)
+    query.released.set()
+    for outcome in (first, same, subset):
+        outcome['thread'].join()
+
+    assert sorted(query.calls) == [[1], [1, 2]]
+    assert hawk_ids_of(same['result']) == [1, 2]
+    assert hawk_ids_of(subset['result']) == [1]
+
+
+def test_errors_reach_every_waiting_caller(joined):
+    coalescer = RequestCoalescer()
+    released = threading.Event()
+    started = threading.Event()
+
+    def failing(hawk_ids: List[int]) -> pa.Table:
+        started.set()
+        released.wait()
+        raise RuntimeError('query failed')
+
+    first = start(lambda: coalescer.fetch(KEY, [1, 2], failing))
+    started.wait()
+    second = start(lambda: coalescer.fetch(KEY, [1], failing))
+    wait_for(lambda: joined)
+    released.set()
+    for outcome in (first, second):
+        outcome['thread'].join()
+
+    for outcome in (first, second):
+        assert isinstance(outcome['error'], RuntimeError)
+    assert not coalescer._batches
+    with pytest.raises(RuntimeError):
+        coalescer.fetch(KEY, [1], failing)
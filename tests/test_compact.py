@@ -0,0 +1,124 @@
+"""
+@description: Tests that compact dtypes hold the default layout's values.
+@author: Rithwik Babu
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from hawk_sdk.api.universal.main import Universal
+from hawk_sdk.api.universal_supplemental.main import UniversalSupplemental
+
+HAWK_IDS = [1, 2, 3]
+FIELD_IDS = [1, 2, 3]
+
+REQUESTS = [
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='raw'),
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='6h',
+         aggregations={1: 'mean', 2: 'sum'}),
+    dict(start_date=None, end_date='2024-01-03 23:00:00', interval='snapshot',
+         per_field=True),
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='raw',
+         server_pivot=True),
+]
+
+
+@pytest.fixture
+def universal(duckdb_backend) -> Universal:
+    """A Universal datasource over the DuckDB mirror fixture."""
+    return Universal(backend=duckdb_backend)
+
+
+def expand(compact: pd.DataFrame, like: pd.DataFrame) -> pd.DataFrame:
+    """Converts a compact frame back to the dtypes of the default layout.
+
+    :param compact: A frame returned with compact=True.
+    :param like: The frame returned for the same request without it.
+    :return: The compact values in the default layout.
+    """
+    df = compact.reset_index()
+    return pd.DataFrame({
+        column: df[column].astype(dtype)
+        for column, dtype in like.dtypes.items()
+    })
+
+
+@pytest.mark.parametrize('request_args', REQUESTS)
+def test_compact_frame_round_trips(universal, request_args):
+    default = universal.get_data(HAWK_IDS, FIELD_IDS, **request_args).to_df()
+    compact = universal.get_data(
+        HAWK_IDS, FIELD_IDS, compact=True, **request_args
+    ).to_df()
+
+    assert compact.index.name == 'date'
+    assert str(compact.index.tz) == 'UTC'
+    assert compact['ticker'].dtype == 'category'
+    assert compact['rating'].dtype == 'category'
+    assert compact['close'].dtype == np.float64
+    pd.testing.assert_frame_equal(expand(compact, default), default)
+    assert compact.memory_usage(deep=True).sum() < \
+        default.memory_usage(deep=True).sum()
+
+
+def test_integer_fields_are_nullable_integers(universal):
+    args = (HAWK_IDS, FIELD_IDS, '2024-01-01', '2024-01-02', 'raw')
+    default = universal.get_data(*args).to_df()
+    compact = universal.get_data(*args, compact=True).to_df()
+
+    assert default['volume'].dtype == np.float64
+    assert compact['volume'].dtype == 'Int64'
+    assert compact['volume'].isna().sum() == default['volume'].isna().sum()
+    assert compact['volume'].dropna().tolist() == \
+        default['volume'].dropna().astype(int).tolist()
+
+
+def test_float32_keeps_seven_significant_digits(universal):
+    args = (HAWK_IDS, FIELD_IDS, '2024-01-01', '2024-01-03', 'raw')
+    default = universal.get_data(*args).to_df()
+    compact = universal.get_data(*args, compact=True, float32=True).to_df()
+
+    assert compact['close'].dtype == np.float32
+    np.testing.assert_allclose(
+        compact['close'].to_numpy(np.float64), default['close'], rtol=1e-7
+    )
+
+
+def test_compact_arrow_round_trips(universal):
+    args = (HAWK_IDS, FIELD_IDS, '2024-01-01', '2024-01-03', 'raw')
+    default = universal.get_data(*args, arrow=True).to_arrow()
+    compact = universal.get_data(
+        *args, arrow=True, compact=True, float32=True
+    ).to_arrow()
+
+    types = dict(zip(compact.schema.names, compact.schema.types))
+    assert pa.types.is_dictionary(types['ticker'])
+    assert pa.types.is_dictionary(types['rating'])
+    assert types['volume'] == pa.int64()
+    assert types['close'] == pa.float32()
+    assert compact['ticker'].cast(pa.string()).equals(default['ticker'])
+    assert compact['rating'].cast(pa.string()).equals(default['rating'])
+    assert compact['volume'].cast(pa.float64()).equals(default['volume'])
+    assert compact['date'].equals(default['date'])
+
+
+def test_compact_frame_round_trips_through_parquet(universal, tmp_path):
+    args = (HAWK_IDS, FIELD_IDS, '2024-01-01', '2024-01-03', 'raw')
+    compact = universal.get_data(*args, compact=True).to_df()
+
+    path = tmp_path / 'compact.parquet'
+    compact.to_parquet(path)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), compact)
+
+
+def test_compact_supplemental_round_trips(duckdb_backend):
+    supplemental = UniversalSupplemental(backend=duckdb_backend)
+    args = (['fred', 'eia'], ['GDP', 'WCESTUS1'], '2024-01-01', '2024-01-07')
+    default = supplemental.get_data(*args).to_df()
+    compact = supplemental.get_data(*args, compact=True).to_df()
+
+    assert not default.empty
+    assert compact.index.name == 'record_timestamp'
+    assert compact['source'].dtype == 'category'
+    assert compact['series_id'].dtype == 'category'
+    pd.testing.assert_frame_equal(expand(compact, default), default)
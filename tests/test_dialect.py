@@ -0,0 +1,280 @@
+"""
+@description: Tests for the BigQuery to DuckDB rewrite and the queries it runs.
+@author: Rithwik Babu
+"""
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from google.cloud import bigquery
+
+from hawk_sdk.api.system.repository import SystemRepository
+from hawk_sdk.api.universal.repository import UniversalRepository
+from hawk_sdk.api.universal_supplemental.repository import (
+    UniversalSupplementalRepository,
+)
+from hawk_sdk.core.backend.dialect import (
+    duckdb_parameters,
+    table_references,
+    to_duckdb,
+)
+from hawk_sdk.core.common.intervals import align_range
+
+REWRITES = [
+    (
+        "SELECT * FROM `wsb-hc-qasap-ae2e.production.records` AS r",
+        'SELECT * FROM "production"."records" AS r',
+    ),
+    (
+        "TIMESTAMP_TRUNC(r.record_timestamp, DAY) AS date",
+        "date_trunc('DAY', r.record_timestamp) AS date",
+    ),
+    (
+        "TIMESTAMP_SECONDS(DIV(UNIX_SECONDS(r.record_timestamp), 900) * 900)",
+        "to_timestamp((epoch(r.record_timestamp)::BIGINT // 900) * 900)",
+    ),
+    (
+        "RANGE_BUCKET(UNIX_MICROS(r.record_timestamp) - 1, @cutoff_micros)",
+        "len(list_filter($cutoff_micros, "
+        "b -> b <= epoch_us(r.record_timestamp) - 1))",
+    ),
+    (
+        "BIT_XOR(FARM_FINGERPRINT(CONCAT(CAST(hawk_id AS STRING), value)))",
+        "BIT_XOR(CAST(hash(CONCAT(CAST(hawk_id AS VARCHAR), value))::HUGEINT"
+        " - 9223372036854775808 AS BIGINT))",
+    ),
+    (
+        "r.hawk_id IN UNNEST(@hawk_ids) AND r.record_timestamp <= @timestamp",
+        "r.hawk_id IN (SELECT UNNEST($hawk_ids)) "
+        "AND r.record_timestamp <= $timestamp",
+    ),
+    (
+        "SELECT w.* EXCEPT (date, hawk_id) FROM wide_data AS w",
+        "SELECT w.* EXCLUDE (date, hawk_id) FROM wide_data AS w",
+    ),
+    (
+        "CAST(NULL AS FLOAT64), CAST(NULL AS INT64), CAST(NULL AS STRING)",
+        "CAST(NULL AS DOUBLE), CAST(NULL AS BIGINT), CAST(NULL AS VARCHAR)",
+    ),
+]
+
+# Every query template of the repositories, as (repository, method, args).
+TEMPLATES = [
+    ('universal', 'submit_data',
+     ([1, 2], [1, 2, 3], '2024-01-01', '2024-01-02', 'raw')),
+    ('universal', 'submit_data',
+     ([1, 2], [1, 2, 3], '2024-01-01', '2024-01-02', '1h',
+      {1: 'max', 2: 'sum', 3: 'first'})),
+    ('universal', 'submit_data',
+     ([1, 2], [1, 2], '2024-01-01', '2024-01-02', '15m',
+      {1: 'mean', 2: 'count'}, False, 5)),
+    ('universal', 'submit_data_wide',
+     ([1, 2], [1, 2, 3], '2024-01-01', '2024-01-02', 'raw')),
+    ('universal', 'submit_data_wide',
+     ([1, 2], [1, 2], '2024-01-01', '2024-01-02', '1d', {1: 'min'}, False)),
+    ('universal', 'submit_row_count',
+     ([1, 2], [1, 2], '2024-01-01', '2024-01-02', '6h')),
+    ('universal', 'submit_snapshot',
+     ([1, 2, 3], [1, 2], '2024-01-02 12:00:00')),
+    ('universal', 'submit_latest_values',
+     ([1, 2, 3], [1, 2], '2024-01-02 12:00:00', '2024-01-01 00:00:00')),
+    ('universal', 'submit_as_of',
+     ([1, 2, 3], [1, 2], [1704110400000000, 1704196800000000])),
+    ('universal', 'submit_latest_snapshot', ([1, 2, 3], [1, 2])),
+    ('universal', 'submit_field_ids_by_name', (['close', 'volume'],)),
+    ('universal', 'submit_field_names', ([1, 3],)),
+    ('universal', 'submit_all_tickers', ()),
+    ('universal', 'submit_all_fields', ()),
+    ('system', 'submit_hawk_ids', (['AAA', 'CCC'],)),
+    ('system', 'submit_identifiers', (4,)),
+    ('system', 'submit_identifiers', (4, [1, 2])),
+    ('system', 'submit_identifier_signatures', (4,)),
+    ('supplemental', 'submit_data',
+     (['fred'], ['GDP'], '2024-01-01', '2024-01-05')),
+    ('supplemental', 'submit_data',
+     (['fred'], ['GDP', 'CPI'], '2024-01-01', '2024-01-05', 3)),
+    ('supplemental', 'submit_data_by_source',
+     (['fred', 'eia'], '2024-01-01', '2024-01-05')),
+    ('supplemental', 'submit_row_count',
+     (['fred'], '2024-01-01', '2024-01-05', ['CPI'])),
+    ('supplemental', 'submit_latest_data', (['fred'], ['GDP', 'CPI'])),
+    ('supplemental', 'submit_all_series', ()),
+    ('supplemental', 'submit_all_series', ('eia',)),
+    ('supplemental', 'submit_available_sources', ()),
+]
+
+REPOSITORIES = {
+    'universal': UniversalRepository,
+    'system': SystemRepository,
+    'supplemental': UniversalSupplementalRepository,
+}
+
+
+def view_name(dataset: str, table: str) -> str:
+    """Names the DuckDB relation of a table, as DuckDBBackend does.
+
+    :param dataset: The environment.
+    :param table: The table name.
+    :return: The quoted view name.
+    """
+    return f'"{dataset}"."{table}"'
+
+
+def read_records(mirror: str) -> pd.DataFrame:
+    """Reads the mirrored records for computing expected results.
+
+    :param mirror: The mirror directory.
+    :return: The records as a pandas DataFrame.
+    """
+    path = os.path.join(mirror, 'production', 'records')
+    return pq.read_table(path).to_pandas()
+
+
+@pytest.mark.parametrize('query, expected', REWRITES)
+def test_to_duckdb_rewrites(query, expected):
+    assert to_duckdb(query, view_name) == expected
+
+
+def test_table_references():
+    query = (
+        "SELECT * FROM `wsb-hc-qasap-ae2e.production.records` AS r "
+        "JOIN `wsb-hc-qasap-ae2e.production.fields` AS f USING (field_id) "
+        "JOIN `other-project.development.records` AS d USING (hawk_id)"
+    )
+    assert table_references(query) == {
+        ('production', 'records'),
+        ('production', 'fields'),
+        ('development', 'records'),
+    }
+
+
+def test_duckdb_parameters():
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ArrayQueryParameter('hawk_ids', 'INT64', [1, 2]),
+        bigquery.ScalarQueryParameter('start_date', 'STRING', '2024-01-01'),
+        bigquery.ScalarQueryParameter(
+            'timestamp', 'TIMESTAMP', '2024-01-02 03:04:05'
+        ),
+        bigquery.ScalarQueryParameter(
+            'cutoff', 'TIMESTAMP',
+            pd.Timestamp('2024-01-02T03:04:05-05:00').to_pydatetime()
+        ),
+    ])
+    assert duckdb_parameters(job_config) == {
+        'hawk_ids': [1, 2],
+        'start_date': '2024-01-01',
+        'timestamp': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        'cutoff': datetime(2024, 1, 2, 8, 4, 5, tzinfo=timezone.utc),
+    }
+    assert duckdb_parameters(None) == {}
+
+
+@pytest.mark.parametrize('repository, method, args', TEMPLATES)
+def test_every_query_template_runs_on_duckdb(
+    duckdb_backend, repository, method, args
+):
+    repo = REPOSITORIES[repository]('production', backend=duckdb_backend)
+    result = getattr(repo, method)(*args).result()
+
+    assert isinstance(result, pa.Table)
+    assert result.num_rows > 0
+
+
+@pytest.mark.parametrize('interval, aggregation', [
+    ('raw', None), ('1d', 'last'), ('6h', 'max'), ('15m', 'sum'),
+])
+def test_submit_data_matches_records(
+    duckdb_backend, mirror, interval, aggregation
+):
+    repository = UniversalRepository('production', backend=duckdb_backend)
+    start_date, end_date = '2024-01-01 06:00:00', '2024-01-02 17:59:59'
+    aggregations = {1: aggregation} if aggregation else None
+    result = repository.submit_data(
+        [1, 3], [1], start_date, end_date, interval, aggregations
+    ).result().to_pandas()
+
+    # Aggregated queries widen the range to whole buckets.
+    start_date, end_date = align_range(start_date, end_date, interval)
+    records = read_records(mirror)
+    records = records[
+        records['hawk_id'].isin([1, 3]) & (records['field_id'] == 1)
+        & (records['record_timestamp'] >= pd.Timestamp(start_date, tz='UTC'))
+        & (records['record_timestamp'] <= pd.Timestamp(end_date, tz='UTC'))
+    ]
+    date = records['record_timestamp']
+    if interval != 'raw':
+        date = date.dt.floor(pd.Timedelta(interval.replace('m', 'min')))
+    expected = records.assign(date=date).sort_values('record_timestamp')
+    if aggregation:
+        expected = expected.groupby(['date', 'hawk_id'], as_index=False)
+        expected = expected['double_value'].agg(aggregation)
+    expected = expected.sort_values(['date', 'hawk_id'])
+
+    assert result['ticker'].isin(['AAA', 'CCC']).all()
+    assert (result['field_name'] == 'close').all()
+    assert result['date'].tolist() == expected['date'].tolist()
+    assert result['hawk_id'].tolist() == expected['hawk_id'].tolist()
+    assert result['double_value'].tolist() == \
+        expected['double_value'].tolist()
+
+
+def test_submit_as_of_matches_records(duckdb_backend, mirror):
+    repository = UniversalRepository('production', backend=duckdb_backend)
+    cutoffs = pd.DatetimeIndex(
+        ['2024-01-01 12:00', '2024-01-02 12:00', '2024-01-03 23:00'], tz='UTC'
+    )
+    cutoff_micros = (cutoffs.as_unit('us').asi8).tolist()
+    result = repository.submit_as_of(
+        [1, 3], [1, 2], cutoff_micros, '2024-01-01 06:00:00'
+    ).result().to_pandas()
+
+    records = read_records(mirror)
+    records = records[
+        records['hawk_id'].isin([1, 3])
+        & records['field_id'].isin([1, 2])
+        & (records['record_timestamp'] >= pd.Timestamp('2024-01-01 06:00Z'))
+        & (records['record_timestamp'] <= cutoffs[-1])
+    ]
+    # Records belong to the first cutoff at or after them.
+    cutoff_index = cutoffs.searchsorted(records['record_timestamp'])
+    expected = records.assign(cutoff_index=cutoff_index)
+    expected = expected.sort_values('record_timestamp')
+    expected = expected.groupby(
+        ['cutoff_index', 'hawk_id', 'field_id'], as_index=False
+    ).last()
+
+    assert result[['cutoff_index', 'hawk_id', 'field_id']].values.tolist() \
+        == expected[['cutoff_index', 'hawk_id', 'field_id']].values.tolist()
+    values = result['double_value'].fillna(result['int_value'])
+    expected_values = expected['double_value'].fillna(expected['int_value'])
+    assert values.tolist() == expected_values.tolist()
+
+
+def test_submit_latest_values_matches_records(duckdb_backend, mirror):
+    repository = UniversalRepository('production', backend=duckdb_backend)
+    timestamp, start_date = '2024-01-03 04:00:00', '2024-01-02 00:00:00'
+    result = repository.submit_latest_values(
+        [1, 2, 3], [1, 2, 3], timestamp, start_date
+    ).result().to_pandas()
+
+    records = read_records(mirror)
+    records = records[
+        (records['record_timestamp'] >= pd.Timestamp(start_date, tz='UTC'))
+        & (records['record_timestamp'] <= pd.Timestamp(timestamp, tz='UTC'))
+    ]
+    expected = records.sort_values('record_timestamp').groupby(
+        ['hawk_id', 'field_id'], as_index=False
+    ).last()
+    # Each row is dated at its hawk_id's latest update.
+    expected['date'] = expected.groupby('hawk_id')['record_timestamp'] \
+        .transform('max')
+
+    assert result[['hawk_id', 'field_id']].values.tolist() == \
+        expected[['hawk_id', 'field_id']].values.tolist()
+    assert result['date'].tolist() == expected['date'].tolist()
+    assert result['char_value'].tolist() == expected['char_value'].tolist()
+    assert result['int_value'].fillna(-1).tolist() == \
+        expected['int_value'].fillna(-1).tolist()
@@ -0,0 +1,95 @@
+"""
+@description: Tests for the Storage Read API download path.
+@author: Rithwik Babu
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+import pyarrow as pa
+import pytest
+from google.api_core.exceptions import PermissionDenied
+from google.cloud import bigquery
+
+from hawk_sdk.core.common import download
+from hawk_sdk.core.common.download import StorageReadDownloader
+
+DESTINATION = bigquery.TableReference.from_string('project.dataset._anon')
+
+
+def make_rows(total_rows: int = 10) -> mock.MagicMock:
+    """Builds a stand-in RowIterator of a finished query.
+
+    :param total_rows: The reported result size.
+    :return: The mock RowIterator; its REST download returns one row.
+    """
+    rows = mock.MagicMock()
+    rows.total_rows = total_rows
+    rows.client.project = 'billing'
+    rows.client.get_job.return_value.destination = DESTINATION
+    rows.to_arrow.return_value = pa.table({'hawk_id': [0]})
+    rows.to_arrow_iterable.return_value = iter(
+        pa.table({'hawk_id': [1, 2]}).to_batches()
+    )
+    return rows
+
+
+@pytest.fixture
+def read_client(monkeypatch) -> mock.MagicMock:
+    """A read client with two streams of two rows each."""
+    client = mock.MagicMock()
+    client.create_read_session.return_value = SimpleNamespace(
+        streams=[SimpleNamespace(name='s1'), SimpleNamespace(name='s2')]
+    )
+    client.read_rows.side_effect = lambda name: SimpleNamespace(
+        to_arrow=lambda session: pa.table(
+            {'hawk_id': [1, 2] if name == 's1' else [3, 4]}
+        )
+    )
+    monkeypatch.setattr(
+        download, 'get_bigquery_read_client', lambda client_: client
+    )
+    return client
+
+
+def test_unordered_read_uses_parallel_streams(read_client):
+    rows = make_rows()
+    table = StorageReadDownloader(min_rows=1, max_stream_count=4).to_arrow(
+        rows, preserve_order=False
+    )
+
+    assert sorted(table['hawk_id'].to_pylist()) == [1, 2, 3, 4]
+    kwargs = read_client.create_read_session.call_args.kwargs
+    assert kwargs['parent'] == 'projects/billing'
+    assert kwargs['max_stream_count'] == 4
+    assert kwargs['read_session'].table == DESTINATION.to_bqstorage()
+    assert not rows.to_arrow_iterable.called
+
+
+def test_ordered_read_keeps_the_client_library_path(read_client):
+    rows = make_rows()
+    table = StorageReadDownloader(min_rows=1).to_arrow(rows)
+
+    assert table['hawk_id'].to_pylist() == [1, 2]
+    assert rows.to_arrow_iterable.call_args.kwargs['bqstorage_client'] \
+        is read_client
+    assert not read_client.create_read_session.called
+
+
+def test_small_results_use_rest(read_client):
+    rows = make_rows(total_rows=10)
+    table = StorageReadDownloader(min_rows=100).to_arrow(
+        rows, preserve_order=False
+    )
+
+    assert table['hawk_id'].to_pylist() == [0]
+    assert not read_client.create_read_session.called
+
+
+def test_permission_error_falls_back_and_disables(read_client):
+    read_client.create_read_session.side_effect = PermissionDenied('no')
+    downloader = StorageReadDownloader(min_rows=1)
+
+    table = downloader.to_arrow(make_rows(), preserve_order=False)
+
+    assert table['hawk_id'].to_pylist() == [0]
+    assert downloader.disabled
@@ -0,0 +1,117 @@
+"""
+@description: Tests that DataObject exports read back to the same data.
+@author: Rithwik Babu
+"""
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from hawk_sdk.api.universal.main import Universal
+from hawk_sdk.core.common.data_object import DataObject
+from hawk_sdk.core.common.export import read_arrow
+
+ARGS = ([1, 2, 3], [1, 2, 3], '2024-01-01', '2024-01-03', 'raw')
+
+LAYOUTS = [
+    dict(),
+    dict(compact=True),
+    dict(compact=True, float32=True),
+    dict(arrow=True),
+    dict(arrow=True, compact=True),
+]
+
+
+@pytest.fixture
+def universal(duckdb_backend) -> Universal:
+    """A Universal datasource over the DuckDB mirror fixture."""
+    return Universal(backend=duckdb_backend)
+
+
+@pytest.mark.parametrize('compression', ['zstd', 'snappy', None])
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_parquet_round_trips(universal, tmp_path, layout, compression):
+    data = universal.get_data(*ARGS, **layout)
+    path = str(tmp_path / 'data.parquet')
+    data.to_parquet(path, compression=compression, row_group_size=50)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(path), data.to_df())
+
+
+@pytest.mark.parametrize('compression', ['lz4', 'zstd', None])
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_feather_round_trips(universal, tmp_path, layout, compression):
+    data = universal.get_data(*ARGS, **layout)
+    path = str(tmp_path / 'data.feather')
+    data.to_feather(path, compression=compression)
+
+    pd.testing.assert_frame_equal(pd.read_feather(path), data.to_df())
+    if compression is None:
+        assert read_arrow(path).equals(data.to_arrow())
+
+
+@pytest.mark.parametrize('compression', [None, 'lz4', 'zstd'])
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_arrow_file_round_trips(universal, tmp_path, layout, compression):
+    data = universal.get_data(*ARGS, **layout)
+    path = str(tmp_path / 'data.arrow')
+    data.to_arrow(path, compression=compression, batch_rows=40)
+
+    table = read_arrow(path)
+    assert table.equals(data.to_arrow())
+    assert max(len(chunk) for chunk in table['hawk_id'].chunks) <= 40
+    pd.testing.assert_frame_equal(table.to_pandas(), data.to_df())
+
+
+def read_csv(path: str) -> pd.DataFrame:
+    """Reads an exported CSV with dates parsed as UTC timestamps.
+
+    :param path: The CSV file.
+    :return: The parsed frame.
+    """
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'], utc=True, format='ISO8601')
+    return df
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_chunked_csv_matches_pandas_csv(universal, tmp_path, layout):
+    data = universal.get_data(*ARGS, **layout)
+    pandas_path = str(tmp_path / 'pandas.csv')
+    chunked_path = str(tmp_path / 'chunked.csv')
+    data.to_csv(pandas_path)
+    data.to_csv(chunked_path, chunk_rows=7, max_workers=3)
+
+    with open(chunked_path) as f:
+        lines = f.read().splitlines()
+    assert lines.count(lines[0]) == 1
+    assert len(lines) == data.count() + 1
+    # Arrow writes whole floats without a decimal point, so read_csv may
+    # infer integers where the pandas file has floats.
+    pd.testing.assert_frame_equal(
+        read_csv(chunked_path), read_csv(pandas_path), check_dtype=False
+    )
+
+
+def test_empty_csv_keeps_its_header(tmp_path):
+    data = DataObject('empty', pd.DataFrame({
+        'date': pd.Series([], dtype='datetime64[us, UTC]'),
+        'hawk_id': pd.Series([], dtype=np.int64),
+    }))
+    path = str(tmp_path / 'empty.csv')
+    data.to_csv(path, chunk_rows=10)
+
+    with open(path) as f:
+        assert f.read().splitlines() == ['"date","hawk_id"']
+
+
+def test_mixed_field_columns_are_written_as_strings(tmp_path):
+    df = pd.DataFrame({
+        'hawk_id': [1, 2, 3],
+        'rating': pd.Series([1.5, 'AA', np.nan], dtype=object),
+    })
+    path = str(tmp_path / 'mixed.parquet')
+    DataObject('mixed', df).to_parquet(path)
+
+    table = pq.read_table(path)
+    assert table['rating'].to_pylist() == ['1.5', 'AA', None]
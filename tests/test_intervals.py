@@ -0,0 +1,37 @@
+"""
+@description: Tests for the interval bucketing helpers.
+@author: Rithwik Babu
+"""
+import pytest
+
+from hawk_sdk.core.common.intervals import align_range
+
+
+def test_align_range_widens_to_whole_buckets():
+    assert align_range('2024-01-01 10:15:00', '2024-01-01 12:05:00', '1h') == (
+        '2024-01-01 10:00:00.000000', '2024-01-01 12:59:59.999999'
+    )
+    assert align_range('2024-01-01', '2024-01-03', '1d') == (
+        '2024-01-01 00:00:00.000000', '2024-01-03 23:59:59.999999'
+    )
+
+
+def test_align_range_converts_offsets_to_utc():
+    assert align_range(
+        '2024-01-01T23:30:00-05:00', '2024-01-02T09:10:00+02:00', '1h'
+    ) == (
+        '2024-01-02 04:00:00.000000', '2024-01-02 07:59:59.999999'
+    )
+    assert align_range(
+        '2024-01-01T23:30:00Z', '2024-01-02T00:30:00-01:00', '1d'
+    ) == (
+        '2024-01-01 00:00:00.000000', '2024-01-02 23:59:59.999999'
+    )
+
+
+@pytest.mark.parametrize('start_date, end_date', [
+    ('2024-01-01', '2024-01-02'),
+    ('2024-01-01T23:30:00-05:00', '2024-01-02T01:00:00-05:00'),
+])
+def test_align_range_keeps_raw_ranges(start_date, end_date):
+    assert align_range(start_date, end_date, 'raw') == (start_date, end_date)
@@ -0,0 +1,98 @@
+"""
+@description: Tests for streaming get_data results in whole-date chunks.
+@author: Rithwik Babu
+"""
+import asyncio
+from typing import List
+
+import pandas as pd
+import pytest
+
+from hawk_sdk.api.universal.async_main import AsyncUniversal
+from hawk_sdk.api.universal.main import Universal
+
+HAWK_IDS = [1, 2, 3]
+FIELD_IDS = [1, 2, 3]
+RANGE = ('2024-01-01', '2024-01-03')
+
+
+@pytest.fixture
+def universal(duckdb_backend) -> Universal:
+    """A Universal datasource over the DuckDB mirror fixture."""
+    return Universal(backend=duckdb_backend)
+
+
+def assert_chunks_match(chunks: List[pd.DataFrame], expected: pd.DataFrame):
+    """Checks streamed chunks against the frame get_data returns.
+
+    :param chunks: The streamed chunks, in order.
+    :param expected: The get_data result.
+    :return: None
+    """
+    for chunk in chunks:
+        assert chunk.columns.tolist() == expected.columns.tolist()
+    dates = [set(chunk['date']) for chunk in chunks]
+    for i, earlier in enumerate(dates):
+        for later in dates[i + 1:]:
+            assert max(earlier) < min(later)
+    # A field left empty in one chunk is a float column there, so concat
+    # may widen its dtype; the values must still match.
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), expected, check_dtype=False
+    )
+
+
+@pytest.mark.parametrize('interval, aggregations', [
+    ('raw', None),
+    ('6h', {1: 'max', 2: 'sum'}),
+    ('1d', None),
+])
+@pytest.mark.parametrize('batch_rows, date_chunk_days', [
+    (10, 1),
+    (50, 1),
+    (50, None),
+    (10_000, 1),
+])
+def test_chunks_concatenate_to_get_data(
+    universal, interval, aggregations, batch_rows, date_chunk_days
+):
+    args = (HAWK_IDS, FIELD_IDS, *RANGE, interval)
+    expected = universal.get_data(*args, aggregations=aggregations).to_df()
+    assert not expected.empty
+
+    chunks = [
+        chunk.to_df() for chunk in universal.iter_data(
+            *args, batch_rows=batch_rows, date_chunk_days=date_chunk_days,
+            aggregations=aggregations
+        )
+    ]
+    assert_chunks_match(chunks, expected)
+
+
+def test_small_batches_stream_several_chunks(universal):
+    chunks = list(universal.iter_data(
+        HAWK_IDS, FIELD_IDS, *RANGE, 'raw', batch_rows=10, date_chunk_days=1
+    ))
+    assert len(chunks) > 1
+
+
+def test_async_chunks_concatenate_to_get_data(duckdb_backend):
+    datasource = AsyncUniversal(backend=duckdb_backend)
+    args = (HAWK_IDS, FIELD_IDS, *RANGE, 'raw')
+
+    async def run() -> List[pd.DataFrame]:
+        return [
+            chunk.to_df() async for chunk in datasource.iter_data(
+                *args, batch_rows=10, date_chunk_days=1
+            )
+        ]
+
+    expected = Universal(backend=duckdb_backend).get_data(*args).to_df()
+    assert_chunks_match(asyncio.run(run()), expected)
+
+
+def test_snapshot_is_not_streamed(universal):
+    with pytest.raises(ValueError):
+        next(universal.iter_data(
+            HAWK_IDS, FIELD_IDS, None, '2024-01-03', 'snapshot'
+        ))
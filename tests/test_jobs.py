@@ -0,0 +1,135 @@
+"""
+@description: Tests for submitting and polling BigQuery jobs from asyncio.
+@author: Rithwik Babu
+"""
+import asyncio
+import threading
+import time
+from typing import List, Optional
+
+import pyarrow as pa
+import pytest
+from google.api_core.exceptions import BadRequest
+
+from hawk_sdk.core.common import jobs
+from hawk_sdk.core.common.jobs import run_job, wait_for_job
+from hawk_sdk.core.common.metrics import track
+
+
+class FakeJob:
+    """A QueryJob that finishes after a number of polls."""
+
+    def __init__(self, polls: int, error: Optional[str] = None) -> None:
+        """Initializes the fake job.
+
+        :param polls: How many done() calls return False before it finishes.
+        :param error: A message the job fails with, if any.
+        """
+        self.job_id = f'job-{polls}'
+        self.polls = polls
+        self.done_calls = 0
+        self.threads: List[int] = []
+        self.error_result = None if error is None else {'message': error}
+        self.total_bytes_processed = 100
+        self.total_bytes_billed = 10
+
+    def done(self) -> bool:
+        """Polls the job state.
+
+        :return: Whether the job has finished.
+        """
+        self.threads.append(threading.get_ident())
+        self.done_calls += 1
+        return self.done_calls > self.polls
+
+    def result(self) -> pa.Table:
+        """Returns the rows, raising the job's error if it failed.
+
+        :return: A one-row table.
+        """
+        if self.error_result is not None:
+            raise BadRequest(self.error_result['message'])
+        return pa.table({'value': [1]})
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> List[float]:
+    """Records the delays wait_for_job sleeps for, without sleeping."""
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record(delay: float) -> None:
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(jobs.asyncio, 'sleep', record)
+    return delays
+
+
+def test_poll_delay_doubles_up_to_the_maximum(sleeps):
+    job = FakeJob(polls=6)
+    finished = asyncio.run(
+        wait_for_job(job, poll_interval=0.5, max_poll_interval=3.0)
+    )
+    assert finished is job
+    assert sleeps == [0.5, 1.0, 2.0, 3.0, 3.0, 3.0]
+    assert job.done_calls == 7
+
+
+def test_finished_job_is_not_slept_on(sleeps):
+    job = FakeJob(polls=0)
+    asyncio.run(wait_for_job(job))
+    assert sleeps == [] and job.done_calls == 1
+
+
+def test_job_state_is_polled_off_the_event_loop(sleeps):
+    job = FakeJob(polls=2)
+
+    async def run() -> int:
+        await wait_for_job(job)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert job.threads and loop_thread not in job.threads
+
+
+def test_failed_job_raises_its_error(sleeps):
+    with pytest.raises(BadRequest, match='Syntax error'):
+        asyncio.run(wait_for_job(FakeJob(polls=1, error='Syntax error')))
+
+
+def test_run_job_submits_from_a_worker_thread(sleeps):
+    job = FakeJob(polls=1)
+    submits = []
+
+    def submit(query: str) -> FakeJob:
+        submits.append((query, threading.get_ident()))
+        return job
+
+    async def run() -> int:
+        assert await run_job(submit, 'SELECT 1') is job
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert [query for query, _ in submits] == ['SELECT 1']
+    assert submits[0][1] != loop_thread
+
+
+def test_jobs_are_awaited_concurrently():
+    job_list = [FakeJob(polls=3) for _ in range(20)]
+
+    async def run() -> None:
+        await asyncio.gather(*(
+            wait_for_job(job, poll_interval=0.05, max_poll_interval=0.05)
+            for job in job_list
+        ))
+
+    with track('test') as metrics:
+        began = time.monotonic()
+        asyncio.run(run())
+        elapsed = time.monotonic() - began
+
+    # One job alone takes three 0.05s sleeps; in sequence 20 take 3s.
+    assert elapsed < 1.5
+    assert len(metrics.jobs) == 20
+    assert metrics.total_bytes_processed == 2000
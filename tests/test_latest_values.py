@@ -0,0 +1,130 @@
+"""
+@description: Tests for per-field latest-value snapshots.
+@author: Rithwik Babu
+"""
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hawk_sdk.api.universal.async_main import AsyncUniversal
+from hawk_sdk.api.universal.main import Universal
+
+HAWK_IDS = [1, 2, 3]
+FIELD_IDS = [1, 2, 3]
+CUTOFF = '2024-01-03 23:00:00'
+
+
+@pytest.fixture
+def universal(duckdb_backend) -> Universal:
+    """A Universal datasource over the DuckDB mirror fixture."""
+    return Universal(backend=duckdb_backend)
+
+
+def expected_frame(rows: list) -> pd.DataFrame:
+    """Builds the snapshot frame expected for rows of the mirror fixture.
+
+    :param rows: (date, hawk_id, ticker, close, rating, volume) tuples.
+    :return: The frame get_data returns for them.
+    """
+    dates, hawk_ids, tickers, close, rating, volume = zip(*rows)
+    return pd.DataFrame({
+        'date': pd.to_datetime(list(dates), utc=True).as_unit('us'),
+        'hawk_id': np.array(hawk_ids, dtype=np.int64),
+        'ticker': list(tickers),
+        'close': np.array(close, dtype=float),
+        'rating': pd.array(rating, dtype='str'),
+        'volume': np.array(volume, dtype=float),
+    })
+
+
+def snapshot(universal: Universal, **kwargs) -> pd.DataFrame:
+    """Runs a snapshot of every hawk_id and field at CUTOFF.
+
+    :param universal: The datasource.
+    :param kwargs: Extra get_data arguments.
+    :return: The snapshot frame.
+    """
+    return universal.get_data(
+        HAWK_IDS, FIELD_IDS, None, CUTOFF, 'snapshot', **kwargs
+    ).to_df()
+
+
+def test_default_snapshot_keeps_only_the_latest_timestamp(universal):
+    df = snapshot(universal)
+    # Only close is recorded at 23:00, and hawk_id 3 stopped the day before.
+    assert df['hawk_id'].tolist() == [1, 2]
+    assert df.columns.tolist() == ['date', 'hawk_id', 'ticker', 'close']
+
+
+def test_per_field_takes_each_fields_own_latest_value(universal):
+    expected = expected_frame([
+        ('2024-01-02 23:00', 3, 'CCC', 347, 'R324', 3042),
+        ('2024-01-03 23:00', 1, 'AAA', 171, 'R148', 1066),
+        ('2024-01-03 23:00', 2, 'BBB', 271, 'R248', 2066),
+    ])
+    pd.testing.assert_frame_equal(
+        snapshot(universal, per_field=True), expected, check_dtype=False
+    )
+
+
+def test_max_staleness_drops_values_older_than_the_bound(universal):
+    # 12h before the cutoff is 2024-01-03 11:00: hawk_id 3 and every
+    # rating are older than that.
+    expected = expected_frame([
+        ('2024-01-03 23:00', 1, 'AAA', 171, None, 1066),
+        ('2024-01-03 23:00', 2, 'BBB', 271, None, 2066),
+    ]).drop(columns='rating')
+    pd.testing.assert_frame_equal(
+        snapshot(universal, per_field=True, max_staleness='12h'), expected
+    )
+    # The bound is inclusive: the ratings at 2024-01-03 00:00 stay within
+    # 23h, and hawk_id 3's last records, at 2024-01-02 23:00, within 1d.
+    within_23h = snapshot(universal, per_field=True, max_staleness='23h')
+    assert within_23h['rating'].tolist() == ['R148', 'R248']
+    within_1d = snapshot(universal, per_field=True, max_staleness='1d')
+    assert within_1d['hawk_id'].tolist() == [3, 1, 2]
+
+
+def test_earlier_cutoff_ignores_later_records(universal):
+    df = universal.get_data(
+        HAWK_IDS, [1, 2], None, '2024-01-02 05:00:00', 'snapshot',
+        per_field=True
+    ).to_df()
+    assert df['close'].tolist() == [129, 229, 329]
+    assert df['volume'].tolist() == [1024, 2024, 3024]
+
+
+def test_max_staleness_requires_per_field(universal):
+    with pytest.raises(ValueError, match='per_field'):
+        snapshot(universal, max_staleness='1d')
+
+
+def test_latest_snapshot_staleness_is_relative_to_now(universal):
+    latest = universal.get_latest_snapshot(HAWK_IDS, FIELD_IDS, per_field=True)
+    pd.testing.assert_frame_equal(
+        latest.to_df().drop(columns='date'),
+        snapshot(universal, per_field=True).drop(columns='date')
+    )
+    # The fixture's records are from 2024, so none are within a day of now.
+    stale = universal.get_latest_snapshot(
+        HAWK_IDS, FIELD_IDS, per_field=True, max_staleness='1d'
+    )
+    assert stale.to_df().empty
+
+
+def test_async_per_field_matches_sync(universal, duckdb_backend):
+    datasource = AsyncUniversal(backend=duckdb_backend)
+
+    async def run() -> pd.DataFrame:
+        data = await datasource.get_data(
+            HAWK_IDS, FIELD_IDS, None, CUTOFF, 'snapshot', per_field=True,
+            max_staleness='12h'
+        )
+        return data.to_df()
+
+    pd.testing.assert_frame_equal(
+        asyncio.run(run()),
+        snapshot(universal, per_field=True, max_staleness='12h')
+    )
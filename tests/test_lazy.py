@@ -0,0 +1,110 @@
+"""
+@description: Tests for pushing lazy head, count and select into the query.
+@author: Rithwik Babu
+"""
+import pandas as pd
+import pytest
+
+from hawk_sdk.api.universal.main import Universal
+from hawk_sdk.core.common.lazy import LazyDataObject
+
+HAWK_IDS = [1, 2, 3]
+FIELD_IDS = [1, 2, 3]
+
+REQUESTS = [
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='raw'),
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='6h',
+         aggregations={1: 'max', 2: 'sum'}),
+    dict(start_date=None, end_date='2024-01-03 23:00:00', interval='snapshot'),
+    dict(start_date=None, end_date='2024-01-03 23:00:00', interval='snapshot',
+         per_field=True),
+    dict(start_date=None, end_date='2024-01-03 23:00:00', interval='snapshot',
+         per_field=True, max_staleness='12h'),
+]
+
+
+@pytest.fixture
+def universal(duckdb_backend) -> Universal:
+    """A Universal datasource over the DuckDB mirror fixture."""
+    return Universal(backend=duckdb_backend)
+
+
+@pytest.mark.parametrize('request_args', REQUESTS)
+def test_head_and_count_match_collect(universal, request_args):
+    collected = universal.get_data(HAWK_IDS, FIELD_IDS, **request_args).to_df()
+    assert not collected.empty
+
+    def lazy() -> LazyDataObject:
+        return universal.get_data(
+            HAWK_IDS, FIELD_IDS, lazy=True, **request_args
+        )
+
+    for n in (1, 4, 1000):
+        data = lazy()
+        pd.testing.assert_frame_equal(data.head(n), collected.head(n))
+        assert not data.loaded
+    data = lazy()
+    assert data.count() == len(collected)
+    assert not data.loaded
+
+
+@pytest.mark.parametrize('request_args', REQUESTS)
+def test_select_matches_collect(universal, request_args):
+    columns = ['date', 'hawk_id', 'close']
+    collected = universal.get_data(HAWK_IDS, FIELD_IDS, **request_args)
+    expected = collected.select(columns).to_df()
+
+    selected = universal.get_data(
+        HAWK_IDS, FIELD_IDS, lazy=True, **request_args
+    ).select(columns)
+    pd.testing.assert_frame_equal(selected.head(2), expected.head(2))
+    assert selected.count() == len(expected)
+    pd.testing.assert_frame_equal(selected.to_df(), expected)
+
+
+def test_select_narrows_range_queries_to_the_selected_fields(universal):
+    columns = ['date', 'hawk_id', 'volume']
+    args = (HAWK_IDS, [1, 2], '2024-01-01', '2024-01-03', 'raw')
+
+    selected = universal.get_data(*args, lazy=True).select(columns)
+    expected = universal.get_data(HAWK_IDS, [2], *args[2:]).to_df()[columns]
+    assert selected.count() == len(expected) == 26
+    pd.testing.assert_frame_equal(selected.head(5), expected.head(5))
+    pd.testing.assert_frame_equal(selected.to_df(), expected)
+
+
+def test_snapshot_select_keeps_the_requested_fields(universal):
+    columns = ['date', 'hawk_id', 'volume']
+    args = (HAWK_IDS, FIELD_IDS, None, '2024-01-03 23:00:00', 'snapshot')
+
+    # Rows are dated at each hawk_id's latest update of any requested field,
+    # which a query for volume alone would move to its last volume record.
+    expected = universal.get_data(*args, per_field=True).select(columns)
+    selected = universal.get_data(*args, per_field=True, lazy=True)
+    selected = selected.select(columns)
+    pd.testing.assert_frame_equal(selected.to_df(), expected.to_df())
+
+
+def test_snapshot_head_and_count_keep_per_field_options(universal):
+    service = universal.service
+    args = (HAWK_IDS, FIELD_IDS, None, '2024-01-03 23:00:00', 'snapshot')
+
+    latest = service.get_data(*args)
+    per_field = service.get_data(*args, per_field=True)
+    fresh = service.get_data(
+        *args, per_field=True, max_staleness='12h'
+    )
+    assert len(latest) == 2 and len(per_field) == 3 and len(fresh) == 2
+
+    assert service.count_data(*args) == 2
+    assert service.count_data(*args, per_field=True) == 3
+    assert service.count_data(
+        *args, per_field=True, max_staleness='12h'
+    ) == 2
+    pd.testing.assert_frame_equal(
+        service.head_data(*args, 5, per_field=True), per_field
+    )
+    pd.testing.assert_frame_equal(
+        service.head_data(*args, 5, per_field=True, max_staleness='12h'),
+        fresh
+    )
@@ -0,0 +1,160 @@
+"""
+@description: Tests for the process-wide metadata cache.
+@author: Rithwik Babu
+"""
+import asyncio
+from typing import Callable, List
+
+import pandas as pd
+import pytest
+
+from hawk_sdk.api.universal.main import Universal
+from hawk_sdk.core.cache import metadata_cache as metadata_cache_module
+from hawk_sdk.core.cache.metadata_cache import MetadataCache, metadata_cache
+
+
+class Clock:
+    """A monotonic clock the tests move by hand."""
+
+    def __init__(self) -> None:
+        """Starts the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Returns the current time.
+
+        :return: Seconds since the clock started.
+        """
+        return self.now
+
+
+class Loader:
+    """Counts loads and returns the load number."""
+
+    def __init__(self) -> None:
+        """Initializes the counter."""
+        self.calls = 0
+
+    def __call__(self) -> int:
+        """Loads a value.
+
+        :return: How many loads have run, including this one.
+        """
+        self.calls += 1
+        return self.calls
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    """Replaces the clock the metadata cache reads."""
+    clock = Clock()
+    monkeypatch.setattr(metadata_cache_module.time, 'monotonic', clock)
+    return clock
+
+
+def test_values_are_loaded_once_until_they_expire(clock):
+    cache = MetadataCache(ttl=60)
+    loader = Loader()
+    key = ('production', 'fields', 'bigquery')
+
+    assert [cache.get(key, loader) for _ in range(3)] == [1, 1, 1]
+    clock.now = 59.9
+    assert cache.get(key, loader) == 1
+    clock.now = 60
+    assert cache.get(key, loader) == 2
+    assert loader.calls == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = MetadataCache(ttl=60, max_entries=2)
+    loaders = {name: Loader() for name in 'abc'}
+
+    def get(name: str) -> int:
+        return cache.get(('production', name), loaders[name])
+
+    get('a'), get('b')
+    get('a')
+    get('c')
+    assert len(cache._entries) == 2
+    get('a'), get('c')
+    assert loaders['a'].calls == 1 and loaders['c'].calls == 1
+    get('b')
+    assert loaders['b'].calls == 2
+
+
+def test_invalidate_drops_one_environment(clock):
+    cache = MetadataCache(ttl=60)
+    production, development = Loader(), Loader()
+    cache.get(('production', 'fields'), production)
+    cache.get(('development', 'fields'), development)
+
+    cache.invalidate('production')
+    cache.get(('production', 'fields'), production)
+    cache.get(('development', 'fields'), development)
+    assert production.calls == 2 and development.calls == 1
+
+    cache.invalidate()
+    cache.get(('development', 'fields'), development)
+    assert development.calls == 2
+
+
+def test_async_loaders_share_the_cache(clock):
+    cache = MetadataCache(ttl=60)
+    loader = Loader()
+
+    async def load() -> int:
+        return loader()
+
+    async def run() -> List[int]:
+        return [
+            await cache.get_async(('production', 'fields'), load)
+            for _ in range(2)
+        ]
+
+    assert asyncio.run(run()) == [1, 1]
+    assert cache.get(('production', 'fields'), Loader()) == 1
+    clock.now = 60
+    assert asyncio.run(run()) == [2, 2]
+
+
+def test_ttl_defaults_to_the_environment_variable(monkeypatch):
+    monkeypatch.setenv('HAWK_SDK_METADATA_TTL', '5')
+    assert MetadataCache().ttl == 5.0
+
+
+@pytest.fixture
+def counted_fields(duckdb_backend, monkeypatch):
+    """A Universal datasource counting its fields table loads.
+
+    :return: The datasource, and a list holding a None per load.
+    """
+    metadata_cache.invalidate()
+    universal = Universal(backend=duckdb_backend)
+    loads = []
+    fetch_all_fields: Callable = universal.repository.fetch_all_fields
+
+    def counted() -> object:
+        loads.append(None)
+        return fetch_all_fields()
+
+    monkeypatch.setattr(universal.repository, 'fetch_all_fields', counted)
+    yield universal, loads
+    metadata_cache.invalidate()
+
+
+def test_local_metadata_reads_fields_from_the_cache(counted_fields):
+    universal, loads = counted_fields
+    args = ([1, 2], [1, 2], '2024-01-01', '2024-01-02', 'raw')
+
+    expected = universal.get_data(*args).to_df()
+    for _ in range(3):
+        pd.testing.assert_frame_equal(
+            universal.get_data(*args, local_metadata=True).to_df(), expected
+        )
+    names = universal.service.get_field_names([1, 2])
+    assert names == {1: 'close', 2: 'volume'}
+    assert len(loads) == 1
+
+    universal.invalidate_metadata()
+    universal.get_data(*args, local_metadata=True)
+    assert len(loads) == 2
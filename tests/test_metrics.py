@@ -0,0 +1,136 @@
+"""
+@description: Tests for collecting per-call query metrics across threads.
+@author: Rithwik Babu
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from hawk_sdk.api.universal.async_main import AsyncUniversal
+from hawk_sdk.api.universal.main import Universal
+from hawk_sdk.core.common.metrics import (
+    CallMetrics,
+    add_metrics_sink,
+    record_phase,
+    record_rows,
+    remove_metrics_sink,
+    track
+)
+
+ARGS = ([1, 2, 3], [1, 2, 3], '2024-01-01', '2024-01-02', 'raw')
+
+
+@pytest.fixture
+def sink() -> List[CallMetrics]:
+    """Collects the metrics of every call finished during the test."""
+    received = []
+    add_metrics_sink(received.append)
+    yield received
+    remove_metrics_sink(received.append)
+
+
+def test_concurrent_updates_are_not_lost():
+    metrics = CallMetrics('test')
+
+    def update() -> None:
+        for _ in range(1000):
+            metrics.add_rows(1)
+            metrics.add_phase('download', 0.001)
+            metrics.add_coalesced()
+
+    threads = [threading.Thread(target=update) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.rows == 8000 and metrics.coalesced == 8000
+    assert metrics.phases['download'] == pytest.approx(8.0)
+
+
+def test_only_threads_with_the_call_context_report_into_it():
+    with track('test') as metrics:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            copied = [
+                pool.submit(contextvars.copy_context().run, record_rows, 5)
+                for _ in range(4)
+            ]
+            plain = [pool.submit(record_rows, 7) for _ in range(4)]
+            for future in copied + plain:
+                future.result()
+        record_rows(1)
+
+    # Pool threads start with an empty context, so only work run in a copy
+    # of the caller's context is counted.
+    assert metrics.rows == 21
+    record_rows(100)
+    assert metrics.rows == 21
+
+
+def test_concurrent_calls_keep_separate_metrics():
+    results = {}
+    barrier = threading.Barrier(4)
+
+    def call(rows: int) -> None:
+        with track(f'call-{rows}') as metrics:
+            barrier.wait()
+            for _ in range(rows):
+                record_rows(1)
+                with record_phase('pivot'):
+                    pass
+        results[rows] = metrics
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in (1, 2, 3, 4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert {rows: m.rows for rows, m in results.items()} == {
+        1: 1, 2: 2, 3: 3, 4: 4
+    }
+    assert all('pivot' in m.phases for m in results.values())
+
+
+def test_chunked_get_data_sums_every_chunk(duckdb_backend, sink):
+    universal = Universal(backend=duckdb_backend)
+    single = universal.get_data(*ARGS).metrics
+
+    data = universal.get_data(*ARGS, hawk_id_chunk_size=1, max_workers=3)
+    metrics = data.metrics
+    assert len(single.jobs) == 1 and len(metrics.jobs) == 3
+    assert len({job['job_id'] for job in metrics.jobs}) == 3
+    assert metrics.rows == single.rows > 0
+    assert {'submit', 'execute', 'pivot'} <= set(metrics.phases)
+    assert metrics.name == 'universal.get_data'
+    assert sink == [single, metrics]
+
+
+def test_async_get_data_sums_every_chunk(duckdb_backend, sink):
+    datasource = AsyncUniversal(backend=duckdb_backend)
+
+    async def run() -> CallMetrics:
+        data = await datasource.get_data(*ARGS, hawk_id_chunk_size=1)
+        return data.metrics
+
+    metrics = asyncio.run(run())
+    single = Universal(backend=duckdb_backend).get_data(*ARGS).metrics
+    assert len(metrics.jobs) == 3
+    assert metrics.rows == single.rows
+    assert sink == [metrics, single]
+
+
+def test_failing_sink_does_not_fail_the_call(duckdb_backend, sink):
+    def fail(metrics: CallMetrics) -> None:
+        raise RuntimeError('sink failed')
+
+    add_metrics_sink(fail)
+    try:
+        data = Universal(backend=duckdb_backend).get_data(*ARGS)
+    finally:
+        remove_metrics_sink(fail)
+    assert sink == [data.metrics]
@@ -0,0 +1,205 @@
+"""
+@description: Tests for syncing a local Parquet mirror from a query backend.
+@author: Rithwik Babu
+"""
+import glob
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from conftest import write_table
+from hawk_sdk.core.backend.base import QueryBackend
+from hawk_sdk.core.backend.dialect import duckdb_parameters
+from hawk_sdk.core.backend.duckdb_backend import DuckDBBackend
+from hawk_sdk.core.backend.mirror import MirrorSync
+
+SORT_KEYS = [
+    ('record_timestamp', 'ascending'),
+    ('hawk_id', 'ascending'),
+    ('field_id', 'ascending'),
+]
+
+
+class RecordingBackend(QueryBackend):
+    """Passes queries to another backend, keeping their parameters."""
+
+    name = 'recording'
+
+    def __init__(
+        self,
+        backend: QueryBackend,
+        fail: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> None:
+        """Initializes the wrapper.
+
+        :param backend: The backend that runs the queries.
+        :param fail: Raises for queries whose parameters it returns True for.
+        """
+        self.backend = backend
+        self.fail = fail
+        self.params: List[Dict[str, Any]] = []
+
+    def query(self, query: str, job_config: Any = None) -> Any:
+        """Records a query's parameters and runs it.
+
+        :param query: BigQuery SQL.
+        :param job_config: Carries the query parameters, if any.
+        :return: The wrapped backend's job.
+        """
+        params = duckdb_parameters(job_config)
+        if self.fail is not None and self.fail(params):
+            raise ConnectionError('connection lost')
+        self.params.append(params)
+        return self.backend.query(query, job_config)
+
+    def record_queries(self) -> List[Dict[str, Any]]:
+        """Lists the parameters of the partition queries run so far.
+
+        :return: Parameters of the queries with a partition_keys parameter.
+        """
+        return [p for p in self.params if 'partition_keys' in p]
+
+
+def read_mirror(root: str, where: str = 'TRUE') -> pa.Table:
+    """Reads records from a mirror through DuckDBBackend.
+
+    :param root: The mirror directory.
+    :param where: A filter on the records.
+    :return: The matching records, sorted.
+    """
+    backend = DuckDBBackend(root, threads=1)
+    try:
+        return backend.query(
+            "SELECT * FROM `p.production.records` WHERE " + where
+        ).result().sort_by(SORT_KEYS)
+    finally:
+        backend.close()
+
+
+def in_range(start: str, end: str) -> str:
+    """Builds a filter on record_timestamp.
+
+    :param start: The inclusive start timestamp.
+    :param end: The inclusive end timestamp.
+    :return: SQL condition.
+    """
+    start, end = pd.Timestamp(start, tz='UTC'), pd.Timestamp(end, tz='UTC')
+    return (
+        f"record_timestamp BETWEEN TIMESTAMPTZ '{start}' "
+        f"AND TIMESTAMPTZ '{end}' AND field_id IN (1, 2)"
+    )
+
+
+@pytest.fixture
+def target(tmp_path) -> str:
+    """The directory the tests sync into."""
+    return str(tmp_path / 'target')
+
+
+def test_first_sync_copies_the_range(mirror, duckdb_backend, target):
+    source = RecordingBackend(duckdb_backend)
+    with MirrorSync(target, backend=source, lookback_days=0) as sync:
+        downloaded = sync.sync(
+            '2024-01-01', '2024-01-02 23:59:59.999999', [1, 2], ['fred']
+        )
+
+    expected = read_mirror(
+        mirror, in_range('2024-01-01', '2024-01-02 23:59:59')
+    )
+    assert read_mirror(target).equals(expected)
+    assert downloaded['records'] == expected.num_rows
+    assert downloaded['fields'] == 3 and downloaded['hawk_identifiers'] == 3
+    assert downloaded['supplemental_records'] == 4
+    assert sorted(
+        os.path.relpath(path, target)
+        for path in glob.glob(f'{target}/production/records/**/*.parquet')
+    ) == [
+        'production/records/month=2024-01/field_id=1.parquet',
+        'production/records/month=2024-01/field_id=2.parquet',
+    ]
+
+
+def test_incremental_sync_appends_only_new_records(
+    mirror, duckdb_backend, target
+):
+    source = RecordingBackend(duckdb_backend)
+    with MirrorSync(target, backend=source, lookback_days=0) as sync:
+        sync.sync_table('records', [1, 2], '2024-01-01', '2024-01-02')
+
+        # New upstream records, one of them in a new month.
+        write_table(mirror, 'records/late', pa.table({
+            'record_timestamp': pa.array(
+                pd.to_datetime(
+                    ['2024-01-03 05:30', '2024-02-01 00:00'], utc=True
+                ),
+                pa.timestamp('us', tz='UTC')
+            ),
+            'hawk_id': pa.array([1, 2], pa.int64()),
+            'field_id': pa.array([1, 1], pa.int64()),
+            'double_value': pa.array([-1.0, -2.0]),
+            'int_value': pa.nulls(2, pa.int64()),
+            'char_value': pa.nulls(2, pa.string()),
+        }))
+        first_queries = len(source.record_queries())
+        downloaded = sync.sync_table(
+            'records', [1, 2], '2024-01-01', '2024-02-01 23:59:59.999999'
+        )
+        again = sync.sync_table(
+            'records', [1, 2], '2024-01-01', '2024-02-01 23:59:59.999999'
+        )
+
+    new_queries = source.record_queries()[first_queries:]
+    assert new_queries
+    assert all(
+        params['start_date'] > pd.Timestamp('2024-01-02', tz='UTC')
+        for params in new_queries
+    )
+    assert again == 0
+    expected = read_mirror(
+        mirror, in_range('2024-01-01', '2024-02-01 23:59:59')
+    )
+    assert downloaded == expected.num_rows - read_mirror(
+        mirror, in_range('2024-01-01', '2024-01-02')
+    ).num_rows
+    assert read_mirror(target).equals(expected)
+
+
+def test_interrupted_sync_resumes_the_missing_partitions(
+    mirror, duckdb_backend, target
+):
+    def field_2(params: Dict[str, Any]) -> bool:
+        return params.get('partition_keys') == [2]
+
+    failing = RecordingBackend(duckdb_backend, fail=field_2)
+    with MirrorSync(
+        target, backend=failing, keys_per_query=1, lookback_days=0
+    ) as sync:
+        with pytest.raises(ConnectionError):
+            sync.sync_table('records', [1, 2], '2024-01-01', '2024-01-03')
+    # A writer killed mid-file leaves only a temporary file behind.
+    partial = os.path.join(
+        target, 'production', 'records', 'month=2024-01',
+        'field_id=2.parquet.1.1.tmp'
+    )
+    with open(partial, 'wb') as f:
+        f.write(b'PAR1')
+    synced = in_range('2024-01-01', '2024-01-03') + ' AND field_id = 1'
+    assert read_mirror(target).equals(read_mirror(mirror, synced))
+
+    resumed = RecordingBackend(duckdb_backend)
+    with MirrorSync(
+        target, backend=resumed, keys_per_query=1, lookback_days=0
+    ) as sync:
+        downloaded = sync.sync_table(
+            'records', [1, 2], '2024-01-01', '2024-01-03'
+        )
+
+    assert [p['partition_keys'] for p in resumed.record_queries()] == [[2]]
+    expected = read_mirror(mirror, in_range('2024-01-01', '2024-01-03'))
+    assert downloaded == read_mirror(
+        mirror, in_range('2024-01-01', '2024-01-03') + ' AND field_id = 2'
+    ).num_rows
+    assert read_mirror(target).equals(expected)
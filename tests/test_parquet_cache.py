@@ -0,0 +1,311 @@
+"""
+@description: Tests for the Parquet cache and the cached Universal repository.
+@author: Rithwik Babu
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from hawk_sdk.api.universal.cached_repository import CachedUniversalRepository
+from hawk_sdk.core.cache.parquet_cache import (
+    RECORD_SCHEMA,
+    ParquetCache,
+    to_micros
+)
+from hawk_sdk.core.common.intervals import align_range
+
+SORT_KEYS = [
+    ('field_id', 'ascending'), ('hawk_id', 'ascending'),
+    ('date', 'ascending')
+]
+
+
+class FakeUniversalRepository:
+    """In-memory stand-in for UniversalRepository serving daily raw records."""
+
+    environment = 'production'
+
+    def __init__(
+        self, n_hawk_ids: int = 20, n_fields: int = 7, n_days: int = 90
+    ) -> None:
+        """Builds one double_value record per (day, hawk_id, field).
+
+        :param n_hawk_ids: Number of hawk_ids, numbered from 1.
+        :param n_fields: Number of fields, numbered from 1.
+        :param n_days: Number of days starting 2024-01-01.
+        """
+        dates = pd.date_range(
+            '2024-01-01', periods=n_days, freq='D', tz='UTC'
+        )
+        date, hawk_id, field_id = (a.ravel() for a in np.meshgrid(
+            dates, np.arange(1, n_hawk_ids + 1), np.arange(1, n_fields + 1),
+            indexing='ij'
+        ))
+        date_type = RECORD_SCHEMA.field('date').type
+        self.records = pa.table({
+            'date': pa.array(pd.DatetimeIndex(date), date_type),
+            'hawk_id': hawk_id.astype(np.int64),
+            'ticker': pa.array('T' + hawk_id.astype(str)),
+            'field_id': field_id.astype(np.int64),
+            'field_name': pa.array('f' + field_id.astype(str)),
+            'double_value': np.random.default_rng(0).normal(size=len(date)),
+            'int_value': pa.nulls(len(date), pa.int64()),
+            'char_value': pa.nulls(len(date), pa.string()),
+        })
+        self.queries = 0
+
+    def fetch_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True,
+        limit: Optional[int] = None
+    ) -> pa.Table:
+        """Returns the raw records of the request.
+
+        :param hawk_ids: The hawk_ids to fetch.
+        :param field_ids: The field_ids to fetch.
+        :param start_date: The inclusive start of the range.
+        :param end_date: The inclusive end of the range.
+        :param interval: Must be 'raw'.
+        :param aggregations: Unused.
+        :param join_metadata: Unused.
+        :param limit: Unused.
+        :return: A pyarrow Table of long-format records.
+        """
+        self.queries += 1
+        df = self.records.to_pandas()
+        dates = df['date'].astype('datetime64[us, UTC]').astype('int64')
+        df = df[
+            df['hawk_id'].isin(hawk_ids)
+            & df['field_id'].isin(field_ids)
+            & (dates >= to_micros(start_date))
+            & (dates <= to_micros(end_date))
+        ]
+        return pa.Table.from_pandas(
+            df, schema=RECORD_SCHEMA, preserve_index=False
+        )
+
+
+def fetch(repository: CachedUniversalRepository, hawk_ids: List[int],
+          field_ids: List[int], start_date: str, end_date: str) -> pa.Table:
+    """Fetches raw records through the cache, sorted for comparison.
+
+    :param repository: The cached repository.
+    :param hawk_ids: The hawk_ids to fetch.
+    :param field_ids: The field_ids to fetch.
+    :param start_date: The start date.
+    :param end_date: The end date.
+    :return: The records sorted by field_id, hawk_id and date.
+    """
+    return repository.fetch_data(
+        hawk_ids, field_ids, start_date, end_date, 'raw'
+    ).sort_by(SORT_KEYS)
+
+
+def expected(upstream: FakeUniversalRepository, hawk_ids: List[int],
+             field_ids: List[int], start_date: str, end_date: str) -> pa.Table:
+    """Fetches the same records straight from the fake, sorted for comparison.
+
+    :param upstream: The fake repository.
+    :param hawk_ids: The hawk_ids to fetch.
+    :param field_ids: The field_ids to fetch.
+    :param start_date: The start date.
+    :param end_date: The end date.
+    :return: The records sorted by field_id, hawk_id and date.
+    """
+    return upstream.fetch_data(
+        hawk_ids, field_ids, start_date, end_date, 'raw'
+    ).sort_by(SORT_KEYS)
+
+
+def test_request_larger_than_cache_is_complete(tmp_path):
+    upstream = FakeUniversalRepository()
+    repository = CachedUniversalRepository(
+        upstream, ParquetCache(str(tmp_path), max_bytes=3000)
+    )
+    args = (list(range(1, 21)), list(range(1, 8)), '2024-01-01', '2024-03-30')
+
+    result = fetch(repository, *args)
+
+    assert result.num_rows == 20 * 7 * 90
+    assert result.equals(expected(upstream, *args))
+
+
+def test_partially_cached_request_merges_cached_and_fetched_records(tmp_path):
+    upstream = FakeUniversalRepository()
+    repository = CachedUniversalRepository(
+        upstream, ParquetCache(str(tmp_path))
+    )
+    args = ([1, 2, 3, 4], [1, 2, 3], '2024-01-01', '2024-02-20')
+
+    fetch(repository, [1, 2, 3], [1, 2], '2024-01-10', '2024-02-10')
+    queries = upstream.queries
+    result = fetch(repository, *args)
+
+    assert upstream.queries > queries
+    assert result.equals(expected(upstream, *args))
+
+    queries = upstream.queries
+    again = fetch(repository, *args)
+    assert upstream.queries == queries
+    assert again.equals(result)
+
+
+def coverage_rows(cache: ParquetCache) -> List[tuple]:
+    """Lists the coverage entries of the cache manifest.
+
+    :param cache: The cache to inspect.
+    :return: (field_id, month, start_us, end_us) tuples in order.
+    """
+    with cache._connect() as conn:
+        return conn.execute(
+            "SELECT field_id, month, start_us, end_us FROM coverage "
+            "ORDER BY field_id, month, start_us"
+        ).fetchall()
+
+
+def test_settled_coverage_is_merged(tmp_path):
+    upstream = FakeUniversalRepository()
+    cache = ParquetCache(str(tmp_path))
+    repository = CachedUniversalRepository(upstream, cache)
+
+    for start_date, end_date in [
+        ('2024-01-01', '2024-01-05 23:59:59.999999'),
+        ('2024-01-11', '2024-01-20'),
+        ('2024-01-06', '2024-01-10 23:59:59.999999'),
+    ]:
+        fetch(repository, [1, 2], [1], start_date, end_date)
+
+    start_us, end_us = to_micros('2024-01-01'), to_micros('2024-01-20')
+    assert coverage_rows(cache) == [(1, '2024-01', start_us, end_us)]
+    assert cache.missing_ranges(
+        'production', 1, [1, 2, 3], start_us, end_us
+    ) == {3: [(start_us, end_us)]}
+
+
+def test_missing_ranges_per_hawk_set(tmp_path):
+    upstream = FakeUniversalRepository()
+    cache = ParquetCache(str(tmp_path))
+    repository = CachedUniversalRepository(upstream, cache)
+    fetch(repository, [1, 2], [1], '2024-01-01', '2024-01-10')
+    fetch(repository, [2, 3], [1], '2024-01-21', '2024-01-31')
+
+    start_us, end_us = to_micros('2024-01-01'), to_micros('2024-01-31')
+    day = 86400 * 1_000_000
+    assert cache.missing_ranges(
+        'production', 1, [1, 2, 3, 4], start_us, end_us
+    ) == {
+        1: [(to_micros('2024-01-10') + 1, end_us)],
+        2: [(to_micros('2024-01-10') + 1, to_micros('2024-01-21') - 1)],
+        3: [(start_us, to_micros('2024-01-21') - 1)],
+        4: [(start_us, end_us)],
+    }
+    assert cache.missing_ranges(
+        'production', 1, [2], start_us, start_us + day
+    ) == {}
+
+
+def test_expired_recent_coverage_is_dropped(tmp_path):
+    upstream = FakeUniversalRepository()
+    cache = ParquetCache(str(tmp_path), recent_days=10_000, recent_ttl=0.0)
+    repository = CachedUniversalRepository(upstream, cache)
+
+    fetch(repository, [1], [1], '2024-01-01', '2024-01-10')
+    fetch(repository, [1], [1], '2024-01-01', '2024-01-05')
+    fetch(repository, [1], [2], '2024-01-01', '2024-01-05')
+
+    # Every entry is recent and expires at once, so only the last write remains.
+    assert coverage_rows(cache) == [
+        (2, '2024-01', to_micros('2024-01-01'), to_micros('2024-01-05'))
+    ]
+
+
+class FakeDailyRepository:
+    """Serves hourly records near today, aggregated to 'last' per day."""
+
+    environment = 'production'
+
+    def __init__(self) -> None:
+        """Builds hourly records for the last eight days of hawk_id 1."""
+        today = pd.Timestamp.now(tz='UTC').floor('D')
+        self.dates = pd.date_range(
+            today - pd.Timedelta(days=7), today + pd.Timedelta(hours=23),
+            freq='h'
+        )
+        self.values = np.arange(len(self.dates), dtype=float)
+
+    def fetch_data(
+        self,
+        hawk_ids: List[int],
+        field_ids: List[int],
+        start_date: str,
+        end_date: str,
+        interval: str,
+        aggregations: Optional[Dict[int, str]] = None,
+        join_metadata: bool = True,
+        limit: Optional[int] = None
+    ) -> pa.Table:
+        """Returns each day's last value, widening the range to whole days.
+
+        :param hawk_ids: The hawk_ids to fetch; only 1 has records.
+        :param field_ids: The field_ids to fetch; only 1 has records.
+        :param start_date: The start of the range.
+        :param end_date: The end of the range.
+        :param interval: Must be '1d'.
+        :param aggregations: Unused; fields take their last value.
+        :param join_metadata: Unused.
+        :param limit: Unused.
+        :return: A pyarrow Table of long-format records.
+        """
+        start_date, end_date = align_range(start_date, end_date, interval)
+        df = pd.DataFrame({'date': self.dates, 'double_value': self.values})
+        df = df[
+            (df['date'] >= pd.Timestamp(start_date, tz='UTC'))
+            & (df['date'] <= pd.Timestamp(end_date, tz='UTC'))
+            & (1 in hawk_ids) & (1 in field_ids)
+        ]
+        df = df.assign(date=df['date'].dt.floor('D'))
+        df = df.groupby('date', as_index=False).last()
+        n = len(df)
+        return pa.table({
+            'date': pa.array(df['date'], RECORD_SCHEMA.field('date').type),
+            'hawk_id': pa.array([1] * n, pa.int64()),
+            'ticker': pa.array(['T1'] * n),
+            'field_id': pa.array([1] * n, pa.int64()),
+            'field_name': pa.array(['f1'] * n),
+            'double_value': pa.array(df['double_value'], pa.float64()),
+            'int_value': pa.nulls(n, pa.int64()),
+            'char_value': pa.nulls(n, pa.string()),
+        })
+
+
+def test_aggregated_refreshes_replace_whole_buckets(tmp_path):
+    upstream = FakeDailyRepository()
+    cache = ParquetCache(str(tmp_path), recent_days=2, recent_ttl=0.0)
+    repository = CachedUniversalRepository(upstream, cache)
+    start_date = upstream.dates[0].strftime('%Y-%m-%d')
+    end_date = upstream.dates[-1].strftime('%Y-%m-%d')
+
+    def daily() -> pd.Series:
+        table = repository.fetch_data([1], [1], start_date, end_date, '1d')
+        df = table.to_pandas().sort_values('date')
+        return df.set_index('date')['double_value']
+
+    first = daily()
+    assert len(first) == 8
+    for _ in range(3):
+        pd.testing.assert_series_equal(daily(), first)
+
+    # Revise the last hour of the day that becomes recent mid-bucket.
+    upstream.values[-25] = 18200.0
+    refreshed = daily()
+    assert len(refreshed) == 8
+    assert refreshed.iloc[-2] == 18200.0
+    pd.testing.assert_series_equal(refreshed.iloc[:-2], first.iloc[:-2])
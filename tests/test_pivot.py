@@ -0,0 +1,180 @@
+"""
+@description: Tests that the pivot engine matches pivot_table.
+@author: Rithwik Babu
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from hawk_sdk.core.common.pivot import pivot_records, pivot_records_arrow
+
+DATES = pd.date_range('2024-01-01', periods=3, freq='D', tz='UTC')
+
+
+def make_records(rows: list) -> pd.DataFrame:
+    """Builds long-format records from tuples.
+
+    Each tuple is (day, hawk_id, ticker, field, double, int, char).
+
+    :param rows: The records, with None for missing values.
+    :return: A long-format DataFrame typed like the repository output.
+    """
+    columns = [
+        'day', 'hawk_id', 'ticker', 'field_name',
+        'double_value', 'int_value', 'char_value'
+    ]
+    df = pd.DataFrame(rows, columns=columns)
+    return pd.DataFrame({
+        'date': pd.DatetimeIndex(DATES[df['day'].to_numpy(dtype=int)]),
+        'hawk_id': df['hawk_id'].astype('int64'),
+        'ticker': df['ticker'].astype(object),
+        'field_id': df['field_name'].factorize(sort=True)[0].astype('int64'),
+        'field_name': df['field_name'].astype(object),
+        'double_value': df['double_value'].astype(float),
+        'int_value': df['int_value'].astype('Int64'),
+        'char_value': df['char_value'].astype(object),
+    })
+
+
+def pivot_table_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """The combine_first + pivot_table implementation pivot_records replaced.
+
+    :param df: Long-format records.
+    :return: A DataFrame in wide format with field names as columns.
+    """
+    df = df.copy()
+    df['value'] = df['double_value'].combine_first(
+        df['int_value'].astype(float)
+    ).combine_first(
+        df['char_value']
+    )
+    pivoted = df.pivot_table(
+        index=['date', 'hawk_id', 'ticker'],
+        columns='field_name',
+        values='value',
+        aggfunc='first'
+    ).reset_index()
+    pivoted.columns.name = None
+    return pivoted
+
+
+def assert_matches_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """Asserts pivot_records holds the same values as pivot_table.
+
+    pivot_table returns every field as object once any char value is
+    present, so values are compared after casting numeric columns back.
+
+    :param df: Long-format records.
+    :return: The output of pivot_records.
+    """
+    engine = pivot_records(df)
+    reference = pivot_table_reference(df)
+    assert list(engine.columns) == list(reference.columns)
+    for column in engine.columns:
+        if engine[column].dtype == float:
+            reference[column] = reference[column].astype(float)
+    pd.testing.assert_frame_equal(engine, reference, check_dtype=False)
+    return engine
+
+
+def test_mixed_records_match_pivot_table():
+    rng = np.random.default_rng(0)
+    rows = []
+    for day in range(3):
+        for hawk_id in (3, 1, 2):
+            ticker, sector = f'T{hawk_id}', f's{hawk_id}'
+            close, volume = rng.normal(), int(rng.integers(1000))
+            rows.append((day, hawk_id, ticker, 'close', close, None, None))
+            rows.append((day, hawk_id, ticker, 'volume', None, volume, None))
+            rows.append((day, hawk_id, ticker, 'sector', None, None, sector))
+    rows.append((1, 2, 'T2', 'close', None, None, None))
+    df = make_records(rows).sample(frac=1.0, random_state=0)
+    engine = assert_matches_reference(df)
+    assert list(engine.columns) == [
+        'date', 'hawk_id', 'ticker', 'close', 'sector', 'volume'
+    ]
+    assert engine['hawk_id'].tolist() == [1, 2, 3] * 3
+
+
+def test_int_only_fields():
+    df = make_records([
+        (0, 1, 'A', 'volume', None, 10, None),
+        (0, 2, 'B', 'volume', None, 20, None),
+        (1, 1, 'A', 'volume', None, None, None),
+        (1, 2, 'B', 'volume', None, 30, None),
+    ])
+    engine = assert_matches_reference(df)
+    assert engine['volume'].dtype == float
+    assert engine['volume'].tolist() == [10.0, 20.0, 30.0]
+
+    integers = pivot_records(df, integer_fields=True)
+    assert integers['volume'].dtype == 'Int64'
+    assert integers['volume'].tolist() == [10, 20, 30]
+
+
+def test_char_valued_fields():
+    df = make_records([
+        (0, 1, 'A', 'rating', None, None, 'buy'),
+        (0, 2, 'B', 'rating', None, None, 'sell'),
+        (1, 1, 'A', 'rating', 1.5, None, None),
+        (1, 2, 'B', 'close', 2.0, None, None),
+    ])
+    engine = assert_matches_reference(df)
+    assert engine['rating'].dtype == object
+    assert engine['rating'].tolist()[:3] == ['buy', 'sell', 1.5]
+    assert np.isnan(engine['rating'].iloc[3])
+
+
+def test_duplicate_records_keep_first_value():
+    df = make_records([
+        (0, 1, 'A', 'close', 1.0, None, None),
+        (0, 1, 'A', 'close', 2.0, None, None),
+        (0, 1, 'A', 'volume', None, None, None),
+        (0, 1, 'A', 'volume', None, 7, None),
+        (0, 1, 'A', 'volume', None, 8, None),
+        (0, 2, 'B', 'rating', None, None, 'buy'),
+        (0, 2, 'B', 'rating', 3.0, None, None),
+    ])
+    engine = assert_matches_reference(df)
+    assert engine['close'].tolist()[0] == 1.0
+    assert engine['volume'].tolist()[0] == 7.0
+    assert engine['rating'].tolist()[1] == 'buy'
+
+
+def test_null_ticker_rows_are_kept():
+    df = make_records([
+        (0, 1, 'A', 'close', 1.0, None, None),
+        (0, 2, None, 'close', 2.0, None, None),
+        (1, 2, None, 'close', 3.0, None, None),
+    ])
+    engine = pivot_records(df)
+    # pivot_table drops rows whose index holds a null, pivot_records keeps them.
+    assert engine['hawk_id'].tolist() == [1, 2, 2]
+    assert engine['ticker'].isna().tolist() == [False, True, True]
+    assert engine['close'].tolist() == [1.0, 2.0, 3.0]
+
+    reference = pivot_table_reference(df.assign(ticker=df['ticker'].fillna('')))
+    reference['ticker'] = reference['ticker'].replace('', None)
+    pd.testing.assert_frame_equal(engine, reference, check_dtype=False)
+
+
+@pytest.mark.parametrize('rows', [[], [(0, 1, 'A', 'close', None, None, None)]])
+def test_empty_inputs(rows):
+    df = make_records(rows)
+    engine = pivot_records(df)
+    assert engine.empty
+
+
+def test_arrow_pivot_matches_pandas_pivot():
+    df = make_records([
+        (0, 1, 'A', 'close', 1.0, None, None),
+        (0, 1, 'A', 'close', 2.0, None, None),
+        (0, 1, 'A', 'volume', None, 7, None),
+        (1, 1, 'A', 'volume', None, 8, None),
+        (0, 2, 'B', 'close', 3.0, None, None),
+    ])
+    engine = pivot_records(df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    arrow = pivot_records_arrow(table).to_pandas()
+    pd.testing.assert_frame_equal(arrow, engine, check_dtype=False)
@@ -0,0 +1,153 @@
+"""
+@description: Tests for the in-process identifier resolver.
+@author: Rithwik Babu
+"""
+import asyncio
+import threading
+from typing import Iterator, List, Optional
+
+import pandas as pd
+import pytest
+
+from hawk_sdk.api.system import resolver as resolver_module
+from hawk_sdk.api.system.resolver import IdentifierResolver
+from hawk_sdk.api.universal.async_main import AsyncUniversal
+from hawk_sdk.api.universal.main import Universal
+
+
+class FakeBackend:
+    """Stands in for a query backend; only its name is used."""
+
+    name = 'fake'
+
+
+class FakeSystemRepository:
+    """In-memory stand-in for SystemRepository serving hawk_identifiers rows."""
+
+    environment = 'test'
+    backend = FakeBackend()
+
+    def __init__(self, rows: List[tuple]) -> None:
+        """Initializes the fake with (hawk_id, id_type, value) rows.
+
+        :param rows: The hawk_identifiers rows.
+        """
+        self.rows = rows
+
+    def fetch_identifier_signatures(self, bucket_count: int) -> Iterator[dict]:
+        """Returns a row count and fingerprint per bucket.
+
+        :param bucket_count: Number of hawk_id buckets.
+        :return: Rows with bucket, row_count and fingerprint.
+        """
+        signatures = {}
+        for hawk_id, id_type, value in self.rows:
+            bucket = hawk_id % bucket_count
+            count, fingerprint = signatures.get(bucket, (0, 0))
+            row_hash = hash((hawk_id, id_type, value))
+            signatures[bucket] = (count + 1, fingerprint ^ row_hash)
+        return iter([
+            {'bucket': bucket, 'row_count': count, 'fingerprint': fingerprint}
+            for bucket, (count, fingerprint) in signatures.items()
+        ])
+
+    def fetch_identifiers(
+        self,
+        bucket_count: int,
+        buckets: Optional[List[int]] = None
+    ) -> Iterator[dict]:
+        """Returns the rows of some buckets.
+
+        :param bucket_count: Number of hawk_id buckets.
+        :param buckets: The buckets to return, or None for all of them.
+        :return: Rows with hawk_id, id_type, value and bucket.
+        """
+        return iter([
+            {
+                'hawk_id': hawk_id,
+                'id_type': id_type,
+                'value': value,
+                'bucket': hawk_id % bucket_count
+            }
+            for hawk_id, id_type, value in self.rows
+            if buckets is None or hawk_id % bucket_count in buckets
+        ])
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(resolver_module, '_indexes', {})
+
+
+def test_resolve_and_reverse():
+    repository = FakeSystemRepository([
+        (1, 'TICKER', 'AAA'), (2, 'TICKER', 'BBB'), (3, 'TICKER', 'BBB'),
+        (2, 'FIGI', 'F2'),
+    ])
+    resolver = IdentifierResolver(repository)
+
+    assert resolver.resolve(['BBB', 'ZZZ', 'AAA']).tolist() == [2, pd.NA, 1]
+    assert resolver.resolve(['F2'], id_type='FIGI').tolist() == [2]
+    assert resolver.reverse([3, 1, 9]).tolist()[:2] == ['BBB', 'AAA']
+    assert pd.isna(resolver.reverse([9]).iloc[0])
+
+
+def test_unknown_id_type_raises():
+    resolver = IdentifierResolver(FakeSystemRepository([(1, 'TICKER', 'AAA')]))
+    with pytest.raises(ValueError, match='Available: TICKER'):
+        resolver.resolve(['x'], id_type='ISIN')
+
+
+def test_refresh_replaces_lookups():
+    repository = FakeSystemRepository([(1, 'TICKER', 'AAA')])
+    resolver = IdentifierResolver(repository)
+    assert resolver.resolve(['AAA', 'BBB']).tolist() == [1, pd.NA]
+
+    repository.rows = [(1, 'TICKER', 'AAA'), (2, 'TICKER', 'BBB')]
+    resolver.invalidate()
+    assert resolver.resolve(['AAA', 'BBB']).tolist() == [1, 2]
+
+
+def test_lookups_during_refreshes_match_the_rows():
+    repository = FakeSystemRepository(
+        [(i, 'TICKER', f'T{i}') for i in range(1, 200)]
+    )
+    resolver = IdentifierResolver(repository, max_age=0.0)
+    errors = []
+
+    def look_up() -> None:
+        for _ in range(50):
+            try:
+                assert resolver.resolve(['T5', 'T150']).tolist() == [5, 150]
+            except BaseException as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=look_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+def test_universal_builds_its_resolver_only_for_tickers(duckdb_backend):
+    universal = Universal(backend=duckdb_backend)
+    args = ([1, 2, 3], '2024-01-01', '2024-01-03', 'raw')
+    by_hawk_id = universal.get_data([1, 2], *args).to_df()
+    assert universal._resolver is None
+
+    by_ticker = universal.get_data(['AAA', 2], *args).to_df()
+    assert universal._resolver is not None
+    pd.testing.assert_frame_equal(by_ticker, by_hawk_id)
+
+
+def test_async_universal_resolves_tickers(duckdb_backend):
+    datasource = AsyncUniversal(backend=duckdb_backend)
+
+    async def run() -> pd.DataFrame:
+        data = await datasource.get_latest_snapshot(
+            ['CCC', 'AAA'], [1], per_field=True
+        )
+        return data.to_df()
+
+    assert sorted(asyncio.run(run())['hawk_id']) == [1, 3]
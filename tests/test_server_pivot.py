@@ -0,0 +1,80 @@
+"""
+@description: Tests that pivoting in the query matches pivoting client-side.
+@author: Rithwik Babu
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from hawk_sdk.api.universal.async_main import AsyncUniversal
+from hawk_sdk.api.universal.main import Universal
+
+HAWK_IDS = [1, 2, 3]
+FIELD_IDS = [1, 2, 3]
+
+REQUESTS = [
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='raw'),
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='6h',
+         aggregations={1: 'max', 2: 'sum', 3: 'first'}),
+    dict(start_date='2024-01-01', end_date='2024-01-02', interval='1d'),
+    dict(start_date='2024-01-01', end_date='2024-01-03', interval='raw',
+         hawk_id_chunk_size=2, date_chunk_days=1),
+]
+
+
+@pytest.fixture
+def universal(duckdb_backend) -> Universal:
+    """A Universal datasource over the DuckDB mirror fixture."""
+    return Universal(backend=duckdb_backend)
+
+
+@pytest.mark.parametrize('local_metadata', [False, True])
+@pytest.mark.parametrize('request_args', REQUESTS)
+def test_server_pivot_matches_client_pivot(
+    universal, request_args, local_metadata
+):
+    def get(server_pivot: bool) -> pd.DataFrame:
+        return universal.get_data(
+            HAWK_IDS, FIELD_IDS, server_pivot=server_pivot,
+            local_metadata=local_metadata, **request_args
+        ).to_df()
+
+    expected = get(server_pivot=False)
+    assert not expected.empty
+    pd.testing.assert_frame_equal(get(server_pivot=True), expected)
+
+
+@pytest.mark.parametrize('request_args', REQUESTS[:2])
+def test_arrow_server_pivot_matches_client_pivot(universal, request_args):
+    def get(server_pivot: bool) -> pd.DataFrame:
+        return universal.get_data(
+            HAWK_IDS, FIELD_IDS, server_pivot=server_pivot, arrow=True,
+            **request_args
+        ).to_arrow()
+
+    assert get(server_pivot=True).equals(get(server_pivot=False))
+
+
+def test_server_pivot_drops_fields_without_values(universal):
+    # rating is only recorded at midnight, so no 06:00-23:00 bucket has one.
+    args = (HAWK_IDS, FIELD_IDS, '2024-01-01 06:00', '2024-01-01 23:00', '1h')
+    expected = universal.get_data(*args).to_df()
+    assert 'rating' not in expected.columns
+    pd.testing.assert_frame_equal(
+        universal.get_data(*args, server_pivot=True).to_df(), expected
+    )
+
+
+def test_async_server_pivot_matches_client_pivot(duckdb_backend):
+    datasource = AsyncUniversal(backend=duckdb_backend)
+    args = (HAWK_IDS, FIELD_IDS, '2024-01-01', '2024-01-03', 'raw')
+
+    async def run() -> pd.DataFrame:
+        data = await datasource.get_data(
+            *args, server_pivot=True, hawk_id_chunk_size=2
+        )
+        return data.to_df()
+
+    expected = Universal(backend=duckdb_backend).get_data(*args).to_df()
+    pd.testing.assert_frame_equal(asyncio.run(run()), expected)